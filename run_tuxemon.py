@@ -38,6 +38,33 @@ if __name__ == "__main__":
         default=None,
         help="Skip title screen and load map directly",
     )
+    parser.add_argument(
+        "-s",
+        "--server",
+        dest="server_name",
+        metavar="name",
+        type=str,
+        nargs="?",
+        const="Default Tuxemon Server",
+        default=None,
+        help="Run a dedicated multiplayer server, without display",
+    )
+    parser.add_argument(
+        "--record",
+        dest="record",
+        metavar="inputs.json",
+        type=str,
+        default=None,
+        help="Record the inputs of the player in a file, to replay them",
+    )
+    parser.add_argument(
+        "--replay",
+        dest="replay",
+        metavar="inputs.json",
+        type=str,
+        default=None,
+        help="Replay recorded inputs as fast as possible, without display",
+    )
     args = parser.parse_args()
 
     if args.mod:
@@ -46,4 +73,10 @@ if __name__ == "__main__":
         config.skip_titlescreen = True
         config.splash = False
 
-    main.main(load_slot=args.slot)
+    if args.server_name:
+        main.headless(args.server_name)
+    elif args.replay:
+        report = main.replay(args.replay)
+        print(report.summary())
+    else:
+        main.main(load_slot=args.slot, record=args.record)
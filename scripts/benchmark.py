@@ -0,0 +1,438 @@
+"""
+Benchmark the hot paths of the engine, without a display.
+
+Each case times a part of the engine (loading the database and the maps,
+scrolling, pathfinding, event engine ticks, creating monsters, saving,
+rendering text...) and reports the fastest and median time of a call.
+The cases needing a world run a real client on the dummy SDL drivers.
+
+The results can be written as JSON, appended to a history file (one JSON
+document per line, with the time and commit of the run) to follow them
+over time, and compared to a baseline: the script exits with status 1
+if a case got slower than the baseline by more than the threshold.  A
+baseline is the JSON output of a previous run, and is only meaningful
+on the machine that produced it.
+
+Examples:
+
+    PYTHONPATH=. python scripts/benchmark.py
+    PYTHONPATH=. python scripts/benchmark.py --quick -k pathfind -k event
+    PYTHONPATH=. python scripts/benchmark.py --json baseline.json
+    PYTHONPATH=. python scripts/benchmark.py --baseline baseline.json \\
+        --history benchmarks.jsonl --threshold 0.1
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import glob
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from argparse import ArgumentParser
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import pygame
+
+from tuxemon import prepare, save
+from tuxemon.client import LocalPygameClient
+from tuxemon.db import JSONDatabase
+from tuxemon.map_loader import TMXMapLoader
+from tuxemon.monster import Monster
+from tuxemon.session import local_session
+from tuxemon.states.start import BackgroundState
+from tuxemon.states.world.worldstate import WorldState
+from tuxemon.technique.technique import Technique
+from tuxemon.ui.draw import iter_render_text
+
+Benchmark = Callable[[], object]
+
+# maps used by the cases needing a world
+WORLD_MAPS = ("taba_town.tmx", "route1.tmx", "spyder_route3.tmx")
+MONSTERS = ("rockitten", "bigfin", "dollfin", "fruitera", "aardorn")
+TECHNIQUES = ("ram", "fire_claw", "bubble_trap", "blossom", "sting")
+TEXT = (
+    "Welcome to the world of Tuxemon! Tuxemon are creatures which live "
+    "alongside humans, and are trained to battle each other.\n"
+    "Some people keep them as pets, others use them for battles. "
+) * 4
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[["Game"], Benchmark]
+    # calls timed together, and times they are timed
+    number: int
+    repeat: int
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, number: int = 1, repeat: int = 5):
+    """Register a case, whose setup returns the callable to time."""
+
+    def register(setup: Callable[["Game"], Benchmark]):
+        CASES.append(Case(name, setup, number, repeat))
+        return setup
+
+    return register
+
+
+class Game:
+    """
+    The game, started on the first case needing it.
+
+    Starting the client loads the database, the translations and the
+    configuration, so every case but ``db.load`` starts it.
+
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[LocalPygameClient] = None
+        self._world: Optional[WorldState] = None
+        self._map = ""
+        self._save_dir: Optional[str] = None
+
+    @property
+    def client(self) -> LocalPygameClient:
+        if self._client is None:
+            prepare.init()
+            self._client = LocalPygameClient(prepare.CONFIG)
+            setattr(prepare, "GLOBAL_CONTROL", self._client)
+            local_session.client = self._client
+            self._client.push_state(BackgroundState())
+        return self._client
+
+    def world(self, map_name: str) -> WorldState:
+        """Return the world, on a map."""
+        path = prepare.fetch("maps", map_name)
+        if self._world is None:
+            self._world = self.client.push_state(WorldState(map_name=path))
+            # the options a new game sets
+            local_session.player.game_variables.update(
+                music_volume=0.0,
+                sound_volume=0.0,
+                hemisphere="Northern",
+            )
+            # the first frame runs the init events, and the player sets
+            # the variables of the time of day
+            self.client.update(0.0)
+        elif self._map != map_name:
+            self._world.change_map(path)
+        self._map = map_name
+        return self._world
+
+    def save_to_temp_dir(self) -> None:
+        """Save the games in a temporary folder, removed by close."""
+        if self._save_dir is None:
+            self._save_dir = tempfile.mkdtemp(prefix="tuxemon-benchmark-")
+            prepare.SAVE_PATH = os.path.join(self._save_dir, "slot")
+
+    def close(self) -> None:
+        if self._save_dir is not None:
+            shutil.rmtree(self._save_dir)
+
+
+@case("db.load", repeat=5)
+def bench_db_load(game: Game) -> Benchmark:
+    return lambda: JSONDatabase().load()
+
+
+@case("map.load_all", repeat=2)
+def bench_map_load_all(game: Game) -> Benchmark:
+    # the tilesets are converted to the format of the display
+    game.client
+    maps = sorted(glob.glob(os.path.join(prepare.fetch("maps"), "*.tmx")))
+
+    def load_all() -> None:
+        loader = TMXMapLoader()
+        for filename in maps:
+            loader.load(filename)
+
+    return load_all
+
+
+def reachable_tiles(
+    world: WorldState,
+    start: Tuple[int, int],
+) -> List[Tuple[int, int]]:
+    """Tiles the player can walk to, nearest first."""
+    seen = {start}
+    queue = deque([start])
+    tiles = []
+    while queue:
+        tile = queue.popleft()
+        tiles.append(tile)
+        for exit_tile in world.get_exits(tile):
+            if exit_tile not in seen:
+                seen.add(exit_tile)
+                queue.append(exit_tile)
+    return tiles
+
+
+def bench_pathfind(map_name: str) -> Callable[[Game], Benchmark]:
+    def setup(game: Game) -> Benchmark:
+        world = game.world(map_name)
+        start = world.player.tile_pos
+        tiles = reachable_tiles(world, start)
+        # the farthest tiles, and some at mid distance
+        middle = len(tiles) // 2
+        destinations = tiles[-3:] + tiles[middle : middle + 2]
+
+        def pathfind() -> None:
+            for dest in destinations:
+                world.pathfind(start, dest)
+
+        return pathfind
+
+    return setup
+
+
+for map_name in WORLD_MAPS:
+    case(f"world.pathfind[{map_name}]", repeat=10)(bench_pathfind(map_name))
+
+
+@case("map.scroll", repeat=5)
+def bench_map_scroll(game: Game) -> Benchmark:
+    world = game.world(WORLD_MAPS[0])
+    renderer = world.current_map.renderer
+    if renderer is None:
+        world.current_map.initialize_renderer()
+        renderer = world.current_map.renderer
+    assert renderer
+    width, height = renderer.map_rect.size
+    screen = game.client.screen
+    # across the map, then jumping to far places
+    centers = [(x, height // 2) for x in range(0, width, 4)]
+    centers += [((i * 7919) % width, (i * 104729) % height) for i in range(50)]
+
+    def scroll() -> None:
+        for center in centers:
+            renderer.center(center)
+            renderer.draw(screen, screen.get_rect())
+
+    return scroll
+
+
+@case("event_engine.update", number=100, repeat=5)
+def bench_event_engine(game: Game) -> Benchmark:
+    game.world(WORLD_MAPS[0])
+    engine = game.client.event_engine
+    return lambda: engine.update(1 / 60)
+
+
+@case("event_action.create", number=1000, repeat=5)
+def bench_event_action(game: Game) -> Benchmark:
+    actions = game.client.event_engine.actions
+    calls = (
+        (actions["teleport"], ("taba_town.tmx", "3", "4")),
+        (actions["set_variable"], ("a:b",)),
+        (actions["add_monster"], ("rockitten", "10")),
+    )
+
+    def create() -> None:
+        for action, parameters in calls:
+            action(*parameters)
+
+    return create
+
+
+@case("monster.create", number=20, repeat=5)
+def bench_monster(game: Game) -> Benchmark:
+    game.client
+
+    def create() -> None:
+        for slug in MONSTERS:
+            monster = Monster()
+            monster.load_from_db(slug)
+            monster.set_level(20)
+            monster.set_moves(20)
+
+    return create
+
+
+@case("technique.load", number=100, repeat=5)
+def bench_technique(game: Game) -> Benchmark:
+    game.client
+
+    def load() -> None:
+        for slug in TECHNIQUES:
+            Technique().load(slug)
+
+    return load
+
+
+@case("save.round_trip", number=5, repeat=5)
+def bench_save(game: Game) -> Benchmark:
+    game.world(WORLD_MAPS[0])
+    game.save_to_temp_dir()
+    thumbnail = save.capture_thumbnail(game.client)
+
+    def round_trip() -> None:
+        # what the save menu does: show the slots, then save
+        for slot in range(1, 4):
+            save.read_header(slot)
+        # the player moves between saves, so the thumbnail changes
+        thumbnail.scroll(1, 0)
+        save.save(save.get_save_data(local_session), 1, thumbnail)
+
+    return round_trip
+
+
+@case("save.load", number=5, repeat=5)
+def bench_load(game: Game) -> Benchmark:
+    game.world(WORLD_MAPS[0])
+    game.save_to_temp_dir()
+    save.save(save.get_save_data(local_session), 1)
+    return lambda: save.load(1)
+
+
+@case("text.render", number=20, repeat=5)
+def bench_text(game: Game) -> Benchmark:
+    game.client
+    font = pygame.font.Font(prepare.fetch("font", prepare.FONT_BASIC), 16)
+    rect = pygame.Rect(0, 0, 400, 300)
+
+    def render() -> None:
+        list(iter_render_text(TEXT, font, (0, 0, 0), (255, 255, 255), rect))
+
+    return render
+
+
+def run_case(bench_case: Case, game: Game, quick: bool) -> Dict[str, Any]:
+    function = bench_case.setup(game)
+    repeat = 1 if quick else bench_case.repeat
+    times = timeit.repeat(function, number=bench_case.number, repeat=repeat)
+    per_call = [t / bench_case.number for t in times]
+    return {
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "number": bench_case.number,
+        "repeat": repeat,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """Return the cases slower than the baseline by more than threshold."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["min"] / baseline[name]["min"]
+        status = "ok"
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            status = "faster"
+        print(f"{name:34} {ratio:6.2f}x baseline  {status}")
+    return regressions
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "-k",
+        dest="filters",
+        action="append",
+        default=[],
+        help="only run the cases whose name contains this text",
+    )
+    parser.add_argument("--quick", action="store_true", help="time once")
+    parser.add_argument("--list", action="store_true", help="list cases")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--history", help="append the results to this file")
+    parser.add_argument("--baseline", help="compare to these results")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    cases = [
+        c
+        for c in CASES
+        if not args.filters or any(f in c.name for f in args.filters)
+    ]
+    if args.list:
+        for bench_case in cases:
+            print(bench_case.name)
+        return
+
+    game = Game()
+    results = {}
+    try:
+        for bench_case in cases:
+            result = run_case(bench_case, game, args.quick)
+            results[bench_case.name] = result
+            print(
+                f"{bench_case.name:34} min {format_time(result['min']):>12}"
+                f"  median {format_time(result['median']):>12}",
+                flush=True,
+            )
+    finally:
+        game.close()
+
+    run = {
+        "time": time.time(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(run, fp, indent=4)
+    if args.history:
+        with open(args.history, "a") as fp:
+            fp.write(json.dumps(run) + "\n")
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Slower than the baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
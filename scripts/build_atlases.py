@@ -0,0 +1,56 @@
+"""
+Build the texture atlases of a mod.
+
+Each folder is packed in a few sheets (``atlas-<n>.png``) indexed by
+``atlas.json``; the game then loads the images of the folder from the
+sheets.  The images are kept, run the script again after changing them.
+
+Examples:
+
+    PYTHONPATH=. python scripts/build_atlases.py
+    PYTHONPATH=. python scripts/build_atlases.py mods/tuxemon sprites
+"""
+
+import os
+import time
+from argparse import ArgumentParser
+
+import pygame
+
+from tuxemon.atlas import SHEET_SIZE, build_atlas
+
+# folders of small images loaded together: the battle sprites are loaded
+# one monster at a time, and the tilesets by the maps
+FOLDERS = (
+    "sprites",
+    "sprites_obj",
+    "animations/technique",
+    "gfx/items",
+    "gfx/ui/combat",
+    "gfx/ui/icons/element",
+    "gfx/ui/icons/status",
+    "gfx/ui/monster/pieces",
+)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("mod", nargs="?", default="mods/tuxemon")
+    parser.add_argument("folders", nargs="*", default=FOLDERS)
+    parser.add_argument("--sheet-size", type=int, default=SHEET_SIZE)
+    args = parser.parse_args()
+
+    pygame.init()
+    for folder in args.folders:
+        directory = os.path.join(args.mod, folder)
+        if not os.path.isdir(directory):
+            print(f"{directory}: not found")
+            continue
+        start = time.perf_counter()
+        count = build_atlas(directory, args.sheet_size)
+        elapsed = time.perf_counter() - start
+        print(f"{directory}: {count} images packed in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
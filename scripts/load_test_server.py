@@ -0,0 +1,177 @@
+"""
+Load test the multiplayer server with simulated clients.
+
+The server runs headlessly: a loopback stand-in for the Neteria server
+hands the notifications straight to in-process clients, counting the
+packets and their size as JSON (how Neteria serializes them).  Each
+server tick, some clients move, turn or change map, then the server
+sends what it queued.  At the end, every client must know the current
+character of every other client on its map.
+
+Examples:
+
+    PYTHONPATH=. python scripts/load_test_server.py -c 200 -m 10 -t 200
+"""
+
+import json
+import random
+import time
+from argparse import ArgumentParser
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from tuxemon.networking import TuxemonServer, apply_char_delta
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+
+class LoopbackServer:
+    """Stand-in for the Neteria server, keeping the notifications."""
+
+    def __init__(self) -> None:
+        self.registry: Dict[str, Dict[str, Any]] = {}
+        self.inboxes: Dict[str, List[Any]] = defaultdict(list)
+        self.packets = 0
+        self.bytes = 0
+
+    def notify(self, cuuid: str, event_data: Any) -> None:
+        self.packets += 1
+        self.bytes += len(json.dumps(event_data))
+        self.inboxes[cuuid].append(event_data)
+
+
+class SimulatedClient:
+    def __init__(self, cuuid: str, map_name: str, rng: random.Random):
+        self.cuuid = cuuid
+        self.map_name = map_name
+        self.rng = rng
+        self.tile_pos = (rng.randrange(50), rng.randrange(50))
+        self.facing = rng.choice(DIRECTIONS)
+        self.event_numbers: Dict[str, int] = defaultdict(int)
+        self.char_dicts: Dict[str, Dict[str, Any]] = {}
+
+    def event(self, event_type: str, **data: Any) -> Dict[str, Any]:
+        self.event_numbers[event_type] += 1
+        return {
+            "type": event_type,
+            "event_number": self.event_numbers[event_type],
+            **data,
+        }
+
+    def push_self(self) -> Dict[str, Any]:
+        return self.event(
+            "PUSH_SELF",
+            sprite_name="adventurer",
+            map_name=self.map_name,
+            char_dict={
+                "tile_pos": self.tile_pos,
+                "name": self.cuuid,
+                "facing": self.facing,
+            },
+        )
+
+    def act(self, maps: List[str]) -> Dict[str, Any]:
+        roll = self.rng.random()
+        if roll < 0.05:
+            self.map_name = self.rng.choice(maps)
+            return self.event(
+                "CLIENT_MAP_UPDATE",
+                map_name=self.map_name,
+                char_dict={"tile_pos": self.tile_pos},
+            )
+        if roll < 0.3:
+            self.facing = self.rng.choice(DIRECTIONS)
+            return self.event(
+                "CLIENT_FACING", char_dict={"facing": self.facing}
+            )
+        x, y = self.tile_pos
+        self.tile_pos = (x + self.rng.choice((-1, 1)), y)
+        return self.event(
+            "CLIENT_MOVE_COMPLETE",
+            map_name=self.map_name,
+            char_dict={"tile_pos": self.tile_pos},
+        )
+
+    def receive(self, packets: List[Any]) -> None:
+        for packet in packets:
+            if packet["type"] == "NOTIFY_BATCH":
+                events = packet["events"]
+            else:
+                events = [packet]
+            for event in events:
+                event = dict(event)
+                if event["type"] == "NOTIFY_CLIENT_DISCONNECTED":
+                    self.char_dicts.pop(event["cuuid"], None)
+                apply_char_delta(self.char_dicts, event)
+
+
+def run(
+    clients: int,
+    maps: int,
+    ticks: int,
+    actions: float,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    loopback = LoopbackServer()
+    server = TuxemonServer(None, network=loopback)
+    map_names = [f"map{i}.tmx" for i in range(maps)]
+    simulated = {}
+    for i in range(clients):
+        cuuid = f"client{i}"
+        client = SimulatedClient(cuuid, rng.choice(map_names), rng)
+        simulated[cuuid] = client
+        loopback.registry[cuuid] = {}
+        server.server_event_handler(cuuid, client.push_self())
+
+    server_time = 0.0
+    events = 0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        for cuuid, client in simulated.items():
+            if rng.random() < actions:
+                server.server_event_handler(cuuid, client.act(map_names))
+                events += 1
+        server.next_tick = 0.0
+        server.update()
+        server_time += time.perf_counter() - start
+        for cuuid, inbox in loopback.inboxes.items():
+            simulated[cuuid].receive(inbox)
+        loopback.inboxes.clear()
+
+    mismatches = 0
+    for cuuid, client in simulated.items():
+        for peer in server.interested_clients(cuuid):
+            char = loopback.registry[peer]["char_dict"]
+            if client.char_dicts.get(peer) != char:
+                mismatches += 1
+
+    print(f"clients: {clients}, maps: {maps}, ticks: {ticks}")
+    print(f"client events: {events}")
+    print(
+        f"packets sent: {loopback.packets} ({loopback.packets / ticks:.1f}/tick)"
+    )
+    print(f"bytes sent: {loopback.bytes} ({loopback.bytes / ticks:.0f}/tick)")
+    print(f"server time: {server_time * 1000 / ticks:.3f} ms/tick")
+    print(f"out of sync characters: {mismatches}")
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("-c", "--clients", type=int, default=100)
+    parser.add_argument("-m", "--maps", type=int, default=5)
+    parser.add_argument("-t", "--ticks", type=int, default=200)
+    parser.add_argument(
+        "-a",
+        "--actions",
+        type=float,
+        default=0.5,
+        help="chance of each client acting on a tick",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.clients, args.maps, args.ticks, args.actions, args.seed)
+
+
+if __name__ == "__main__":
+    main()
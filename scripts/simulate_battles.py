@@ -0,0 +1,228 @@
+"""
+Run seeded AI-vs-AI battles headlessly and report win rates.
+
+Battles are played by tuxemon.simulation.BattleSimulator, without a
+display, across a pool of worker processes.  Each battle uses its own
+seed (``--seed`` + battle number), so any battle of a sweep can be
+replayed alone.  Battles interrupted by an exception are counted and
+their seeds are reported instead of stopping the whole sweep.
+
+Examples:
+
+    PYTHONPATH=. python scripts/simulate_battles.py -n 100000 -l 20
+    PYTHONPATH=. python scripts/simulate_battles.py -m rockitten bigfin \\
+        --party-size 1 --json results.json
+"""
+
+import json
+import random
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+from tuxemon.ai import DIFFICULTIES
+from tuxemon.db import db
+from tuxemon.simulation import BattleSimulator
+
+
+def init_worker():
+    # forked workers inherit the database of the parent process
+    if not db.database["monster"]:
+        db.load()
+
+
+def run_chunk(
+    roster: Sequence[str],
+    party_size: int,
+    level: int,
+    difficulty: str,
+    seed: int,
+    start: int,
+    stop: int,
+) -> Dict[str, Counter]:
+    stats: Dict[str, Counter] = {
+        "battles": Counter(),
+        "monster_games": Counter(),
+        "monster_wins": Counter(),
+        "technique_games": Counter(),
+        "technique_wins": Counter(),
+        "errors": Counter(),
+    }
+    for number in range(start, stop):
+        rng = random.Random(seed + number)
+        slugs = rng.sample(list(roster), party_size * 2)
+        sim = BattleSimulator(rng, difficulty)
+        parties = (
+            [sim.create_monster(s, level) for s in slugs[:party_size]],
+            [sim.create_monster(s, level) for s in slugs[party_size:]],
+        )
+        try:
+            result = sim.run(*parties)
+        except Exception as e:
+            stats["battles"]["errors"] += 1
+            stats["errors"][
+                f"{type(e).__name__}: {e} (seed {seed + number})"
+            ] += 1
+            continue
+        stats["battles"]["total"] += 1
+        stats["battles"]["turns"] += result.turns
+        if result.winner is None:
+            stats["battles"]["draws"] += 1
+        for side in (0, 1):
+            won = int(result.winner == side)
+            for slug in result.parties[side]:
+                stats["monster_games"][slug] += 1
+                stats["monster_wins"][slug] += won
+            for slug in result.techniques[side]:
+                stats["technique_games"][slug] += 1
+                stats["technique_wins"][slug] += won
+    return stats
+
+
+def win_rates(games: Counter, wins: Counter) -> List[Dict[str, object]]:
+    rates = [
+        {
+            "slug": slug,
+            "games": count,
+            "win_rate": round(wins[slug] / count, 4),
+        }
+        for slug, count in games.items()
+    ]
+    return sorted(rates, key=lambda r: r["win_rate"], reverse=True)
+
+
+def print_table(title: str, rows: List[Dict[str, object]], top: int):
+    print(f"\n{title}")
+    for row in rows[:top]:
+        print(f"  {row['slug']:<30} {row['win_rate']:>7.2%} {row['games']:>9}")
+    if len(rows) > top * 2:
+        print("  ...")
+        for row in rows[-top:]:
+            print(
+                f"  {row['slug']:<30} {row['win_rate']:>7.2%} {row['games']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--battles",
+        type=int,
+        default=10000,
+        help="Number of battles to simulate",
+    )
+    parser.add_argument(
+        "-l",
+        "--level",
+        type=int,
+        default=10,
+        help="Level of every monster",
+    )
+    parser.add_argument(
+        "-p",
+        "--party-size",
+        type=int,
+        default=1,
+        help="Number of monsters of each trainer",
+    )
+    parser.add_argument(
+        "-m",
+        "--monsters",
+        nargs="*",
+        help="Slugs of the monsters to draw parties from (default: all)",
+    )
+    parser.add_argument(
+        "-d",
+        "--difficulty",
+        choices=DIFFICULTIES,
+        default="easy",
+        help="Difficulty of the AI of both trainers",
+    )
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the first battle",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="Number of battles sent to a worker at once",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of best and worst entries printed",
+    )
+    parser.add_argument(
+        "--json",
+        dest="json_path",
+        help="Write the full results to this JSON file",
+    )
+    args = parser.parse_args()
+
+    db.load()
+    roster = args.monsters or sorted(
+        slug
+        for slug, monster in db.database["monster"].items()
+        if monster.moveset
+    )
+    if len(roster) < args.party_size * 2:
+        parser.error("not enough monsters to fill both parties")
+
+    totals: Dict[str, Counter] = {}
+    with ProcessPoolExecutor(args.workers, initializer=init_worker) as pool:
+        futures = [
+            pool.submit(
+                run_chunk,
+                roster,
+                args.party_size,
+                args.level,
+                args.difficulty,
+                args.seed,
+                start,
+                min(start + args.chunk_size, args.battles),
+            )
+            for start in range(0, args.battles, args.chunk_size)
+        ]
+        for future in futures:
+            for key, counter in future.result().items():
+                totals.setdefault(key, Counter()).update(counter)
+
+    battles = totals["battles"]
+    monsters = win_rates(totals["monster_games"], totals["monster_wins"])
+    techniques = win_rates(totals["technique_games"], totals["technique_wins"])
+    print(
+        f"{battles['total']} battles, {battles['draws']} draws, "
+        f"{battles['errors']} errors, "
+        f"{battles['turns'] / max(battles['total'], 1):.1f} turns on average"
+    )
+    for error in list(totals["errors"])[: args.top]:
+        print(f"  error: {error}")
+    print_table("Monsters", monsters, args.top)
+    print_table("Techniques", techniques, args.top)
+
+    if args.json_path:
+        with open(args.json_path, "w") as fp:
+            json.dump(
+                {
+                    "battles": dict(battles),
+                    "errors": list(totals["errors"]),
+                    "monsters": monsters,
+                    "techniques": techniques,
+                },
+                fp,
+                indent=2,
+            )
@@ -66,3 +66,8 @@ class GetDefaultPriceAndCost(EconomyTestBase):
         economy = self.economy
         with self.assertRaises(RuntimeError):
             inventory = economy.lookup_item_inventory("unknown_item")
+
+    def test_lookup_item(self):
+        economy = self.economy
+        self.assertEqual(economy.lookup_item("revive").price, 100)
+        self.assertIsNone(economy.lookup_item("unknown_item"))
@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import unittest
+import uuid
+
+from tuxemon.item.inventory import Inventory
+
+
+class FakeItem:
+    def __init__(self, slug, name=""):
+        self.slug = slug
+        self.name = name or slug
+        self.quantity = 1
+        self.instance_id = uuid.uuid4()
+
+    def get_state(self):
+        return {"slug": self.slug, "quantity": self.quantity}
+
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        self.potion = FakeItem("potion")
+        self.ball = FakeItem("tuxeball")
+        self.other_potion = FakeItem("potion")
+        self.inventory = Inventory([self.potion, self.ball, self.other_potion])
+
+    def test_order_is_kept(self):
+        self.assertEqual(
+            list(self.inventory), [self.potion, self.ball, self.other_potion]
+        )
+        self.assertEqual(len(self.inventory), 3)
+
+    def test_find(self):
+        self.assertIs(self.inventory.find("potion"), self.potion)
+        self.assertIsNone(self.inventory.find("revive"))
+        self.assertEqual(self.inventory.count("potion"), 2)
+        self.inventory.remove(self.potion)
+        self.assertIs(self.inventory.find("potion"), self.other_potion)
+        self.inventory.remove(self.other_potion)
+        self.assertIsNone(self.inventory.find("potion"))
+        self.assertEqual(self.inventory.count("potion"), 0)
+
+    def test_get_and_contains(self):
+        self.assertIs(self.inventory.get(self.ball.instance_id), self.ball)
+        self.assertIn(self.ball, self.inventory)
+        copy = FakeItem("tuxeball")
+        copy.instance_id = self.ball.instance_id
+        self.assertNotIn(copy, self.inventory)
+        with self.assertRaises(ValueError):
+            self.inventory.remove(copy)
+
+    def test_remove_while_iterating(self):
+        for item in self.inventory:
+            self.inventory.remove(item)
+        self.assertFalse(self.inventory)
+
+    def test_sorted_is_kept_until_changed(self):
+        def key(item):
+            return item.name
+
+        first = self.inventory.sorted(key)
+        self.assertEqual(
+            [item.slug for item in first], ["potion", "potion", "tuxeball"]
+        )
+        self.assertIs(self.inventory.sorted(key), first)
+        self.inventory.append(FakeItem("apple"))
+        self.assertEqual(self.inventory.sorted(key)[0].slug, "apple")
+
+    def test_state_is_kept_until_changed(self):
+        state = self.inventory.get_state()
+        self.assertEqual(state[1], {"slug": "tuxeball", "quantity": 1})
+        self.assertIs(self.inventory.get_state(), state)
+        self.ball.quantity = 2
+        state = self.inventory.get_state()
+        self.assertEqual(state[1]["quantity"], 2)
+        self.assertIs(self.inventory.get_state(), state)
+        self.inventory.remove(self.ball)
+        self.assertEqual(len(self.inventory.get_state()), 2)
@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import random
+import unittest
+
+from tuxemon.ai import choose_action, expected_damage, usable_actions
+from tuxemon.db import db
+from tuxemon.formula import simple_damage_calculate
+from tuxemon.simulation import BattleSimulator
+
+
+class TestScoring(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not db.database["monster"]:
+            db.load()
+
+    def setUp(self):
+        sim = BattleSimulator(random.Random(0))
+        self.user = sim.create_monster("agnite", 20)
+        self.target = sim.create_monster("bigfin", 20)
+        self.actions = usable_actions(self.user, [self.target])
+
+    def test_expected_damage_matches_formula(self):
+        damages = expected_damage(self.user, self.actions)
+        for (tech, target), expected in zip(self.actions, damages):
+            if expected:
+                damage, _ = simple_damage_calculate(tech, self.user, target)
+                self.assertAlmostEqual(
+                    expected,
+                    tech.accuracy * min(damage, target.current_hp),
+                )
+
+    def test_hard_picks_the_best_action(self):
+        damages = expected_damage(self.user, self.actions)
+        best = self.actions[damages.index(max(damages))]
+        action = choose_action(self.user, [self.target], "hard")
+        self.assertEqual(action, best)
+
+    def test_easy_is_seeded(self):
+        first = choose_action(
+            self.user, [self.target], "easy", random.Random(4)
+        )
+        second = choose_action(
+            self.user, [self.target], "easy", random.Random(4)
+        )
+        self.assertEqual(first, second)
+
+    def test_no_usable_action(self):
+        for tech in self.user.moves:
+            tech.next_use = 1
+        self.assertIsNone(choose_action(self.user, [self.target], "hard"))
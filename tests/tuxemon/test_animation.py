@@ -4,7 +4,12 @@ from unittest.mock import Mock, call
 
 import pygame
 
-from tuxemon.animation import Task
+from tuxemon.animation import (
+    Animation,
+    AnimationGroup,
+    Task,
+    remove_animations_of,
+)
 
 DEFAULT_INTERVAL = 1.0
 
@@ -104,3 +109,46 @@ class TestAnimation(unittest.TestCase):
         task.reset_delay(lower_delay)
 
         self.assertEqual(DEFAULT_INTERVAL, task._interval)
+
+
+class TestAnimationGroup(unittest.TestCase):
+    def test_update_reaches_final_values(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        callback = Mock(spec=Callable)
+        group = AnimationGroup()
+        ani = Animation(rect, x=11, duration=1.0, transition="linear")
+        ani.callback = callback
+        group.add(ani)
+
+        group.update(0.5)
+        self.assertEqual(rect.x, 6)
+        callback.assert_not_called()
+
+        group.update(0.5)
+        self.assertEqual(rect.x, 11)
+        callback.assert_called_once()
+        self.assertEqual(len(group), 0)
+
+    def test_delayed_animation_starts_later(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        group = AnimationGroup()
+        group.add(Animation(rect, x=10, duration=1.0, delay=1.0))
+
+        group.update(0.5)
+        self.assertEqual(rect.x, 0)
+        group.update(0.6)
+        group.update(1.0)
+        self.assertEqual(rect.x, 10)
+
+    def test_remove_animations_of(self):
+        first = pygame.Rect(0, 0, 10, 10)
+        second = pygame.Rect(0, 0, 10, 10)
+        group = AnimationGroup()
+        group.add(Animation(first, x=10, duration=1.0))
+        group.add(Animation(second, x=10, duration=1.0))
+        group.add(Task(Mock(spec=Callable), DEFAULT_INTERVAL))
+
+        remove_animations_of(first, group)
+        group.update(1.0)
+        self.assertEqual(first.x, 0)
+        self.assertEqual(second.x, 10)
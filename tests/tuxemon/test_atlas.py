@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from tuxemon import graphics
+from tuxemon.atlas import ATLAS_INDEX, build_atlas, group_name, pack
+from tuxemon.db import db
+from tuxemon.graphics import TextureAtlasIndex
+
+
+class TestPack(unittest.TestCase):
+    def test_group_name(self):
+        for filename, group in (
+            ("adventurer_front.png", "adventurer"),
+            ("adventurer_back_walk.002.png", "adventurer"),
+            ("bigfin-front.png", "bigfin"),
+            ("bigfin-menu01.png", "bigfin"),
+            ("fire_01.png", "fire"),
+            ("apple.png", "apple"),
+        ):
+            self.assertEqual(group_name(filename), group)
+
+    def test_groups_stay_together(self):
+        # a sheet holds four images, a group of three does not fit after
+        # another one
+        sizes = {f"a_{i:02}.png": (40, 40) for i in range(3)}
+        sizes.update({f"b_{i:02}.png": (40, 40) for i in range(3)})
+        sheets = pack(sizes, sheet_size=100)
+        self.assertEqual(
+            [sorted(sheet) for sheet in sheets],
+            [
+                ["a_00.png", "a_01.png", "a_02.png"],
+                ["b_00.png", "b_01.png", "b_02.png"],
+            ],
+        )
+
+    def test_big_group_is_split(self):
+        sizes = {f"a_{i:02}.png": (40, 40) for i in range(6)}
+        sheets = pack(sizes, sheet_size=100)
+        self.assertEqual([len(sheet) for sheet in sheets], [4, 2])
+
+    def test_rectangles_do_not_overlap(self):
+        sizes = {f"i{i}.png": (10 + i % 7, 5 + i % 11) for i in range(100)}
+        sheets = pack(sizes, sheet_size=64)
+        placed = 0
+        for sheet in sheets:
+            rects = [pygame.Rect(r) for r in sheet.values()]
+            for i, rect in enumerate(rects):
+                self.assertTrue(pygame.Rect(0, 0, 64, 64).contains(rect))
+                self.assertEqual(rect.collidelist(rects[i + 1 :]), -1)
+            placed += len(sheet)
+        self.assertEqual(placed, len(sizes))
+
+    def test_too_big(self):
+        self.assertEqual(pack({"huge.png": (200, 10)}, sheet_size=100), [])
+
+
+class TestTextureAtlasIndex(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.images = {}
+        for number, color in enumerate(("red", "green", "blue")):
+            image = pygame.Surface((8 + number, 16), pygame.SRCALPHA)
+            image.fill(color)
+            image.fill((0, 0, 0, 0), (0, 0, 2, 2))
+            filename = f"npc_front_walk.00{number}.png"
+            pygame.image.save(image, os.path.join(self.directory, filename))
+            self.images[filename] = image
+        self.index = TextureAtlasIndex()
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def test_without_atlas(self):
+        self.assertIsNone(self.index.load(self.path("npc_front_walk.000.png")))
+
+    def test_load_from_sheet(self):
+        self.assertEqual(build_atlas(self.directory), 3)
+        # rebuilding replaces the sheets instead of packing them
+        self.assertEqual(build_atlas(self.directory), 3)
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            ["atlas-0.png", "atlas.json", *sorted(self.images)],
+        )
+        for filename, image in self.images.items():
+            loaded = self.index.load(self.path(filename))
+            self.assertIsNotNone(loaded.get_parent())
+            self.assertEqual(loaded.get_size(), image.get_size())
+            for pos in ((0, 0), (1, 1), (5, 10)):
+                self.assertEqual(loaded.get_at(pos), image.get_at(pos))
+        self.assertIsNone(self.index.load(self.path("missing.png")))
+
+    def test_edited_image_ignores_atlas(self):
+        build_atlas(self.directory)
+        os.utime(self.path(ATLAS_INDEX), ns=(0, 0))
+        self.assertIsNone(self.index.load(self.path("npc_front_walk.000.png")))
+
+    def test_reload_forgets_atlas(self):
+        self.addCleanup(graphics._atlas_index.clear)
+        filename = self.path("npc_front_walk.000.png")
+        self.assertIsNone(graphics._atlas_index.load(filename))
+        build_atlas(self.directory)
+        self.assertIsNone(graphics._atlas_index.load(filename))
+        db.load("element")
+        self.assertIsNotNone(graphics._atlas_index.load(filename))
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import os
+import tempfile
+import unittest
+import wave
+from unittest import mock
+
+import pygame
+from pygame import mixer
+
+from tuxemon import audio
+from tuxemon.audio import BankedSound, DummySound, SoundBank
+from tuxemon.db import db
+
+
+def write_wave(filename, frames):
+    with wave.open(filename, "wb") as fp:
+        fp.setnchannels(1)
+        fp.setsampwidth(2)
+        fp.setframerate(22050)
+        fp.writeframes(b"\x00\x01" * frames)
+
+
+class TestSoundBank(unittest.TestCase):
+    def setUp(self):
+        try:
+            mixer.init(frequency=22050, size=-16, channels=1)
+        except pygame.error:
+            self.skipTest("no mixer")
+        self.addCleanup(mixer.quit)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.filenames = {}
+        for slug in ("sound_a", "sound_b", "sound_c"):
+            filename = os.path.join(tmp.name, f"{slug}.wav")
+            write_wave(filename, 1000)
+            self.filenames[slug] = filename
+        patcher = mock.patch.object(
+            audio, "get_sound_filename", side_effect=self.filenames.get
+        )
+        self.get_filename = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_decoded_once(self):
+        bank = SoundBank()
+        sound = bank.get("sound_a")
+        self.assertIsNotNone(sound)
+        self.assertIs(bank.get("sound_a"), sound)
+        self.assertEqual(self.get_filename.call_count, 1)
+
+    def test_missing(self):
+        bank = SoundBank()
+        self.assertIsNone(bank.get("sound_z"))
+        self.assertIsNone(bank.get("sound_z"))
+        self.assertIsNone(bank.get(""))
+        self.assertEqual(self.get_filename.call_count, 1)
+
+    def test_least_recently_used_dropped(self):
+        # room for two sounds of 1000 16 bits samples
+        bank = SoundBank(max_size=4000)
+        sound_a = bank.get("sound_a")
+        bank.get("sound_b")
+        self.assertIs(bank.get("sound_a"), sound_a)
+        bank.get("sound_c")
+        self.assertEqual(bank.size, 4000)
+        self.assertIs(bank.get("sound_a"), sound_a)
+        self.assertEqual(self.get_filename.call_count, 3)
+        bank.get("sound_b")
+        self.assertEqual(self.get_filename.call_count, 4)
+
+    def test_preload(self):
+        bank = SoundBank()
+        bank.preload(["sound_a", "sound_b", None, "sound_z"])
+        self.assertIsNotNone(bank.get("sound_a"))
+        self.assertIsNotNone(bank.get("sound_b"))
+        self.assertIsNone(bank.get("sound_z"))
+        self.assertEqual(self.get_filename.call_count, 3)
+        bank.clear()
+        self.assertEqual(bank.size, 0)
+
+    def test_load_sound(self):
+        with mock.patch.object(audio, "sound_bank", SoundBank()):
+            self.assertIsInstance(audio.load_sound("sound_z", 1.0), DummySound)
+            sound = audio.load_sound("sound_a", 0.5)
+            self.assertIsInstance(sound, BankedSound)
+            self.assertEqual(sound.volume, 0.5)
+            self.assertIs(audio.load_sound("sound_a", 1.0).sound, sound.sound)
+
+    def test_reload_clears_sounds(self):
+        self.addCleanup(audio.sound_bank.clear)
+        self.assertIsNotNone(audio.sound_bank.get("sound_a"))
+        self.assertIsNone(audio.sound_bank.get("sound_z"))
+        db.load("element")
+        self.assertEqual(audio.sound_bank.size, 0)
+        audio.sound_bank.get("sound_a")
+        audio.sound_bank.get("sound_z")
+        self.assertEqual(self.get_filename.call_count, 4)
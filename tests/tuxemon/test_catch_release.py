@@ -4,6 +4,7 @@ import unittest
 from unittest import mock
 
 from tuxemon.monster import Monster
+from tuxemon.monster_registry import MonsterRegistry
 from tuxemon.npc import NPC
 
 
@@ -13,6 +14,7 @@ def mockNPC(self) -> None:
     self.game_variables = {}
     self.monster_boxes = {}
     self.monster_boxes["Kennel"] = []
+    self.monster_registry = MonsterRegistry()
 
 
 class TestCatchTuxemon(unittest.TestCase):
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import unittest
+from typing import Callable
+from unittest.mock import Mock
+
+from tuxemon.animation import Task
+from tuxemon.clock import Scheduler
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SchedulerTestBase(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeTime()
+        self.scheduler = Scheduler(self.time)
+        self.scheduler.tick()
+
+    def advance(self, dt):
+        self.time.now += dt
+        self.scheduler.tick()
+
+
+class TestScheduler(SchedulerTestBase):
+    def test_calls_in_deadline_order(self):
+        calls = []
+        self.scheduler.schedule(lambda dt: calls.append("late"), 2.0)
+        self.scheduler.schedule(lambda dt: calls.append("early"), 1.0)
+        self.scheduler.schedule(lambda dt: calls.append("later"), 1.0)
+        self.advance(0.5)
+        self.assertEqual(calls, [])
+        self.advance(1.0)
+        self.assertEqual(calls, ["early", "later"])
+        self.advance(1.0)
+        self.assertEqual(calls, ["early", "later", "late"])
+
+    def test_repeat_until_false(self):
+        results = [None, None, False]
+        callback = Mock(side_effect=lambda dt: results.pop(0))
+        self.scheduler.schedule(callback, 1.0, repeat=True)
+        for _ in range(5):
+            self.advance(1.0)
+        self.assertEqual(callback.call_count, 3)
+        self.assertIsNone(self.scheduler.get_idle_time())
+
+    def test_scheduled_by_callback_waits_next_tick(self):
+        callback = Mock()
+        self.scheduler.schedule(
+            lambda dt: self.scheduler.schedule(callback), 1.0
+        )
+        self.advance(1.0)
+        callback.assert_not_called()
+        self.advance(0.0)
+        callback.assert_called_once()
+
+    def test_unschedule_owner(self):
+        owner = object()
+        callback = Mock()
+        other = Mock()
+        for delay in (1.0, 2.0, 3.0):
+            self.scheduler.schedule(callback, delay, owner=owner)
+        self.scheduler.schedule(other, 2.0)
+        self.assertTrue(self.scheduler.is_scheduled(owner))
+        self.scheduler.unschedule_owner(owner)
+        self.assertFalse(self.scheduler.is_scheduled(owner))
+        self.advance(5.0)
+        callback.assert_not_called()
+        other.assert_called_once()
+
+    def test_unschedule_many(self):
+        callback = Mock()
+        items = [self.scheduler.schedule(callback, 1.0) for _ in range(100)]
+        for item in items[1:]:
+            self.scheduler.unschedule_item(item)
+        self.assertLess(len(self.scheduler._scheduled_items), 100)
+        self.advance(1.0)
+        callback.assert_called_once()
+
+    def test_idle_time(self):
+        self.assertIsNone(self.scheduler.get_idle_time())
+        item = self.scheduler.schedule(Mock(), 2.0)
+        self.scheduler.schedule(Mock(), 3.0)
+        self.time.now += 0.5
+        self.assertEqual(self.scheduler.get_idle_time(), 1.5)
+        self.scheduler.unschedule_item(item)
+        self.assertEqual(self.scheduler.get_idle_time(), 2.5)
+
+
+class TestAttachedTask(SchedulerTestBase):
+    def setUp(self):
+        super().setUp()
+        self.mock_callback = Mock(spec=Callable)
+        self.other_mock_callback = Mock(spec=Callable)
+
+    def test_task_called_at_deadline(self):
+        task = Task(self.mock_callback, 1.0, 2)
+        task.attach(self.scheduler)
+        self.advance(0.5)
+        self.mock_callback.assert_not_called()
+        self.advance(0.5)
+        self.assertEqual(self.mock_callback.call_count, 1)
+        self.advance(1.0)
+        self.assertEqual(self.mock_callback.call_count, 2)
+        self.assertTrue(task.is_finish())
+        self.assertIsNone(self.scheduler.get_idle_time())
+
+    def test_chained_task_attached(self):
+        owner = object()
+        task = Task(self.mock_callback, 1.0)
+        task.chain(self.other_mock_callback, 1.0)
+        task.attach(self.scheduler, owner)
+        self.advance(1.0)
+        self.mock_callback.assert_called_once()
+        self.assertTrue(self.scheduler.is_scheduled(owner))
+        self.advance(1.0)
+        self.other_mock_callback.assert_called_once()
+        self.assertFalse(self.scheduler.is_scheduled(owner))
+
+    def test_reset_delay(self):
+        task = Task(self.mock_callback, 1.0)
+        task.attach(self.scheduler)
+        self.advance(0.5)
+        task.reset_delay(2.0)
+        self.advance(1.0)
+        self.mock_callback.assert_not_called()
+        self.advance(1.0)
+        self.mock_callback.assert_called_once()
+
+    def test_abort(self):
+        task = Task(self.mock_callback, 1.0)
+        task.attach(self.scheduler)
+        task.abort()
+        self.advance(1.0)
+        self.mock_callback.assert_not_called()
@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import unittest
+
+from tuxemon.db import ElementType, db
+from tuxemon.element import element_chart, get_element
+from tuxemon.formula import simple_damage_multiplier
+
+
+class TestElementChart(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not db.database["monster"]:
+            db.load()
+
+    def test_elements_are_shared(self):
+        self.assertIs(get_element("fire"), get_element(ElementType.fire))
+
+    def test_multiplier_matches_table(self):
+        for slug in ElementType:
+            element = get_element(slug)
+            for item in element.types:
+                self.assertEqual(
+                    element.lookup_multiplier(item.against),
+                    element.lookup_field(item.against, "multiplier"),
+                )
+
+    def test_aether_is_neutral(self):
+        aether = get_element("aether")
+        fire = get_element("fire")
+        metal = get_element("metal")
+        self.assertEqual(simple_damage_multiplier([aether], [metal]), 1.0)
+        self.assertEqual(simple_damage_multiplier([fire], [aether]), 1.0)
+
+    def test_last_pair_is_used(self):
+        fire = get_element("fire")
+        metal = get_element("metal")
+        earth = get_element("earth")
+        self.assertEqual(
+            simple_damage_multiplier([fire], [metal, earth]),
+            fire.lookup_multiplier(ElementType.earth),
+        )
+
+    def test_reload_clears_elements(self):
+        fire = get_element("fire")
+        fire.lookup_multiplier(ElementType.metal)
+        db.load("element")
+        self.assertFalse(element_chart._matrix)
+        self.assertIsNot(get_element("fire"), fire)
+        self.assertEqual(
+            get_element("fire").lookup_multiplier(ElementType.metal),
+            fire.lookup_field(ElementType.metal, "multiplier"),
+        )
@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import json
+import unittest
+
+from tuxemon.game_variables import GameVariables, parse_number, parse_value
+
+
+class TestParse(unittest.TestCase):
+    def test_parse_value(self):
+        self.assertIs(parse_value("true"), True)
+        self.assertIs(parse_value("False"), False)
+        self.assertEqual(parse_value("12"), 12)
+        self.assertIsInstance(parse_value("12"), int)
+        self.assertEqual(parse_value("-0.5"), -0.5)
+        self.assertEqual(parse_value("gender_male"), "gender_male")
+        self.assertEqual(parse_value(2.5), 2.5)
+
+    def test_parse_number(self):
+        self.assertEqual(parse_number("3"), 3.0)
+        self.assertEqual(parse_number("1.5"), 1.5)
+        self.assertIsNone(parse_number("1.5.2"))
+        self.assertIsNone(parse_number("steps"))
+
+
+class TestGameVariables(unittest.TestCase):
+    def setUp(self):
+        self.variables = GameVariables({"steps": 0, "daytime": "true"})
+        self.changes = []
+        self.variables.subscribe(
+            ["steps", "cinema_mode"],
+            lambda key, old, new: self.changes.append((key, old, new)),
+        )
+
+    def test_dict(self):
+        variables = self.variables
+        variables["cinema_mode"] = "on"
+        variables.setdefault("cinema_mode", "off")
+        variables.update(hour="10")
+        self.assertEqual(variables.pop("hour"), "10")
+        self.assertIsNone(variables.pop("hour", None))
+        self.assertEqual(variables.get("missing", 1), 1)
+        self.assertIsInstance(variables, dict)
+        self.assertEqual(
+            json.loads(json.dumps(variables)),
+            {"steps": 0, "daytime": "true", "cinema_mode": "on"},
+        )
+
+    def test_versions(self):
+        variables = self.variables
+        version = variables.version
+        variables["steps"] += 0
+        variables["daytime"] = "true"
+        self.assertEqual(variables.version, version)
+        self.assertEqual(variables.changed_since(version), set())
+
+        variables["steps"] += 1
+        del variables["daytime"]
+        variables["cinema_mode"] = "on"
+        self.assertEqual(
+            variables.changed_since(version),
+            {"steps", "daytime", "cinema_mode"},
+        )
+        self.assertEqual(variables.key_version("cinema_mode"), version + 3)
+        self.assertEqual(variables.key_version("unknown"), 0)
+        self.assertEqual(
+            self.changes,
+            [("steps", 0, 1), ("cinema_mode", None, "on")],
+        )
+
+    def test_snapshot(self):
+        variables = self.variables
+        snapshot = variables.snapshot()
+        self.assertEqual(snapshot, {"steps": 0, "daytime": "true"})
+        self.assertIsNot(snapshot, variables)
+        variables["steps"] = 0
+        self.assertIs(variables.snapshot(), snapshot)
+        variables["steps"] = 1
+        self.assertEqual(variables.snapshot()["steps"], 1)
+        self.assertEqual(snapshot["steps"], 0)
+
+    def test_types_are_changes(self):
+        variables = self.variables
+        variables["steps"] = 0.0
+        variables["steps"] = "0"
+        self.assertEqual(len(self.changes), 2)
+
+    def test_typed_values(self):
+        variables = self.variables
+        self.assertIs(variables.typed("daytime"), True)
+        variables["steps"] = "12"
+        self.assertEqual(variables.number("steps"), 12.0)
+        self.assertEqual(variables.typed("steps"), 12)
+        variables["steps"] = "13.5"
+        self.assertEqual(variables.number("steps"), 13.5)
+        with self.assertRaises(ValueError):
+            variables.number("daytime")
+        with self.assertRaises(KeyError):
+            variables.number("missing")
+
+    def test_reset(self):
+        variables = self.variables
+        version = variables.version
+        variables.reset({"steps": 5, "daytime": "true", "hour": "10"})
+        self.assertEqual(
+            variables, {"steps": 5, "daytime": "true", "hour": "10"}
+        )
+        self.assertEqual(variables.changed_since(version), {"steps", "hour"})
+        variables.reset({})
+        self.assertEqual(variables, {})
+        self.assertEqual(self.changes[-1], ("steps", 5, None))
+
+    def test_unsubscribe(self):
+        subscriber = lambda key, old, new: self.fail("unsubscribed")
+        self.variables.subscribe(["steps"], subscriber)
+        self.variables.unsubscribe(["steps"], subscriber)
+        self.variables["steps"] = 1
+        self.assertEqual(len(self.changes), 1)
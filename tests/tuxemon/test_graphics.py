@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import os
+import tempfile
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+import pygame
+
+from tuxemon import graphics
+from tuxemon.db import db
+from tuxemon.graphics import AnimationFrameIndex
+
+
+class TestAnimationFrameIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+        for filename in (
+            "water01.png",
+            "water00.png",
+            "fire_10.png",
+            "fire_02.png",
+            "smoke.3.png",
+            "readme.txt",
+            "nodigits.png",
+        ):
+            self.touch(filename)
+        self.index = AnimationFrameIndex()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def touch(self, filename):
+        with open(os.path.join(self.directory, filename), "w"):
+            pass
+
+    def frames(self, name):
+        return [
+            os.path.basename(path)
+            for path in self.index.lookup(self.directory, name)
+        ]
+
+    def test_frames_are_sorted(self):
+        self.assertEqual(self.frames("water"), ["water00.png", "water01.png"])
+
+    def test_separators(self):
+        self.assertEqual(self.frames("fire"), ["fire_02.png", "fire_10.png"])
+        self.assertEqual(self.frames("fire_"), ["fire_02.png", "fire_10.png"])
+        self.assertEqual(self.frames("smoke"), ["smoke.3.png"])
+
+    def test_name_ending_with_digits(self):
+        self.assertEqual(self.frames("fire_1"), ["fire_10.png"])
+        self.assertEqual(self.frames("water0"), ["water00.png", "water01.png"])
+
+    def test_missing_animation(self):
+        self.assertEqual(self.frames("readme"), [])
+        self.assertEqual(self.frames("nodigits"), [])
+
+    def test_reindex_on_directory_change(self):
+        self.assertEqual(self.frames("grass"), [])
+        self.touch("grass00.png")
+        os.utime(self.directory, ns=(0, 1))
+        self.assertEqual(self.frames("grass"), ["grass00.png"])
+
+
+class TestSharedImages(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(
+            mock.patch.object(graphics, "_shared_images", OrderedDict())
+        )
+        self.enterContext(
+            mock.patch.object(
+                graphics,
+                "load_and_scale",
+                lambda filename: pygame.Surface((1, 1)),
+            )
+        )
+        self.enterContext(mock.patch.object(graphics, "MAX_SHARED_IMAGES", 2))
+
+    def test_least_recently_used_are_dropped(self):
+        first = graphics.load_shared_image("a.png")
+        graphics.load_shared_image("b.png")
+        self.assertIs(graphics.load_shared_image("a.png"), first)
+        graphics.load_shared_image("c.png")
+        self.assertEqual(list(graphics._shared_images), ["a.png", "c.png"])
+
+    def test_reload_clears_images(self):
+        image = graphics.load_shared_image("a.png")
+        db.load("element")
+        self.assertFalse(graphics._shared_images)
+        self.assertIsNot(graphics.load_shared_image("a.png"), image)
@@ -0,0 +1,33 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import unittest
+
+from tuxemon.menu.grid import VirtualGrid
+
+
+class TestVirtualGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = VirtualGrid(list(range(10)), columns=3, visible_rows=2)
+
+    def test_visible(self):
+        self.assertEqual(self.grid.rows, 4)
+        self.assertEqual(self.grid.visible, [0, 1, 2, 3, 4, 5])
+
+    def test_scroll_is_clamped(self):
+        self.assertFalse(self.grid.scroll(-1))
+        self.assertTrue(self.grid.scroll(5))
+        self.assertEqual(self.grid.first_row, 2)
+        self.assertEqual(self.grid.visible, [6, 7, 8, 9])
+        self.assertFalse(self.grid.scroll(1))
+
+    def test_by_column_pads_last_row(self):
+        self.grid.scroll(2)
+        self.assertEqual(
+            list(self.grid.by_column()),
+            [(0, 6), (3, 9), (1, 7), (4, None), (2, 8), (5, None)],
+        )
+
+    def test_fewer_rows_than_window(self):
+        grid = VirtualGrid([0, 1], columns=3, visible_rows=2)
+        self.assertFalse(grid.scroll(1))
+        self.assertEqual(list(grid.by_column()), [(0, 0), (1, 1), (2, None)])
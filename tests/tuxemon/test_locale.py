@@ -0,0 +1,142 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tuxemon.constants import paths
+from tuxemon.locale import (
+    LocaleInfo,
+    MoCatalog,
+    PlaceholderRegistry,
+    TranslatorPo,
+    compile_template,
+    placeholders,
+    replace_text,
+)
+
+PO_HEADER = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+"""
+
+
+class TestReplaceText(unittest.TestCase):
+    def setUp(self):
+        monster = MagicMock()
+        monster.name = "Rockitten"
+        monster.level = 5
+        self.session = MagicMock()
+        self.session.player.name = "Red"
+        self.session.player.money = {"player": 100}
+        self.session.player.game_variables = {
+            "unit_measure": "Metric",
+            "steps": 1000,
+        }
+        self.session.player.monsters = [monster]
+        self.session.client.map_name = "Taba Town"
+
+    def test_placeholders(self):
+        text = replace_text(
+            self.session,
+            "${{name}} has ${{money}}${{currency}} in ${{map_name}}",
+        )
+        self.assertEqual(text, "Red has 100$ in Taba Town")
+
+    def test_monster_placeholders(self):
+        text = replace_text(
+            self.session,
+            "${{monster_0_name}} is level ${{monster_0_level}}",
+        )
+        self.assertEqual(text, "Rockitten is level 5")
+
+    def test_unknown_placeholders_are_kept(self):
+        text = "${{monster_1_name}} ${{unknown}} ${{monster_0_unknown}}"
+        self.assertEqual(replace_text(self.session, text), text)
+
+    def test_new_lines(self):
+        self.assertEqual(replace_text(self.session, r"a\nb"), "a\nb")
+
+    def test_only_used_placeholders_are_resolved(self):
+        # the steps need the unit of measure
+        del self.session.player.game_variables["unit_measure"]
+        self.assertEqual(replace_text(self.session, "${{name}}"), "Red")
+        with self.assertRaises(KeyError):
+            replace_text(self.session, "${{steps}}")
+
+    def test_mod_placeholder(self):
+        placeholders.register("rival", lambda session: "Blue")
+        self.addCleanup(placeholders._resolvers.pop, "rival")
+        text = replace_text(self.session, "${{rival}} and ${{name}}")
+        self.assertEqual(text, "Blue and Red")
+
+
+class TestPlaceholderRegistry(unittest.TestCase):
+    def test_names_before_patterns(self):
+        registry = PlaceholderRegistry()
+        registry.register_pattern(r"item_(\w+)", lambda s, m: m.group(1))
+        registry.register("item_count", lambda s: "3")
+        self.assertEqual(registry.resolve(None, "item_count"), "3")
+        self.assertEqual(registry.resolve(None, "item_potion"), "potion")
+        self.assertIsNone(registry.resolve(None, "other"))
+
+    def test_compile_template(self):
+        self.assertEqual(
+            compile_template("Hi ${{name}}!"),
+            ("Hi ", "name", "!"),
+        )
+        self.assertIs(
+            compile_template("Hi ${{name}}!"),
+            compile_template("Hi ${{name}}!"),
+        )
+
+
+class TestMoCatalog(unittest.TestCase):
+    def compile(self, name, messages):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        po_path = os.path.join(tmp.name, name + ".po")
+        with open(po_path, "w", encoding="UTF8") as po_file:
+            po_file.write(PO_HEADER)
+            for msgid, msgstr in messages.items():
+                po_file.write(f'msgid "{msgid}"\nmsgstr "{msgstr}"\n\n')
+        mo_path = os.path.join(tmp.name, name + ".mo")
+        TranslatorPo.compile_gettext(po_path, mo_path)
+        return MoCatalog(mo_path)
+
+    def test_gettext(self):
+        messages = {f"key_{i:03}": f"value {i}" for i in range(100)}
+        messages["accent"] = "Ça a marché !"
+        catalog = self.compile("fr", messages)
+        for msgid, msgstr in messages.items():
+            self.assertEqual(catalog.gettext(msgid), msgstr)
+        self.assertEqual(catalog.gettext("missing"), "missing")
+
+    def test_fallback(self):
+        catalog = self.compile("fr", {"yes": "oui"})
+        catalog.add_fallback(self.compile("en", {"yes": "yes", "no": "no"}))
+        self.assertEqual(catalog.gettext("yes"), "oui")
+        self.assertEqual(catalog.gettext("no"), "no")
+        self.assertEqual(catalog.gettext("maybe"), "maybe")
+
+
+class TestTranslatorPo(unittest.TestCase):
+    def test_recompile_closes_catalog(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.enterContext(patch.object(paths, "CACHE_DIR", tmp.name))
+        po_path = os.path.join(tmp.name, "base.po")
+        with open(po_path, "w", encoding="UTF8") as po_file:
+            po_file.write(PO_HEADER + 'msgid "yes"\nmsgstr "oui"\n')
+        info = LocaleInfo("fr_FR", "LC_MESSAGES", "base", po_path)
+        translator = TranslatorPo()
+        translator.search_locale = lambda locale: iter([info])
+
+        catalog = translator.load_catalog("fr_FR", "base")
+        recompiled = translator.load_catalog("fr_FR", "base", True)
+        # the file was replaced after the old catalog was unmapped
+        self.assertTrue(catalog._data.closed)
+        self.assertEqual(catalog.gettext("yes"), "yes")
+        self.assertEqual(recompiled.gettext("yes"), "oui")
@@ -0,0 +1,161 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import os
+import tempfile
+import unittest
+
+import pygame
+import pyscroll
+from pytmx.util_pygame import load_pygame
+
+from tuxemon.map_renderer import ChunkCache, ChunkedRenderer
+
+WIDTH = 40
+HEIGHT = 30
+VIEW_SIZE = (100, 70)
+
+TILESET = """<?xml version="1.0" encoding="UTF-8"?>
+<tileset name="test" tilewidth="16" tileheight="16" tilecount="4" columns="4">
+ <image source="tiles.png" width="64" height="16"/>
+ <tile id="3">
+  <animation>
+   <frame tileid="3" duration="1000000"/>
+   <frame tileid="0" duration="1000000"/>
+  </animation>
+ </tile>
+</tileset>
+"""
+
+MAP = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.2" orientation="orthogonal" renderorder="right-down"
+ width="{width}" height="{height}" tilewidth="16" tileheight="16">
+ <tileset firstgid="1" source="test.tsx"/>
+ <layer name="ground" width="{width}" height="{height}">
+  <data encoding="csv">{ground}</data>
+ </layer>
+ <layer name="objects" width="{width}" height="{height}">
+  <data encoding="csv">{objects}</data>
+ </layer>
+</map>
+"""
+
+
+def write_map(folder: str) -> str:
+    tiles = pygame.Surface((64, 16), pygame.SRCALPHA)
+    for number, color in enumerate(("red", "green", "blue", "yellow")):
+        tiles.fill(color, (number * 16, 0, 16, 16))
+    # the second layer only covers a part of its tiles
+    tiles.fill((0, 0, 0, 0), (16, 0, 8, 16))
+    pygame.image.save(tiles, os.path.join(folder, "tiles.png"))
+    with open(os.path.join(folder, "test.tsx"), "w") as fp:
+        fp.write(TILESET)
+
+    ground = [[1 + (x + y) % 3 for x in range(WIDTH)] for y in range(HEIGHT)]
+    objects = [[0] * WIDTH for _ in range(HEIGHT)]
+    for x, y in ((3, 3), (20, 10), (39, 29), (35, 2)):
+        objects[y][x] = 2
+    # animated tiles, in one chunk and on the edge of two
+    objects[5][5] = 4
+    objects[12][31] = 4
+    objects[12][32] = 4
+
+    def csv(rows):
+        return ",\n".join(",".join(str(gid) for gid in row) for row in rows)
+
+    filename = os.path.join(folder, "test.tmx")
+    with open(filename, "w") as fp:
+        fp.write(
+            MAP.format(
+                width=WIDTH,
+                height=HEIGHT,
+                ground=csv(ground),
+                objects=csv(objects),
+            )
+        )
+    return filename
+
+
+class TestChunkedRenderer(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.folder = tmp.name
+        self.filename = write_map(self.folder)
+
+    def render(self, renderer, centers):
+        frames = []
+        for center in centers:
+            surface = pygame.Surface(VIEW_SIZE)
+            renderer.center(center)
+            renderer.draw(surface, surface.get_rect())
+            frames.append(pygame.image.tobytes(surface, "RGB"))
+        return frames
+
+    def make_renderer(self, cache, **kwargs):
+        data = pyscroll.data.TiledMapData(load_pygame(self.filename))
+        # chunks of 8 tiles, to have many of them on this small map
+        return ChunkedRenderer(data, VIEW_SIZE, cache, 128, **kwargs)
+
+    def test_same_as_pyscroll(self):
+        # walking across the map, then jumping
+        centers = [(x, 40) for x in range(0, 650, 4)]
+        centers += [(640, y) for y in range(40, 480, 4)]
+        centers += [(100, 100), (500, 300), (320, 240)]
+        for clamp_camera in (True, False):
+            data = pyscroll.data.TiledMapData(load_pygame(self.filename))
+            expected = self.render(
+                pyscroll.BufferedRenderer(
+                    data,
+                    VIEW_SIZE,
+                    clamp_camera=clamp_camera,
+                ),
+                centers,
+            )
+            renderer = self.make_renderer(
+                ChunkCache(),
+                clamp_camera=clamp_camera,
+            )
+            self.assertTrue(self.render(renderer, centers) == expected)
+
+    def test_chunks_are_cached(self):
+        # room for four chunks of 128 pixels
+        chunk_size = pygame.Surface((128, 128)).get_pitch() * 128
+        cache = ChunkCache(max_size=4 * chunk_size, directory=self.folder)
+        renderer = self.make_renderer(cache)
+        centers = [(x, 40) for x in range(0, 650, 16)]
+        expected = self.render(renderer, centers)
+        self.assertEqual(len(cache), 4)
+        self.assertEqual(cache.size, 4 * chunk_size)
+        saved = os.listdir(os.path.join(self.folder, renderer.map_id, "16"))
+        self.assertEqual(len(saved), 5)
+
+        # the chunks are loaded from their images
+        renderer = self.make_renderer(ChunkCache(directory=self.folder))
+        renderer._render_chunk = None
+        self.assertTrue(self.render(renderer, centers) == expected)
+
+    def test_reload_tiles(self):
+        cache = ChunkCache(directory=self.folder)
+        renderer = self.make_renderer(cache)
+        self.render(renderer, [(100, 100)])
+        map_id = renderer.map_id
+
+        # the tileset is edited
+        tiles_path = os.path.join(self.folder, "tiles.png")
+        tiles = pygame.image.load(tiles_path)
+        tiles.fill("white", (0, 0, 16, 16))
+        pygame.image.save(tiles, tiles_path)
+        os.utime(tiles_path, ns=(0, 0))
+        renderer.data.tmx.reload_images()
+        renderer.reload_tiles()
+
+        self.assertNotEqual(renderer.map_id, map_id)
+        self.assertFalse(os.path.exists(os.path.join(self.folder, map_id)))
+        data = pyscroll.data.TiledMapData(load_pygame(self.filename))
+        expected = self.render(
+            pyscroll.BufferedRenderer(data, VIEW_SIZE),
+            [(100, 100)],
+        )
+        self.assertTrue(self.render(renderer, [(100, 100)]) == expected)
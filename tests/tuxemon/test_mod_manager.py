@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from tuxemon.constants import paths
+from tuxemon.mod_manager import Manager, PackageRelease
+
+
+def make_zip(name):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zipf:
+        zipf.writestr(f"{name}.txt", name * 1000)
+    return buffer.getvalue()
+
+
+class ContentServerHandler(BaseHTTPRequestHandler):
+    """Stand-in for the API of a TuxemonContentServer."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        server.connections.add(self.client_address)
+        packages = server.packages
+        match = re.match(r"/api/packages/(\w+)/(\w+)/(\w+)", self.path)
+        if self.path == "/api/packages":
+            self.send_json([{"name": n, "repo": server.url} for n in packages])
+        elif match and match.group(3) == "releases":
+            archive = packages[match.group(2)]["archive"]
+            checksum = hashlib.sha256(archive).hexdigest()
+            self.send_json([{"id": 1, "sha256": checksum}])
+        elif match and match.group(3) == "dependencies":
+            deps = packages[match.group(2)]["depends"]
+            self.send_json({"hard": [{"packages": deps}]})
+        else:
+            match = re.match(r"/packages/\w+/(\w+)/releases/", self.path)
+            archive = packages[match.group(1)]["archive"]
+            start = 0
+            if "Range" in self.headers:
+                start = int(
+                    re.match(r"bytes=(\d+)-", self.headers["Range"])[1]
+                )
+                server.ranges.append(start)
+                self.send_response(206)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(archive) - start))
+            self.end_headers()
+            self.wfile.write(archive[start:])
+
+
+class TestDownloadPackages(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), ContentServerHandler
+        )
+        self.server.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.server.requests = []
+        self.server.connections = set()
+        self.server.ranges = []
+        self.server.packages = {
+            name: {"archive": make_zip(name), "depends": depends}
+            for name, depends in (
+                ("main", ["tux/lib", "tux/base"]),
+                ("lib", ["tux/base", "default"]),
+                ("base", []),
+            )
+        }
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,)
+        )
+        thread.daemon = True
+        thread.start()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        os.makedirs(os.path.join(self.tmp, "mods"))
+        for attr in ("CACHE_DIR", "BASEDIR", "USER_GAME_DATA_DIR"):
+            patcher = mock.patch.object(paths, attr, self.tmp)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.manager = Manager(self.server.url, default_to_cache=False)
+
+    def tearDown(self):
+        self.manager.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_download_with_dependencies(self):
+        self.manager.download_package("tux", "main", None, self.server.url)
+        for name in ("main", "lib", "base"):
+            path = os.path.join(self.tmp, "mods", name, f"{name}.txt")
+            self.assertTrue(os.path.exists(path))
+        downloads = [r for r in self.server.requests if "download" in r]
+        self.assertEqual(len(downloads), 3)
+        self.assertLess(
+            len(self.server.connections), len(self.server.requests)
+        )
+
+    def test_installed_dependencies_skipped(self):
+        mods = os.path.join(self.tmp, "mods")
+        os.makedirs(os.path.join(mods, "base"))
+        with open(os.path.join(mods, "lib.zip"), "wb") as file:
+            file.write(make_zip("lib"))
+        resolved = self.manager.resolve_dependencies(
+            "tux", "main", None, self.server.url
+        )
+        self.assertEqual([package.name for package in resolved], ["main"])
+
+    def test_resume_download(self):
+        package = self.manager.resolve_release(
+            "tux", "base", None, self.server.url
+        )
+        archive = self.server.packages["base"]["archive"]
+        os.makedirs(os.path.dirname(package.filename))
+        with open(package.filename + ".part", "wb") as file:
+            file.write(archive[:100])
+        self.manager.download_release(package)
+        self.assertEqual(self.server.ranges, [100])
+        with open(package.filename, "rb") as file:
+            self.assertEqual(file.read(), archive)
+
+    def test_reject_bad_checksum(self):
+        package = PackageRelease("tux", "base", 1.0, self.server.url, "0" * 64)
+        with self.assertRaises(ValueError):
+            self.manager.download_release(package)
+        self.assertFalse(os.path.exists(package.filename))
+        self.assertFalse(os.path.exists(package.filename + ".part"))
+
+    def test_install_without_extracting(self):
+        filename = os.path.join(self.tmp, "local.zip")
+        with open(filename, "wb") as file:
+            file.write(make_zip("local"))
+        self.manager.install_local_package(filename, "local", extract=False)
+        mods = os.path.join(self.tmp, "mods")
+        self.assertTrue(os.path.isfile(os.path.join(mods, "local.zip")))
+        self.assertFalse(os.path.exists(os.path.join(mods, "local")))
@@ -2,7 +2,9 @@
 # Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
 import unittest
 
-from tuxemon.monster import MAX_LEVEL, Monster
+from tuxemon import monster
+from tuxemon.db import db
+from tuxemon.monster import MAX_LEVEL, MISSING_IMAGE, Monster
 
 
 class MonsterTestBase(unittest.TestCase):
@@ -29,3 +31,29 @@ class SetLevel(MonsterTestBase):
         mon = self.mon
         mon.set_level(-100)
         self.assertEqual(mon.level, 1)
+
+
+class SharedResources(MonsterTestBase):
+    @classmethod
+    def setUpClass(cls):
+        if not db.database["monster"]:
+            db.load()
+
+    def test_sprite_paths_are_shared(self):
+        first = Monster()
+        first.load_from_db("rockitten")
+        second = Monster()
+        second.load_from_db("rockitten")
+        self.assertIs(first.front_battle_sprite, second.front_battle_sprite)
+        self.assertNotEqual(first.front_battle_sprite, MISSING_IMAGE)
+
+    def test_missing_sprite(self):
+        mon = Monster()
+        self.assertEqual(mon.get_sprite_path("gfx/nothing"), MISSING_IMAGE)
+
+    def test_reload_clears_sprite_paths(self):
+        mon = Monster()
+        mon.load_from_db("rockitten")
+        self.assertTrue(monster._sprite_paths)
+        db.load("element")
+        self.assertFalse(monster._sprite_paths)
@@ -0,0 +1,115 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from tuxemon.db import ElementType
+from tuxemon.monster import Monster
+from tuxemon.monster_registry import MonsterRegistry
+from tuxemon.npc import NPC
+
+
+def mockNPC(self) -> None:
+    self.monsters = []
+    self.isplayer = False
+    self.game_variables = {}
+    self.monster_boxes = {}
+    self.monster_registry = MonsterRegistry()
+
+
+def make_monster(slug, techniques=(), types=()):
+    monster = Monster()
+    monster.slug = slug
+    monster.moves = [SimpleNamespace(slug=tech) for tech in techniques]
+    monster._types = [SimpleNamespace(slug=ele) for ele in types]
+    monster.types = list(monster._types)
+    return monster
+
+
+class TestMonsterRegistry(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(NPC, "__init__", mockNPC)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.npc = NPC()
+        self.rockitten = make_monster("rockitten", ["ram"], ["earth"])
+        self.fruitera = make_monster("fruitera", ["bite"], ["wood"])
+        self.npc.add_monster(self.rockitten, 0)
+        self.npc.add_monster(self.fruitera, 1)
+
+    def test_find_in_party(self):
+        npc = self.npc
+        self.assertIs(npc.find_monster("fruitera"), self.fruitera)
+        self.assertIsNone(npc.find_monster("bigfin"))
+        iid = self.rockitten.instance_id
+        self.assertIs(npc.find_monster_by_id(iid), self.rockitten)
+        self.assertIsNone(npc.find_monster_in_storage(iid))
+
+    def test_first_of_a_species(self):
+        other = make_monster("fruitera")
+        self.npc.add_monster(other, 0)
+        self.assertIs(self.npc.find_monster("fruitera"), other)
+        self.npc.switch_monsters(0, 2)
+        self.assertIs(self.npc.find_monster("fruitera"), self.fruitera)
+
+    def test_techniques_and_types(self):
+        npc = self.npc
+        self.assertTrue(npc.has_tech("ram"))
+        self.assertFalse(npc.has_tech("fire_claw"))
+        self.assertFalse(npc.has_tech(None))
+        # every monster counts, not only the last one
+        self.assertTrue(npc.has_type(ElementType.earth))
+        self.assertTrue(npc.has_type(ElementType.wood))
+        self.assertFalse(npc.has_type(ElementType.fire))
+
+        self.rockitten.learn(SimpleNamespace(slug="fire_claw"))
+        self.assertTrue(npc.has_tech("fire_claw"))
+        # a type given for a battle is not counted
+        self.rockitten.types = [SimpleNamespace(slug="fire")]
+        self.rockitten.learn(SimpleNamespace(slug="tackle"))
+        self.assertFalse(npc.has_type(ElementType.fire))
+
+        npc.remove_monster(self.rockitten)
+        self.assertFalse(npc.has_tech("ram"))
+        self.assertFalse(npc.has_type(ElementType.earth))
+        self.assertIsNone(npc.find_monster("rockitten"))
+
+    def test_release(self):
+        npc = self.npc
+        self.assertTrue(npc.release_monster(self.fruitera))
+        self.assertFalse(npc.release_monster(self.fruitera))
+        self.assertIsNone(npc.find_monster_by_id(self.fruitera.instance_id))
+        self.assertFalse(npc.has_tech("bite"))
+        self.assertEqual(npc.monsters, [self.rockitten])
+
+    def test_storage(self):
+        npc = self.npc
+        npc.remove_monster(self.fruitera)
+        npc.add_monster_to_storage(self.fruitera, "box")
+        iid = self.fruitera.instance_id
+        self.assertIsNone(npc.find_monster_by_id(iid))
+        self.assertIs(npc.find_monster_in_storage(iid), self.fruitera)
+        self.assertFalse(npc.has_tech("bite"))
+
+        version = npc.monster_registry.storage_version
+        npc.monster_registry.update(self.fruitera)
+        self.assertEqual(npc.monster_registry.storage_version, version + 1)
+        npc.monster_registry.update(self.rockitten)
+        self.assertEqual(npc.monster_registry.storage_version, version + 1)
+
+        npc.remove_monster_from_storage(self.fruitera)
+        self.assertEqual(npc.monster_registry.storage_version, version + 2)
+        self.assertEqual(npc.monster_boxes["box"], [])
+        self.assertIsNone(npc.find_monster_in_storage(iid))
+        # removing it again does nothing
+        npc.remove_monster_from_storage(self.fruitera)
+
+    def test_full_party_goes_to_kennel(self):
+        npc = self.npc
+        for number in range(5):
+            npc.add_monster(make_monster(f"m{number}"), len(npc.monsters))
+        self.assertEqual(len(npc.monsters), 6)
+        last = npc.monster_boxes["Kennel"][0]
+        self.assertIsNone(npc.find_monster(last.slug))
+        self.assertIs(npc.find_monster_in_storage(last.instance_id), last)
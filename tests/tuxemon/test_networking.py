@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import unittest
+from unittest.mock import Mock
+
+from tuxemon.networking import TuxemonServer, apply_char_delta
+
+
+def push_self(name, map_name):
+    return {
+        "type": "PUSH_SELF",
+        "event_number": 0,
+        "sprite_name": "adventurer",
+        "map_name": map_name,
+        "char_dict": {"tile_pos": (1, 1), "name": name, "facing": "down"},
+    }
+
+
+class ServerTestBase(unittest.TestCase):
+    def setUp(self):
+        self.network = Mock(registry={})
+        self.server = TuxemonServer(None, network=self.network)
+
+    def connect(self, cuuid, map_name):
+        self.network.registry[cuuid] = {}
+        self.server.server_event_handler(cuuid, push_self(cuuid, map_name))
+
+    def tick(self):
+        self.network.notify.reset_mock()
+        self.server.next_tick = 0.0
+        self.server.update()
+        return {c.args[0]: c.args[1] for c in self.network.notify.call_args_list}
+
+    def events(self, packet):
+        if packet["type"] == "NOTIFY_BATCH":
+            return packet["events"]
+        return [packet]
+
+
+class TestTuxemonServer(ServerTestBase):
+    def test_only_clients_on_same_map_notified(self):
+        self.connect("a", "town.tmx")
+        self.connect("b", "town.tmx")
+        self.connect("c", "cave.tmx")
+        packets = self.tick()
+        self.assertEqual(set(packets), {"a", "b"})
+        self.assertEqual(packets["a"]["cuuid"], "b")
+        self.assertEqual(packets["b"]["cuuid"], "a")
+
+    def test_events_batched_and_delta_encoded(self):
+        self.connect("a", "town.tmx")
+        self.connect("b", "town.tmx")
+        self.tick()
+        for facing in ("up", "left"):
+            self.server.server_event_handler(
+                "b",
+                {
+                    "type": "CLIENT_FACING",
+                    "event_number": 1 if facing == "up" else 2,
+                    "char_dict": {"facing": facing},
+                },
+            )
+        packets = self.tick()
+        self.assertEqual(list(packets), ["a"])
+        events = self.events(packets["a"])
+        self.assertEqual(
+            [e["char_dict"] for e in events],
+            [{"facing": "up"}, {"facing": "left"}],
+        )
+
+    def test_client_changing_map_is_sent_its_peers(self):
+        self.connect("a", "town.tmx")
+        self.connect("b", "cave.tmx")
+        self.tick()
+        self.server.server_event_handler(
+            "a",
+            {
+                "type": "CLIENT_MAP_UPDATE",
+                "event_number": 1,
+                "map_name": "cave.tmx",
+                "char_dict": {"tile_pos": (4, 2)},
+            },
+        )
+        packets = self.tick()
+        known = {}
+        for cuuid, packet in packets.items():
+            for event in self.events(packet):
+                apply_char_delta(known.setdefault(cuuid, {}), event)
+        self.assertEqual(known["a"]["b"]["name"], "b")
+        self.assertEqual(known["b"]["a"]["tile_pos"], (4, 2))
+
+    def test_disconnect_all_stale_clients(self):
+        for cuuid in ("a", "b", "c"):
+            self.connect(cuuid, "town.tmx")
+        self.tick()
+        for cuuid in ("a", "b"):
+            self.network.registry[cuuid]["ping_timestamp"] = -100.0
+        self.server.next_tick = 0.0
+        self.assertFalse(self.server.update())
+        self.assertEqual(list(self.network.registry), ["c"])
+        self.assertEqual(self.server.maps, {"town.tmx": {"c"}})
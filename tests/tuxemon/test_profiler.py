@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import json
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from tuxemon.profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler(history=10, max_events=5)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.filename = os.path.join(tmp.name, "trace.json")
+
+    def test_disabled(self):
+        profiler = self.profiler
+        self.assertFalse(profiler.enabled)
+        # the same scope is used while disabled
+        self.assertIs(profiler.scope("a"), profiler.scope("b"))
+        profiler.begin_frame()
+        with profiler.scope("a"):
+            pass
+        profiler.end_frame()
+        self.assertEqual(len(profiler.frame_times), 0)
+
+    def test_trace(self):
+        profiler = self.profiler
+        profiler.start_trace()
+        self.assertTrue(profiler.recording)
+        profiler.begin_frame()
+        with profiler.scope("WorldState", "update"):
+            with profiler.scope("pathfind"):
+                pass
+        profiler.end_frame()
+        self.assertEqual(profiler.stop_trace(self.filename), 3)
+        self.assertFalse(profiler.enabled)
+
+        with open(self.filename) as fp:
+            events = json.load(fp)["traceEvents"]
+        self.assertEqual(
+            [(e["name"], e["cat"], e["ph"]) for e in events],
+            [
+                ("pathfind", "", "X"),
+                ("WorldState", "update", "X"),
+                ("frame", "frame", "X"),
+            ],
+        )
+        pathfind, update, frame = events
+        self.assertLessEqual(update["ts"], pathfind["ts"])
+        self.assertLessEqual(frame["ts"], update["ts"])
+        self.assertGreaterEqual(frame["dur"], update["dur"])
+
+    def test_trace_is_bounded(self):
+        profiler = self.profiler
+        profiler.start_trace()
+        for _ in range(10):
+            with profiler.scope("a"):
+                pass
+        # the scopes, then a marker of where the trace was cut
+        self.assertEqual(profiler.stop_trace(self.filename), 6)
+
+    def test_graph(self):
+        profiler = self.profiler
+        profiler.set_graph(True)
+        for _ in range(20):
+            profiler.begin_frame()
+            profiler.end_frame()
+        self.assertEqual(len(profiler.frame_times), 10)
+        profiler.frame_times.append(1.0)
+        surface = pygame.Surface((100, 100))
+        profiler.draw(surface, 1 / 60)
+        # the long frame is the last bar, on the right
+        self.assertEqual(surface.get_at((99, 59))[:3], (230, 30, 30))
+        profiler.set_graph(False)
+        self.assertFalse(profiler.enabled)
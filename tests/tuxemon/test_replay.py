@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import os
+import tempfile
+import unittest
+from typing import List
+from unittest import mock
+
+from tuxemon.platform.const import buttons
+from tuxemon.platform.events import EventQueueHandler, PlayerInput
+from tuxemon.platform.platform_pygame.events import PygameEventQueueHandler
+from tuxemon.replay import (
+    InputRecording,
+    RecordingEventQueueHandler,
+    ReplayEventQueueHandler,
+    save_hash,
+)
+
+
+class ScriptedEventQueueHandler(PygameEventQueueHandler):
+    """Gives the inputs of a held button, like the keyboard does."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.down = PlayerInput(buttons.DOWN)
+        self.frames: List[List[PlayerInput]] = []
+
+    def process_events(self):
+        if len(self.frames) in (1, 2):
+            if not self.down.hold_time:
+                self.down.value = 1
+                self.down.hold_time = 1
+            self.frames.append([self.down])
+            yield self.down
+            self.down.hold_time += 1
+        else:
+            self.down.value = 0
+            self.down.hold_time = 0
+            self.frames.append([])
+
+    def release_controls(self):
+        if self.down.held:
+            yield PlayerInput(buttons.DOWN, 0, 0)
+
+
+def play(handler: EventQueueHandler, frames: int):
+    inputs = []
+    for _ in range(frames):
+        inputs.append(
+            [
+                (i.button, i.value, i.pressed, i.held)
+                for i in handler.process_events()
+            ]
+        )
+        if len(inputs) == 2:
+            inputs.append(
+                [(i.button, i.value) for i in handler.release_controls()]
+            )
+    return inputs
+
+
+class TestInputReplay(unittest.TestCase):
+    def test_record_and_replay(self):
+        recording = InputRecording(42, 0.5, {"load_slot": 1})
+        handler = RecordingEventQueueHandler(
+            ScriptedEventQueueHandler(),
+            recording,
+        )
+        played = play(handler, 4)
+        self.assertEqual(recording.frames, 4)
+        self.assertEqual(
+            played[1],
+            [(buttons.DOWN, 1, True, True)],
+        )
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        filename = os.path.join(tmp.name, "inputs.json")
+        recording.save(filename)
+        loaded = InputRecording.load(filename)
+        self.assertEqual(loaded.seed, 42)
+        self.assertEqual(loaded.time_delta, 0.5)
+        self.assertEqual(loaded.options, {"load_slot": 1})
+        self.assertEqual(loaded.frames, 4)
+
+        replayed = play(
+            ReplayEventQueueHandler(PygameEventQueueHandler(), loaded),
+            4,
+        )
+        self.assertEqual(replayed, played)
+
+    def test_load_not_a_recording(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        filename = os.path.join(tmp.name, "inputs.json")
+        with open(filename, "w") as fp:
+            fp.write("{}")
+        with self.assertRaises(ValueError):
+            InputRecording.load(filename)
+
+    def test_save_hash(self):
+        saves = [{"time": "a", "npc": 1}, {"npc": 1, "time": "a"}]
+        saves += [{"time": "a", "npc": 2}, None]
+        with mock.patch("tuxemon.save.read_save", side_effect=saves):
+            first = save_hash(1)
+            self.assertEqual(save_hash(1), first)
+            self.assertNotEqual(save_hash(1), first)
+            self.assertIsNone(save_hash(1))
@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import base64
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from tuxemon import prepare, save
+
+
+def make_save_data():
+    return {
+        "player_name": "Red",
+        "time": "2023-01-01 10:00",
+        "monsters": [{"slug": "rockitten", "level": 5}],
+        "items": [{"slug": "potion", "quantity": 2}],
+        "game_variables": {"steps": 10},
+        "monster_boxes": {"Kennel": [], "Box 1": [{"slug": "bigfin"}]},
+        "item_boxes": {"Locker": [{"slug": "apple"}]},
+    }
+
+
+class TestSaveJournal(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.enterContext(
+            patch.object(prepare, "SAVE_PATH", os.path.join(tmp.name, "slot"))
+        )
+        self.enterContext(patch.object(prepare, "SAVE_METHOD", "JSON"))
+        self.enterContext(patch.dict(save.journals, clear=True))
+        self.save_path = save.get_save_path(1)
+        self.journal_path = f"{self.save_path}.{save.JOURNAL_EXTENSION}"
+
+    def read_journal(self):
+        with open(self.journal_path) as journal:
+            return [json.loads(line) for line in journal]
+
+    def test_sections(self):
+        save_data = make_save_data()
+        sections = save.split_sections(save_data)
+        self.assertEqual(sections["monster_boxes/Box 1"], [{"slug": "bigfin"}])
+        self.assertEqual(
+            sections["player"],
+            {"player_name": "Red", "time": "2023-01-01 10:00"},
+        )
+        self.assertEqual(save.merge_sections(sections), save_data)
+
+    def test_only_changes_are_written(self):
+        save_data = make_save_data()
+        save.save(save_data, 1)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+        # the changed data is new objects, as the save data is kept
+        # until it changes
+        save_data["game_variables"] = {"steps": 11}
+        box = save_data["monster_boxes"]["Box 1"]
+        save_data["monster_boxes"]["Box 1"] = [*box, {"slug": "tux"}]
+        del save_data["item_boxes"]["Locker"]
+        save.save(save_data, 1)
+        (entry,) = self.read_journal()
+        self.assertEqual(
+            set(entry["sections"]),
+            {"player", "variables", "monster_boxes/Box 1"},
+        )
+        self.assertEqual(entry["removed"], ["item_boxes/Locker"])
+
+        # read by another game
+        save.journals.clear()
+        self.assertEqual(save.read_save(1), save_data)
+
+    def test_monsters_are_compared_by_digest(self):
+        save_data = make_save_data()
+        save.save(save_data, 1)
+        save_data["monsters"][0]["level"] = 6
+        with patch.object(
+            save, "section_digest", wraps=save.section_digest
+        ) as digest:
+            save.save(save_data, 1)
+        # the other sections are the same objects, not encoded again
+        digest.assert_called_once_with({"monsters": save_data["monsters"]})
+        (entry,) = self.read_journal()
+        self.assertEqual(set(entry["sections"]), {"player", "party"})
+
+        # after a load, the monsters saved again are compared by digest
+        save.journals.clear()
+        save.read_save(1)
+        save_data = make_save_data()
+        save_data["monsters"][0]["level"] = 6
+        save.save(save_data, 1)
+        entry = self.read_journal()[-1]
+        self.assertNotIn("party", entry["sections"])
+        self.assertNotIn("monster_boxes/Box 1", entry["sections"])
+
+    def test_compaction(self):
+        save_data = make_save_data()
+        with patch.object(save, "MAX_JOURNAL_ENTRIES", 2):
+            for steps in range(5):
+                save_data["game_variables"] = {"steps": steps}
+                save.save(save_data, 1)
+            self.assertEqual(len(self.read_journal()), 1)
+        save.journals.clear()
+        self.assertEqual(save.read_save(1), save_data)
+
+    def test_interrupted_saves(self):
+        save_data = make_save_data()
+        save.save(save_data, 1)
+        save_data["game_variables"] = {"steps": 11}
+        save.save(save_data, 1)
+        # the game stopped while writing an entry
+        with open(self.journal_path, "a") as journal:
+            journal.write('{"generation": "')
+        save.journals.clear()
+        self.assertEqual(save.read_save(1), save_data)
+
+        # or after writing a full file, before removing the journal
+        with open(self.journal_path) as journal:
+            stale_entry = journal.readline()
+        save.journals.clear()
+        save.save(save_data, 1)
+        with open(self.journal_path, "w") as journal:
+            journal.write(stale_entry.replace("11", "12"))
+        save.journals.clear()
+        self.assertEqual(save.read_save(1), save_data)
+
+    def test_old_save(self):
+        save_data = make_save_data()
+        save.write_save_file(save_data, self.save_path)
+        self.assertEqual(save.read_save(1), save_data)
+        save.save(save_data, 1)
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertIsNone(save.read_save(2))
+
+    def test_read_save_keeps_the_journal(self):
+        save_data = make_save_data()
+        save.save(save_data, 1)
+        save_data["game_variables"] = {"steps": 11}
+        save.save(save_data, 1)
+        journal = save.journals[self.save_path]
+        self.assertEqual(save.read_save(1), save_data)
+        self.assertIs(save.journals[self.save_path], journal)
+
+        # unless the slot was written by another game
+        save.journals.clear()
+        save.read_save(1)
+        self.assertIsNot(save.journals[self.save_path], journal)
+
+
+class TestSaveHeader(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.enterContext(
+            patch.object(prepare, "SAVE_PATH", os.path.join(tmp.name, "slot"))
+        )
+        self.enterContext(patch.object(prepare, "SAVE_METHOD", "JSON"))
+        self.enterContext(patch.dict(save.journals, clear=True))
+        self.thumbnail = pygame.Surface((4, 3))
+        self.thumbnail.fill((10, 20, 30))
+
+    def test_header(self):
+        self.assertIsNone(save.read_header(1))
+        save.save(make_save_data(), 1, self.thumbnail)
+        with patch.object(save, "read_save") as read_save:
+            header = save.read_header(1)
+        read_save.assert_not_called()
+        self.assertEqual(header["player_name"], "Red")
+        self.assertEqual(header["time"], "2023-01-01 10:00")
+        self.assertFalse(header["broken"])
+        self.assertEqual(header["thumbnail"].get_size(), (4, 3))
+        self.assertEqual(header["thumbnail"].get_at((0, 0)), (10, 20, 30))
+
+    def test_thumbnail_written_when_changed(self):
+        save_data = make_save_data()
+        with patch.object(
+            pygame.image, "save", wraps=pygame.image.save
+        ) as image_save:
+            save.save(save_data, 1, self.thumbnail)
+            save.save(save_data, 1, self.thumbnail)
+            self.assertEqual(image_save.call_count, 1)
+            self.thumbnail.set_at((0, 0), (0, 0, 0))
+            save.save(save_data, 1, self.thumbnail)
+            self.assertEqual(image_save.call_count, 2)
+
+    def test_old_save(self):
+        save_data = make_save_data()
+        save_data.update(
+            screenshot=base64.b64encode(bytes([10, 20, 30] * 12)).decode(),
+            screenshot_width=4,
+            screenshot_height=3,
+        )
+        save.write_save_file(save_data, save.get_save_path(1))
+        header = save.read_header(1)
+        self.assertEqual(header["player_name"], "Red")
+        self.assertEqual(header["thumbnail"].get_at((3, 2)), (10, 20, 30))
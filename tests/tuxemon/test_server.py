@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import unittest
+from unittest.mock import Mock
+
+from tuxemon.server import DedicatedServer
+
+MAP_NAME = "taba_town.tmx"
+
+
+class TestDedicatedServer(unittest.TestCase):
+    def setUp(self):
+        self.network = Mock(registry={})
+        self.server = DedicatedServer(network=self.network)
+        self.connect("a", (0, 4))
+
+    def connect(self, cuuid, tile_pos):
+        self.network.registry[cuuid] = {}
+        self.server.server_event_handler(
+            cuuid,
+            {
+                "type": "PUSH_SELF",
+                "event_number": 0,
+                "sprite_name": "adventurer",
+                "map_name": MAP_NAME,
+                "char_dict": {
+                    "tile_pos": tile_pos,
+                    "name": cuuid,
+                    "facing": "down",
+                },
+            },
+        )
+
+    def move(self, cuuid, tile_pos, event_number=1):
+        self.server.server_event_handler(
+            cuuid,
+            {
+                "type": "CLIENT_MOVE_COMPLETE",
+                "event_number": event_number,
+                "map_name": MAP_NAME,
+                "char_dict": {"tile_pos": tile_pos},
+            },
+        )
+        return self.network.registry[cuuid]["char_dict"]["tile_pos"]
+
+    def test_map_loaded_without_display(self):
+        txmn_map = self.server.get_map(MAP_NAME)
+        self.assertIsNotNone(txmn_map)
+        self.assertTrue(txmn_map.collision_map)
+
+    def test_accept_move_to_free_tile(self):
+        self.assertEqual(self.move("a", (1, 4)), (1, 4))
+
+    def test_refuse_move_into_wall(self):
+        self.assertEqual(self.move("a", (0, 3)), (0, 4))
+        correction = self.server.outbox["a"][-1]
+        self.assertEqual(correction["type"], "NOTIFY_CLIENT_CORRECTION")
+        self.assertEqual(correction["char_dict"]["tile_pos"], (0, 4))
+
+    def test_refuse_teleport(self):
+        self.assertEqual(self.move("a", (10, 10)), (0, 4))
+
+    def test_refuse_move_into_player(self):
+        self.connect("b", (1, 4))
+        self.assertEqual(self.move("a", (1, 4)), (0, 4))
@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import random
+import unittest
+
+from tuxemon.db import db
+from tuxemon.session import local_session
+from tuxemon.simulation import BattleSimulator
+
+
+class TestBattleSimulator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not db.database["monster"]:
+            db.load()
+
+    def simulate(self, seed):
+        sim = BattleSimulator(random.Random(seed))
+        party_a = [
+            sim.create_monster("rockitten", 10),
+            sim.create_monster("agnite", 10),
+        ]
+        party_b = [
+            sim.create_monster("bigfin", 10),
+            sim.create_monster("nut", 10),
+        ]
+        return sim.run(party_a, party_b)
+
+    def test_same_seed_same_battle(self):
+        self.assertEqual(self.simulate(3), self.simulate(3))
+
+    def test_battle_ends(self):
+        result = self.simulate(7)
+        self.assertIn(result.winner, (0, 1, None))
+        self.assertGreater(result.turns, 0)
+        self.assertEqual(result.parties[0], ["rockitten", "agnite"])
+        self.assertEqual(result.parties[1], ["bigfin", "nut"])
+
+    def test_random_state_restored(self):
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        self.simulate(1)
+        self.assertEqual(random.random(), expected)
+
+    def test_run_again(self):
+        sim = BattleSimulator(random.Random(2))
+        party_a = [sim.create_monster("rockitten", 10)]
+        party_b = [sim.create_monster("bigfin", 10)]
+        sim.run(party_a, party_b)
+        first_turn = sim._log_action[0][0]
+        party_a = [sim.create_monster("rockitten", 10)]
+        party_b = [sim.create_monster("bigfin", 10)]
+        sim.run(party_a, party_b)
+        # the turns of the second battle are counted from the start
+        self.assertEqual(sim._log_action[0][0], first_turn)
+
+    def test_session_player_restored(self):
+        player = local_session.player
+        self.simulate(1)
+        self.assertIs(local_session.player, player)
@@ -304,3 +304,22 @@ class WhenEmpty(StateManagerTestBase):
 
     def test_no_states_current_state_is_none(self):
         self.assertEqual(self.sm.current_state, None)
+
+
+class CancelTasks(StateManagerTestBase):
+    def setUp(self):
+        self.scheduler = Mock()
+        self.sm = StateManager("head.tail", scheduler=self.scheduler)
+        self.create_and_register_state("a")
+        self.create_and_register_state("b")
+        self.state_a = self.sm.push_state("a")
+        self.state_b = self.sm.push_state("b")
+        self.sm.update(0)
+
+    def test_pop_cancels_tasks(self):
+        self.sm.pop_state()
+        self.scheduler.unschedule_owner.assert_called_once_with(self.state_b)
+
+    def test_remove_cancels_tasks(self):
+        self.sm.remove_state(self.state_a)
+        self.scheduler.unschedule_owner.assert_called_once_with(self.state_a)
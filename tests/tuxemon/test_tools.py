@@ -1,12 +1,16 @@
 # SPDX-License-Identifier: GPL-3.0
 # Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
 import unittest
+from dataclasses import dataclass
+from typing import Literal, Optional, Union
 from unittest import mock
 
 from tuxemon.player import Player
 from tuxemon.session import Session, local_session
 from tuxemon.tools import (
+    cast_dataclass_parameters,
     copy_dict_with_keys,
+    get_casting_plan,
     number_or_variable,
     round_to_divisible,
 )
@@ -70,3 +74,47 @@ class TestVariableMoney(unittest.TestCase):
 
             result = number_or_variable(local_session, "my_var")
             self.assertEqual(result, 2.0)
+
+
+@dataclass
+class Parameters:
+    name: str
+    amount: int
+    ratio: Optional[float] = None
+    target: Union[int, str, None] = None
+    mode: Literal["in", "out"] = "in"
+
+    def __post_init__(self) -> None:
+        cast_dataclass_parameters(self)
+
+
+class TestCastDataclassParameters(unittest.TestCase):
+    def test_cast(self):
+        params = Parameters("bob", "3", "0.5", "2", "out")
+        self.assertEqual(params.name, "bob")
+        self.assertEqual(params.amount, 3)
+        self.assertEqual(params.ratio, 0.5)
+        self.assertEqual(params.target, 2)
+        self.assertEqual(params.mode, "out")
+
+    def test_none(self):
+        params = Parameters("bob", 3, "", "")
+        self.assertIsNone(params.ratio)
+        self.assertIsNone(params.target)
+
+    def test_union_order(self):
+        self.assertEqual(Parameters("bob", 3, target="abc").target, "abc")
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Parameters("bob", "three")
+        with self.assertRaises(ValueError):
+            Parameters("bob", 3, mode="up")
+
+    def test_plan_is_cached(self):
+        plan = get_casting_plan(Parameters)
+        self.assertEqual(
+            [name for name, cast in plan],
+            ["name", "amount", "ratio", "target", "mode"],
+        )
+        self.assertIs(get_casting_plan(Parameters), plan)
@@ -0,0 +1,237 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+import io
+import json
+import os
+import tempfile
+import unittest
+import wave
+import zipfile
+from unittest import mock
+
+import pygame
+
+from tuxemon import prepare, vfs
+from tuxemon.audio import _decode_sound, get_sound_filename
+from tuxemon.constants import paths
+from tuxemon.db import JSONDatabase, db
+from tuxemon.graphics import load_surface
+from tuxemon.map_loader import TMXMapLoader
+from tuxemon.states.world.worldstate import WorldState
+from tuxemon.technique.technique import Technique
+
+TILESET = """<?xml version="1.0" encoding="UTF-8"?>
+<tileset name="tiles" tilewidth="16" tileheight="16" tilecount="4" columns="2">
+ <image source="tiles.png" width="32" height="32"/>
+</tileset>
+"""
+
+MAP = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.8" orientation="orthogonal" renderorder="right-down" width="3" height="2" tilewidth="16" tileheight="16" infinite="0">
+ <properties>
+  <property name="slug" value="archived"/>
+ </properties>
+ <tileset firstgid="1" source="../gfx/tiles.tsx"/>
+ <layer id="1" name="Tile Layer 1" width="3" height="2">
+  <data encoding="csv">
+1,2,3,
+4,1,2
+</data>
+ </layer>
+</map>
+"""
+
+
+EVENTS = """events:
+  Archived event:
+    actions:
+    - set_variable archived:yes
+    x: 1
+    y: 1
+    width: 1
+    height: 1
+    type: "event"
+"""
+
+
+def make_png():
+    surface = pygame.Surface((32, 32))
+    surface.fill((255, 0, 0))
+    buffer = io.BytesIO()
+    pygame.image.save(surface, buffer, "tiles.png")
+    return buffer.getvalue()
+
+
+def make_wav():
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(22050)
+        wav.writeframes(bytes(2205 * 2))
+    return buffer.getvalue()
+
+
+class TestArchivedMod(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.addCleanup(vfs.unmount_all)
+
+        with zipfile.ZipFile(
+            os.path.join(self.tmp, "zipped.zip"), "w"
+        ) as zipf:
+            zipf.writestr(
+                "db/monster/rockitten.json",
+                json.dumps({"slug": "rockitten"}),
+                zipfile.ZIP_DEFLATED,
+            )
+            zipf.writestr("db/monster/notes.txt", "not loaded")
+            zipf.writestr("gfx/tiles.png", make_png())
+            zipf.writestr("gfx/tiles.tsx", TILESET, zipfile.ZIP_DEFLATED)
+            zipf.writestr("maps/archived.tmx", MAP)
+
+        for name, value in (
+            ("mods_folder", self.tmp),
+            ("BASEDIR", self.tmp),
+            ("system_installed_folders", []),
+        ):
+            patcher = mock.patch.object(paths, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(prepare.CONFIG, "mods", ["zipped"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fetch_from_archive(self):
+        path = prepare.fetch("db", "monster", "rockitten.json")
+        self.assertEqual(
+            path, os.path.join(self.tmp, "zipped", "db/monster/rockitten.json")
+        )
+        self.assertTrue(vfs.exists(path))
+        self.assertTrue(vfs.isdir(prepare.fetch("db")))
+        self.assertEqual(
+            json.loads(vfs.read_bytes(path)), {"slug": "rockitten"}
+        )
+        with self.assertRaises(OSError):
+            prepare.fetch("db", "missing.json")
+
+    def test_listdir(self):
+        mod_folder = os.path.join(self.tmp, "zipped")
+        # the archive is only mounted once the mod is searched
+        with self.assertRaises(FileNotFoundError):
+            vfs.listdir(mod_folder)
+        prepare.fetch("db")
+        self.assertEqual(vfs.listdir(mod_folder), ["db", "gfx", "maps"])
+        self.assertEqual(
+            vfs.listdir(os.path.join(mod_folder, "db", "monster")),
+            ["notes.txt", "rockitten.json"],
+        )
+
+    def test_load_json(self):
+        database = JSONDatabase()
+        database.path = prepare.fetch("db")
+        database.load_json("monster")
+        self.assertEqual(
+            database.preloaded["monster"], {"rockitten": {"slug": "rockitten"}}
+        )
+
+    def test_load_surface(self):
+        surface = load_surface(prepare.fetch("gfx", "tiles.png"))
+        self.assertEqual(surface.get_size(), (32, 32))
+        self.assertEqual(surface.get_at((0, 0))[:3], (255, 0, 0))
+
+    def test_load_map_with_external_tileset(self):
+        sources = []
+
+        def image_loader(filename, colorkey, **kwargs):
+            sources.append(filename)
+            self.assertTrue(vfs.exists(filename))
+            return lambda rect=None, flags=None: None
+
+        loader = TMXMapLoader(load_images=False)
+        loader.image_loader = image_loader
+        txmn_map = loader.load(prepare.fetch("maps", "archived.tmx"))
+        self.assertEqual(txmn_map.size, (3, 2))
+        self.assertEqual(
+            os.path.normpath(sources[0]),
+            os.path.join(self.tmp, "zipped", "gfx", "tiles.png"),
+        )
+
+
+class TestArchivedModAssets(unittest.TestCase):
+    """Assets found through the db, in a mod archive."""
+
+    @classmethod
+    def setUpClass(cls):
+        if not db.database["technique"]:
+            db.load()
+        cls.technique = next(
+            tech
+            for tech in db.database["technique"].values()
+            if tech.animation
+        )
+        cls.sound = next(iter(db.database["sounds"].values()))
+
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.addCleanup(vfs.unmount_all)
+
+        animation = self.technique.animation
+        with zipfile.ZipFile(
+            os.path.join(self.tmp, "zipped.zip"), "w"
+        ) as zipf:
+            for number in range(3):
+                zipf.writestr(
+                    f"animations/technique/{animation}_{number:02}.png",
+                    make_png(),
+                )
+            zipf.writestr("sounds/" + self.sound.file, make_wav())
+            zipf.writestr("gfx/tiles.png", make_png())
+            zipf.writestr("gfx/tiles.tsx", TILESET)
+            zipf.writestr("maps/archived.tmx", MAP)
+            zipf.writestr("maps/archived.yaml", EVENTS)
+
+        # the db and translations are still read from the default mod
+        for name, value in (
+            ("mods_folder", self.tmp),
+            ("system_installed_folders", []),
+        ):
+            patcher = mock.patch.object(paths, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            prepare.CONFIG, "mods", ["zipped", *prepare.CONFIG.mods]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_technique_animation(self):
+        technique = Technique()
+        technique.load(self.technique.slug)
+        self.assertEqual(len(technique.images), 3)
+        for filename in technique.images:
+            self.assertTrue(filename.startswith(self.tmp))
+            self.assertTrue(vfs.exists(filename))
+
+    def test_map_events(self):
+        path = prepare.fetch("maps", "archived.tmx")
+        txmn_map = WorldState.load_map(mock.MagicMock(), path)
+        self.assertIn("Archived event", [e.name for e in txmn_map.events])
+
+    def test_sound(self):
+        filename = get_sound_filename(self.sound.slug)
+        self.assertEqual(
+            filename,
+            os.path.join(self.tmp, "zipped", "sounds", self.sound.file),
+        )
+        pygame.mixer.init()
+        self.addCleanup(pygame.mixer.quit)
+        sound = _decode_sound(filename)
+        self.assertIsNotNone(sound)
+        self.assertAlmostEqual(sound.get_length(), 0.1, places=2)
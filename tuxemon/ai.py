@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import random
-from typing import TYPE_CHECKING, Tuple
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
+from tuxemon import prepare
 from tuxemon.combat import pre_checking
-from tuxemon.db import ItemCategory
+from tuxemon.db import CategoryCondition, ItemCategory, db
+from tuxemon.element import element_chart
+from tuxemon.formula import simple_damage_stats
 from tuxemon.technique.technique import Technique
 
 if TYPE_CHECKING:
@@ -14,6 +18,186 @@ if TYPE_CHECKING:
     from tuxemon.monster import Monster
     from tuxemon.states.combat.combat import CombatState
 
+# easy picks a random usable action, normal picks one at random weighted
+# by its score, hard picks the best one and looks ahead one turn
+DIFFICULTIES = ("easy", "normal", "hard")
+LOOKAHEAD = {"easy": 0, "normal": 0, "hard": 1}
+# seconds a decision may spend scoring before it settles for the scores
+# computed so far
+TIME_BUDGET = 0.002
+# a status is worth this share of the hp of the monster receiving it
+STATUS_VALUE = 0.25
+DAMAGE_EFFECTS = ("damage", "area", "local_damage")
+DAMAGE_RANGES = ("melee", "touch", "ranged", "reach", "reliable")
+
+Action = Tuple[Technique, "Monster"]
+
+
+def usable_actions(
+    monster: Monster,
+    opponents: Sequence[Monster],
+) -> List[Action]:
+    """
+    Every (technique, target) pair the monster can use this turn.
+
+    Only the last moves (``max_moves``) are considered, they must be
+    recharged and their conditions must be met by the target.
+
+    Parameters:
+        monster: Monster choosing the action.
+        opponents: Monsters it may target.
+
+    Returns:
+        The usable actions.
+
+    """
+    return [
+        (mov, opponent)
+        for mov in monster.moves[-monster.max_moves :]
+        if mov.next_use <= 0
+        for opponent in opponents
+        if mov.validate(opponent)
+    ]
+
+
+def expected_damage(
+    monster: Monster,
+    actions: Sequence[Action],
+) -> List[float]:
+    """
+    Expected damage of many actions, in one pass.
+
+    The damage follows ``formula.simple_damage_calculate``, with the
+    multipliers read from the element chart, then each damage is
+    weighted by the accuracy of the technique and capped by the hp left
+    to the target.
+
+    Parameters:
+        monster: Monster using the techniques.
+        actions: Pairs of technique and target.
+
+    Returns:
+        The expected damage of each action, 0 for techniques that do
+        not deal regular damage.
+
+    """
+    damages = [0.0] * len(actions)
+    for i, (tech, target) in enumerate(actions):
+        if tech.range not in DAMAGE_RANGES or not any(
+            e.name in DAMAGE_EFFECTS for e in tech.effects
+        ):
+            continue
+        mult = element_chart.damage_multiplier(tech.types, target.types)
+        strength, resist = simple_damage_stats(tech, monster, target)
+        damage = int(strength * tech.power * mult / resist)
+        damages[i] = tech.accuracy * min(damage, target.current_hp)
+    return damages
+
+
+def score_actions(
+    monster: Monster,
+    actions: Sequence[Action],
+    lookahead: int = 0,
+    deadline: Optional[float] = None,
+) -> List[float]:
+    """
+    Score the actions a monster may take, in hp.
+
+    The score adds the expected damage, the value of the statuses
+    given and of the hp healed. With a lookahead, an action expected
+    to knock out its target also earns the damage the target would
+    have dealt back on its next turn.
+
+    Parameters:
+        monster: Monster choosing the action.
+        actions: Pairs of technique and target.
+        lookahead: Number of turns to look ahead.
+        deadline: ``time.perf_counter`` value after which the
+            lookahead is skipped.
+
+    Returns:
+        The score of each action.
+
+    """
+    damages = expected_damage(monster, actions)
+    scores = list(damages)
+    for i, (tech, target) in enumerate(actions):
+        for effect in tech.effects:
+            objective = getattr(effect, "objective", None)
+            if effect.name == "give":
+                condition: str = getattr(effect, "condition")
+                status = db.lookup(condition, table="technique")
+                if objective == "user":
+                    receiver = monster
+                    wanted = CategoryCondition.positive
+                else:
+                    receiver = target
+                    wanted = CategoryCondition.negative
+                if status.category == wanted and not receiver.status:
+                    scores[i] += (
+                        tech.accuracy
+                        * (tech.potency or 1.0)
+                        * STATUS_VALUE
+                        * receiver.hp
+                    )
+            elif effect.name == "healing" and objective == "user":
+                heal = (7 + monster.level) * tech.healing_power
+                missing = monster.hp - monster.current_hp
+                scores[i] += tech.accuracy * min(heal, missing)
+
+    if lookahead > 0 and (deadline is None or time.perf_counter() < deadline):
+        threats: Dict[Monster, float] = {}
+        for i, (tech, target) in enumerate(actions):
+            if damages[i] < target.current_hp * tech.accuracy:
+                continue
+            if target not in threats:
+                replies = score_actions(
+                    target,
+                    usable_actions(target, [monster]),
+                    lookahead - 1,
+                    deadline,
+                )
+                threats[target] = max(replies, default=0.0)
+            scores[i] += tech.accuracy * threats[target]
+    return scores
+
+
+def choose_action(
+    monster: Monster,
+    opponents: Sequence[Monster],
+    difficulty: str = "easy",
+    rng: Optional[random.Random] = None,
+) -> Optional[Action]:
+    """
+    Choose the technique and target of a monster.
+
+    Parameters:
+        monster: Monster choosing the action.
+        opponents: Monsters it may target.
+        difficulty: One of ``DIFFICULTIES``.
+        rng: Random generator, defaults to the ``random`` module.
+
+    Returns:
+        The technique and its target, ``None`` if no technique is
+        usable.
+
+    """
+    choice = rng or random
+    actions = usable_actions(monster, opponents)
+    if not actions:
+        return None
+    if difficulty == "easy" or len(actions) == 1:
+        return choice.choice(actions)
+    deadline = time.perf_counter() + TIME_BUDGET
+    scores = score_actions(monster, actions, LOOKAHEAD[difficulty], deadline)
+    if difficulty == "normal":
+        weights = [score + 1.0 for score in scores]
+        return choice.choices(actions, weights)[0]
+    best = max(scores)
+    return choice.choice(
+        [action for action, score in zip(actions, scores) if score == best]
+    )
+
 
 # Class definition for an AI model.
 class AI:
@@ -24,6 +208,7 @@ class AI:
         self.user = combat.players[1]  # ai
         self.monster = monster
         self.opponents = combat.monsters_in_play[self.human]
+        self.difficulty = prepare.CONFIG.ai_difficulty
 
         if self.combat.is_trainer_battle:
             self.make_decision_trainer()
@@ -56,50 +241,30 @@ class AI:
         """
         Tracks next_use and recharge, if both unusable, skip.
         """
-        actions = []
-        # it chooses among the last 4 moves
-        for mov in self.monster.moves[-self.monster.max_moves :]:
-            if mov.next_use <= 0:
-                for opponent in self.opponents:
-                    # it checks technique conditions
-                    if mov.validate(opponent):
-                        actions.append((mov, opponent))
-        if not actions:
+        # wild monsters keep picking at random
+        difficulty = "easy"
+        if self.combat.is_trainer_battle:
+            difficulty = self.difficulty
+        action = choose_action(self.monster, self.opponents, difficulty)
+        if action is None:
             skip = Technique()
             skip.load("skip")
             return skip, random.choice(self.opponents)
-        else:
-            return random.choice(actions)
+        return action
 
     def check_weakest(self) -> bool:
         """
         Is it the weakest monster in the NPC's party?
         """
-        weakest = [
-            m
-            for m in self.user.monsters
-            if m.level == min([m.level for m in self.user.monsters])
-        ]
-        weak = weakest[0]
-        if weak.level == self.monster.level:
-            return True
-        else:
-            return False
+        weakest = min(m.level for m in self.user.monsters)
+        return weakest == self.monster.level
 
     def check_strongest(self) -> bool:
         """
         Is it the strongest monster in the NPC's party?
         """
-        strongest = [
-            m
-            for m in self.user.monsters
-            if m.level == max([m.level for m in self.user.monsters])
-        ]
-        strong = strongest[0]
-        if strong.level == self.monster.level:
-            return True
-        else:
-            return False
+        strongest = max(m.level for m in self.user.monsters)
+        return strongest == self.monster.level
 
     def need_potion(self) -> bool:
         """
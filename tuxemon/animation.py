@@ -4,26 +4,34 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
+from functools import partial
 from math import cos, pi, sin, sqrt
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     DefaultDict,
+    Dict,
     List,
     Mapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Union,
 )
 
 import pygame
 
-__all__ = ("Task", "Animation", "remove_animations_of")
+__all__ = ("Task", "Animation", "AnimationGroup", "remove_animations_of")
 
 from tuxemon.compat import Rect
 
+if TYPE_CHECKING:
+    from tuxemon.clock import ScheduledItem, Scheduler
+
 ScheduledFunction = Callable[[], Any]
+Setter = Callable[[float], Any]
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +66,9 @@ def remove_animations_of(target: object, group: pygame.sprite.Group) -> None:
         group: Pygame group where to remove the animations.
 
     """
+    if isinstance(group, AnimationGroup):
+        group.remove_animations_of(target)
+        return
     animations = [ani for ani in group.sprites() if isinstance(ani, Animation)]
     to_remove = [
         ani for ani in animations if target in [i[0] for i in ani.targets]
@@ -169,6 +180,13 @@ class Task(TaskBase):
 
         When chaining tasks, do not add the chained tasks to a group.
 
+        >>> # let a scheduler call the task, instead of a group
+        >>> task = Task(call_later, 1000)
+        >>> task.attach(scheduler, owner=state)
+
+        Tasks chained to an attached task are attached to the same
+        scheduler.
+
     """
 
     _valid_schedules = ("on interval", "on finish", "on abort")
@@ -191,8 +209,40 @@ class Task(TaskBase):
         self._duration: float = 0
         self._chain: List[Task] = list()
         self._state = ANIMATION_RUNNING
+        self._scheduler: Optional[Scheduler] = None
+        self._owner: Any = None
+        self._item: Optional[ScheduledItem] = None
         self.schedule(callback)
 
+    def attach(self, scheduler: Scheduler, owner: Any = None) -> None:
+        """
+        Let a scheduler call the task when its interval is over.
+
+        An attached task is not updated by a group: the scheduler keeps
+        it until its next deadline, so waiting tasks cost nothing on
+        each frame.
+
+        Parameters:
+            scheduler: Scheduler calling the task.
+            owner: Owner of the task in the scheduler.
+
+        """
+        self._scheduler = scheduler
+        self._owner = owner
+        self._item = scheduler.schedule(
+            self._on_deadline,
+            self._interval - self._duration,
+            repeat=True,
+            owner=owner,
+        )
+        self._item.interval = self._interval
+
+    def _on_deadline(self, dt: float) -> bool:
+        if self._state is not ANIMATION_RUNNING:
+            return False
+        self.update(self._interval - self._duration)
+        return self._state is ANIMATION_RUNNING
+
     def chain(
         self,
         callback: ScheduledFunction,
@@ -300,6 +350,9 @@ class Task(TaskBase):
         if new_delay > time_left:
             self._interval = new_delay
             self._duration = 0
+            if self._scheduler is not None and self._item is not None:
+                self._scheduler.unschedule_item(self._item)
+                self.attach(self._scheduler, self._owner)
 
     def abort(self) -> None:
         """Force task to finish, without executing callbacks."""
@@ -309,8 +362,14 @@ class Task(TaskBase):
     def _cleanup(self) -> None:
         self._chain = []
         self.kill()
+        if self._scheduler is not None and self._item is not None:
+            self._scheduler.unschedule_item(self._item)
 
     def _execute_chain(self) -> None:
+        if self._scheduler is not None:
+            for task in self._chain:
+                task.attach(self._scheduler, self._owner)
+            return
         groups = self.groups()
         for task in self._chain:
             task.add(*groups)
@@ -423,6 +482,8 @@ class Animation(pygame.sprite.Sprite):
             Tuple[object, Mapping[str, Tuple[float, float]]]
         ] = list()
         self._targets: Sequence[object] = list()
+        # setter, initial and final value of each animated property
+        self._values: List[Tuple[Setter, float, float]] = list()
         self.delay = delay
         self._state = ANIMATION_NOT_STARTED
         self._round_values = round_values
@@ -472,33 +533,29 @@ class Animation(pygame.sprite.Sprite):
 
         return check_number(value)
 
-    def _set_value(self, target: object, name: str, value: float) -> None:
+    def _make_setter(self, target: object, name: str) -> Setter:
         """
-        Set a value on some other object.
+        Resolve once how to set a value on some other object.
 
-        If the name references a callable type, then
-        the object of that name will be called with 'value'
-        as the first and only argument.
-
-        Because callables are 'write only', there is no way
-        to determine the initial value.  you can supply
-        an initial value in the constructor as a value or
-        reference to a callable object.
+        If the name references a callable type, then the object of that
+        name will be called with the value as the first and only
+        argument. Because callables are 'write only', there is no way
+        to determine the initial value.  you can supply an initial value
+        in the constructor as a value or reference to a callable object.
 
         Parameters:
             target: Object to be modified.
             name: Name of attribute to be modified.
-            value: New value of the attribute.
 
-        """
-        if self._round_values:
-            value = int(round(value, 0))
+        Returns:
+            Function taking the new value of the attribute, it does not
+            round the value.
 
+        """
         attr = getattr(target, name)
         if callable(attr):
-            attr(value)
-        else:
-            setattr(target, name, value)
+            return attr
+        return partial(setattr, target, name)
 
     def update(self, dt: float) -> None:
         """
@@ -532,13 +589,26 @@ class Animation(pygame.sprite.Sprite):
                 self.delay = 0
             return
 
-        p = min(1.0, self._elapsed / self._duration)
+        self._step(self._progress())
+
+    def _progress(self) -> float:
+        if self._duration <= 0:
+            return 1.0
+        return min(1.0, self._elapsed / self._duration)
+
+    def _step(self, p: float) -> None:
+        """
+        Apply the values at some progress of the animation.
+
+        Parameters:
+            p: Progress, between 0 and 1.
+
+        """
         t = self._transition(p)
-        for target, props in self.targets:
-            for name, values in props.items():
-                a, b = values
-                value = (a * (1.0 - t)) + (b * t)
-                self._set_value(target, name, value)
+        rounded = self._round_values
+        for setter, a, b in self._values:
+            value = (a * (1.0 - t)) + (b * t)
+            setter(round(value) if rounded else value)
 
         if hasattr(self, "update_callback"):
             self.update_callback()
@@ -559,11 +629,9 @@ class Animation(pygame.sprite.Sprite):
         # if self._state is not ANIMATION_RUNNING:
         #     raise RuntimeError
 
-        if self.targets is not None:
-            for target, props in self.targets:
-                for name, values in props.items():
-                    a, b = values
-                    self._set_value(target, name, b)
+        rounded = self._round_values
+        for setter, _, b in self._values:
+            setter(round(b) if rounded else b)
 
         if hasattr(self, "update_callback"):
             self.update_callback()
@@ -585,6 +653,7 @@ class Animation(pygame.sprite.Sprite):
 
         self._state = ANIMATION_FINISHED
         self.targets = []
+        self._values = []
         self.kill()
         if hasattr(self, "callback"):
             self.callback()
@@ -610,12 +679,16 @@ class Animation(pygame.sprite.Sprite):
 
         self._state = ANIMATION_RUNNING
         self._targets = targets
+        for group in self.groups():
+            if isinstance(group, AnimationGroup):
+                group.index_targets(self)
 
         if self.delay == 0:
             self._gather_initial_values()
 
     def _gather_initial_values(self) -> None:
         self.targets = list()
+        self._values = list()
         for target in self._targets:
             props = dict()
             if isinstance(target, Rect):
@@ -627,11 +700,111 @@ class Animation(pygame.sprite.Sprite):
                 if self._relative:
                     value += initial
                 props[name] = initial, value
+                setter = self._make_setter(target, name)
+                self._values.append((setter, initial, value))
             self.targets.append((target, props))
 
         self.update(0)
 
 
+class AnimationGroup(pygame.sprite.Group):
+    """
+    Group of tasks and animations, updated in one step per frame.
+
+    The running animations are gathered once per update and advanced
+    together: the elapsed time, progress and easing of all of them are
+    computed in one pass over parallel lists, then the values are
+    written back through setters resolved when each animation started.
+
+    The animations are indexed by target, so removing the animations
+    of an object does not scan the group.
+
+    """
+
+    def __init__(self, *sprites: Any) -> None:
+        self._by_target: Dict[int, Set[Animation]] = {}
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite: Any, layer: None = None) -> None:
+        super().add_internal(sprite, layer)
+        if isinstance(sprite, Animation):
+            self.index_targets(sprite)
+
+    def remove_internal(self, sprite: Any) -> None:
+        super().remove_internal(sprite)
+        if isinstance(sprite, Animation):
+            for target in sprite._targets:
+                animations = self._by_target.get(id(target))
+                if animations is not None:
+                    animations.discard(sprite)
+                    if not animations:
+                        del self._by_target[id(target)]
+
+    def index_targets(self, animation: Animation) -> None:
+        """
+        Index an animation by its targets.
+
+        Parameters:
+            animation: Animation of the group.
+
+        """
+        for target in animation._targets:
+            self._by_target.setdefault(id(target), set()).add(animation)
+
+    def remove_animations_of(self, target: object) -> None:
+        """
+        Remove the animations of a target.
+
+        Parameters:
+            target: Object whose animations should be removed.
+
+        """
+        animations = self._by_target.get(id(target))
+        if animations:
+            self.remove(*animations)
+
+    def update(self, dt: float) -> None:
+        """
+        Update every task and animation of the group.
+
+        Parameters:
+            dt: Time passed since last update.
+
+        """
+        running = []
+        for sprite in self.sprites():
+            if (
+                type(sprite) is Animation
+                and sprite._state is ANIMATION_RUNNING
+                and sprite.delay <= 0
+            ):
+                running.append(sprite)
+            else:
+                sprite.update(dt)
+
+        elapsed = [ani._elapsed + dt for ani in running]
+        progress = [
+            min(1.0, e / ani._duration) if ani._duration > 0 else 1.0
+            for ani, e in zip(running, elapsed)
+        ]
+        eased = [ani._transition(p) for ani, p in zip(running, progress)]
+
+        members = self.spritedict
+        for ani, e, p, t in zip(running, elapsed, progress, eased):
+            # an earlier callback may have stopped the animation
+            if ani._state is not ANIMATION_RUNNING or ani not in members:
+                continue
+            ani._elapsed = e
+            rounded = ani._round_values
+            for setter, a, b in ani._values:
+                value = (a * (1.0 - t)) + (b * t)
+                setter(round(value) if rounded else value)
+            if hasattr(ani, "update_callback"):
+                ani.update_callback()
+            if p >= 1:
+                ani.finish()
+
+
 class AnimationTransition:
     """
     Collection of animation functions to be used with the Animation object.
@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""Texture atlases, packing the images of a folder in a few sheets.
+
+An atlas is built offline for a folder of images: related images (the
+frames of a NPC sprite set, of a technique animation...) are packed in
+the same sheet, ``atlas-<n>.png``, and ``atlas.json`` gives the sheet
+and rectangle of each image. The graphics module then loads an image
+listed in the atlas as a subsurface of its sheet, decoding one sheet
+instead of many files.
+
+The images stay in the folder, and the atlas has to be built again once
+they change.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+ATLAS_INDEX = "atlas.json"
+SHEET_PATTERN = re.compile(r"atlas-[0-9]+\.png$")
+SHEET_SIZE = 512
+
+# frames of an animation and the directions of a sprite set, removed
+# from the file name to get the group of an image
+FRAME_SUFFIX = re.compile(r"\.?_?[0-9]+$")
+SPRITE_SUFFIX = re.compile(r"(_(front|back|left|right))?(_walk)?$")
+
+AtlasRect = Tuple[int, int, int, int]
+
+
+def group_name(filename: str) -> str:
+    """
+    Return the group of an image, kept in a single sheet if possible.
+
+    For example, ``adventurer_front_walk.001.png`` is in the
+    ``adventurer`` group, and ``bigfin-front.png`` in ``bigfin``.
+
+    Parameters:
+        filename: Name of the image, without directory.
+
+    Returns:
+        Name of the group.
+
+    """
+    stem = os.path.splitext(filename)[0]
+    stem = FRAME_SUFFIX.sub("", stem)
+    stem = SPRITE_SUFFIX.sub("", stem)
+    return stem.split("-")[0] or filename
+
+
+class ShelfPacker:
+    """
+    Places rectangles in a sheet, on shelves from top to bottom.
+
+    Parameters:
+        width: Width of the sheet.
+        height: Maximum height of the sheet.
+
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+        self.shelf_height = 0
+
+    def place(self, size: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Place a rectangle.
+
+        Parameters:
+            size: Size of the rectangle.
+
+        Returns:
+            Position of the rectangle, ``None`` if the sheet is full.
+
+        """
+        width, height = size
+        x, y, shelf_height = self.x, self.y, self.shelf_height
+        if x + width > self.width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if x + width > self.width or y + height > self.height:
+            return None
+        self.x = x + width
+        self.y = y
+        self.shelf_height = max(shelf_height, height)
+        return x, y
+
+    def place_all(
+        self,
+        sizes: Sequence[Tuple[int, int]],
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Place every rectangle, or none of them.
+
+        Parameters:
+            sizes: Sizes of the rectangles.
+
+        Returns:
+            Positions of the rectangles, ``None`` if they do not all fit.
+
+        """
+        state = (self.x, self.y, self.shelf_height)
+        positions = []
+        for size in sizes:
+            position = self.place(size)
+            if position is None:
+                self.x, self.y, self.shelf_height = state
+                return None
+            positions.append(position)
+        return positions
+
+
+def pack(
+    sizes: Mapping[str, Tuple[int, int]],
+    sheet_size: int = SHEET_SIZE,
+) -> List[Dict[str, AtlasRect]]:
+    """
+    Pack images in sheets, keeping their groups together.
+
+    A group that does not fit in the current sheet starts a new one,
+    and is only split if it does not fit in an empty sheet. Images
+    bigger than a sheet are left out.
+
+    Parameters:
+        sizes: Size of each image, by file name.
+        sheet_size: Width and maximum height of the sheets.
+
+    Returns:
+        Rectangle of each image, for each sheet.
+
+    """
+    groups: Dict[str, List[str]] = {}
+    for filename in sorted(sizes):
+        width, height = sizes[filename]
+        if width > sheet_size or height > sheet_size:
+            logger.info(f"{filename} is too big for the atlas, left out")
+            continue
+        groups.setdefault(group_name(filename), []).append(filename)
+
+    sheets: List[Dict[str, AtlasRect]] = [{}]
+    packer = ShelfPacker(sheet_size, sheet_size)
+    for filenames in groups.values():
+        # tallest first, so the shelves are filled
+        filenames.sort(key=lambda f: -sizes[f][1])
+        group_sizes = [sizes[f] for f in filenames]
+        positions = packer.place_all(group_sizes)
+        if positions is None and sheets[-1]:
+            packer = ShelfPacker(sheet_size, sheet_size)
+            sheets.append({})
+            positions = packer.place_all(group_sizes)
+        if positions is not None:
+            for filename, (x, y) in zip(filenames, positions):
+                sheets[-1][filename] = (x, y, *sizes[filename])
+            continue
+        # the group is bigger than a sheet
+        for filename in filenames:
+            position = packer.place(sizes[filename])
+            if position is None:
+                packer = ShelfPacker(sheet_size, sheet_size)
+                sheets.append({})
+                position = packer.place(sizes[filename])
+            assert position is not None
+            sheets[-1][filename] = (*position, *sizes[filename])
+    return [sheet for sheet in sheets if sheet]
+
+
+def build_atlas(directory: str, sheet_size: int = SHEET_SIZE) -> int:
+    """
+    Build the atlas of a folder, replacing the previous one.
+
+    Parameters:
+        directory: Folder of the images.
+        sheet_size: Width and maximum height of the sheets.
+
+    Returns:
+        Number of images in the atlas.
+
+    """
+    for filename in os.listdir(directory):
+        if SHEET_PATTERN.match(filename) or filename == ATLAS_INDEX:
+            os.remove(os.path.join(directory, filename))
+
+    images = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".png"):
+            path = os.path.join(directory, filename)
+            images[filename] = pygame.image.load(path)
+    sizes = {name: image.get_size() for name, image in images.items()}
+
+    index: List[Dict[str, object]] = []
+    count = 0
+    for number, frames in enumerate(pack(sizes, sheet_size)):
+        width = max(x + w for x, y, w, h in frames.values())
+        height = max(y + h for x, y, w, h in frames.values())
+        sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+        for filename, (x, y, w, h) in frames.items():
+            image = images[filename]
+            if image.get_flags() & pygame.SRCALPHA:
+                # copies the pixels as is, the sheet is transparent
+                sheet.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                sheet.blit(image, (x, y))
+        sheet_name = f"atlas-{number}.png"
+        pygame.image.save(sheet, os.path.join(directory, sheet_name))
+        index.append({"file": sheet_name, "frames": frames})
+        count += len(frames)
+
+    with open(os.path.join(directory, ATLAS_INDEX), "w") as fp:
+        json.dump({"sheets": index}, fp, indent=1, sort_keys=True)
+    return count
@@ -4,17 +4,25 @@ from __future__ import annotations
 
 import logging
 import os.path
-from typing import Optional, Protocol
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Protocol, Set
 
 import pygame
 from pygame import mixer
 
+from tuxemon import vfs
 from tuxemon.db import db
 from tuxemon.session import local_session
 from tuxemon.tools import transform_resource_filename
 
 logger = logging.getLogger(__name__)
 
+# decoded sounds kept by the sound bank, in bytes
+SOUND_BANK_SIZE = 32 * 1024 * 1024
+# copies of the same sound playing at once
+MAX_INSTANCES = 2
+
 
 class SoundProtocol(Protocol):
     def play(self) -> object:
@@ -26,6 +34,170 @@ class DummySound:
         pass
 
 
+class BankedSound:
+    """
+    Sound shared through the sound bank, played at its own volume.
+
+    The volume is set on the channel playing the sound, so the same
+    decoded sound can be played at different volumes.
+
+    Parameters:
+        sound: Decoded sound.
+        volume: Volume of the sound, between 0 and 1.
+
+    """
+
+    def __init__(self, sound: mixer.Sound, volume: float) -> None:
+        self.sound = sound
+        self.volume = volume
+
+    def play(self) -> Optional[mixer.Channel]:
+        # a sound repeated quickly (cries, hits...) would take every
+        # channel, and cut the other sounds
+        if self.sound.get_num_channels() >= MAX_INSTANCES:
+            return None
+        channel = self.sound.play()
+        if channel is not None:
+            channel.set_volume(self.volume)
+        return channel
+
+
+def _decode_sound(filename: str) -> Optional[mixer.Sound]:
+    try:
+        if os.path.isfile(filename):
+            return mixer.Sound(filename)
+        with vfs.open_file(filename) as fp:
+            return mixer.Sound(file=fp)
+    except MemoryError:
+        # raised on some systems if there is no mixer
+        logger.error("memoryerror, unable to load sound")
+        return None
+    except pygame.error as e:
+        # pick one:
+        # * there is no mixer
+        # * sound has invalid path
+        # * mixer has no output (device ok, no speakers)
+        logger.error(e)
+        logger.error("unable to load sound")
+        return None
+
+
+def _sound_size(sound: mixer.Sound) -> int:
+    init = mixer.get_init()
+    if init is None:
+        return 0
+    frequency, size, channels = init
+    return int(sound.get_length() * frequency) * channels * abs(size) // 8
+
+
+class SoundBank:
+    """
+    Decoded sounds by slug, the least recently used dropped first.
+
+    Sounds can be decoded ahead on a worker thread with ``preload``; a
+    sound still being decoded when it is needed is waited for.
+
+    Parameters:
+        max_size: Size of the decoded sounds kept, in bytes.
+
+    """
+
+    def __init__(self, max_size: int = SOUND_BANK_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._sounds: OrderedDict[str, mixer.Sound] = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._pending: Dict[str, Future[Optional[mixer.Sound]]] = {}
+        self._missing: Set[str] = set()
+        self._loader: Optional[ThreadPoolExecutor] = None
+
+    def _store(self, slug: str, sound: Optional[mixer.Sound]) -> None:
+        if sound is None:
+            self._missing.add(slug)
+            return
+        size = _sound_size(sound)
+        self._sounds[slug] = sound
+        self._sizes[slug] = size
+        self.size += size
+        # the sound just stored is kept, even if it is too big
+        while self.size > self.max_size and len(self._sounds) > 1:
+            dropped, _ = self._sounds.popitem(last=False)
+            self.size -= self._sizes.pop(dropped)
+
+    def get(self, slug: Optional[str]) -> Optional[mixer.Sound]:
+        """
+        Get a decoded sound, decoding it if needed.
+
+        Parameters:
+            slug: Slug of the sound in the db.
+
+        Returns:
+            Decoded sound, or ``None`` if it can't be loaded.
+
+        """
+        if not slug or slug in self._missing:
+            return None
+        sound = self._sounds.get(slug)
+        if sound is not None:
+            self._sounds.move_to_end(slug)
+            return sound
+        future = self._pending.pop(slug, None)
+        if future is not None:
+            sound = future.result()
+        else:
+            filename = get_sound_filename(slug)
+            sound = None if filename is None else _decode_sound(filename)
+        self._store(slug, sound)
+        return sound
+
+    def preload(self, slugs: Iterable[Optional[str]]) -> None:
+        """
+        Decode sounds on a worker thread.
+
+        Parameters:
+            slugs: Slugs of the sounds in the db.
+
+        """
+        for slug in slugs:
+            if (
+                not slug
+                or slug in self._sounds
+                or slug in self._pending
+                or slug in self._missing
+            ):
+                continue
+            filename = get_sound_filename(slug)
+            if filename is None:
+                self._missing.add(slug)
+                continue
+            if self._loader is None:
+                self._loader = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="sound_loader",
+                )
+            self._pending[slug] = self._loader.submit(_decode_sound, filename)
+
+    def clear(self) -> None:
+        """
+        Drop every sound, after the sounds being decoded are done.
+
+        Called each time the db is loaded, as the sounds of a mod may
+        replace the ones known so far.
+
+        """
+        for future in self._pending.values():
+            future.result()
+        self._pending.clear()
+        self._sounds.clear()
+        self._sizes.clear()
+        self._missing.clear()
+        self.size = 0
+
+
+sound_bank = SoundBank()
+db.add_load_callback(sound_bank.clear)
+
+
 def get_sound_filename(slug: Optional[str]) -> Optional[str]:
     """
     Get the filename of a sound slug.
@@ -46,7 +218,7 @@ def get_sound_filename(slug: Optional[str]) -> Optional[str]:
 
     # On some platforms, pygame will silently fail loading
     # a sound if the filename is incorrect so we check here
-    if not os.path.exists(filename):
+    if not vfs.exists(filename):
         logger.error(f"audio file does not exist: {filename}")
         return None
 
@@ -55,7 +227,9 @@ def get_sound_filename(slug: Optional[str]) -> Optional[str]:
 
 def load_sound(slug: Optional[str], value: Optional[float]) -> SoundProtocol:
     """
-    Load a sound from disk, identified by its slug in the db.
+    Load a sound, identified by its slug in the db.
+
+    The sound is decoded once and kept in the sound bank.
 
     Parameters:
         slug: Slug for the file record to load.
@@ -65,9 +239,8 @@ def load_sound(slug: Optional[str], value: Optional[float]) -> SoundProtocol:
         not found.
 
     """
-
-    filename = get_sound_filename(slug)
-    if filename is None:
+    sound = sound_bank.get(slug)
+    if sound is None:
         return DummySound()
     volume: float = 0.3
     if value is None:
@@ -76,19 +249,15 @@ def load_sound(slug: Optional[str], value: Optional[float]) -> SoundProtocol:
             volume = float(player.game_variables["sound_volume"])
     else:
         volume = value
-    try:
-        sound = mixer.Sound(filename)
-        mixer.Sound.set_volume(sound, volume)
-        return sound
-    except MemoryError:
-        # raised on some systems if there is no mixer
-        logger.error("memoryerror, unable to load sound")
-        return DummySound()
-    except pygame.error as e:
-        # pick one:
-        # * there is no mixer
-        # * sound has invalid path
-        # * mixer has no output (device ok, no speakers)
-        logger.error(e)
-        logger.error("unable to load sound")
-        return DummySound()
+    return BankedSound(sound, volume)
+
+
+def preload_sounds(slugs: Iterable[Optional[str]]) -> None:
+    """
+    Decode sounds in the background, before they are played.
+
+    Parameters:
+        slugs: Slugs of the sounds in the db.
+
+    """
+    sound_bank.preload(slugs)
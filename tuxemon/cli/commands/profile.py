@@ -0,0 +1,62 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+from __future__ import annotations
+
+import os
+import time
+
+from tuxemon.cli.clicommand import CLICommand
+from tuxemon.cli.context import InvokeContext
+from tuxemon.cli.exceptions import ParseError
+from tuxemon.cli.parser import parse
+from tuxemon.constants import paths
+from tuxemon.profiler import profiler
+
+
+class ProfileCommand(CLICommand):
+    """
+    Profile the frames of the game.
+
+    """
+
+    name = "profile"
+    description = (
+        "Record a trace of the frames with 'start', write it with "
+        "'stop [filename]', or toggle the frame time graph with 'graph'."
+    )
+    example = "profile stop trace.json"
+
+    def invoke(self, ctx: InvokeContext, line: str) -> None:
+        """
+        Profile the frames of the game.
+
+        Parameters:
+            ctx: Contains references to parts of the game and CLI interface.
+            line: Input text after the command name.
+
+        """
+        args = parse(line)
+        if not args:
+            print("Missing arguments: start, stop [filename] or graph")
+            raise ParseError
+        elif args[0] == "start":
+            profiler.start_trace()
+            print("Recording a trace")
+        elif args[0] == "stop":
+            if not profiler.recording:
+                print("No trace is being recorded")
+                return
+            if len(args) > 1:
+                filename = args[1]
+            else:
+                stamp = time.strftime("%Y%m%d-%H%M%S")
+                filename = os.path.join(
+                    paths.USER_STORAGE_DIR, f"trace-{stamp}.json"
+                )
+            count = profiler.stop_trace(filename)
+            print(f"{count} scopes written to {filename}")
+        elif args[0] == "graph":
+            profiler.set_graph(not profiler.show_graph)
+        else:
+            print(f"Unknown argument: {args[0]}")
+            raise ParseError
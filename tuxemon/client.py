@@ -25,11 +25,14 @@ import pygame as pg
 
 from tuxemon import networking, rumble
 from tuxemon.cli.processor import CommandProcessor
+from tuxemon.clock import Scheduler
 from tuxemon.config import TuxemonConfig
+from tuxemon.constants import paths
 from tuxemon.db import MapType
 from tuxemon.event import EventObject
 from tuxemon.event.eventengine import EventEngine
 from tuxemon.map import TuxemonMap
+from tuxemon.map_renderer import chunk_cache
 from tuxemon.platform.events import PlayerInput
 from tuxemon.platform.platform_pygame.events import (
     PygameEventQueueHandler,
@@ -38,6 +41,7 @@ from tuxemon.platform.platform_pygame.events import (
     PygameMouseInput,
     PygameTouchOverlayInput,
 )
+from tuxemon.profiler import profiler
 from tuxemon.session import local_session
 from tuxemon.state import State, StateManager
 from tuxemon.states.world.worldstate import WorldState
@@ -62,9 +66,17 @@ class LocalPygameClient:
     def __init__(self, config: TuxemonConfig) -> None:
         self.config = config
 
+        # time the game was stepped by, the clock of the timed callbacks
+        self.game_time = 0.0
+        # whether the frames step the game by a fixed time, see main
+        self.fixed_step = False
+
+        # timed callbacks of every state, see State.task
+        self.scheduler = Scheduler(lambda: self.game_time)
         self.state_manager = StateManager(
             "tuxemon.states",
             on_state_change=self.on_state_change,
+            scheduler=self.scheduler,
         )
         self.state_manager.auto_state_discovery()
         self.screen = pg.display.get_surface()
@@ -74,6 +86,15 @@ class LocalPygameClient:
         self.show_fps = config.show_fps
         self.current_time = 0.0
 
+        # timing of the frames, see tuxemon.profiler
+        profiler.set_graph(config.show_profiler)
+        if config.profile_trace:
+            profiler.start_trace()
+
+        # the pre-rendered map chunks, see tuxemon.map_renderer
+        if config.cache_map_chunks:
+            chunk_cache.directory = paths.MAP_CHUNKS
+
         # somehow this value is being patched somewhere
         self.events: Sequence[EventObject] = []
         self.inits: Sequence[EventObject] = []
@@ -319,7 +340,12 @@ class LocalPygameClient:
         frames = 0
 
         while not self.exit:
-            clock_tick = clock() - last_update
+            profiler.begin_frame()
+            if self.fixed_step:
+                # a replay of the inputs will run the same frames
+                clock_tick = frame_length
+            else:
+                clock_tick = clock() - last_update
             last_update = clock()
             time_since_draw += clock_tick
             update(clock_tick)
@@ -328,11 +354,27 @@ class LocalPygameClient:
                 draw(screen)
                 if self.controller_overlay:
                     self.controller_overlay.draw(screen)
-                flip()
+                with profiler.scope("flip"):
+                    flip()
                 frames += 1
+            profiler.end_frame()
 
             fps_timer, frames = self.handle_fps(clock_tick, fps_timer, frames)
-            time.sleep(0.01)
+
+            # sleep until the next frame, or the next task if it is sooner
+            if self.fixed_step:
+                # every loop is a frame
+                idle_time = last_update + frame_length - clock()
+            else:
+                idle_time = frame_length - time_since_draw
+                next_task = self.scheduler.get_idle_time()
+                if next_task is not None:
+                    idle_time = min(idle_time, next_task)
+            if idle_time > 0:
+                time.sleep(idle_time)
+
+        if self.config.profile_trace and profiler.recording:
+            profiler.stop_trace(self.config.profile_trace)
 
     def update(self, time_delta: float) -> None:
         """
@@ -347,18 +389,22 @@ class LocalPygameClient:
             time_delta: Elapsed time since last frame.
 
         """
+        self.game_time += time_delta
+
         # Update our networking
-        if self.client.listening:
-            self.client.update(time_delta)
-            self.add_clients_to_map(self.client.client.registry)
-        if self.server.listening:
-            self.server.update()
+        with profiler.scope("networking"):
+            if self.client.listening:
+                self.client.update(time_delta)
+                self.add_clients_to_map(self.client.client.registry)
+            if self.server.listening:
+                self.server.update()
 
-        # get all the input waiting for use
-        events = self.input_manager.process_events()
+        with profiler.scope("input"):
+            # get all the input waiting for use
+            events = self.input_manager.process_events()
 
-        # process the events and collect the unused ones
-        key_events = list(self.process_events(events))
+            # process the events and collect the unused ones
+            key_events = list(self.process_events(events))
 
         # TODO: phase this out in favor of event-dispatch
         self.key_events = key_events
@@ -367,11 +413,16 @@ class LocalPygameClient:
         # are met and run an action associated with that condition.
         self.event_data = {}
 
-        self.event_engine.update(time_delta)
+        with profiler.scope("event engine"):
+            self.event_engine.update(time_delta)
 
         if self.event_data:
             logger.debug("Event Data:" + str(self.event_data))
 
+        # Call the tasks whose time has come
+        with profiler.scope("scheduler"):
+            self.scheduler.tick()
+
         # Update the game engine
         self.update_states(time_delta)
 
@@ -429,11 +480,15 @@ class LocalPygameClient:
 
         # draw from bottom up for proper layering
         for state in reversed(to_draw):
-            state.draw(surface)
+            with profiler.scope(state.name, "draw"):
+                state.draw(surface)
 
         if self.config.collision_map:
             self.draw_event_debug()
 
+        if profiler.show_graph:
+            profiler.draw(surface, 1.0 / self.fps)
+
         if self.save_to_disk:
             filename = "snapshot%05d.tga" % self.frame_number
             self.frame_number += 1
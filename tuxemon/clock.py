@@ -1,9 +1,12 @@
 # SPDX-License-Identifier: GPL-3.0
 # Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+from __future__ import annotations
+
 import collections
+import itertools
 import time
-from heapq import heapify, heappop, heappush, heappushpop
-from typing import Any, Callable, Deque, List, Optional, Union
+from heapq import heapify, heappop, heappush
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
 
 __all__ = ("ScheduledItem", "Scheduler", "Clock")
 
@@ -17,25 +20,56 @@ class ScheduledItem:
     If you hold on to instance of this class, do not modify any values of it.
     """
 
-    __slots__ = ["func", "interval", "last_ts", "next_ts"]
+    __slots__ = [
+        "func",
+        "interval",
+        "repeat",
+        "last_ts",
+        "next_ts",
+        "owner",
+        "order",
+        "cancelled",
+    ]
 
     def __init__(
-        self, func: Any, last_ts: float, next_ts: float, interval: float
+        self,
+        func: Any,
+        last_ts: float,
+        next_ts: float,
+        interval: float,
+        repeat: bool = False,
+        owner: Any = None,
+        order: int = 0,
     ) -> None:
         self.func = func
         self.interval = interval
+        self.repeat = repeat
         self.last_ts = last_ts
         self.next_ts = next_ts
+        self.owner = owner
+        self.order = order
+        self.cancelled = False
 
-    def __lt__(self, other: Any) -> Any:
-        try:
-            return self.next_ts < other.next_ts
-        except AttributeError:
-            return self.next_ts < other
+    def __lt__(self, other: ScheduledItem) -> bool:
+        # items due at the same time are called in scheduling order
+        if self.next_ts == other.next_ts:
+            return self.order < other.order
+        return self.next_ts < other.next_ts
 
 
 class Scheduler:
-    """Class for scheduling functions."""
+    """
+    Class for scheduling functions.
+
+    Items are kept in a heap ordered by deadline, so scheduling is
+    O(log n). Unscheduling marks the items as cancelled, they are
+    dropped when they reach the top of the heap (or when cancelled
+    items make up most of it).
+
+    Items can have an owner: ``unschedule_owner`` cancels all the items
+    of an owner at once, like the timers of a state being removed.
+
+    """
 
     def __init__(self, time_function: Callable[[], float] = time.perf_counter):
         """Initialise a Clock, with optional custom time function.
@@ -49,59 +83,30 @@ class Scheduler:
         self._last_ts: float = -1
         self._times: Deque[int] = collections.deque(maxlen=10)
         self._scheduled_items: List[ScheduledItem] = []
-        self._next_tick_items: List[ScheduledItem] = []
+        self._by_func: Dict[Any, Set[ScheduledItem]] = {}
+        self._by_owner: Dict[Any, Set[ScheduledItem]] = {}
+        self._cancelled = 0
+        self._order = itertools.count()
         self.cumulative_time = 0.0
 
-    def _get_nearest_ts(self) -> Union[float, int]:
-        """Schedule from now, unless now is sufficiently close to last_ts, in
-        which case use last_ts.  This clusters together scheduled items that
-        probably want to be scheduled together.
+    def _get_nearest_ts(self) -> float:
         """
-        last_ts = self._last_ts
-        ts = self._time()
-        if ts - last_ts > 0.2:
-            last_ts = ts
-        return last_ts
-
-    def _get_soft_next_ts(self, last_ts: float, interval: float) -> float:
-        def taken(ts: float, e: float) -> bool:
-            """Return True if the given time has already got an item
-            scheduled nearby.
-            """
-            for item in self._scheduled_items:
-                if item.next_ts is None:
-                    continue
-                elif abs(item.next_ts - ts) <= e:
-                    return True
-                elif item.next_ts > ts + e:
-                    return False
-            return False
-
-        next_ts = last_ts + interval
-        if not taken(next_ts, interval / 4):
-            return next_ts
-
-        dt = interval
-        divs = 1
-        while True:
-            next_ts = last_ts
-            for i in range(divs - 1):
-                next_ts += dt
-                if not taken(next_ts, dt / 4.0):
-                    return next_ts
-            dt /= 2
-            divs *= 2
-
-            # Avoid infinite loop in pathological case
-            if divs > 16:
-                return next_ts
+        Time from which to schedule.
+
+        This is the time of the last tick: the callbacks scheduled
+        between two ticks are called from the same point in time, like
+        the tasks updated on each frame.
+        """
+        if self._last_ts < 0:
+            return self._time()
+        return self._last_ts
 
     def schedule(
         self,
         func: Any,
         delay: float = 0.0,
         repeat: bool = False,
-        soft: bool = False,
+        owner: Any = None,
     ) -> ScheduledItem:
         """
         Schedule a function to be run sometime in the future.
@@ -113,15 +118,8 @@ class Scheduler:
             def callback(dt):
                 pass
 
-
-        Limitations
-        ===========
-
-        There is a hard limit of 10 items that can be scheduled on
-        next tick.  This limit reduces the power and performance
-        impact of the clock on mobile and battery operated computers.
-
-        A runtime error will be raised if the maximum is reached.
+        A function scheduled with no delay is called on the next tick,
+        even when it is scheduled by a callback of the current tick.
 
 
         Unscheduling
@@ -130,45 +128,30 @@ class Scheduler:
         If callback returns False (not None), then it will not be
         scheduled again.
 
-
-        Soft Scheduling
-        ===============
-
-        This is useful for functions that need to be called regularly,
-        but not relative to the initial start time.
-        for example: events which need to occur regularly -- if all audio
-        updates are scheduled at the same time
-        (for example, mixing several tracks of a music score, or playing
-        multiple videos back simultaneously), the resulting load on the
-        CPU is excessive for those intervals but idle outside.  Using
-        the soft interval scheduling, the load is more evenly distributed.
-
         Parameters:
             func: Function to be called
             delay: Delay in time unit until it is called
             repeat: Function will be repeated every 'delay' units
-            soft: See notes about Soft Scheduling
+            owner: Object owning the item, see ``unschedule_owner``
 
         Returns:
             Reference to scheduled item
 
         """
         last_ts = self._get_nearest_ts()
-        if soft:
-            assert delay > 0.0
-            next_ts = self._get_soft_next_ts(last_ts, delay)
-            last_ts = next_ts - delay
-        next_ts = last_ts + delay
-
-        interval = delay if repeat else 0.0
-
-        item = ScheduledItem(func, last_ts, next_ts, interval)
-        if next_ts == 0.0:
-            self._next_tick_items.append(item)
-            if len(self._next_tick_items) > 10:
-                raise RuntimeError
-        else:
-            heappush(self._scheduled_items, item)
+        item = ScheduledItem(
+            func,
+            last_ts,
+            last_ts + delay,
+            delay,
+            repeat,
+            owner,
+            next(self._order),
+        )
+        heappush(self._scheduled_items, item)
+        self._by_func.setdefault(func, set()).add(item)
+        if owner is not None:
+            self._by_owner.setdefault(owner, set()).add(item)
         return item
 
     def tick(self) -> float:
@@ -243,87 +226,37 @@ class Scheduler:
         """
         scheduled_items = self._scheduled_items
         now = self._last_ts
-        result = False
-
-        # handle items scheduled for next tick
-        if self._next_tick_items:
-            result = True
-            for item in list(self._next_tick_items):
-                retval = item.func(dt)
-                # do not change the following line to "if not retval"!
-                # some items will return None, but False is a special value
-                if retval == False:
-                    self._next_tick_items.remove(item)
-
-        # check the next scheduled item that is not called each tick
-        # if it is scheduled in the future, then exit
-        try:
-            item = scheduled_items[0]
-            if item.next_ts > now:
-                return result
-        except IndexError:
-            return result
-
-        # we have at least one item that is due to be called
-        result = True
-        get_soft_next_ts = self._get_soft_next_ts
-
-        # wherever this value is true the current item will be pushed
-        # into the heap.  it essentially means that the current
-        # scheduled item is important and needs stay scheduled.
-        replace = False
-
-        while scheduled_items:
-            # get the next item to be called
-            head = scheduled_items[0]
-
-            # if next item is scheduled in the future then exit while
-            # taking care of the heap
-            if head.next_ts > now:
-                if replace:
-                    heappush(scheduled_items, item)
-                replace = False
-                break
-
-            # the scheduler will hold onto a reference to an item in
-            # case it needs to be rescheduled.  it is more efficient
-            # to push and pop the heap in one call than to make two
-            # calls.
-            if replace:
-                item = heappushpop(scheduled_items, item)
+
+        # take every due item first, so the items rescheduled or
+        # scheduled by the callbacks wait for the next tick
+        due = []
+        while scheduled_items and scheduled_items[0].next_ts <= now:
+            item = heappop(scheduled_items)
+            if item.cancelled:
+                self._cancelled -= 1
             else:
-                item = heappop(scheduled_items)
+                due.append(item)
 
-            # call the function associated with the scheduled item
+        for item in due:
+            # an earlier callback may have unscheduled this one
+            if item.cancelled:
+                continue
             retval = item.func(now - item.last_ts)
+            if item.cancelled:
+                continue
 
-            if item.interval:
-                # callbacks can unschedule themselves by returning false
-                replace = not retval == False
-                item.next_ts = item.last_ts + item.interval
+            # do not change the following line to "if not retval"!
+            # some items will return None, but False is a special value
+            if item.repeat and retval != False:
                 item.last_ts = now
-
-                # the execution time of this item has already passed
-                # so it must be rescheduled
-                if item.next_ts <= now:
-                    if now - item.next_ts < 0.05:
-                        item.next_ts = now + item.interval
-                    else:
-                        # missed by significant amount, do a soft reschedule
-                        # to avoid lumping everything together
-                        # in this case, the next dt will not be accurate
-                        item.next_ts = get_soft_next_ts(now, item.interval)
-                        item.last_ts = item.next_ts - item.interval
+                item.next_ts += item.interval
+                if item.next_ts < now:
+                    item.next_ts = now + item.interval
+                heappush(scheduled_items, item)
             else:
-                # replace is False, so this item will not be rescheduled
-                replace = False
-
-        # it is possible that the loop exited while an important item
-        # was waiting to be pushed into the heap.
-        if replace:
-            heappush(scheduled_items, item)
+                self._forget(item)
 
-        return result
+        return bool(due)
 
     def get_idle_time(self) -> Optional[float]:
         """
@@ -333,11 +266,13 @@ class Scheduler:
             Time until the next scheduled event in time units, or ``None``
             if there is no event scheduled.
         """
-        if self._next_tick_items:
-            return 0.0
+        scheduled_items = self._scheduled_items
+        while scheduled_items and scheduled_items[0].cancelled:
+            heappop(scheduled_items)
+            self._cancelled -= 1
 
         try:
-            next_ts = self._scheduled_items[0].next_ts
+            next_ts = scheduled_items[0].next_ts
             return max(next_ts - self._time(), 0.0)
         except IndexError:
             return None
@@ -353,19 +288,66 @@ class Scheduler:
             func: The function to remove from the schedule.
 
         """
+        for item in list(self._by_func.get(func, ())):
+            self.unschedule_item(item)
+
+    def unschedule_owner(self, owner: Any) -> None:
+        """
+        Remove all the items of an owner from the schedule.
+
+        Parameters:
+            owner: Owner given when scheduling the items.
+
+        """
+        for item in list(self._by_owner.get(owner, ())):
+            self.unschedule_item(item)
+
+    def unschedule_item(self, item: ScheduledItem) -> None:
+        """
+        Remove a scheduled item.
 
-        def remove(list_: List[ScheduledItem]) -> bool:
-            resort = False
-            remove_ = list_.remove
-            for i in list(i for i in list_ if i.func is func):
-                remove_(i)
-                resort = True
-            return resort
-
-        remove(self._next_tick_items)
-        if remove(self._scheduled_items):
-            # this will restructure the heap
+        Parameters:
+            item: Item returned by ``schedule``.
+
+        """
+        if item.cancelled:
+            return
+        item.cancelled = True
+        self._forget(item)
+        self._cancelled += 1
+        # drops the cancelled items once they are most of the heap
+        if self._cancelled > 16 and self._cancelled * 2 > len(
+            self._scheduled_items
+        ):
+            self._scheduled_items = [
+                i for i in self._scheduled_items if not i.cancelled
+            ]
             heapify(self._scheduled_items)
+            self._cancelled = 0
+
+    def is_scheduled(self, owner: Any) -> bool:
+        """
+        Whether an owner has items in the schedule.
+
+        Parameters:
+            owner: Owner given when scheduling the items.
+
+        Returns:
+            ``True`` if some items of the owner are still scheduled.
+
+        """
+        return owner in self._by_owner
+
+    def _forget(self, item: ScheduledItem) -> None:
+        for index, key in (
+            (self._by_func, item.func),
+            (self._by_owner, item.owner),
+        ):
+            items = index.get(key)
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    del index[key]
 
 
 class Clock(Scheduler):
@@ -12,13 +12,23 @@ from __future__ import annotations
 
 import logging
 import random
-from typing import TYPE_CHECKING, Generator, List, Sequence, Union
+from typing import (
+    TYPE_CHECKING,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from tuxemon.db import PlagueType
 from tuxemon.locale import T
 from tuxemon.technique.technique import Technique
 
 if TYPE_CHECKING:
+    from tuxemon.item.item import Item
     from tuxemon.monster import Monster
     from tuxemon.npc import NPC
     from tuxemon.player import Player
@@ -26,6 +36,23 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger()
 
+# TODO: move to mod config
+SORT_ORDER = [
+    "meta",
+    "item",
+    "utility",
+    "potion",
+    "food",
+    "heal",
+    "damage",
+]
+
+
+class EnqueuedAction(NamedTuple):
+    user: Union[Monster, NPC, None]
+    technique: Union[Technique, Item, None]
+    target: Monster
+
 
 def check_battle_legal(player: Player) -> bool:
     """
@@ -158,6 +185,115 @@ def has_status_bond(monster: Monster) -> bool:
         return False
 
 
+def rank_action(action: EnqueuedAction) -> Tuple[int, int]:
+    """
+    Sort key of an action in the action queue.
+
+    * Swap actions are always first
+    * Techniques that damage are sorted by monster speed
+    * Items are sorted by trainer speed
+
+    Parameters:
+        action: The enqueued action.
+
+    Returns:
+        Primary and secondary order of the action.
+
+    """
+    if action.technique is None:
+        return 0, 0
+    sort = action.technique.sort
+    primary_order = SORT_ORDER.index(sort)
+
+    if sort == "meta":
+        # all meta items sorted together
+        # use of 0 leads to undefined sort/probably random
+        return primary_order, 0
+    elif sort == "potion":
+        return primary_order, 0
+    else:
+        # TODO: determine the secondary sort element,
+        # monster speed, trainer speed, etc
+        assert action.user
+        return primary_order, action.user.speed_test(action)
+
+
+def status_response(
+    monster: Monster,
+    technique: Technique,
+) -> Optional[str]:
+    """
+    Checks the technique used and its status response.
+
+    Removes the status of the monster or replaces it with the next
+    one (eg. charging -> charged up -> exhausted -> tired).
+
+    Parameters:
+        monster: The monster using the technique.
+        technique: The technique used.
+
+    Returns:
+        The slug of the status which ended or changed, ``None`` if the
+        status of the monster did not change.
+
+    """
+    # removes enraged
+    if has_status(monster, "status_enraged") and not has_effect_param(
+        technique, "status_enraged", "give", "condition"
+    ):
+        monster.status.clear()
+        return "status_enraged"
+    # removes sniping
+    if has_status(monster, "status_sniping") and not has_effect_param(
+        technique, "status_sniping", "give", "condition"
+    ):
+        monster.status.clear()
+        return "status_sniping"
+    # removes dozing
+    if has_status(monster, "status_dozing"):
+        monster.status.clear()
+        return "status_dozing"
+    # removes tired
+    if has_status(monster, "status_tired"):
+        monster.status.clear()
+        return "status_tired"
+    # change exhausted -> tired
+    if has_status(monster, "status_exhausted") and not has_effect_param(
+        technique, "status_exhausted", "give", "condition"
+    ):
+        replace_status(monster, "status_tired")
+        return "status_exhausted"
+    # change charging -> charged up
+    if has_status(monster, "status_charging") and not has_effect_param(
+        technique, "status_charging", "give", "condition"
+    ):
+        replace_status(monster, "status_chargedup")
+        return "status_charging"
+    # change charged up -> exhausted
+    if has_status(monster, "status_chargedup") and not has_effect_param(
+        technique, "status_chargedup", "give", "condition"
+    ):
+        replace_status(monster, "status_exhausted")
+        return "status_chargedup"
+    # change nodding off -> dozing
+    if has_status(monster, "status_noddingoff") and not has_effect_param(
+        technique, "status_noddingoff", "give", "condition"
+    ):
+        replace_status(monster, "status_dozing")
+        return "status_noddingoff"
+    return None
+
+
+def replace_status(monster: Monster, status_name: str) -> None:
+    """
+    Replaces the current status of the monster.
+    """
+    monster.status.clear()
+    status = Technique()
+    status.load(status_name)
+    monster.apply_status(status)
+
+
 def fainted(monster: Monster) -> bool:
     return has_status(monster, "status_faint") or monster.current_hp <= 0
 
@@ -36,8 +36,10 @@ class TuxemonConfig:
         self.fullscreen = cfg.getboolean("display", "fullscreen")
         self.fps = cfg.getfloat("display", "fps")
         self.show_fps = cfg.getboolean("display", "show_fps")
+        self.show_profiler = cfg.getboolean("display", "show_profiler")
         self.scaling = cfg.getboolean("display", "scaling")
         self.collision_map = cfg.getboolean("display", "collision_map")
+        self.cache_map_chunks = cfg.getboolean("display", "cache_map_chunks")
         self.large_gui = cfg.getboolean("display", "large_gui")
         self.controller_overlay = cfg.getboolean(
             "display",
@@ -67,6 +69,10 @@ class TuxemonConfig:
         self.compress_save: Optional[str] = cfg.get("game", "compress_save")
         if self.compress_save == "None":
             self.compress_save = None
+        # trace of the frames written when the game quits
+        self.profile_trace: Optional[str] = cfg.get("game", "profile_trace")
+        if self.profile_trace == "None":
+            self.profile_trace = None
 
         # [gameplay]
         self.items_consumed_on_failure = cfg.getboolean(
@@ -94,6 +100,11 @@ class TuxemonConfig:
             "dialog_speed",
         )
         assert self.dialog_speed in ("slow", "max")
+        self.ai_difficulty = cfg.get(
+            "gameplay",
+            "ai_difficulty",
+        )
+        assert self.ai_difficulty in ("easy", "normal", "hard")
 
         # [player]
         self.player_animation_speed = cfg.getfloat("player", "animation_speed")
@@ -204,8 +215,10 @@ def get_defaults() -> Mapping[str, Any]:
                         ("fullscreen", "False"),
                         ("fps", "60"),
                         ("show_fps", "False"),
+                        ("show_profiler", "False"),
                         ("scaling", "True"),
                         ("collision_map", "False"),
+                        ("cache_map_chunks", "False"),
                         ("large_gui", "False"),
                         ("controller_overlay", "False"),
                         ("controller_transparency", "45"),
@@ -224,8 +237,9 @@ def get_defaults() -> Mapping[str, Any]:
                         ("net_controller_enabled", "False"),
                         ("locale", "en_US"),
                         ("dev_tools", "False"),
-                        ("recompile_translations", "True"),
+                        ("recompile_translations", "False"),
                         ("compress_save", "None"),
+                        ("profile_trace", "None"),
                     )
                 ),
             ),
@@ -239,6 +253,7 @@ def get_defaults() -> Mapping[str, Any]:
                         ("default_upper_monster_catch_resistance", "1"),
                         ("default_lower_monster_catch_resistance", "1"),
                         ("dialog_speed", "slow"),
+                        ("ai_difficulty", "easy"),
                     )
                 ),
             ),
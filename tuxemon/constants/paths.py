@@ -43,6 +43,9 @@ logger.debug("cache: %s", CACHE_DIR)
 L18N_MO_FILES = os.path.join(CACHE_DIR, "l18n")
 logger.debug("l18: %s", L18N_MO_FILES)
 
+# pre-rendered map chunks
+MAP_CHUNKS = os.path.join(CACHE_DIR, "map_chunks")
+
 # mods
 mods_folder = os.path.normpath(os.path.join(LIBDIR, "..", "mods"))
 logger.debug("mods: %s", mods_folder)
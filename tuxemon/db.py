@@ -11,6 +11,7 @@ from enum import Enum
 from operator import itemgetter
 from typing import (
     Any,
+    Callable,
     Dict,
     List,
     Literal,
@@ -30,13 +31,12 @@ from pydantic import (
 )
 from typing_extensions import Annotated
 
-from tuxemon import prepare
+from tuxemon import prepare, vfs
 from tuxemon.locale import T
 
 logger = logging.getLogger(__name__)
 
 # Load the default translator for data validation
-T.collect_languages(False)
 T.load_translator()
 
 # Target is a mapping of who this targets
@@ -880,6 +880,7 @@ class JSONDatabase:
         self.preloaded: Dict[TableName, Dict[str, Any]] = {}
         self.database: Dict[TableName, Dict[str, Any]] = {}
         self.path = ""
+        self._load_callbacks: List[Callable[[], None]] = []
         for table in self._tables:
             self.preloaded[table] = {}
             self.database[table] = {}
@@ -924,7 +925,22 @@ class JSONDatabase:
         for table, entries in self.preloaded.items():
             for slug, item in entries.items():
                 self.load_model(item, table, validate)
-        self.preloaded.clear()
+            entries.clear()
+        for callback in self._load_callbacks:
+            callback()
+
+    def add_load_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Call a function each time data is loaded.
+
+        Modules keeping objects built from the data use it to forget
+        them when the data changes, like when a mod is switched.
+
+        Parameters:
+            callback: Function called after each load.
+
+        """
+        self._load_callbacks.append(callback)
 
     def load_json(self, directory: TableName, validate: bool = False) -> None:
         """
@@ -936,13 +952,14 @@ class JSONDatabase:
                 fails
 
         """
-        for json_item in os.listdir(os.path.join(self.path, directory)):
+        for json_item in vfs.listdir(os.path.join(self.path, directory)):
             # Only load .json files.
             if not json_item.endswith(".json"):
                 continue
 
             # Load our json as a dictionary.
-            with open(os.path.join(self.path, directory, json_item)) as fp:
+            path = os.path.join(self.path, directory, json_item)
+            with vfs.open_file(path) as fp:
                 try:
                     item = json.load(fp)
                 except ValueError:
@@ -1227,7 +1244,7 @@ class Validator:
 
         try:
             path = prepare.fetch(file)
-            return os.path.exists(path)
+            return vfs.exists(path)
         except OSError:
             return False
 
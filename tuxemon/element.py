@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import logging
-from typing import Union
+from typing import Dict, Mapping, Optional, Sequence, Set, Union
 
-from tuxemon.db import ElementType, db
+from tuxemon.db import ElementModel, ElementType, db
 
 logger = logging.getLogger(__name__)
 
+# position of each element in the rows and columns of the chart
+ELEMENT_INDEX = {ele: i for i, ele in enumerate(ElementType)}
+AETHER = ELEMENT_INDEX[ElementType.aether]
+
 
 class Element:
     """An Element holds a list of types and multipliers."""
@@ -16,6 +20,7 @@ class Element:
     def __init__(self, slug: Union[str, None] = None) -> None:
         self.name: str = ""
         self.icon: str = ""
+        self.index = 0
         if slug:
             self.load(slug)
 
@@ -28,6 +33,7 @@ class Element:
         self.name = results.slug.name
         self.types = results.types
         self.icon = results.icon
+        self.index = ELEMENT_INDEX[self.slug]
 
     def lookup_field(
         self, element: ElementType, field: str
@@ -41,12 +47,141 @@ class Element:
 
     def lookup_multiplier(self, element: ElementType) -> float:
         """Looks up the element multiplier for this element."""
-        mult = self.lookup_field(element, "multiplier")
-
-        if mult is None:
-            mult = 1.0
-            logger.error(
-                f"Multiplier for element '{element}' not found in "
-                f"this element '{self.slug}'"
-            )
-        return mult
+        return element_chart.multiplier(self.index, ELEMENT_INDEX[element])
+
+
+class ElementChart:
+    """
+    Multipliers of every element against every other element.
+
+    The chart is built once from the element table, as a dense matrix
+    indexed by the position of each ElementType (``Element.index``), so
+    a multiplier is two index lookups.
+
+    """
+
+    def __init__(self) -> None:
+        self._matrix: Sequence[Sequence[float]] = []
+
+    def clear(self) -> None:
+        """Forget the chart, so it is built again when next used."""
+        self._matrix = []
+
+    def load(
+        self,
+        elements: Optional[Mapping[str, ElementModel]] = None,
+    ) -> None:
+        """
+        Build the chart.
+
+        Parameters:
+            elements: Element models to build the chart from. Defaults to
+                the element table of the database.
+
+        """
+        if elements is None:
+            elements = db.database["element"]
+        size = len(ELEMENT_INDEX)
+        matrix = [[1.0] * size for _ in range(size)]
+        for attack, row in ELEMENT_INDEX.items():
+            found: Set[ElementType] = set()
+            model = elements.get(attack)
+            for item in model.types if model else []:
+                # the first entry wins, like Element.lookup_field
+                if item.against not in found:
+                    found.add(item.against)
+                    column = ELEMENT_INDEX[item.against]
+                    matrix[row][column] = item.multiplier
+            for target in ELEMENT_INDEX:
+                if target not in found:
+                    logger.error(
+                        f"Multiplier for element '{target}' not found in "
+                        f"this element '{attack}'"
+                    )
+        self._matrix = [tuple(row) for row in matrix]
+
+    def multiplier(self, attack: int, target: int) -> float:
+        """
+        Multiplier of an element against another.
+
+        Parameters:
+            attack: Index of the element of the attack.
+            target: Index of the element of the target.
+
+        Returns:
+            The multiplier.
+
+        """
+        if not self._matrix:
+            self.load()
+        return self._matrix[attack][target]
+
+    def damage_multiplier(
+        self,
+        attack_types: Sequence[Element],
+        target_types: Sequence[Element],
+    ) -> float:
+        """
+        Damage multiplier of a technique against a monster.
+
+        Aether is neutral. When several pairs of types apply, the last
+        one is used; the result is clamped between 0.25 and 4.
+
+        Parameters:
+            attack_types: The types of the technique.
+            target_types: The types of the target.
+
+        Returns:
+            The attack multiplier.
+
+        """
+        if not self._matrix:
+            self.load()
+        m = 1.0
+        for attack in attack_types:
+            if attack.index == AETHER:
+                continue
+            row = self._matrix[attack.index]
+            for target in target_types:
+                if target and target.index != AETHER:
+                    m = row[target.index]
+        if m > 4.0:
+            return 4.0
+        if m < 0.25:
+            return 0.25
+        return m
+
+
+element_chart = ElementChart()
+_elements: Dict[str, Element] = {}
+
+
+def get_element(slug: str) -> Element:
+    """
+    Return the shared Element of a slug.
+
+    Elements are never modified once loaded, so one instance per slug
+    is shared by every monster and technique.
+
+    Parameters:
+        slug: Slug of the element.
+
+    Returns:
+        The element.
+
+    """
+    try:
+        return _elements[slug]
+    except KeyError:
+        element = Element(slug)
+        _elements[slug] = element
+        return element
+
+
+def clear_elements() -> None:
+    """Forget the shared elements and the chart, as the db was reloaded."""
+    element_chart.clear()
+    _elements.clear()
+
+
+db.add_load_callback(clear_elements)
@@ -71,3 +71,4 @@ class ChangeTasteAction(EventAction):
             monster.set_stats()
         else:
             raise ValueError(f"{self.taste} must be warm or cold")
+        trainer.monster_registry.update(monster)
@@ -48,16 +48,13 @@ class ClearKennelAction(EventAction):
             )
         else:
             if kennel in player.monster_boxes:
-                monsters_kennel = player.monster_boxes[kennel]
-                if transfer is None:
-                    player.monster_boxes.pop(kennel)
-                else:
-                    if transfer in player.monster_boxes:
-                        for mon in monsters_kennel:
-                            player.monster_boxes[transfer].append(mon)
-                            player.monster_boxes.pop(kennel)
-                    else:
-                        player.monster_boxes[transfer] = monsters_kennel
-                        player.monster_boxes.pop(kennel)
+                if transfer is not None:
+                    player.monster_boxes.setdefault(transfer, [])
+                monsters_kennel = list(player.monster_boxes[kennel])
+                for mon in monsters_kennel:
+                    player.remove_monster_from_storage(mon)
+                    if transfer is not None:
+                        player.add_monster_to_storage(mon, transfer)
+                player.monster_boxes.pop(kennel)
             else:
                 return
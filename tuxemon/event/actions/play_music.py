@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass
 from typing import Union, final
 
-from tuxemon import prepare
+from tuxemon import prepare, vfs
 from tuxemon.db import db
 from tuxemon.event.eventaction import EventAction
 from tuxemon.platform import mixer
@@ -57,7 +58,11 @@ class PlayMusicAction(EventAction):
             path = prepare.fetch(
                 "music", db.lookup_file("music", self.filename)
             )
-            mixer.music.load(path)
+            if os.path.isfile(path):
+                mixer.music.load(path)
+            else:
+                # streamed from the mod archive, the name gives the format
+                mixer.music.load(vfs.open_file(path), path)
             mixer.music.set_volume(volume)
             mixer.music.play(-1)
         except Exception as e:
@@ -48,21 +48,21 @@ class QuarantineAction(EventAction):
                 if ele.plague == PlagueType.infected
             ]
             for ele in infected:
-                player.monster_boxes["quarantine"].append(ele)
                 player.remove_monster(ele)
+                player.add_monster_to_storage(ele, "quarantine")
         elif self.value == "out":
             box = [mon for mon in player.monster_boxes["quarantine"]]
             # empty the box
             if self.amount is None or self.amount >= len(box):
                 for ele in box:
                     ele.plague = PlagueType.inoculated
+                    player.remove_monster_from_storage(ele)
                     player.add_monster(ele, len(player.monsters))
-                    player.monster_boxes["quarantine"].remove(ele)
             else:
                 sample = random.sample(box, self.amount)
                 for sam in sample:
                     sam.plague = PlagueType.inoculated
+                    player.remove_monster_from_storage(sam)
                     player.add_monster(sam, len(player.monsters))
-                    player.monster_boxes["quarantine"].remove(sam)
         else:
             raise ValueError(f"{self.value} must be in or out")
@@ -56,5 +56,5 @@ class StoreMonsterAction(EventAction):
             else:
                 store = box
 
-        player.monster_boxes[store].append(monster)
         player.remove_monster(monster)
+        player.add_monster_to_storage(monster, store)
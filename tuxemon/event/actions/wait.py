@@ -2,7 +2,6 @@
 # Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
 from __future__ import annotations
 
-import time
 from dataclasses import dataclass
 from typing import final
 
@@ -28,10 +27,10 @@ class WaitAction(EventAction):
     name = "wait"
     seconds: float
 
-    # TODO: use event loop time, not wall clock
     def start(self) -> None:
-        self.finish_time = time.time() + self.seconds
+        # the time of the game, so a replay of the inputs waits as long
+        self.finish_time = self.session.client.game_time + self.seconds
 
     def update(self) -> None:
-        if time.time() >= self.finish_time:
+        if self.session.client.game_time >= self.finish_time:
             self.stop()
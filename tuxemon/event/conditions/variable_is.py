@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import operator
+from typing import Callable, Mapping
 
 from tuxemon.event import MapCondition
 from tuxemon.event.eventcondition import EventCondition
@@ -11,6 +13,15 @@ from tuxemon.tools import number_or_variable
 
 logger = logging.getLogger(__name__)
 
+OPERATIONS: Mapping[str, Callable[[float, float], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
 
 class VariableIsCondition(EventCondition):
     """
@@ -49,17 +60,7 @@ class VariableIsCondition(EventCondition):
         operand2 = number_or_variable(session, condition.parameters[2])
 
         # Check if the condition is true
-        if operation == "==":
-            return operand1 == operand2
-        elif operation == "!=":
-            return operand1 != operand2
-        elif operation == ">":
-            return operand1 > operand2
-        elif operation == ">=":
-            return operand1 >= operand2
-        elif operation == "<":
-            return operand1 < operand2
-        elif operation == "<=":
-            return operand1 <= operand2
-        else:
+        try:
+            return OPERATIONS[operation](operand1, operand2)
+        except KeyError:
             raise ValueError(f"invalid operation type {operation}")
@@ -31,29 +31,19 @@ def simple_damage_multiplier(
         The attack multiplier.
 
     """
-    m = 1.0
-    for attack_type in attack_types:
-        for target_type in target_types:
-            if target_type:
-                if (
-                    attack_type.slug == "aether"
-                    or target_type.slug == "aether"
-                ):
-                    continue
-                m = attack_type.lookup_multiplier(target_type.slug)
-
-    m = min(4, m)
-    m = max(0.25, m)
-    return m
+    # imported here, since tuxemon.locale imports this module
+    from tuxemon.element import element_chart
 
+    return element_chart.damage_multiplier(attack_types, target_types)
 
-def simple_damage_calculate(
+
+def simple_damage_stats(
     technique: Technique,
     user: Monster,
     target: Monster,
-) -> Tuple[int, float]:
+) -> Tuple[int, int]:
     """
-    Calculates the damage of a technique based on stats and multiplier.
+    Strength of the user and resistance of the target for a technique.
 
     Parameters:
         technique: The technique to calculate for.
@@ -61,7 +51,7 @@ def simple_damage_calculate(
         target: The one the technique is being used on.
 
     Returns:
-        A tuple (damage, multiplier).
+        A tuple (user_strength, target_resist).
 
     """
     if technique.range == "melee":
@@ -84,7 +74,27 @@ def simple_damage_calculate(
             "unhandled damage category %s",
             technique.range,
         )
+    return user_strength, target_resist
+
 
+def simple_damage_calculate(
+    technique: Technique,
+    user: Monster,
+    target: Monster,
+) -> Tuple[int, float]:
+    """
+    Calculates the damage of a technique based on stats and multiplier.
+
+    Parameters:
+        technique: The technique to calculate for.
+        user: The user of the technique.
+        target: The one the technique is being used on.
+
+    Returns:
+        A tuple (damage, multiplier).
+
+    """
+    user_strength, target_resist = simple_damage_stats(technique, user, target)
     mult = simple_damage_multiplier(
         (technique.types),
         (target.types),
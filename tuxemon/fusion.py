@@ -19,6 +19,8 @@ except ImportError:
     Image = Any
 import json
 
+from tuxemon import vfs
+
 
 class Body:
     """
@@ -162,8 +164,7 @@ class Body:
         # If "file" is set to true, then assume that json_data is a path to a
         # file containing json.
         if file:
-            with open(json_data) as f:
-                json_data = "".join(f.readlines())
+            json_data = vfs.read_bytes(json_data).decode()
 
         # Load the json data and convert it to a dictionary.
         body_dict = json.loads(json_data)
@@ -189,8 +190,8 @@ class Body:
         self.tertiary_colors = body_dict["tertiary_colors"]
 
         # Load the image files.
-        self.body_image = Image.open(self.body_image_path)
-        self.face_image = Image.open(self.face_image_path)
+        self.body_image = Image.open(vfs.open_file(self.body_image_path))
+        self.face_image = Image.open(vfs.open_file(self.face_image_path))
 
     def get_state(self) -> Optional[Mapping[str, Any]]:
         if self.name:
@@ -0,0 +1,300 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""Game variables of a NPC, with typed values and change tracking.
+
+The variables are set by the event actions and read by the conditions,
+mostly as strings. The store is a dict, so actions and saves use it as
+before, but its changes are tracked:
+
+* ``number`` and ``typed`` parse a value once after each change, instead
+  of at each read;
+* each change bumps ``version``, and ``key_version`` is the version of
+  the last change of a key, so ``changed_since`` lists the variables
+  changed after a version, and ``snapshot`` copies the variables once
+  per version, for the saves;
+* ``subscribe`` registers a function called when a variable changes.
+
+Setting a variable to the value it has is not a change.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+logger = logging.getLogger(__name__)
+
+VariableValue = Union[int, float, bool, str]
+# called with the name, previous and new value, None when not set
+Subscriber = Callable[[str, Any, Any], None]
+
+NUMBER_CACHE_SIZE = 1024
+
+
+def parse_value(value: Any) -> VariableValue:
+    """
+    Return the typed value of a variable.
+
+    Parameters:
+        value: Value of the variable, usually a string.
+
+    Returns:
+        The value as a bool for ``true`` and ``false``, as an int or a
+        float for numbers, else as a string.
+
+    """
+    if isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+@lru_cache(maxsize=NUMBER_CACHE_SIZE)
+def parse_number(text: str) -> Optional[float]:
+    """
+    Return the number written in an event parameter.
+
+    Parameters:
+        text: The parameter.
+
+    Returns:
+        The number, ``None`` if the parameter is not made of digits
+        with an optional decimal point.
+
+    """
+    if text.replace(".", "", 1).isdigit():
+        return float(text)
+    return None
+
+
+class GameVariables(Dict[str, Any]):
+    """
+    Game variables, counting and notifying their changes.
+
+    Parameters:
+        args: Initial variables, as for ``dict``.
+        kwargs: Initial variables, as for ``dict``.
+
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.version = 0
+        self._versions: Dict[str, int] = {}
+        self._numbers: Dict[str, float] = {}
+        self._typed: Dict[str, VariableValue] = {}
+        self._snapshot: Tuple[int, Dict[str, Any]] = (-1, {})
+        self._subscribers: DefaultDict[str, List[Subscriber]]
+        self._subscribers = defaultdict(list)
+        self.update(*args, **kwargs)
+
+    def _changed(self, key: str, old: Any, new: Any) -> None:
+        self.version += 1
+        self._versions[key] = self.version
+        self._numbers.pop(key, None)
+        self._typed.pop(key, None)
+        for subscriber in self._subscribers.get(key, ()):
+            subscriber(key, old, new)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        old = self.get(key)
+        if key in self and type(old) is type(value) and old == value:
+            return
+        super().__setitem__(key, value)
+        self._changed(key, old, value)
+
+    def __delitem__(self, key: str) -> None:
+        old = self[key]
+        super().__delitem__(key)
+        self._changed(key, old, None)
+
+    def __ior__(self, other: Any) -> GameVariables:  # type: ignore[override, misc]
+        self.update(other)
+        return self
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self) -> Tuple[str, Any]:
+        key, value = super().popitem()
+        self._changed(key, value, None)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        for key in list(self):
+            del self[key]
+
+    def reset(self, variables: Mapping[str, Any]) -> None:
+        """
+        Replace the variables, as when a game is loaded.
+
+        Only the variables whose value is different are changed.
+
+        Parameters:
+            variables: The new variables.
+
+        """
+        for key in [key for key in self if key not in variables]:
+            del self[key]
+        self.update(variables)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a copy of the variables, as a plain dict.
+
+        The copy is kept until a variable changes, so it must not be
+        modified. Saves use it to skip the variables when they did not
+        change.
+
+        Returns:
+            Copy of the variables.
+
+        """
+        if self._snapshot[0] != self.version:
+            self._snapshot = (self.version, dict(self))
+        return self._snapshot[1]
+
+    def number(self, key: str) -> float:
+        """
+        Return the numeric value of a variable.
+
+        Parameters:
+            key: Name of the variable.
+
+        Returns:
+            The value, as a float.
+
+        Raises:
+            KeyError: The variable is not set.
+            ValueError: The value is not a number.
+
+        """
+        number = self._numbers.get(key)
+        if number is None:
+            value = self[key]
+            try:
+                number = float(value)
+            except (ValueError, TypeError):
+                raise ValueError(
+                    f"game variable {key} is not a number: {value}"
+                )
+            self._numbers[key] = number
+        return number
+
+    def typed(self, key: str) -> VariableValue:
+        """
+        Return the typed value of a variable, see ``parse_value``.
+
+        Parameters:
+            key: Name of the variable.
+
+        Returns:
+            The value, as a bool, an int, a float or a string.
+
+        Raises:
+            KeyError: The variable is not set.
+
+        """
+        value = self._typed.get(key)
+        if value is None:
+            value = parse_value(self[key])
+            self._typed[key] = value
+        return value
+
+    def key_version(self, key: str) -> int:
+        """
+        Return the version of the last change of a variable.
+
+        Parameters:
+            key: Name of the variable.
+
+        Returns:
+            The version, 0 if the variable never changed.
+
+        """
+        return self._versions.get(key, 0)
+
+    def changed_since(self, version: int) -> Set[str]:
+        """
+        Return the variables changed after a version, set or removed.
+
+        Parameters:
+            version: A previous value of ``version``.
+
+        Returns:
+            Names of the variables.
+
+        """
+        return {
+            key
+            for key, key_version in self._versions.items()
+            if key_version > version
+        }
+
+    def subscribe(self, keys: Iterable[str], subscriber: Subscriber) -> None:
+        """
+        Call a function when variables change.
+
+        Parameters:
+            keys: Names of the variables.
+            subscriber: Function called with the name of the changed
+                variable, its previous value and its new value.
+
+        """
+        for key in keys:
+            self._subscribers[key].append(subscriber)
+
+    def unsubscribe(self, keys: Iterable[str], subscriber: Subscriber) -> None:
+        """
+        Stop calling a function when variables change.
+
+        Parameters:
+            keys: Names of the variables.
+            subscriber: Function given to ``subscribe``.
+
+        """
+        for key in keys:
+            subscribers = self._subscribers.get(key)
+            if subscribers and subscriber in subscribers:
+                subscribers.remove(subscriber)
+                if not subscribers:
+                    del self._subscribers[key]
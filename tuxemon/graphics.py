@@ -6,16 +6,22 @@ General "tools" code for pygame graphics operations that don't
 have a home in any specific place.
 
 """
+
 from __future__ import annotations
 
+import json
 import logging
 import os
-import re
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import (
     TYPE_CHECKING,
     Any,
+    Dict,
     Generator,
     Iterable,
+    List,
+    Mapping,
     Optional,
     Protocol,
     Sequence,
@@ -27,7 +33,9 @@ import pygame
 from pytmx.pytmx import TileFlags
 from pytmx.util_pygame import handle_transformation, smart_convert
 
-from tuxemon import prepare
+from tuxemon import prepare, vfs
+from tuxemon.atlas import ATLAS_INDEX, AtlasRect
+from tuxemon.db import db
 from tuxemon.session import Session
 from tuxemon.sprite import Sprite
 from tuxemon.surfanim import SurfaceAnimation
@@ -38,6 +46,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# shared images, least recently used first
+_shared_images: OrderedDict[str, pygame.surface.Surface] = OrderedDict()
+MAX_SHARED_IMAGES = 256
+_pending_images: Dict[str, Future[pygame.surface.Surface]] = {}
+_image_loader: Optional[ThreadPoolExecutor] = None
+
 
 ColorLike = Union[
     pygame.color.Color,
@@ -141,6 +155,94 @@ def load_and_scale(filename: str) -> pygame.surface.Surface:
     return scale_surface(load_image(filename), prepare.SCALE)
 
 
+def load_shared_image(filename: str) -> pygame.surface.Surface:
+    """
+    Load and scale an image once, then share it.
+
+    Every call with the same filename returns the same surface, so it
+    must not be modified: copy it before drawing on it or changing its
+    alpha. The ``MAX_SHARED_IMAGES`` images used last are kept.
+
+    Parameters:
+        filename: Path of the image file.
+
+    Returns:
+        Loaded and scaled image.
+
+    """
+    image = _shared_images.get(filename)
+    if image is not None:
+        _shared_images.move_to_end(filename)
+        return image
+    image = load_and_scale(filename)
+    _share_image(filename, image)
+    return image
+
+
+def _share_image(filename: str, image: pygame.surface.Surface) -> None:
+    _shared_images[filename] = image
+    if len(_shared_images) > MAX_SHARED_IMAGES:
+        _shared_images.popitem(last=False)
+
+
+def clear_shared_images() -> None:
+    """Forget the shared images, as the db or the mods were reloaded."""
+    _shared_images.clear()
+    for future in _pending_images.values():
+        future.cancel()
+    _pending_images.clear()
+
+
+db.add_load_callback(clear_shared_images)
+
+
+def request_shared_image(filename: str) -> Optional[pygame.surface.Surface]:
+    """
+    Get a shared image without waiting for it to be decoded.
+
+    When the image is not in the shared cache (see ``load_shared_image``)
+    yet, it is decoded on a worker thread and ``None`` is returned; the
+    calls made after the decoding is over return the image. The image
+    is converted and scaled on the calling thread, as conversion needs
+    the display.
+
+    Parameters:
+        filename: Path of the image file.
+
+    Returns:
+        Loaded and scaled image, ``None`` while it is being decoded.
+
+    """
+    global _image_loader
+
+    image = _shared_images.get(filename)
+    if image is not None:
+        _shared_images.move_to_end(filename)
+        return image
+
+    future = _pending_images.get(filename)
+    if future is None:
+        path = transform_resource_filename(filename)
+        if _atlas_index.lookup(path) is not None:
+            # cutting the image out of its sheet is not worth a thread
+            return load_shared_image(filename)
+        if _image_loader is None:
+            _image_loader = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="image_loader",
+            )
+        _pending_images[filename] = _image_loader.submit(load_surface, path)
+        return None
+    if not future.done():
+        return None
+
+    del _pending_images[filename]
+    image = smart_convert(future.result(), None, True)
+    image = scale_surface(image, prepare.SCALE)
+    _share_image(filename, image)
+    return image
+
+
 def load_image(filename: str) -> pygame.surface.Surface:
     """Load image from the resources folder
 
@@ -159,7 +261,27 @@ def load_image(filename: str) -> pygame.surface.Surface:
 
     """
     filename = transform_resource_filename(filename)
-    return smart_convert(pygame.image.load(filename), None, True)
+    image = _atlas_index.load(filename)
+    if image is not None:
+        return image
+    return smart_convert(load_surface(filename), None, True)
+
+
+def load_surface(path: str) -> pygame.surface.Surface:
+    """
+    Decode an image file, which may be in a mod archive.
+
+    Parameters:
+        path: Path of the image file.
+
+    Returns:
+        Decoded image, not converted.
+
+    """
+    if os.path.isfile(path):
+        return pygame.image.load(path)
+    with vfs.open_file(path) as fp:
+        return pygame.image.load(fp, path)
 
 
 def load_sprite(
@@ -211,7 +333,7 @@ def load_animated_sprite(
     """
     anim = []
     for filename in filenames:
-        if os.path.exists(filename):
+        if vfs.exists(filename):
             image = load_and_scale(filename)
             anim.append((image, delay))
 
@@ -252,6 +374,209 @@ def load_frames_files(
         yield load_and_scale(filename)
 
 
+class AnimationFrameIndex:
+    """
+    Index of animation frame files, grouped by animation name.
+
+    Each directory is listed once and every frame file is registered
+    under all the animation names that would match it, so looking up
+    the frames of an animation does not need to scan the directory.
+    A directory is listed again when its modification time changes.
+
+    """
+
+    def __init__(self) -> None:
+        self._directories: Dict[
+            str, Tuple[int, Mapping[str, Sequence[str]]]
+        ] = {}
+
+    def lookup(self, directory: str, name: str) -> Sequence[str]:
+        """
+        Return the sorted frame filenames of an animation.
+
+        Parameters:
+            directory: Directory where the frames are located.
+            name: Name of the animation (common prefix of the frames).
+
+        Returns:
+            Sequence of filenames.
+
+        """
+        mtime = vfs.getmtime_ns(directory)
+        cached = self._directories.get(directory)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self.build(directory))
+            self._directories[directory] = cached
+        return list(cached[1].get(name, ()))
+
+    def clear(self) -> None:
+        """Forget every indexed directory."""
+        self._directories.clear()
+
+    @staticmethod
+    def frame_names(filename: str) -> Sequence[str]:
+        r"""
+        Return the animation names a frame filename belongs to.
+
+        A frame has the format ``animation_name\.?_?[0-9]+\.png``.
+        Since animation names may end with digits themselves, a frame
+        such as ``fire_10.png`` belongs to ``fire``, ``fire_`` and
+        ``fire_1``.
+
+        Parameters:
+            filename: Name of the file, without directory.
+
+        Returns:
+            Animation names matching the file, empty if it is not a frame.
+
+        """
+        if not filename.endswith(".png"):
+            return []
+        stem = filename[:-4]
+        base = stem.rstrip("0123456789")
+        digits = stem[len(base) :]
+        if not digits:
+            return []
+
+        names = [base + digits[:i] for i in range(1, len(digits))]
+        names.append(base)
+        if base.endswith("_"):
+            base = base[:-1]
+            names.append(base)
+        if base.endswith("."):
+            names.append(base[:-1])
+        return names
+
+    @classmethod
+    def build(cls, directory: str) -> Mapping[str, Sequence[str]]:
+        """
+        List a directory and group its frames by animation name.
+
+        Parameters:
+            directory: Directory where the frames are located.
+
+        Returns:
+            Mapping of animation names to their sorted frame filenames.
+
+        """
+        index: Dict[str, List[str]] = defaultdict(list)
+        for filename in sorted(vfs.listdir(directory)):
+            path = os.path.join(directory, filename)
+            for name in cls.frame_names(filename):
+                index[name].append(path)
+        return dict(index)
+
+
+_frame_index = AnimationFrameIndex()
+
+
+class TextureAtlasIndex:
+    """
+    Index of the texture atlases built with ``tuxemon.atlas``.
+
+    The atlas of a directory is read the first time one of its images
+    is loaded, and ignored if one of its images was modified after it.
+    Its sheets are decoded when first used, and the last used ones are
+    kept: an image in the atlas is a subsurface of its sheet, so it must
+    not be drawn on.
+
+    Parameters:
+        max_sheets: Number of decoded sheets kept.
+
+    """
+
+    def __init__(self, max_sheets: int = 16) -> None:
+        self.max_sheets = max_sheets
+        self._directories: Dict[str, Mapping[str, Tuple[str, AtlasRect]]] = {}
+        self._sheets: OrderedDict[str, pygame.surface.Surface] = OrderedDict()
+
+    def lookup(self, path: str) -> Optional[Tuple[str, AtlasRect]]:
+        """
+        Return where an image is in the atlas of its directory.
+
+        Parameters:
+            path: Path of the image file.
+
+        Returns:
+            Path of the sheet and rectangle of the image in it, ``None``
+            if the image is not in an atlas.
+
+        """
+        directory, filename = os.path.split(path)
+        frames = self._directories.get(directory)
+        if frames is None:
+            frames = self.build(directory)
+            self._directories[directory] = frames
+        return frames.get(filename)
+
+    def load(self, path: str) -> Optional[pygame.surface.Surface]:
+        """
+        Load an image from the atlas of its directory.
+
+        Parameters:
+            path: Path of the image file.
+
+        Returns:
+            Subsurface of the sheet, ``None`` if the image is not in an
+            atlas.
+
+        """
+        frame = self.lookup(path)
+        if frame is None:
+            return None
+        sheet_path, rect = frame
+        sheet = self._sheets.get(sheet_path)
+        if sheet is None:
+            sheet = smart_convert(load_surface(sheet_path), None, True)
+            self._sheets[sheet_path] = sheet
+            if len(self._sheets) > self.max_sheets:
+                self._sheets.popitem(last=False)
+        else:
+            self._sheets.move_to_end(sheet_path)
+        return sheet.subsurface(rect)
+
+    def clear(self) -> None:
+        """Forget every indexed directory and decoded sheet."""
+        self._directories.clear()
+        self._sheets.clear()
+
+    @staticmethod
+    def build(directory: str) -> Mapping[str, Tuple[str, AtlasRect]]:
+        """
+        Read the atlas of a directory.
+
+        Parameters:
+            directory: Directory where the images are located.
+
+        Returns:
+            Mapping of image file names to their sheet and rectangle,
+            empty if there is no atlas or it is older than its images.
+
+        """
+        path = os.path.join(directory, ATLAS_INDEX)
+        if not vfs.exists(path):
+            return {}
+        atlas_mtime = vfs.getmtime_ns(path)
+        frames = {}
+        for sheet in json.loads(vfs.read_bytes(path))["sheets"]:
+            sheet_path = os.path.join(directory, sheet["file"])
+            for filename, (x, y, w, h) in sheet["frames"].items():
+                # the images may be left out, only the sheets being needed
+                source = os.path.join(directory, filename)
+                if (
+                    vfs.exists(source)
+                    and vfs.getmtime_ns(source) > atlas_mtime
+                ):
+                    logger.warning(f"{path} is older than {filename}, ignored")
+                    return {}
+                frames[filename] = (sheet_path, (x, y, w, h))
+        return frames
+
+
+_atlas_index = TextureAtlasIndex()
+db.add_load_callback(_atlas_index.clear)
+
+
 def animation_frame_files(
     directory: str,
     name: str,
@@ -259,7 +584,7 @@ def animation_frame_files(
     r"""
     Return list of filenames from directory for use in animation.
 
-    * each filename will have the format: animation_name[0-9]*\..*
+    * each filename will have the format: animation_name\.?_?[0-9]+\.png
     * will be returned in sorted order
 
     For example, water00.png, water01.png, water02.png.
@@ -272,14 +597,7 @@ def animation_frame_files(
         Sequence of filenames.
 
     """
-    frames = list()
-    pattern = re.compile(rf"{name}\.?_?[0-9]+\.png")
-    # might be slow on large folders
-    for filename in os.listdir(directory):
-        if pattern.match(filename):
-            frames.append(os.path.join(directory, filename))
-    frames.sort()
-    return frames
+    return _frame_index.lookup(directory, name)
 
 
 def create_animation(
@@ -425,7 +743,7 @@ def scaled_image_loader(
     colorkey_color = pygame.Color(f"#{colorkey}") if colorkey else None
 
     # load the tileset image
-    image = pygame.image.load(filename)
+    image = load_surface(filename)
 
     # scale the tileset image to match game scale
     scaled_size = scale_sequence(image.get_size())
@@ -3,22 +3,50 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Dict, Optional, Sequence
 
-from tuxemon.db import db
+from tuxemon.db import EconomyItemModel, db
 
 logger = logging.getLogger(__name__)
 
 
 class Economy:
     """An Economy holds a list of item names and their price/cost for this
-    economy."""
+    economy.
+
+    The items are indexed by slug when set, so looking up the price, cost
+    or inventory of an item does not scan the list.
+    """
 
     def __init__(self, slug: Optional[str] = None) -> None:
+        self.items = []
         # Auto-load the economy from the economy database.
         if slug:
             self.load(slug)
 
+    @property
+    def items(self) -> Sequence[EconomyItemModel]:
+        return self._items
+
+    @items.setter
+    def items(self, items: Sequence[EconomyItemModel]) -> None:
+        self._items = items
+        self._by_slug: Dict[str, EconomyItemModel] = {}
+        for item in items:
+            # the first entry of an item is the one used
+            self._by_slug.setdefault(item.item_name, item)
+
+    def lookup_item(self, item_slug: str) -> Optional[EconomyItemModel]:
+        """Looks up an item of this economy.
+
+        Parameters:
+            item_slug: The item slug to look up in this economy.
+
+        Returns:
+            Entry of the item, None if the economy does not have it.
+        """
+        return self._by_slug.get(item_slug)
+
     def load(self, slug: str) -> None:
         """Loads an economy from the economy.db database.
 
@@ -50,12 +78,10 @@ class Economy:
         Returns:
             Field of item for this economy.
         """
-        for item in self.items:
-            if item.item_name == item_slug and hasattr(item, field):
-                value = int(getattr(item, field))
-                return value
-
-        return None
+        item = self._by_slug.get(item_slug)
+        if item is None or not hasattr(item, field):
+            return None
+        return int(getattr(item, field))
 
     def lookup_item_price(self, item_slug: str) -> int:
         """Looks up the item price from this economy.
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Union
 
 from tuxemon.db import ElementType
-from tuxemon.element import Element
+from tuxemon.element import get_element
 from tuxemon.item.itemeffect import ItemEffect, ItemEffectResult
 
 if TYPE_CHECKING:
@@ -41,13 +41,13 @@ class SwitchEffect(ItemEffect):
         elements = list(ElementType)
         if target:
             if self.element != "random":
-                ele = Element(self.element)
+                ele = get_element(self.element)
                 if ele not in target.types:
                     target.types = [ele]
                     done = True
             else:
                 _target = random.choice(elements)
-                ele = Element(_target)
+                ele = get_element(_target)
                 target.types = [ele]
                 done = True
         return {"success": done, "num_shakes": 0, "extra": None}
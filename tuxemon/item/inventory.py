@@ -0,0 +1,205 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+from __future__ import annotations
+
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from tuxemon.item.item import Item
+
+
+class Inventory:
+    """
+    Items of a bag or of a storage box, indexed by slug and instance id.
+
+    It is used like the list of items it replaces: items keep the order
+    in which they were added, but finding an item, or checking that an
+    item is in the inventory, does not scan the items. An item is in an
+    inventory at most once, and its slug and instance id must not change
+    while it is in it.
+
+    Parameters:
+        items: Initial items.
+
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._items: Dict[uuid.UUID, Item] = {}
+        self._by_slug: Dict[str, Dict[uuid.UUID, Item]] = {}
+        self._sorted: Optional[Tuple[int, Any, bool, Sequence[Item]]] = None
+        self._state: Optional[Tuple[Any, Sequence[Mapping[str, Any]]]] = None
+        # changed each time items are added or removed
+        self.version = 0
+        for item in items:
+            self.append(item)
+
+    def __iter__(self) -> Iterator[Item]:
+        # a copy, so the items can be removed while iterating
+        return iter(list(self._items.values()))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        instance_id = getattr(item, "instance_id", None)
+        if instance_id is None:
+            return False
+        return self._items.get(instance_id) is item
+
+    def __repr__(self) -> str:
+        return f"Inventory({list(self._items.values())})"
+
+    def append(self, item: Item) -> None:
+        """
+        Add an item at the end of the inventory.
+
+        Parameters:
+            item: Item to add.
+
+        """
+        self.remove_id(item.instance_id)
+        self._items[item.instance_id] = item
+        self._by_slug.setdefault(item.slug, {})[item.instance_id] = item
+        self.version += 1
+
+    def remove(self, item: Item) -> None:
+        """
+        Remove an item.
+
+        Parameters:
+            item: Item to remove.
+
+        Raises:
+            ValueError: The item is not in the inventory.
+
+        """
+        if item not in self:
+            raise ValueError(f"{item} is not in the inventory")
+        self.remove_id(item.instance_id)
+
+    def remove_id(self, instance_id: uuid.UUID) -> Optional[Item]:
+        """
+        Remove the item with an instance id, if any.
+
+        Parameters:
+            instance_id: Instance id of the item.
+
+        Returns:
+            The removed item, ``None`` if there was none.
+
+        """
+        item = self._items.pop(instance_id, None)
+        if item is None:
+            return None
+        same_slug = self._by_slug[item.slug]
+        del same_slug[instance_id]
+        if not same_slug:
+            del self._by_slug[item.slug]
+        self.version += 1
+        return item
+
+    def clear(self) -> None:
+        """Remove all the items."""
+        self._items.clear()
+        self._by_slug.clear()
+        self.version += 1
+
+    def find(self, slug: str) -> Optional[Item]:
+        """
+        Find the first item added with a slug.
+
+        Parameters:
+            slug: Slug of the item.
+
+        Returns:
+            The item, ``None`` if there is no item with this slug.
+
+        """
+        same_slug = self._by_slug.get(slug)
+        if not same_slug:
+            return None
+        return next(iter(same_slug.values()))
+
+    def count(self, slug: str) -> int:
+        """
+        Count the items with a slug.
+
+        Parameters:
+            slug: Slug of the items.
+
+        Returns:
+            Number of items (not their quantity) with this slug.
+
+        """
+        return len(self._by_slug.get(slug, ()))
+
+    def get(self, instance_id: uuid.UUID) -> Optional[Item]:
+        """
+        Find the item with an instance id.
+
+        Parameters:
+            instance_id: Instance id of the item.
+
+        Returns:
+            The item, ``None`` if it is not in the inventory.
+
+        """
+        return self._items.get(instance_id)
+
+    def sorted(
+        self,
+        key: Callable[[Item], Any],
+        reverse: bool = False,
+    ) -> Sequence[Item]:
+        """
+        Return the items sorted.
+
+        The result is kept until items are added or removed, so the key
+        must only depend on attributes of the items that do not change.
+
+        Parameters:
+            key: Sort key of the items.
+            reverse: Whether to sort in descending order.
+
+        Returns:
+            Sorted items.
+
+        """
+        cached = self._sorted
+        if cached is not None and cached[:3] == (self.version, key, reverse):
+            return cached[3]
+        items = tuple(sorted(self._items.values(), key=key, reverse=reverse))
+        self._sorted = (self.version, key, reverse, items)
+        return items
+
+    def get_state(self) -> Sequence[Mapping[str, Any]]:
+        """
+        Prepares the items to be saved to a file.
+
+        The result is kept until items are added or removed, or their
+        quantity changes, so it must not be modified. Saves use it to
+        skip the inventories which did not change.
+
+        Returns:
+            Save data of the items.
+
+        """
+        # quantities change without adding or removing items
+        version = (self.version, [item.quantity for item in self])
+        if self._state is not None and self._state[0] == version:
+            return self._state[1]
+        state = [item.get_state() for item in self]
+        self._state = (version, state)
+        return state
@@ -8,6 +8,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     ClassVar,
+    Iterable,
     List,
     Mapping,
     Optional,
@@ -297,5 +298,5 @@ def decode_items(
     return [Item(save_data=itm) for itm in json_data or {}]
 
 
-def encode_items(itms: Sequence[Item]) -> Sequence[Mapping[str, Any]]:
+def encode_items(itms: Iterable[Item]) -> Sequence[Mapping[str, Any]]:
     return [itm.get_state() for itm in itms]
@@ -4,17 +4,27 @@ from __future__ import annotations
 
 import dataclasses
 import gettext
+import hashlib
 import logging
+import mmap
 import os
 import os.path
+import re
+import struct
+from functools import lru_cache
 from typing import (
     Any,
     Callable,
+    Dict,
     Generator,
     Iterable,
+    List,
     Mapping,
+    Match,
     Optional,
+    Pattern,
     Sequence,
+    Tuple,
 )
 
 from babel.messages.mofile import write_mo
@@ -29,6 +39,12 @@ logger = logging.getLogger(__name__)
 
 FALLBACK_LOCALE = "en_US"
 
+MO_MAGIC = 0x950412DE
+MO_MAGIC_SWAPPED = 0xDE120495
+CHARSET_PATTERN = re.compile(rb"charset=([-\w]+)")
+# messages of a catalog whose lookup is kept
+LOOKUP_CACHE_SIZE = 512
+
 
 @dataclasses.dataclass(frozen=True, order=True)
 class LocaleInfo:
@@ -40,17 +56,111 @@ class LocaleInfo:
     path: str
 
 
+class MoCatalog(gettext.NullTranslations):
+    """
+    Translations read from a compiled ``.mo`` file, without loading it.
+
+    The file is memory-mapped, and each message is found by a binary
+    search of the sorted original strings, so the catalog does not build
+    a dictionary of its messages. Messages missing from the catalog are
+    looked up in its fallback, like with :mod:`gettext`.
+
+    Only singular messages without context are looked up, which is all
+    the game uses.
+
+    Parameters:
+        path: Path of the ``.mo`` file.
+
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        with open(path, "rb") as fp:
+            self._data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = struct.unpack_from("<I", self._data)[0]
+        if magic == MO_MAGIC:
+            self._order = "<"
+        elif magic == MO_MAGIC_SWAPPED:
+            self._order = ">"
+        else:
+            raise ValueError(f"{path} is not a .mo file")
+        self._count, self._keys, self._values = struct.unpack_from(
+            self._order + "3I",
+            self._data,
+            8,
+        )
+        self._entry = struct.Struct(self._order + "2I")
+        # the texts of the current screens are translated every frame
+        self._lookup: Callable[[str], Optional[str]] = lru_cache(
+            maxsize=LOOKUP_CACHE_SIZE,
+        )(self._translation)
+        self._charset = "utf-8"
+        header = self._find(b"")
+        if header is not None:
+            match = CHARSET_PATTERN.search(self._string(self._values, header))
+            if match:
+                self._charset = match.group(1).decode("ascii")
+
+    def _string(self, table: int, index: int) -> bytes:
+        length, offset = self._entry.unpack_from(self._data, table + 8 * index)
+        return self._data[offset : offset + length]
+
+    def _find(self, key: bytes) -> Optional[int]:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            original = self._string(self._keys, middle)
+            if original < key:
+                low = middle + 1
+            elif original > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _translation(self, message: str) -> Optional[str]:
+        index = self._find(message.encode(self._charset))
+        if index is None:
+            return None
+        return self._string(self._values, index).decode(self._charset)
+
+    def gettext(self, message: str) -> str:
+        translation = self._lookup(message)
+        if translation is not None:
+            return translation
+        # from the fallback, if any
+        return super().gettext(message)
+
+    def close(self) -> None:
+        """
+        Unmap the file, so it can be replaced or removed.
+
+        Messages are then only looked up in the fallback.
+
+        """
+        self._count = 0
+        self._lookup = self._translation
+        self._data.close()
+
+
 class TranslatorPo:
     """
     gettext-based translator class.
 
-    po files are read and compiled into mo files by gettext.
-    the mo files are saved in ~/.tuxemon/cache/l18n.
+    po files are compiled into mo files, saved in ~/.tuxemon/cache/l18n
+    under the hash of the po file, so they are compiled again once they
+    change. Only the active locale and the fallback one are compiled and
+    loaded.
 
     """
 
     def __init__(self) -> None:
         self.translate: Callable[[str], str] = lambda x: x
+        # locale and domain of the translate function
+        self._loaded: Optional[Tuple[str, str]] = None
+        # loaded catalogs, by path of their MO file
+        self._catalogs: Dict[str, MoCatalog] = {}
 
     @staticmethod
     def search_locales() -> Generator[LocaleInfo, None, None]:
@@ -64,58 +174,113 @@ class TranslatorPo:
         logger.debug("searching locales...")
         root = prepare.fetch("l18n")
         for locale in os.listdir(root):
-            locale_path = os.path.join(root, locale)
-            if os.path.isdir(locale_path):
-                for category in os.listdir(locale_path):
-                    category_path = os.path.join(locale_path, category)
-                    if os.path.isdir(category_path):
-                        for name in os.listdir(category_path):
-                            path = os.path.join(category_path, name)
-                            if os.path.isfile(path) and name.endswith(".po"):
-                                domain = name[:-3]
-                                info = LocaleInfo(
-                                    locale,
-                                    category,
-                                    domain,
-                                    path,
-                                )
-                                logger.debug("found: %s", info)
-                                yield info
+            yield from TranslatorPo.search_locale(locale)
+
+    @staticmethod
+    def search_locale(locale: str) -> Generator[LocaleInfo, None, None]:
+        """
+        Search the translation files of a locale.
+
+        Parameters:
+            locale: Name of the locale.
+
+        Yields:
+            The information of each translation file of the locale.
+
+        """
+        locale_path = os.path.join(prepare.fetch("l18n"), locale)
+        if not os.path.isdir(locale_path):
+            return
+        for category in os.listdir(locale_path):
+            category_path = os.path.join(locale_path, category)
+            if os.path.isdir(category_path):
+                for name in os.listdir(category_path):
+                    path = os.path.join(category_path, name)
+                    if os.path.isfile(path) and name.endswith(".po"):
+                        domain = name[:-3]
+                        info = LocaleInfo(locale, category, domain, path)
+                        logger.debug("found: %s", info)
+                        yield info
 
     def collect_languages(self, recompile_translations: bool = False) -> None:
         """
-        Collect languages/locales with available translation files.
+        Load the translations of the configured locale.
 
         Parameters:
             recompile_translations: ``True`` if the translations should be
-                recompiled (useful for testing local changes to the
-                translations).
+                recompiled, even if they did not change.
 
         """
-        self.build_translations(recompile_translations)
-        self.load_translator(prepare.CONFIG.locale)
+        self.load_translator(
+            prepare.CONFIG.locale,
+            recompile_translations=recompile_translations,
+        )
 
     def build_translations(self, recompile_translations: bool = False) -> None:
         """
-        Create MO files for existing PO translation files.
+        Create MO files for every existing PO translation file.
+
+        The game compiles the files it loads, this is only needed to
+        check that every translation compiles.
 
         Parameters:
             recompile_translations: ``True`` if the translations should be
-                recompiled (useful for testing local changes to the
-                translations).
+                recompiled, even if they did not change.
 
         """
-        # l18n/locale/LC_category/domain_name.mo
-        cache = os.path.join(paths.CACHE_DIR, "l18n")
         for info in self.search_locales():
-            mo_path = os.path.join(
-                cache,
-                info.locale,
-                info.category,
-                info.domain + ".mo",
-            )
-            if recompile_translations or not os.path.exists(mo_path):
-                self.compile_gettext(info.path, mo_path)
+            self.compiled_path(info, recompile_translations)
+
+    def compiled_path(
+        self,
+        info: LocaleInfo,
+        recompile_translations: bool = False,
+    ) -> str:
+        """
+        Get the MO file of a PO file, compiling it if needed.
+
+        Parameters:
+            info: The PO file.
+            recompile_translations: ``True`` if the translation should be
+                recompiled, even if it did not change.
+
+        Returns:
+            Path of the MO file.
+
+        """
+        with open(info.path, "rb") as fp:
+            digest = hashlib.sha1(fp.read()).hexdigest()[:16]
+        # l18n/locale/LC_category/domain_name.hash.mo
+        folder = os.path.join(
+            paths.CACHE_DIR,
+            "l18n",
+            info.locale,
+            info.category,
+        )
+        mo_path = os.path.join(folder, f"{info.domain}.{digest}.mo")
+        if recompile_translations or not os.path.exists(mo_path):
+            # a mapped file cannot be replaced or removed on Windows
+            self.close_catalog(mo_path)
+            self.compile_gettext(info.path, mo_path)
+            # the files of the previous versions of the translation
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if name.startswith(info.domain + ".") and path != mo_path:
+                    self.close_catalog(path)
+                    os.remove(path)
+        return mo_path
+
+    def close_catalog(self, path: str) -> None:
+        """
+        Close the catalog loaded from a MO file, if any.
+
+        Parameters:
+            path: Path of the MO file.
+
+        """
+        catalog = self._catalogs.pop(path, None)
+        if catalog is not None:
+            catalog.close()
 
     @staticmethod
     def compile_gettext(po_path: str, mo_path: str) -> None:
@@ -131,41 +296,90 @@ class TranslatorPo:
         os.makedirs(mofolder, exist_ok=True)
         with open(po_path, encoding="UTF8") as po_file:
             catalog = read_po(po_file)
-        with open(mo_path, "wb") as mo_file:
+        # written aside, so a catalog being read is not changed
+        tmp_path = mo_path + ".tmp"
+        with open(tmp_path, "wb") as mo_file:
             write_mo(mo_file, catalog)
-            logger.debug("writing l18n mo: %s", mo_path)
+        os.replace(tmp_path, mo_path)
+        logger.debug("writing l18n mo: %s", mo_path)
+
+    def load_catalog(
+        self,
+        locale_name: str,
+        domain: str,
+        recompile_translations: bool = False,
+    ) -> Optional[MoCatalog]:
+        """
+        Load the catalog of a locale.
+
+        Parameters:
+            locale_name: Name of the locale.
+            domain: Name of the domain.
+            recompile_translations: ``True`` if the translation should be
+                recompiled, even if it did not change.
+
+        Returns:
+            The catalog, ``None`` if the locale has no such domain.
+
+        """
+        for info in self.search_locale(locale_name):
+            if info.domain == domain:
+                path = self.compiled_path(info, recompile_translations)
+                self.close_catalog(path)
+                catalog = MoCatalog(path)
+                self._catalogs[path] = catalog
+                return catalog
+        return None
 
     def load_translator(
         self,
         locale_name: str = "en_US",
         domain: str = "base",
+        recompile_translations: bool = False,
     ) -> None:
         """
         Load a selected locale for translation.
 
+        Nothing is done if the locale is already loaded.
+
         Parameters:
             locale_name: Name of the locale.
             domain: Name of the domain.
+            recompile_translations: ``True`` if the translations should be
+                recompiled, even if they did not change.
 
         """
+        if (
+            self._loaded == (locale_name, domain)
+            and not recompile_translations
+        ):
+            return
         logger.debug("loading translator for: %s", locale_name)
-        localedir = os.path.join(paths.CACHE_DIR, "l18n")
-        fallback = gettext.translation("base", localedir, [FALLBACK_LOCALE])
-
-        for info in self.search_locales():
-            if info.locale == locale_name and info.domain == domain:
-                trans = gettext.translation(
-                    info.domain,
-                    localedir,
-                    [locale_name],
+        fallback = self.load_catalog(
+            FALLBACK_LOCALE,
+            "base",
+            recompile_translations,
+        )
+        if fallback is None:
+            raise OSError(f"no translation found for {FALLBACK_LOCALE}")
+        trans: Optional[MoCatalog] = None
+        if locale_name != FALLBACK_LOCALE or domain != "base":
+            trans = self.load_catalog(
+                locale_name,
+                domain,
+                recompile_translations,
+            )
+        if trans is None:
+            if locale_name != FALLBACK_LOCALE:
+                logger.warning(
+                    "Locale %s not found. Using fallback.", locale_name
                 )
-                trans.add_fallback(fallback)
-                break
-        else:
-            logger.warning("Locale %s not found. Using fallback.", locale_name)
             trans = fallback
+        else:
+            trans.add_fallback(fallback)
         trans.install()
         self.translate = trans.gettext
+        self._loaded = (locale_name, domain)
 
     def format(
         self,
@@ -205,10 +419,113 @@ class TranslatorPo:
             return self.translate(text)
 
 
+# a placeholder, like ${{name}}
+PLACEHOLDER_PATTERN = re.compile(r"\$\{\{(\w+)\}\}")
+TEMPLATE_CACHE_SIZE = 1024
+
+# returns the value of a placeholder, None to leave it in the text
+PlaceholderResolver = Callable[[Session], Optional[str]]
+PlaceholderPatternResolver = Callable[[Session, Match[str]], Optional[str]]
+
+
+class PlaceholderRegistry:
+    """
+    Resolvers of the ``${{var}}`` placeholders of the texts.
+
+    A resolver is only called for the placeholders found in a text. It
+    returns the value of the placeholder, or ``None`` to leave it as is.
+    Mods can register their own placeholders::
+
+        placeholders.register("rival", lambda session: rival_name)
+
+    A pattern resolves a family of placeholders, like ``monster_0_name``,
+    and is given the match of the placeholder name.
+
+    """
+
+    def __init__(self) -> None:
+        self._resolvers: Dict[str, PlaceholderResolver] = {}
+        self._patterns: List[
+            Tuple[Pattern[str], PlaceholderPatternResolver]
+        ] = []
+
+    def register(self, name: str, resolver: PlaceholderResolver) -> None:
+        """
+        Register the resolver of a placeholder, replacing any previous one.
+
+        Parameters:
+            name: Name of the placeholder, without the braces.
+            resolver: Returns the value of the placeholder.
+
+        """
+        self._resolvers[name] = resolver
+
+    def register_pattern(
+        self,
+        pattern: str,
+        resolver: PlaceholderPatternResolver,
+    ) -> None:
+        """
+        Register the resolver of the placeholders matching a pattern.
+
+        The names registered with ``register`` are looked up first, then
+        the patterns, in the order they were registered.
+
+        Parameters:
+            pattern: Regular expression matching the whole name.
+            resolver: Returns the value of the placeholder.
+
+        """
+        self._patterns.append((re.compile(pattern), resolver))
+
+    def resolve(self, session: Session, name: str) -> Optional[str]:
+        """
+        Get the value of a placeholder.
+
+        Parameters:
+            session: Session containing the information to fill it.
+            name: Name of the placeholder, without the braces.
+
+        Returns:
+            The value, ``None`` if the placeholder is unknown.
+
+        """
+        resolver = self._resolvers.get(name)
+        if resolver is not None:
+            return resolver(session)
+        for pattern, pattern_resolver in self._patterns:
+            match = pattern.fullmatch(name)
+            if match:
+                return pattern_resolver(session, match)
+        return None
+
+
+placeholders = PlaceholderRegistry()
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(text: str) -> Tuple[str, ...]:
+    """
+    Split a text on its placeholders, once for each text.
+
+    Parameters:
+        text: Text with ``${{var}}`` placeholders.
+
+    Returns:
+        The literal parts of the text, with the placeholder names between
+        them: the names are at the odd indexes.
+
+    """
+    return tuple(PLACEHOLDER_PATTERN.split(text.replace(r"\n", "\n")))
+
+
 def replace_text(session: Session, text: str) -> str:
     """
     Replaces ``${{var}}`` tiled variables with their in-session value.
 
+    Only the placeholders found in the text are resolved, see
+    :class:`PlaceholderRegistry`. Unknown placeholders are left as is.
+
     Parameters:
         session: Session containing the information to fill the variables.
         text: Text whose references to variables should be substituted.
@@ -218,64 +535,83 @@ def replace_text(session: Session, text: str) -> str:
         'Red is running away!'
 
     """
-    player = session.player
-    client = session.client
-    text = text.replace("${{name}}", player.name)
-    text = text.replace("${{currency}}", "$")
-    text = text.replace(r"\n", "\n")
-    text = text.replace("${{money}}", str(player.money["player"]))
+    parts = compile_template(text)
+    if len(parts) == 1:
+        return parts[0]
+    result = [parts[0]]
+    for index in range(1, len(parts), 2):
+        name = parts[index]
+        value = placeholders.resolve(session, name)
+        result.append("${{" + name + "}}" if value is None else value)
+        result.append(parts[index + 1])
+    return "".join(result)
+
+
+def _metric(session: Session) -> bool:
+    return session.player.game_variables["unit_measure"] == "Metric"
+
+
+def _steps(session: Session) -> str:
+    steps = session.player.game_variables["steps"]
+    if _metric(session):
+        return str(convert_km(steps))
+    return str(convert_mi(steps))
+
+
+# the attribute of a party monster shown by each placeholder
+MONSTER_PLACEHOLDERS: Mapping[str, str] = {
+    "name": "name",
+    "desc": "description",
+    "type": "slug",
+    "category": "category",
+    "shape": "shape",
+    "hp": "current_hp",
+    "hp_max": "hp",
+    "level": "level",
+}
+
+
+def _monster(session: Session, match: Match[str]) -> Optional[str]:
+    monsters = session.player.monsters
+    index = int(match.group(1))
+    attribute = MONSTER_PLACEHOLDERS.get(match.group(2))
+    if attribute is None or index >= len(monsters):
+        return None
+    return str(getattr(monsters[index], attribute))
+
+
+def _register_placeholders(registry: PlaceholderRegistry) -> None:
+    registry.register("name", lambda session: session.player.name)
+    registry.register("currency", lambda session: "$")
+    registry.register(
+        "money",
+        lambda session: str(session.player.money["player"]),
+    )
     # distance (metric / imperial)
-    if player.game_variables["unit_measure"] == "Metric":
-        text = text.replace("${{length}}", "km")
-        text = text.replace("${{weight}}", "kg")
-        text = text.replace("${{height}}", "cm")
-        text = text.replace(
-            "${{steps}}",
-            str(convert_km(player.game_variables["steps"])),
-        )
-    else:
-        text = text.replace("${{length}}", "mi")
-        text = text.replace("${{weight}}", "lb")
-        text = text.replace("${{height}}", "ft")
-        text = text.replace(
-            "${{steps}}",
-            str(convert_mi(player.game_variables["steps"])),
-        )
+    registry.register(
+        "length",
+        lambda session: "km" if _metric(session) else "mi",
+    )
+    registry.register(
+        "weight",
+        lambda session: "kg" if _metric(session) else "lb",
+    )
+    registry.register(
+        "height",
+        lambda session: "cm" if _metric(session) else "ft",
+    )
+    registry.register("steps", _steps)
     # maps
-    text = text.replace("${{map_name}}", client.map_name)
-    text = text.replace("${{map_desc}}", client.map_desc)
-    text = text.replace("${{north}}", client.map_north)
-    text = text.replace("${{south}}", client.map_south)
-    text = text.replace("${{east}}", client.map_east)
-    text = text.replace("${{west}}", client.map_west)
-
-    for i in range(len(player.monsters)):
-        monster = player.monsters[i]
-        text = text.replace("${{monster_" + str(i) + "_name}}", monster.name)
-        text = text.replace(
-            "${{monster_" + str(i) + "_desc}}",
-            monster.description,
-        )
-        text = text.replace("${{monster_" + str(i) + "_type}}", monster.slug)
-        text = text.replace(
-            "${{monster_" + str(i) + "_category}}",
-            monster.category,
-        )
-        text = text.replace("${{monster_" + str(i) + "_shape}}", monster.shape)
-        text = text.replace(
-            "${{monster_" + str(i) + "_hp}}",
-            str(monster.current_hp),
-        )
-        text = text.replace(
-            "${{monster_" + str(i) + "_hp_max}}",
-            str(monster.hp),
-        )
-        text = text.replace(
-            "${{monster_" + str(i) + "_level}}",
-            str(monster.level),
-        )
+    registry.register("map_name", lambda session: session.client.map_name)
+    registry.register("map_desc", lambda session: session.client.map_desc)
+    registry.register("north", lambda session: session.client.map_north)
+    registry.register("south", lambda session: session.client.map_south)
+    registry.register("east", lambda session: session.client.map_east)
+    registry.register("west", lambda session: session.client.map_west)
+    registry.register_pattern(r"monster_([0-9]+)_(\w+)", _monster)
+
 
-    return text
+_register_placeholders(placeholders)
 
 
 def process_translate_text(
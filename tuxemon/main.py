@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional, no_type_check
+import os
+from typing import TYPE_CHECKING, Optional
 
 from tuxemon import log, prepare
 from tuxemon.session import local_session
@@ -13,11 +14,16 @@ from tuxemon.states.start import BackgroundState, StartState
 from tuxemon.states.transition.fade import FadeInTransition
 from tuxemon.states.world.worldstate import WorldState
 
+if TYPE_CHECKING:
+    from tuxemon.client import LocalPygameClient
+    from tuxemon.replay import ReplayReport
+
 logger = logging.getLogger(__name__)
 
 
 def main(
     load_slot: Optional[int] = None,
+    record: Optional[str] = None,
 ) -> None:
     """
     Configure and start the game.
@@ -27,6 +33,8 @@ def main(
 
     Parameters:
         load_slot: Number of the save slot to load, if any.
+        record: File where to record the inputs of the player, if any.
+            See :mod:`tuxemon.replay`.
 
     """
     log.configure()
@@ -39,6 +47,42 @@ def main(
 
     client = LocalPygameClient(config)
 
+    recording = None
+    if record:
+        from tuxemon.replay import record as record_inputs
+        from tuxemon.replay import save_hash
+
+        options = {
+            "load_slot": load_slot,
+            "save_hash": save_hash(load_slot) if load_slot else None,
+            "skip_titlescreen": config.skip_titlescreen,
+            "splash": config.splash,
+            "collision_map": config.collision_map,
+            "mods": config.mods,
+        }
+        recording = record_inputs(client, options)
+
+    start(client, load_slot)
+    client.main()
+    if recording is not None and record:
+        recording.save(record)
+    pygame.quit()
+
+
+def start(client: LocalPygameClient, load_slot: Optional[int] = None) -> None:
+    """
+    Push the first states of the game.
+
+    With the ``collision_map`` debug option, monsters and items are
+    also given to the player.
+
+    Parameters:
+        client: The client.
+        load_slot: Number of the save slot to load, if any.
+
+    """
+    config = client.config
+
     # global/singleton hack for now
     setattr(prepare, "GLOBAL_CONTROL", client)
 
@@ -87,16 +131,78 @@ def main(
         for _ in range(100):
             action("add_item", ("apple",))
 
-    client.main()
+
+def replay(filename: str, draw: bool = True) -> ReplayReport:
+    """
+    Replay the inputs recorded in a file, without display.
+
+    The game is started like the recorded session, from the same save,
+    and run as fast as possible. See :mod:`tuxemon.replay`.
+
+    Parameters:
+        filename: File of the recording.
+        draw: Whether to draw the frames.
+
+    Returns:
+        The time of each frame and the state hash at the end.
+
+    Raises:
+        ValueError: The save slot of the recording changed since.
+
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    log.configure()
+
+    from tuxemon import replay as input_replay
+
+    recording = input_replay.InputRecording.load(filename)
+    config = prepare.CONFIG
+    options = recording.options
+    config.mods[:] = options.get("mods", config.mods)
+    config.skip_titlescreen = options.get("skip_titlescreen", False)
+    config.splash = options.get("splash", False)
+    config.collision_map = options.get("collision_map", False)
+    prepare.init()
+
+    load_slot = options.get("load_slot")
+    if load_slot and input_replay.save_hash(load_slot) != options.get(
+        "save_hash"
+    ):
+        raise ValueError(
+            f"save slot {load_slot} changed since {filename} was recorded"
+        )
+
+    import pygame
+
+    from tuxemon.client import LocalPygameClient
+
+    client = LocalPygameClient(config)
+    report = input_replay.replay(
+        client,
+        recording,
+        lambda: start(client, load_slot),
+        draw,
+    )
     pygame.quit()
+    return report
+
+
+def headless(server_name: Optional[str] = None) -> None:
+    """
+    Configure and start a dedicated multiplayer server.
 
+    The server does not open a window, so it runs on machines without
+    a display.
+
+    Parameters:
+        server_name: Name announced to the clients.
+
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    log.configure()
 
-@no_type_check  # FIXME: dead code
-def headless() -> None:
-    """Sets up out headless server and start the game."""
-    from tuxemon.client import HeadlessClient
+    from tuxemon.server import DedicatedServer
 
-    control = HeadlessClient()
-    control.auto_state_discovery()
-    control.push_state("HeadlessServerState")
-    control.main()
+    DedicatedServer(server_name).run()
@@ -6,6 +6,7 @@ import logging
 from itertools import product
 from math import atan2, pi
 from typing import (
+    Any,
     Generator,
     List,
     Literal,
@@ -21,14 +22,13 @@ from typing import (
 )
 
 import pyscroll
-from pytmx import pytmx
 from pytmx.pytmx import TiledMap
 
 from tuxemon import prepare
 from tuxemon.compat.rect import ReadOnlyRect
 from tuxemon.event import EventObject
-from tuxemon.graphics import scaled_image_loader
 from tuxemon.locale import T
+from tuxemon.map_renderer import ChunkedRenderer
 from tuxemon.math import Vector2, Vector3
 from tuxemon.tools import round_to_divisible
 
@@ -332,6 +332,141 @@ def extract_region_properties(
         return None
 
 
+def get_explicit_tile_exits(
+    position: Tuple[int, int],
+    tile: Mapping[str, Any],
+    skip_nodes: Optional[Set[Tuple[int, int]]] = None,
+) -> Optional[Sequence[Tuple[int, int]]]:
+    """
+    Check for exits from tile which are defined in the map.
+
+    This will return exits which were defined by the map creator.
+
+    Checks "continue" and "exits" properties of the tile.
+
+    Parameters:
+        position: Original position.
+        tile: Region properties of the tile.
+        skip_nodes: Set of nodes to skip.
+
+    """
+    # Check if the players current position has any exit limitations.
+    # this check is for tiles which define the only way to exit.
+    # for instance, one-way tiles.
+
+    # does the tile define continue movements?
+    try:
+        return [tuple(dirs2[tile["continue"]] + position)]
+    except KeyError:
+        pass
+
+    # does the tile explicitly define exits?
+    try:
+        adjacent_tiles = list()
+        for direction in tile["exit"]:
+            exit_tile = tuple(dirs2[direction] + position)
+            if exit_tile in skip_nodes:
+                continue
+
+            adjacent_tiles.append(exit_tile)
+        return adjacent_tiles
+    except KeyError:
+        pass
+
+    return None
+
+
+def get_exits(
+    position: Tuple[int, int],
+    collision_map: Mapping[Tuple[int, int], Any],
+    collision_lines_map: Set[Tuple[Tuple[int, int], Direction]],
+    map_size: Tuple[int, int],
+    skip_nodes: Optional[Set[Tuple[int, int]]] = None,
+) -> Sequence[Tuple[int, int]]:
+    """
+    Return list of tiles which can be moved into.
+
+    This checks for adjacent tiles while checking for walls,
+    npcs, and collision lines, one-way tiles, etc.
+
+    Parameters:
+        position: Original position.
+        collision_map: Mapping of collisions with entities and terrain.
+        collision_lines_map: Walls between tiles.
+        map_size: Size of the map, in tiles.
+        skip_nodes: Set of nodes to skip.
+
+    Returns:
+        Sequence of adjacent and traversable tile positions.
+
+    """
+    if skip_nodes is None:
+        skip_nodes = set()
+
+    # if there are explicit way to exit this position use that information,
+    # handles 'continue' and 'exits'
+    tile_data = collision_map.get(position)
+    if tile_data:
+        exits = get_explicit_tile_exits(
+            position,
+            tile_data,
+            skip_nodes,
+        )
+    else:
+        exits = None
+
+    # get exits by checking surrounding tiles
+    adjacent_tiles = list()
+    for direction, neighbor in (
+        ("down", (position[0], position[1] + 1)),
+        ("right", (position[0] + 1, position[1])),
+        ("up", (position[0], position[1] - 1)),
+        ("left", (position[0] - 1, position[1])),
+    ):
+        # if exits are defined make sure the neighbor is present there
+        if exits and neighbor not in exits:
+            continue
+
+        # check if the neighbor region is present in skipped nodes
+        if neighbor in skip_nodes:
+            continue
+
+        # We only need to check the perimeter,
+        # as there is no way to get further out of bounds
+        if not (0 <= neighbor[0] < map_size[0]) or not (
+            0 <= neighbor[1] < map_size[1]
+        ):
+            continue
+
+        # check to see if this tile is separated by a wall
+        if (position, direction) in collision_lines_map:
+            # there is a wall so stop checking this direction
+            continue
+
+        # test if this tile has special movement handling
+        # NOTE: Do not refact. into a dict.get(xxxxx, None) style check
+        # NOTE: None has special meaning in this check
+        try:
+            tile_data = collision_map[neighbor]
+        except KeyError:
+            pass
+        else:
+            # None means tile is blocked with no specific data
+            if tile_data is None:
+                continue
+
+            try:
+                if pairs[direction] not in tile_data["enter"]:
+                    continue
+            except KeyError:
+                continue
+
+        # no tile data, so assume it is free to move into
+        adjacent_tiles.append(neighbor)
+
+    return adjacent_tiles
+
+
 class PathfindNode:
     """Used in path finding search."""
 
@@ -421,7 +556,7 @@ class TuxemonMap:
         self.size = tiled_map.width, tiled_map.height
         self.inits = inits
         self.events = events
-        self.renderer: Optional[pyscroll.BufferedRenderer] = None
+        self.renderer: Optional[ChunkedRenderer] = None
         self.edges = maps.get("edges")
         self.data = tiled_map
         self.sprite_layer = 2
@@ -460,7 +595,7 @@ class TuxemonMap:
         visual_data = pyscroll.data.TiledMapData(self.data)
         # Behaviour at the edges.
         clamp = self.edges == "clamped"
-        self.renderer = pyscroll.BufferedRenderer(
+        self.renderer = ChunkedRenderer(
             visual_data,
             prepare.SCREEN_SIZE,
             clamp_camera=clamp,
@@ -468,12 +603,7 @@ class TuxemonMap:
         )
 
     def reload_tiles(self) -> None:
-        """Reload the map tiles."""
-        data = pytmx.TiledMap(
-            self.data.filename,
-            image_loader=scaled_image_loader,
-            pixelalpha=True,
-        )
-        assert self.renderer
-        self.renderer.data.tmx.images = data.images
-        self.renderer.redraw_tiles(self.renderer._buffer)
+        """Reload the map tiles, from the tileset images."""
+        self.data.reload_images()
+        if self.renderer:
+            self.renderer.reload_tiles()
@@ -1,14 +1,16 @@
 # SPDX-License-Identifier: GPL-3.0
 # Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
 import logging
+import os
 from math import cos, pi, sin
 from typing import Any, Dict, Generator, Iterator, Mapping, Optional, Tuple
+from xml.etree import ElementTree
 
 import pytmx
 import yaml
 from natsort import natsorted
 
-from tuxemon import prepare
+from tuxemon import prepare, vfs
 from tuxemon.compat import Rect
 from tuxemon.event import EventObject, MapAction, MapCondition
 from tuxemon.graphics import scaled_image_loader
@@ -65,8 +67,7 @@ class YAMLEventLoader:
             path: Path to the file.
 
         """
-        with open(path) as fp:
-            yaml_data = yaml.load(fp.read(), Loader=yaml.SafeLoader)
+        yaml_data = yaml.load(vfs.read_bytes(path), Loader=yaml.SafeLoader)
 
         for name, event_data in yaml_data["events"].items():
             conds = []
@@ -139,11 +140,17 @@ class TMXMapLoader:
 
     **Tiled:** http://www.mapeditor.org/
 
+    Parameters:
+        load_images: Whether to load the tile images, servers without
+            display only need the collisions and events.
+
     """
 
-    def __init__(self) -> None:
+    def __init__(self, load_images: bool = True) -> None:
         # Makes mocking easier during tests
         self.image_loader = scaled_image_loader
+        if not load_images:
+            self.image_loader = pytmx.pytmx.default_image_loader
 
     def load(self, filename: str) -> TuxemonMap:
         """Load map data from a tmx map file.
@@ -175,11 +182,14 @@ class TMXMapLoader:
             The loaded map.
 
         """
-        data = pytmx.TiledMap(
-            filename=filename,
-            image_loader=self.image_loader,
-            pixelalpha=True,
-        )
+        if os.path.isfile(filename):
+            data = pytmx.TiledMap(
+                filename=filename,
+                image_loader=self.image_loader,
+                pixelalpha=True,
+            )
+        else:
+            data = self.load_archived_map(filename)
         tile_size = (data.tilewidth, data.tileheight)
         data.tilewidth, data.tileheight = prepare.TILE_SIZE
         events = list()
@@ -362,6 +372,46 @@ class TMXMapLoader:
         for tile_position in tiles_inside_rect(rect, grid_size):
             yield tile_position, extract_region_properties(region_conditions)
 
+    def load_archived_map(self, filename: str) -> pytmx.TiledMap:
+        """
+        Load a tmx map file from a mod archive.
+
+        pytmx opens the external tilesets itself, so they are read from
+        the archive and put in the map before parsing it, with their
+        image paths made relative to the map.
+
+        Parameters:
+            filename: The path to the tmx map file to load.
+
+        Returns:
+            The map data, as loaded by pytmx.
+
+        """
+        root = ElementTree.fromstring(vfs.read_bytes(filename))
+        folder = os.path.dirname(filename)
+        for node in root.findall("tileset"):
+            source = node.get("source")
+            if source is None:
+                continue
+            tileset = ElementTree.fromstring(
+                vfs.read_bytes(os.path.join(folder, source))
+            )
+            for image in tileset.iter("image"):
+                image_source = image.get("source")
+                if image_source is not None:
+                    image.set(
+                        "source",
+                        os.path.join(os.path.dirname(source), image_source),
+                    )
+            tileset.set("firstgid", node.get("firstgid", "1"))
+            node.attrib = tileset.attrib
+            node[:] = list(tileset)
+
+        data = pytmx.TiledMap(image_loader=self.image_loader, pixelalpha=True)
+        data.filename = filename
+        data.parse_xml(root)
+        return data
+
     def load_event(
         self,
         obj: pytmx.TiledObject,
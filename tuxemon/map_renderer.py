@@ -0,0 +1,438 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""Map renderer drawing pre-rendered chunks of the static tiles.
+
+The pyscroll renderer draws the map in a buffer the size of the screen,
+tile by tile and layer by layer, and scrolls it: each time the camera
+crosses a tile, the new row or column is drawn again from every layer.
+
+Here the tiles of every layer are rendered once into chunks, squares of
+``CHUNK_SIZE`` pixels, and the buffer is filled by blitting the parts of
+a few chunks. The columns holding an animated tile are left out of the
+chunks, and drawn tile by tile as pyscroll does, to keep the animations.
+
+The chunks are kept in a cache shared by the maps, the last used ones
+in memory, and optionally saved as images. They are keyed by the map,
+the chunk position and the scale, so going back to a map, or reloading
+its tiles, does not need to render them again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+from collections import OrderedDict, defaultdict
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import pygame
+import pyscroll
+from pygame.rect import Rect
+from pytmx.pytmx import TiledMap
+
+from tuxemon import vfs
+
+logger = logging.getLogger(__name__)
+
+# size of the side of a chunk in pixels, rounded down to a number of tiles
+CHUNK_SIZE = 512
+# bytes of chunks kept in memory, a chunk using up to 1 MB: a 1280x720
+# view shows up to 12 chunks, so this keeps a few screens of them
+CHUNK_CACHE_SIZE = 32 * 1024 * 1024
+
+# map id, position of the chunk in chunks, and scale (tile width in pixels)
+ChunkKey = Tuple[str, Tuple[int, int], int]
+
+
+def chunk_map_id(tmx: TiledMap) -> str:
+    """
+    Return the id of a map in the chunk cache.
+
+    The id changes when the map or its tileset images are modified, so
+    the chunks saved before are not used.
+
+    Parameters:
+        tmx: The map.
+
+    Returns:
+        Name of the map file followed by a hash of its version.
+
+    """
+    filename = tmx.filename or ""
+    folder = os.path.dirname(filename)
+    sources = [filename]
+    sources.extend(
+        os.path.join(folder, tileset.source)
+        for tileset in tmx.tilesets
+        if tileset.source
+    )
+    digest = hashlib.sha1(filename.encode())
+    for path in sources:
+        try:
+            digest.update(str(vfs.getmtime_ns(path)).encode())
+        except OSError:
+            pass
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return f"{stem}-{digest.hexdigest()[:12]}"
+
+
+def _chunk_size(chunk: pygame.surface.Surface) -> int:
+    """Return the size of the pixels of a chunk, in bytes."""
+    return chunk.get_pitch() * chunk.get_height()
+
+
+class ChunkCache:
+    """
+    Pre-rendered chunks of maps, the last used ones being kept.
+
+    The chunks may also be saved as images in a folder, and loaded from
+    there instead of rendered the next time the map is shown.
+
+    Parameters:
+        max_size: Size of the chunks kept in memory, in bytes.
+        directory: Folder where the chunks are saved, ``None`` to only
+            keep them in memory.
+
+    """
+
+    def __init__(
+        self,
+        max_size: int = CHUNK_CACHE_SIZE,
+        directory: Optional[str] = None,
+    ) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.directory = directory
+        self._chunks: OrderedDict[ChunkKey, pygame.surface.Surface]
+        self._chunks = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def path(self, key: ChunkKey) -> Optional[str]:
+        """
+        Return the path of the saved image of a chunk.
+
+        Parameters:
+            key: Key of the chunk.
+
+        Returns:
+            Path of the image, ``None`` if the chunks are not saved.
+
+        """
+        if self.directory is None:
+            return None
+        map_id, (x, y), scale = key
+        return os.path.join(self.directory, map_id, f"{scale}", f"{x}_{y}.png")
+
+    def get(self, key: ChunkKey) -> Optional[pygame.surface.Surface]:
+        """
+        Get a chunk, from memory or from its saved image.
+
+        Parameters:
+            key: Key of the chunk.
+
+        Returns:
+            The chunk, ``None`` if it has to be rendered.
+
+        """
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        path = self.path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            chunk = pygame.image.load(path)
+        except (pygame.error, OSError) as error:
+            logger.warning(f"cannot load map chunk {path}: {error}")
+            return None
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        self._store(key, chunk)
+        return chunk
+
+    def put(self, key: ChunkKey, chunk: pygame.surface.Surface) -> None:
+        """
+        Keep a chunk, and save it if the chunks are saved.
+
+        Parameters:
+            key: Key of the chunk.
+            chunk: The rendered chunk.
+
+        """
+        self._store(key, chunk)
+        path = self.path(key)
+        if path is None:
+            return
+        map_folder = os.path.dirname(os.path.dirname(path))
+        if not os.path.isdir(map_folder):
+            self._remove_old_versions(key[0])
+        temporary = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temporary, "wb") as fp:
+                pygame.image.save(chunk, fp, "png")
+            os.replace(temporary, path)
+        except (pygame.error, OSError) as error:
+            logger.warning(f"cannot save map chunk {path}: {error}")
+
+    def _store(self, key: ChunkKey, chunk: pygame.surface.Surface) -> None:
+        self._forget(key)
+        self._chunks[key] = chunk
+        self.size += _chunk_size(chunk)
+        # the chunk just stored is kept, even when bigger than the cache
+        while self.size > self.max_size and len(self._chunks) > 1:
+            self._forget(next(iter(self._chunks)))
+
+    def _forget(self, key: ChunkKey) -> None:
+        chunk = self._chunks.pop(key, None)
+        if chunk is not None:
+            self.size -= _chunk_size(chunk)
+
+    def _remove_old_versions(self, map_id: str) -> None:
+        assert self.directory
+        if not os.path.isdir(self.directory):
+            return
+        stem = map_id.rsplit("-", 1)[0]
+        for name in os.listdir(self.directory):
+            if name != map_id and name.rsplit("-", 1)[0] == stem:
+                shutil.rmtree(
+                    os.path.join(self.directory, name),
+                    ignore_errors=True,
+                )
+
+    def discard(self, map_id: str) -> None:
+        """
+        Forget the chunks of a map, and remove their saved images.
+
+        Parameters:
+            map_id: Id of the map, see ``chunk_map_id``.
+
+        """
+        for key in [key for key in self._chunks if key[0] == map_id]:
+            self._forget(key)
+        if self.directory is not None:
+            shutil.rmtree(
+                os.path.join(self.directory, map_id),
+                ignore_errors=True,
+            )
+
+    def clear(self) -> None:
+        """Forget every chunk kept in memory."""
+        self._chunks.clear()
+        self.size = 0
+
+
+chunk_cache = ChunkCache()
+
+
+class ChunkedRenderer(pyscroll.BufferedRenderer):
+    """
+    Renderer filling its buffer from pre-rendered chunks of the map.
+
+    Sprites, animations and zoom work as in the pyscroll renderer, only
+    the static tiles are drawn differently.
+
+    Parameters:
+        data: The map data.
+        size: Size of the view, in pixels.
+        cache: Cache of the chunks, the shared one if not given.
+        chunk_size: Size of the side of a chunk, in pixels, the same for
+            the renderers sharing a cache.
+        kwargs: Options of ``pyscroll.BufferedRenderer``.
+
+    """
+
+    def __init__(
+        self,
+        data: pyscroll.data.TiledMapData,
+        size: Tuple[int, int],
+        cache: Optional[ChunkCache] = None,
+        chunk_size: int = CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> None:
+        # the buffer is drawn when the base class is initialized
+        self.cache = chunk_cache if cache is None else cache
+        self.map_id = chunk_map_id(data.tmx)
+        tile_width, tile_height = data.tile_size
+        self.scale = tile_width
+        self.chunk_tiles = max(1, chunk_size // max(tile_width, tile_height))
+        self._animated = self._find_animated_columns(data)
+        super().__init__(data, size, **kwargs)
+
+    def _find_animated_columns(
+        self,
+        data: pyscroll.data.TiledMapData,
+    ) -> Dict[Tuple[int, int], Sequence[Tuple[int, int]]]:
+        """Return the tiles with an animation of each chunk."""
+        animated_gids = {gid for gid, _ in data.get_animations()}
+        if not animated_gids:
+            return {}
+        size = self.chunk_tiles
+        columns: DefaultDict[Tuple[int, int], Set[Tuple[int, int]]]
+        columns = defaultdict(set)
+        for layer in data.visible_tile_layers:
+            for y, row in enumerate(data.tmx.layers[layer].data):
+                for x, gid in enumerate(row):
+                    if gid in animated_gids:
+                        columns[(x // size, y // size)].add((x, y))
+        return {chunk: sorted(tiles) for chunk, tiles in columns.items()}
+
+    def get_chunk(self, x: int, y: int) -> pygame.surface.Surface:
+        """
+        Get a chunk, rendering it if it is not in the cache.
+
+        Parameters:
+            x: Horizontal position of the chunk, in chunks.
+            y: Vertical position of the chunk, in chunks.
+
+        Returns:
+            The static tiles of the chunk.
+
+        """
+        key = (self.map_id, (x, y), self.scale)
+        chunk = self.cache.get(key)
+        if chunk is None:
+            chunk = self._render_chunk(x, y)
+            self.cache.put(key, chunk)
+        return chunk
+
+    def _render_chunk(self, x: int, y: int) -> pygame.surface.Surface:
+        tile_width, tile_height = self.data.tile_size
+        size = self.chunk_tiles
+        area = Rect(x * size, y * size, size, size).clip(self.map_tiles)
+        chunk = pygame.Surface((area.w * tile_width, area.h * tile_height))
+        self._clear_surface(chunk)
+        animated = set(self._animated.get((x, y), ()))
+        images = self.data.tmx.images
+        blits = []
+        for layer in self.data.visible_tile_layers:
+            rows = self.data.tmx.layers[layer].data
+            for tile_y in range(area.top, area.bottom):
+                row = rows[tile_y]
+                for tile_x in range(area.left, area.right):
+                    gid = row[tile_x]
+                    if not gid or (tile_x, tile_y) in animated:
+                        continue
+                    image = images[gid]
+                    if image:
+                        position = (
+                            (tile_x - area.x) * tile_width,
+                            (tile_y - area.y) * tile_height,
+                        )
+                        blits.append((image, position))
+        chunk.blits(blits, doreturn=False)
+        return chunk
+
+    @property
+    def map_tiles(self) -> Rect:
+        """Rect of the map, in tiles."""
+        return Rect((0, 0), self.data.map_size)
+
+    def _draw_tiles(self, surface: pygame.surface.Surface, area: Rect) -> None:
+        """Draw the tiles of an area of the tile view into the buffer."""
+        tile_width, tile_height = self.data.tile_size
+        view = self._tile_view
+        self._clear_surface(
+            surface,
+            (
+                (area.x - view.left) * tile_width,
+                (area.y - view.top) * tile_height,
+                area.w * tile_width,
+                area.h * tile_height,
+            ),
+        )
+        area = area.clip(self.map_tiles)
+        if not area.w or not area.h:
+            return
+        size = self.chunk_tiles
+        blits: List[Any] = []
+        columns: List[Tuple[int, int]] = []
+        for chunk_y in range(area.top // size, (area.bottom - 1) // size + 1):
+            for chunk_x in range(
+                area.left // size,
+                (area.right - 1) // size + 1,
+            ):
+                part = Rect(
+                    chunk_x * size,
+                    chunk_y * size,
+                    size,
+                    size,
+                ).clip(area)
+                source = Rect(
+                    (part.x - chunk_x * size) * tile_width,
+                    (part.y - chunk_y * size) * tile_height,
+                    part.w * tile_width,
+                    part.h * tile_height,
+                )
+                destination = (
+                    (part.x - view.left) * tile_width,
+                    (part.y - view.top) * tile_height,
+                )
+                blits.append(
+                    (self.get_chunk(chunk_x, chunk_y), destination, source)
+                )
+                columns.extend(
+                    tile
+                    for tile in self._animated.get((chunk_x, chunk_y), ())
+                    if part.collidepoint(tile)
+                )
+        # the tiles are queried, so that pyscroll tracks their animation
+        for x, y in columns:
+            for tile_x, tile_y, _, image in self.data.get_tile_images_by_rect(
+                (x, y, 1, 1)
+            ):
+                destination = (
+                    (tile_x - view.left) * tile_width,
+                    (tile_y - view.top) * tile_height,
+                )
+                blits.append((image, destination))
+        surface.blits(blits, doreturn=False)
+
+    def redraw_tiles(self, surface: pygame.surface.Surface) -> None:
+        self._draw_tiles(surface, Rect(self._tile_view))
+
+    def _queue_edge_tiles(self, dx: int, dy: int) -> None:
+        # called once the buffer is scrolled: the edges are drawn at once,
+        # and nothing is left for pyscroll to draw
+        view = self._tile_view
+        self._tile_queue = iter(())
+        if dx > 0:
+            self._draw_tiles(
+                self._buffer,
+                Rect(view.right - dx, view.top, dx, view.height),
+            )
+        elif dx < 0:
+            self._draw_tiles(
+                self._buffer,
+                Rect(view.left, view.top, -dx, view.height),
+            )
+        if dy > 0:
+            self._draw_tiles(
+                self._buffer,
+                Rect(view.left, view.bottom - dy, view.width, dy),
+            )
+        elif dy < 0:
+            self._draw_tiles(
+                self._buffer,
+                Rect(view.left, view.top, view.width, -dy),
+            )
+
+    def reload_tiles(self) -> None:
+        """Draw the map again, once the tile images are reloaded."""
+        self.cache.discard(self.map_id)
+        self.map_id = chunk_map_id(self.data.tmx)
+        self.data.reload_animations()
+        self.redraw_tiles(self._buffer)
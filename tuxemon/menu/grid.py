@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+from __future__ import annotations
+
+import math
+from typing import Generic, Iterator, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class VirtualGrid(Generic[T]):
+    """
+    Window over a grid of items, for menus too long to build at once.
+
+    The items fill the grid row by row. Only the rows inside the window
+    have widgets: menus build them from ``visible`` and rebuild them
+    after a ``scroll``, so the cost of a menu depends on the size of
+    the window, not on the number of items.
+
+    Parameters:
+        items: Items of the grid.
+        columns: Number of items per row.
+        visible_rows: Number of rows inside the window.
+
+    """
+
+    def __init__(
+        self,
+        items: Sequence[T],
+        columns: int,
+        visible_rows: int,
+    ) -> None:
+        self.items = items
+        self.columns = columns
+        self.visible_rows = visible_rows
+        self.first_row = 0
+
+    @property
+    def rows(self) -> int:
+        """Number of rows of the whole grid."""
+        return math.ceil(len(self.items) / self.columns)
+
+    @property
+    def visible(self) -> Sequence[T]:
+        """Items inside the window, row by row."""
+        start = self.first_row * self.columns
+        return self.items[start : start + self.visible_rows * self.columns]
+
+    def by_column(self) -> Iterator[Tuple[int, Optional[T]]]:
+        """
+        Cells inside the window, column by column.
+
+        Menus with columns lay their widgets out column by column, so
+        this is the order to add them in. The empty cells of a partial
+        last row are yielded as ``None``, to be filled with blank
+        widgets.
+
+        Yields:
+            Index in ``visible`` and item.
+
+        """
+        visible = self.visible
+        rows = math.ceil(len(visible) / self.columns)
+        for column in range(self.columns):
+            for row in range(rows):
+                index = row * self.columns + column
+                yield index, visible[index] if index < len(visible) else None
+
+    def scroll(self, rows: int) -> bool:
+        """
+        Move the window, without going past the first or last row.
+
+        Parameters:
+            rows: Number of rows to move down, negative to move up.
+
+        Returns:
+            Whether the window moved.
+
+        """
+        last = max(self.rows - self.visible_rows, 0)
+        first_row = min(max(self.first_row + rows, 0), last)
+        moved = first_row != self.first_row
+        self.first_row = first_row
+        return moved
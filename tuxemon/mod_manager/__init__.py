@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: GPL-3.0
 # Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
 import configparser
+import hashlib
 import json
 import logging
 import os
@@ -8,15 +9,45 @@ import pathlib
 import shutil
 import urllib.request
 import zipfile
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from tuxemon.constants import paths
 from tuxemon.mod_manager.symlink_missing import symlink_missing
 
 logger = logging.getLogger(__name__)
 
+# packages downloaded at the same time, also the size of the connection pool
+DOWNLOAD_WORKERS = 4
+CHUNK_SIZE = 1024 * 1024
+
+
+class PackageRelease(NamedTuple):
+    """A release of a package, as resolved before downloading it."""
+
+    author: str
+    name: str
+    release: float
+    repo: str
+    sha256: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        return (
+            f"{self.repo}/packages/{self.author}/{self.name}"
+            f"/releases/{self.release}/download"
+        )
+
+    @property
+    def filename(self) -> str:
+        return os.path.join(
+            paths.CACHE_DIR,
+            f"downloaded_packages/{self.name}.{self.release}.zip",
+        )
+
 
 def sanitize_paths(path: str) -> str:
     """Removes path specific characters like /."""
@@ -42,6 +73,15 @@ class Manager:
         self.url = other_urls
         self.packages: List[Any] = []
 
+        # one pool of connections for every request to the repositories
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=DOWNLOAD_WORKERS,
+            pool_maxsize=DOWNLOAD_WORKERS,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         if default_to_cache:
             self.packages = self.read_from_cache()
 
@@ -65,7 +105,7 @@ class Manager:
 
     def update(self, url: str) -> Any:
         """Returns the response from the server"""
-        packages = requests.get(url + "/api/packages")
+        packages = self.session.get(url + "/api/packages")
         return packages.json()
 
     def update_all(self) -> None:
@@ -92,83 +132,290 @@ class Manager:
         install_deps: bool = True,
         installed: Any = None,
     ) -> None:
-        """Downloads the specified package"""
+        """
+        Downloads the specified package, and its dependencies.
+
+        The whole dependency graph is resolved first, then the packages
+        are downloaded and extracted concurrently.
+
+        Parameters:
+            author: Author of the package.
+            name: Name of the package.
+            release: Release to download, ``None`` for the latest one.
+            repo: Repository of the package, looked up if not given.
+            dont_extract: Only download the archives.
+            install_deps: Whether to download the dependencies.
+            installed: Packages ("author/name") already installed.
+
+        """
         if repo is None:
             repo = self.get_package_repo(name)
 
-            # Remove trailing slash
-            if repo[-1] == "/":
-                repo = repo[:-1]
+        # Remove trailing slash
+        repo = str(repo).rstrip("/")
+
+        if install_deps:
+            packages = self.resolve_dependencies(
+                author, name, release, repo, installed
+            )
+        else:
+            packages = [self.resolve_release(author, name, release, repo)]
+        self.download_packages(packages, dont_extract)
+        logging.info("Done!")
+
+    def resolve_release(
+        self,
+        author: str,
+        name: str,
+        release: Optional[float],
+        repo: str,
+    ) -> PackageRelease:
+        """
+        Finds the release of a package to download.
+
+        Parameters:
+            author: Author of the package.
+            name: Name of the package.
+            release: Release to download, ``None`` for the latest one.
+            repo: Repository of the package.
+
+        Returns:
+            The release, with its checksum if the repository gives one.
 
+        """
+        r = self.session.get(repo + f"/api/packages/{author}/{name}/releases")
+        r.raise_for_status()
+        releases = r.json()
         if release is None:
             logging.info("Getting latest release...")
-            r = requests.get(repo + f"/api/packages/{author}/{name}/releases")
-            logger.debug(r.text, author, name)
-            logger.debug(repo + f"/api/packages/{author}/{name}/releases")
             # Get latest release (largest number).
-            latest = 0
-            for i in r.json():
-                if i["id"] > latest:
-                    latest = i["id"]
-            release = latest
+            latest = max(releases, key=lambda i: i["id"], default=None)
+        else:
+            latest = next((i for i in releases if i["id"] == release), None)
+        if latest is None:
+            raise ValueError(f"No release {release} of {author}/{name}")
 
         # Sanitize author, name and release
-        author = sanitize_paths(author)
-        name = sanitize_paths(name)
-        release = float(sanitize_paths(str(release)))
-        logger.debug(
-            " ".join(
-                [
-                    author,
-                    name,
-                    str(release),
-                    repo,
-                    str(dont_extract),
-                    str(install_deps),
-                    str(installed),
-                ]
-            )
+        return PackageRelease(
+            sanitize_paths(author),
+            sanitize_paths(name),
+            float(sanitize_paths(str(latest["id"]))),
+            repo,
+            latest.get("sha256"),
         )
-        url = (
-            str(repo)
-            + f"/packages/{author}/{name}/releases/{release}/download"
+
+    def resolve_dependencies(
+        self,
+        author: str,
+        name: str,
+        release: Optional[float],
+        repo: str,
+        installed: Optional[Sequence[str]] = None,
+    ) -> List[PackageRelease]:
+        """
+        Resolves a package and all its hard dependencies.
+
+        Dependencies are looked up level by level, each package once,
+        skipping the ones already in the mods folder.
+
+        Parameters:
+            author: Author of the package.
+            name: Name of the package.
+            release: Release of the package, ``None`` for the latest one.
+            repo: Repository of the packages.
+            installed: Packages ("author/name") to skip.
+
+        Returns:
+            The package, then its dependencies.
+
+        """
+        seen = set(installed or ())
+        seen.add(f"{author}/{name}")
+        resolved = [self.resolve_release(author, name, release, repo)]
+        queue = [(author, name)]
+        while queue:
+            author, name = queue.pop(0)
+            for package in self.get_dependencies(author, name, repo):
+                if package in seen or package == "default":
+                    continue
+                seen.add(package)
+                dep_author, dep_name = package.split("/")
+                # installed either extracted or mounted as an archive
+                installed_path = os.path.join(
+                    paths.BASEDIR, "mods", sanitize_paths(dep_name)
+                )
+                if os.path.exists(installed_path) or os.path.exists(
+                    installed_path + ".zip"
+                ):
+                    continue
+                resolved.append(
+                    self.resolve_release(dep_author, dep_name, None, repo)
+                )
+                queue.append((dep_author, dep_name))
+        return resolved
+
+    def get_dependencies(self, author: str, name: str, repo: str) -> List[str]:
+        """
+        Requests the hard dependencies of a package.
+
+        Parameters:
+            author: Author of the package.
+            name: Name of the package.
+            repo: Repository of the package.
+
+        Returns:
+            The dependencies, as "author/name".
+
+        """
+        r = self.session.get(
+            f"{repo}/api/packages/{author}/{name}/dependencies/?only_hard=1"
         )
+        if r.status_code != 200:
+            raise ValueError(
+                f"Requested {r.url}, received status code {r.status_code}"
+            )
+        dep_list = r.json()
+        return [
+            package
+            for dependency in dep_list
+            for entry in dep_list[dependency]
+            for package in entry["packages"]
+        ]
+
+    def download_packages(
+        self,
+        packages: Sequence[PackageRelease],
+        dont_extract: bool = False,
+    ) -> None:
+        """
+        Downloads packages concurrently, extracting each once downloaded.
+
+        Parameters:
+            packages: Releases to download.
+            dont_extract: Only download the archives.
+
+        """
+        with ThreadPoolExecutor(DOWNLOAD_WORKERS) as pool:
+            downloads = {
+                pool.submit(self.download_release, package): package
+                for package in packages
+            }
+            extractions: List[Future[None]] = []
+            for future in as_completed(downloads):
+                future.result()
+                package = downloads[future]
+                if not dont_extract:
+                    logging.info(f"Extracting {package.name}...")
+                    extractions.append(
+                        pool.submit(
+                            self.extract_package,
+                            package.filename,
+                            package.name,
+                        )
+                    )
+            for extraction in extractions:
+                extraction.result()
+
+        for package in packages:
+            outfolder = os.path.join(paths.BASEDIR, "mods", package.name)
+            self.write_package_to_list(
+                os.path.relpath(outfolder), package.name
+            )
+
+    def download_release(self, package: PackageRelease) -> None:
+        """
+        Downloads the archive of a release.
 
-        filename = os.path.join(
-            paths.CACHE_DIR, f"downloaded_packages/{name}.{release}.zip"
+        An interrupted download is resumed with a range request, and the
+        archive is checked against the checksum of the release, or its
+        own CRCs when the repository gives no checksum.
+
+        Parameters:
+            package: Release to download.
+
+        """
+        filename = package.filename
+        partial = filename + ".part"
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        logging.info(
+            f"Downloading release {package.release} of "
+            f"{package.author}/{package.name}"
         )
 
-        logging.info(f"Downloading release {release} of {author}/{name}")
+        digest = hashlib.sha256()
+        downloaded_size = 0
+        if os.path.exists(partial):
+            with open(partial, "rb") as file:
+                for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    downloaded_size += len(chunk)
+
+        headers = {}
+        if downloaded_size:
+            headers["Range"] = f"bytes={downloaded_size}-"
+        with self.session.get(package.url, stream=True, headers=headers) as r:
+            if r.status_code == 416:
+                # the partial file is already complete
+                pass
+            else:
+                r.raise_for_status()
+                mode = "ab"
+                if r.status_code != 206:
+                    # the server ignored the range, start over
+                    mode = "wb"
+                    digest = hashlib.sha256()
+                    downloaded_size = 0
+                with open(partial, mode) as file:
+                    for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                        file.write(chunk)
+                        digest.update(chunk)
+                        downloaded_size += len(chunk)
+                        logger.debug(f"Downloaded {downloaded_size} bytes")
+
+        if package.sha256 is not None:
+            valid = digest.hexdigest() == package.sha256.lower()
+        else:
+            with zipfile.ZipFile(partial) as zipf:
+                valid = zipf.testzip() is None
+        if not valid:
+            os.remove(partial)
+            raise ValueError(f"Corrupted download of {package.url}")
+        os.replace(partial, filename)
+
+    def extract_package(self, filename: str, name: str) -> None:
+        """
+        Extracts a downloaded package into the mods folder.
 
-        # Based on answer from https://stackoverflow.com/a/16696317/14590202
-        with requests.get(url, stream=True) as r:
-            file_size = r.headers["content-length"]
-            downloaded_size = 0
-            r.raise_for_status()
-            with open(filename, "wb") as file:
-                for chunk in r.iter_content(chunk_size=8096):
-                    file.write(chunk)
-                    downloaded_size += 8096
-                    logger.debug(f"Downloaded {downloaded_size} bytes")
+        Parameters:
+            filename: Path of the archive.
+            name: Name of the package.
 
-        outfolder = os.path.join(paths.BASEDIR, "mods", name)
+        """
+        outfolder = os.path.join(paths.BASEDIR, "mods")
+        with zipfile.ZipFile(filename) as zipf:
+            free = shutil.disk_usage(os.getcwd()).free
+            # get the filesize, based on https://stackoverflow.com/a/39953116/14590202
+            zipsize = sum(zinfo.file_size for zinfo in zipf.filelist)
+            if zipsize > free:
+                raise OSError(
+                    f"Zip contents are bigger than available disk space ({zipsize} > {free})"
+                )
+            zipf.extractall(path=os.path.join(outfolder, name))
 
-        self.write_package_to_list(os.path.relpath(outfolder), name)
+    def mount_package(self, filename: str, name: str) -> None:
+        """
+        Installs a downloaded package as is, to be read from its archive.
 
-        if not dont_extract:
-            logging.info("Extracting...")
-            self.install_local_package(filename, name=name)
+        Parameters:
+            filename: Path of the archive.
+            name: Name of the package.
 
-        if install_deps:
-            # This function calls download_package, might cause issues
-            self.install_dependencies(
-                author=author,
-                name=name,
-                repo=repo,
-                dont_extract=dont_extract,
-                done=installed,
-            )
-        logging.info("Done!")
+        """
+        outfolder = os.path.join(paths.BASEDIR, "mods")
+        # raises BadZipFile rather than installing an unreadable mod
+        with zipfile.ZipFile(filename):
+            pass
+        shutil.copyfile(filename, os.path.join(outfolder, name + ".zip"))
 
     def install_dependencies(
         self,
@@ -178,36 +425,11 @@ class Manager:
         symlink: bool = True,
         **args: Any,
     ) -> None:
-        """Recursively resolve dependencies and symlink them"""
-        logger.debug(author, name, repo)
-        # Request dependencies for specified package
-        r = requests.get(
-            f"{repo}/api/packages/{author}/{name}/dependencies/?only_hard=1"
+        """Resolve dependencies and download them"""
+        packages = self.resolve_dependencies(
+            author, name, None, repo, args.get("done")
         )
-        if r.status_code != 200:
-            raise ValueError(
-                f"Requested {r.url}, received status code {r.status_code}"
-            )
-        logger.debug(r.text, author, name)
-        dep_list = r.json()
-        # Resolve dependencies
-        for dependency in dep_list:
-            for entry in dep_list[dependency]:
-                for package in entry["packages"]:
-                    package = sanitize_paths(package)
-                    if os.path.exists(
-                        os.path.join(paths.BASEDIR, "mods", package)
-                    ):
-                        continue
-                    if package == "default":
-                        continue
-                    self.download_package(
-                        package.split("/")[0],
-                        package.split("/")[1],
-                        release=None,
-                        repo=repo,
-                        install_deps=False,
-                    )
+        self.download_packages(packages[1:], args.get("dont_extract", False))
 
     def parse_mod_conf(self, content: Any) -> Any:
         """
@@ -290,19 +512,16 @@ class Manager:
         name: str,
         download_deps: bool = False,
         link_deps: bool = False,
+        extract: bool = True,
     ) -> None:
         """
         Installs local packages.
-        Based on the download_package function, but without the downloads
+        Based on the download_package function, but without the downloads.
+        Packages which are not extracted are read from their archive.
         """
         outfolder = os.path.join(paths.BASEDIR, "mods")
         self.write_package_to_list(os.path.relpath(outfolder), name)
-        with zipfile.ZipFile(filename) as zipf:
-            free = shutil.disk_usage(os.getcwd()).free
-            # get the filesize, based on https://stackoverflow.com/a/39953116/14590202
-            zipsize = sum(zinfo.file_size for zinfo in zipf.filelist)
-            if zipsize > free:
-                raise OSError(
-                    f"Zip contents are bigger than available disk space ({zipsize} > {free})"
-                )
-            zipf.extractall(path=os.path.join(outfolder, name))
+        if extract:
+            self.extract_package(filename, name)
+        else:
+            self.mount_package(filename, name)
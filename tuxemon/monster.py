@@ -7,8 +7,7 @@ import random
 import uuid
 from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence
 
-from tuxemon import formula, fusion, graphics, tools
-from tuxemon.config import TuxemonConfig
+from tuxemon import formula, fusion, graphics, prepare, tools
 from tuxemon.db import (
     CategoryCondition,
     ElementType,
@@ -25,7 +24,7 @@ from tuxemon.db import (
     TasteWarm,
     db,
 )
-from tuxemon.element import Element
+from tuxemon.element import Element, get_element
 from tuxemon.locale import T
 from tuxemon.shape import Shape
 from tuxemon.sprite import Sprite
@@ -34,8 +33,8 @@ from tuxemon.technique.technique import Technique, decode_moves, encode_moves
 if TYPE_CHECKING:
     import pygame
 
+    from tuxemon.combat import EnqueuedAction
     from tuxemon.npc import NPC
-    from tuxemon.states.combat.combat import EnqueuedAction
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +65,16 @@ SIMPLE_PERSISTANCE_ATTRIBUTES = (
 MAX_LEVEL = 999
 MAX_MOVES = 4
 MISSING_IMAGE = "gfx/sprites/battle/missing.png"
+# resolved path of each sprite name, see Monster.get_sprite_path
+_sprite_paths: Dict[str, str] = {}
+
+
+def clear_sprite_paths() -> None:
+    """Forget the resolved sprite paths, as the db or mods were reloaded."""
+    _sprite_paths.clear()
+
+
+db.add_load_callback(clear_sprite_paths)
 
 
 # class definition for tuxemon flairs:
@@ -148,15 +157,15 @@ class Monster:
         # 0 is 0% capture rate and 255 has a very good chance of capture. This numbers are based on the capture system
         # calculations. This is inspired by the calculations which can be found at:
         # https://bulbapedia.bulbagarden.net/wiki/List_of_Pok%C3%A9mon_by_catch_rate
-        self.catch_rate = TuxemonConfig().default_monster_catch_rate
+        self.catch_rate = prepare.CONFIG.default_monster_catch_rate
 
         # The catch_resistance value is calculated during the capture. The upper and lower catch_resistance
         # set the span on which the catch_resistance will be. For more information check capture.py
         self.upper_catch_resistance = (
-            TuxemonConfig().default_upper_monster_catch_resistance
+            prepare.CONFIG.default_upper_monster_catch_resistance
         )
         self.lower_catch_Resistance = (
-            TuxemonConfig().default_lower_monster_catch_resistance
+            prepare.CONFIG.default_lower_monster_catch_resistance
         )
 
         # The tuxemon's state is used for various animations, etc. For example
@@ -208,7 +217,7 @@ class Monster:
         self.taste_warm = self.set_taste_warm(self.taste_warm)
         # types
         for _ele in results.types:
-            _element = Element(_ele)
+            _element = get_element(_ele)
             self.types.append(_element)
             self._types.append(_element)
 
@@ -221,15 +230,15 @@ class Monster:
         self.weight = self.set_char_weight(results.weight)
         self.gender = random.choice(list(results.possible_genders))
         self.catch_rate = (
-            results.catch_rate or TuxemonConfig().default_monster_catch_rate
+            results.catch_rate or prepare.CONFIG.default_monster_catch_rate
         )
         self.upper_catch_resistance = (
             results.upper_catch_resistance
-            or TuxemonConfig().default_upper_monster_catch_resistance
+            or prepare.CONFIG.default_upper_monster_catch_resistance
         )
         self.lower_catch_resistance = (
             results.lower_catch_resistance
-            or TuxemonConfig().default_lower_monster_catch_resistance
+            or prepare.CONFIG.default_lower_monster_catch_resistance
         )
 
         # Look up the moves that this monster can learn AND LEARN THEM.
@@ -287,6 +296,8 @@ class Monster:
         """
 
         self.moves.append(technique)
+        if self.owner is not None:
+            self.owner.monster_registry.update(self)
 
     def return_types(self) -> None:
         """
@@ -571,9 +582,11 @@ class Monster:
 
         """
         if sprite == "front":
-            surface = graphics.load_sprite(self.front_battle_sprite, **kwargs)
+            surface = self._load_battle_sprite(
+                self.front_battle_sprite, kwargs
+            )
         elif sprite == "back":
-            surface = graphics.load_sprite(self.back_battle_sprite, **kwargs)
+            surface = self._load_battle_sprite(self.back_battle_sprite, kwargs)
         elif sprite == "menu":
             assert (
                 not kwargs
@@ -590,11 +603,19 @@ class Monster:
                 f"gfx/sprites/battle/{self.slug}-{sprite}-{flair.name}"
             )
             if flair_path != MISSING_IMAGE:
-                flair_sprite = graphics.load_sprite(flair_path, **kwargs)
-                surface.image.blit(flair_sprite.image, (0, 0))
+                flair_image = graphics.load_shared_image(flair_path)
+                surface.image.blit(flair_image, (0, 0))
 
         return surface
 
+    @staticmethod
+    def _load_battle_sprite(filename: str, rect_kwargs: Any) -> Sprite:
+        # the sprite gets its own copy of the shared image, as combat
+        # draws flairs on it and fades it out
+        sprite = Sprite(image=graphics.load_shared_image(filename).copy())
+        sprite.rect = sprite.image.get_rect(**rect_kwargs)
+        return sprite
+
     def set_flairs(self) -> None:
         """Set flairs of this monster if they were not already configured."""
         if len(self.flairs) > 0 or self.slug == "":
@@ -616,20 +637,29 @@ class Monster:
         This adds the appropriate file extension if the sprite exists,
         and returns a dummy image if it can't be found.
 
+        Paths are resolved once per sprite name (which holds the slug,
+        the kind of sprite and the flair) and shared by every monster.
+
         Returns:
             Path to sprite or placeholder image.
 
         """
+        try:
+            return _sprite_paths[sprite]
+        except KeyError:
+            pass
+
+        full_path = MISSING_IMAGE
         try:
             path = "%s.png" % sprite
-            full_path = tools.transform_resource_filename(path)
-            if full_path:
-                return full_path
+            full_path = tools.transform_resource_filename(path) or full_path
         except OSError:
             pass
 
-        logger.error(f"Could not find monster sprite {sprite}")
-        return MISSING_IMAGE
+        if full_path == MISSING_IMAGE:
+            logger.error(f"Could not find monster sprite {sprite}")
+        _sprite_paths[sprite] = full_path
+        return full_path
 
     def load_sprites(self) -> bool:
         """
@@ -642,11 +672,14 @@ class Monster:
         if len(self.sprites):
             return True
 
-        self.sprites["front"] = graphics.load_and_scale(
+        # shared with every monster of the same kind, never drawn on
+        self.sprites["front"] = graphics.load_shared_image(
             self.front_battle_sprite
         )
-        self.sprites["back"] = graphics.load_and_scale(self.back_battle_sprite)
-        self.sprites["menu"] = graphics.load_and_scale(self.menu_sprite_1)
+        self.sprites["back"] = graphics.load_shared_image(
+            self.back_battle_sprite
+        )
+        self.sprites["menu"] = graphics.load_shared_image(self.menu_sprite_1)
         return False
 
     def get_state(self) -> Mapping[str, Any]:
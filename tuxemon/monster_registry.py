@@ -0,0 +1,209 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from tuxemon.db import ElementType
+
+if TYPE_CHECKING:
+    from tuxemon.monster import Monster
+
+
+class MonsterRegistry:
+    """
+    Indexes of the monsters of a NPC, in their party and storage boxes.
+
+    The NPC keeps its party and boxes as lists, and tells the registry
+    about each monster added or removed, so finding a monster by slug
+    or instance id, or checking the techniques and types of the party,
+    does not scan the lists.
+
+    The techniques and types of a party monster are counted when it is
+    added; ``update`` counts them again once they change. The types are
+    the monster's own, not the ones a technique gives it for a battle.
+
+    ``storage_version`` changes each time a monster is stored, removed
+    from storage, or ``update``d while stored, so the saves know when
+    the storage boxes must be encoded again.
+
+    """
+
+    def __init__(self) -> None:
+        self._party: Dict[uuid.UUID, Monster] = {}
+        self._slugs: Counter[str] = Counter()
+        self._techniques: Counter[str] = Counter()
+        self._types: Counter[ElementType] = Counter()
+        # what is counted for each party monster
+        self._counted: Dict[uuid.UUID, Tuple[List[str], List[ElementType]]]
+        self._counted = {}
+        # monsters in storage, with the box they are in
+        self._storage: Dict[uuid.UUID, Tuple[Monster, List[Monster]]] = {}
+        self.storage_version = 0
+
+    def clear(self) -> None:
+        """Forget every monster."""
+        self._party.clear()
+        self._slugs.clear()
+        self._techniques.clear()
+        self._types.clear()
+        self._counted.clear()
+        self._storage.clear()
+        self.storage_version += 1
+
+    def _count(self, monster: Monster) -> None:
+        techniques = [tech.slug for tech in monster.moves]
+        types = [ele.slug for ele in monster._types]
+        self._techniques.update(techniques)
+        self._types.update(types)
+        self._counted[monster.instance_id] = (techniques, types)
+
+    def _uncount(self, monster: Monster) -> None:
+        techniques, types = self._counted.pop(monster.instance_id)
+        self._techniques.subtract(techniques)
+        self._types.subtract(types)
+
+    def add_to_party(self, monster: Monster) -> None:
+        """
+        Index a monster added to the party.
+
+        Parameters:
+            monster: The monster.
+
+        """
+        self.remove_from_party(monster)
+        self._party[monster.instance_id] = monster
+        self._slugs[monster.slug] += 1
+        self._count(monster)
+
+    def remove_from_party(self, monster: Monster) -> bool:
+        """
+        Forget a monster removed from the party.
+
+        Parameters:
+            monster: The monster.
+
+        Returns:
+            Whether the monster was in the party.
+
+        """
+        if self._party.get(monster.instance_id) is not monster:
+            return False
+        del self._party[monster.instance_id]
+        self._slugs[monster.slug] -= 1
+        self._uncount(monster)
+        return True
+
+    def update(self, monster: Monster) -> None:
+        """
+        Count again the techniques and types of a party monster.
+
+        A stored monster is not counted, but its box is saved again.
+
+        Parameters:
+            monster: The monster, which changed.
+
+        """
+        if self._party.get(monster.instance_id) is monster:
+            self._uncount(monster)
+            self._count(monster)
+        elif self.in_storage(monster.instance_id) is monster:
+            self.storage_version += 1
+
+    def add_to_storage(self, monster: Monster, box: List[Monster]) -> None:
+        """
+        Index a monster added to a storage box.
+
+        Parameters:
+            monster: The monster.
+            box: The box it is in.
+
+        """
+        self._storage[monster.instance_id] = (monster, box)
+        self.storage_version += 1
+
+    def remove_from_storage(self, monster: Monster) -> Optional[List[Monster]]:
+        """
+        Forget a monster removed from storage.
+
+        Parameters:
+            monster: The monster.
+
+        Returns:
+            The box the monster was in, ``None`` if it was not stored.
+
+        """
+        stored = self._storage.get(monster.instance_id)
+        if stored is None or stored[0] is not monster:
+            return None
+        del self._storage[monster.instance_id]
+        self.storage_version += 1
+        return stored[1]
+
+    def in_party(self, instance_id: uuid.UUID) -> Optional[Monster]:
+        """
+        Find the party monster which has an instance id.
+
+        Parameters:
+            instance_id: The instance_id of the monster.
+
+        Returns:
+            The monster, or None.
+
+        """
+        return self._party.get(instance_id)
+
+    def in_storage(self, instance_id: uuid.UUID) -> Optional[Monster]:
+        """
+        Find the stored monster which has an instance id.
+
+        Parameters:
+            instance_id: The instance_id of the monster.
+
+        Returns:
+            The monster, or None.
+
+        """
+        stored = self._storage.get(instance_id)
+        return None if stored is None else stored[0]
+
+    def count_slug(self, slug: str) -> int:
+        """
+        Count the party monsters of a species.
+
+        Parameters:
+            slug: The slug name of the monster.
+
+        Returns:
+            Number of monsters with this slug in the party.
+
+        """
+        return self._slugs[slug]
+
+    def has_technique(self, slug: str) -> bool:
+        """
+        Whether a monster of the party knows a technique.
+
+        Parameters:
+            slug: The slug name of the technique.
+
+        Returns:
+            Whether the technique is in the party.
+
+        """
+        return self._techniques[slug] > 0
+
+    def has_type(self, slug: ElementType) -> bool:
+        """
+        Whether a monster of the party has a type.
+
+        Parameters:
+            slug: The slug name of the type.
+
+        Returns:
+            Whether the type is in the party.
+
+        """
+        return self._types[slug] > 0
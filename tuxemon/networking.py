@@ -6,16 +6,21 @@ from __future__ import annotations
 
 import logging
 import pprint
-from datetime import datetime
+import time
 from typing import (
     TYPE_CHECKING,
     Any,
     Dict,
+    Iterable,
     List,
     Literal,
+    Mapping,
+    MutableMapping,
     Optional,
+    Set,
     Tuple,
     TypedDict,
+    cast,
 )
 
 import pygame as pg
@@ -41,6 +46,11 @@ except ImportError:
 if TYPE_CHECKING:
     from tuxemon.client import LocalPygameClient
 
+# server ticks per second, the notifications of a tick are sent together
+TICK_RATE = 20
+# seconds without a ping before a client is dropped
+CLIENT_TIMEOUT = 15
+
 
 class CharDict(TypedDict):
     tile_pos: Tuple[int, int]
@@ -63,14 +73,25 @@ class TuxemonServer:
     """Server class for multiplayer games. Creates a netaria server and
     synchronizes the local game with all client states.
 
+    Notifications are queued and sent once per tick, in one packet per
+    client. A client is only notified of the clients on its map, and
+    the character dictionaries it receives only hold the values that
+    changed since the last ones it was sent.
+
     :param game: Instance of the local game.
+    :param server_name: Name announced to the clients.
+    :param network: Transport used instead of a Neteria server, such as
+        the loopback of a load test.
 
     :type game: tuxemon.control.Control object.
 
     """
 
     def __init__(
-        self, game: LocalPygameClient, server_name: Any = None
+        self,
+        game: Optional[LocalPygameClient],
+        server_name: Any = None,
+        network: Any = None,
     ) -> None:
         self.game = game
         if not server_name:
@@ -81,6 +102,17 @@ class TuxemonServer:
         self.listening = False
         self.interfaces: Dict[str, Any] = {}
         self.ips: List[str] = []
+        # notifications waiting for the next tick, by receiving client
+        self.outbox: Dict[str, List[Mapping[str, Any]]] = {}
+        # last character values sent to each client, by client described
+        self.sent_chars: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # clients on each map
+        self.maps: Dict[str, Set[str]] = {}
+        self.next_tick = 0.0
+
+        if network is not None:
+            self.server = network
+            return
 
         # Handle users without networking support.
         if not networking:
@@ -94,24 +126,183 @@ class TuxemonServer:
         )
 
     def update(self) -> Optional[bool]:
-        """Updates the server state with information sent from the clients."""
-        self.server_timestamp = datetime.now()
-        for cuuid in self.server.registry:
-            try:
-                difference = (
-                    self.server_timestamp
-                    - self.server.registry[cuuid]["ping_timestamp"]
+        """
+        Run a server tick, if one is due.
+
+        A tick drops the clients that stopped pinging, then sends the
+        queued notifications.
+
+        Returns:
+            ``False`` if clients were disconnected.
+
+        """
+        now = time.monotonic()
+        if now < self.next_tick:
+            return None
+        self.next_tick = now + 1.0 / TICK_RATE
+
+        registry = self.server.registry
+        disconnected = [
+            cuuid
+            for cuuid, client in registry.items()
+            if now - client.setdefault("ping_timestamp", now) > CLIENT_TIMEOUT
+        ]
+        for cuuid in disconnected:
+            logger.info("Client Disconnected. CUUID: " + str(cuuid))
+            receivers = [
+                client_id
+                for client_id, known in self.sent_chars.items()
+                if cuuid in known
+            ]
+            event_data = EventData(type="CLIENT_DISCONNECTED")
+            self.notify_client(cuuid, event_data, receivers)
+        for cuuid in disconnected:
+            del registry[cuuid]
+            self.forget_client(cuuid)
+
+        self.flush()
+        return False if disconnected else None
+
+    def flush(self) -> None:
+        """Send the queued notifications, one packet per client."""
+        for client_id, events in self.outbox.items():
+            if len(events) == 1:
+                self.server.notify(client_id, events[0])
+            else:
+                self.server.notify(
+                    client_id, {"type": "NOTIFY_BATCH", "events": events}
                 )
-                if difference.seconds > 15:
-                    logger.info("Client Disconnected. CUUID: " + str(cuuid))
-                    event_data = EventData(type="CLIENT_DISCONNECTED")
-                    self.notify_client(cuuid, event_data)
-                    del self.server.registry[cuuid]
-                    return False
-
-            except KeyError:
-                self.server.registry[cuuid]["ping_timestamp"] = datetime.now()
-        return None
+        self.outbox = {}
+
+    def forget_client(self, cuuid: str) -> None:
+        """
+        Drop what the server keeps about a client.
+
+        Parameters:
+            cuuid: Clients unique user identification number.
+
+        """
+        self.outbox.pop(cuuid, None)
+        self.sent_chars.pop(cuuid, None)
+        for known in self.sent_chars.values():
+            known.pop(cuuid, None)
+        for map_name, clients in list(self.maps.items()):
+            clients.discard(cuuid)
+            if not clients:
+                del self.maps[map_name]
+
+    def set_map(self, cuuid: str, map_name: str) -> Set[str]:
+        """
+        Move a client to a map.
+
+        The client is sent the clients already on the map: a snapshot
+        of the ones it does not know, the changes of the others.
+
+        Parameters:
+            cuuid: Clients unique user identification number.
+            map_name: Name of the map.
+
+        Returns:
+            The clients of the map it left, if it changed map.
+
+        """
+        client = self.server.registry[cuuid]
+        previous = client.get("map_name")
+        client["map_name"] = map_name
+        peers = self.maps.setdefault(map_name, set())
+        if cuuid in peers:
+            return set()
+
+        left: Set[str] = set()
+        if previous in self.maps:
+            left = self.maps[previous]
+            left.discard(cuuid)
+            if not left:
+                del self.maps[previous]
+
+        known = self.sent_chars.get(cuuid, {})
+        for peer in peers:
+            if peer not in known:
+                self.queue_notify(cuuid, self.snapshot(peer))
+            else:
+                event_data = EventData(
+                    type="NOTIFY_CLIENT_MAP_UPDATE",
+                    cuuid=peer,
+                    map_name=map_name,
+                    char_dict=self.server.registry[peer]["char_dict"],
+                )
+                self.queue_notify(cuuid, event_data)
+        peers.add(cuuid)
+        return set(left)
+
+    def interested_clients(self, cuuid: str) -> Set[str]:
+        """
+        Clients to notify of the events of a client.
+
+        Parameters:
+            cuuid: Clients unique user identification number.
+
+        Returns:
+            The other clients on its map.
+
+        """
+        map_name = self.server.registry[cuuid].get("map_name")
+        return self.maps.get(map_name, set()) - {cuuid}
+
+    def snapshot(self, cuuid: str) -> EventData:
+        """
+        Notification describing a client completely.
+
+        Parameters:
+            cuuid: Clients unique user identification number.
+
+        Returns:
+            A ``NOTIFY_PUSH_SELF`` event with the whole character.
+
+        """
+        client = self.server.registry[cuuid]
+        return EventData(
+            type="NOTIFY_PUSH_SELF",
+            cuuid=cuuid,
+            event_number=0,
+            sprite_name=client["sprite_name"],
+            map_name=client["map_name"],
+            char_dict=client["char_dict"],
+        )
+
+    def queue_notify(self, client_id: str, event_data: EventData) -> None:
+        """
+        Queue a notification describing a client, for the next tick.
+
+        The character dictionary of the event is reduced to the values
+        this receiver was not sent yet. A receiver that does not know
+        the client yet is sent a snapshot of it first.
+
+        Parameters:
+            client_id: Client receiving the notification.
+            event_data: Notification, with the ``cuuid`` of the client
+                it describes.
+
+        """
+        cuuid = event_data["cuuid"]
+        known = self.sent_chars.setdefault(client_id, {})
+        if event_data["type"] == "NOTIFY_PUSH_SELF":
+            # a new character, not a change
+            known[cuuid] = {}
+        elif cuuid not in known:
+            self.queue_notify(client_id, self.snapshot(cuuid))
+
+        if "char_dict" in event_data:
+            sent = known[cuuid]
+            delta = {
+                key: value
+                for key, value in event_data["char_dict"].items()
+                if key not in sent or sent[key] != value
+            }
+            sent.update(delta)
+            event_data = event_data.copy()
+            event_data["char_dict"] = cast(CharDict, delta)
+        self.outbox.setdefault(client_id, []).append(event_data)
 
     def server_event_handler(self, cuuid: str, event_data: EventData) -> None:
         """Handles events sent from the middleware that are legal.
@@ -134,21 +325,22 @@ class TuxemonServer:
         ):
             return
         else:
-            self.server.registry[cuuid]["event_list"][
-                event_data["type"]
-            ] = event_data["event_number"]
+            self.server.registry[cuuid]["event_list"][event_data["type"]] = (
+                event_data["event_number"]
+            )
 
         if event_data["type"] == "PUSH_SELF":
             self.server.registry[cuuid]["sprite_name"] = event_data[
                 "sprite_name"
             ]
-            self.server.registry[cuuid]["map_name"] = event_data["map_name"]
-            self.server.registry[cuuid]["char_dict"] = event_data["char_dict"]
-            self.server.registry[cuuid]["ping_timestamp"] = datetime.now()
+            self.server.registry[cuuid]["char_dict"] = dict(
+                event_data["char_dict"]
+            )
+            self.server.registry[cuuid]["ping_timestamp"] = time.monotonic()
             self.notify_populate_client(cuuid, event_data)
 
         elif event_data["type"] == "PING":
-            self.server.registry[cuuid]["ping_timestamp"] = datetime.now()
+            self.server.registry[cuuid]["ping_timestamp"] = time.monotonic()
 
         elif (
             event_data["type"] == "CLIENT_INTERACTION"
@@ -177,16 +369,20 @@ class TuxemonServer:
         elif event_data["type"] == "CLIENT_START_BATTLE":
             self.server.registry[cuuid]["char_dict"]["running"] = False
             self.update_char_dict(cuuid, event_data["char_dict"])
-            self.server.registry[cuuid]["map_name"] = event_data["map_name"]
-            self.notify_client(cuuid, event_data)
+            left = self.set_map(cuuid, event_data["map_name"])
+            self.notify_client(
+                cuuid, event_data, self.interested_clients(cuuid) | left
+            )
 
         else:
             self.update_char_dict(cuuid, event_data["char_dict"])
+            left = set()
             if "map_name" in event_data:
-                self.server.registry[cuuid]["map_name"] = event_data[
-                    "map_name"
-                ]
-            self.notify_client(cuuid, event_data)
+                left = self.set_map(cuuid, event_data["map_name"])
+            # the clients of the map it left see it go
+            self.notify_client(
+                cuuid, event_data, self.interested_clients(cuuid) | left
+            )
 
     def update_char_dict(self, cuuid: str, char_dict: CharDict) -> None:
         """Updates registry with player updates.
@@ -199,31 +395,40 @@ class TuxemonServer:
         """
         self.server.registry[cuuid]["char_dict"].update(char_dict)
 
-    def notify_client(self, cuuid: str, event_data: EventData) -> None:
+    def notify_client(
+        self,
+        cuuid: str,
+        event_data: EventData,
+        receivers: Optional[Iterable[str]] = None,
+    ) -> None:
         """
-        Updates all clients with player updates.
+        Updates the clients on the same map with player updates.
 
         Parameters:
             cuuid: Clients unique user identification number.
             event_data: Notification flag information.
+            receivers: Clients to notify instead of the ones on its map.
 
         """
         cuuid = str(cuuid)
         event_data["type"] = "NOTIFY_" + event_data["type"]
         event_data["cuuid"] = cuuid
-        for client_id in self.server.registry:
+        if "char_dict" in event_data:
+            # only what a receiver misses of the whole character is sent
+            event_data["char_dict"] = self.server.registry[cuuid]["char_dict"]
+        if receivers is None:
+            receivers = self.interested_clients(cuuid)
+        for client_id in receivers:
             # Don't notify a player that they themselves moved.
-            if client_id == cuuid:
-                continue
-
-            # Notify client of the players new position.
-            elif client_id != cuuid:
-                self.server.notify(client_id, event_data)
+            if client_id != cuuid:
+                self.queue_notify(client_id, event_data)
 
     def notify_populate_client(
         self, cuuid: str, event_data: EventData
     ) -> None:
-        """Updates all clients with the details of the new client.
+        """Updates the clients on its map with the details of the new client.
+
+        The new client is sent the clients of its map by ``set_map``.
 
         :param cuuid: Clients unique user identification number.
         :param event_data: Event information sent by client.
@@ -233,29 +438,10 @@ class TuxemonServer:
 
         """
         cuuid = str(cuuid)
-        event_data["type"] = "NOTIFY_" + event_data["type"]
-        event_data_1 = event_data
-        for client_id in self.server.registry:
-            # Don't notify a player that they themselves populated.
-            if client_id == cuuid:
-                continue
-
-            elif client_id != cuuid:
-                # Send the new client data to this client
-                event_data_1["cuuid"] = cuuid
-                self.server.notify(client_id, event_data_1)
-
-                # Send this clients data to the new client
-                char = self.server.registry[client_id]
-                event_data_2 = {
-                    "type": event_data["type"],
-                    "cuuid": client_id,
-                    "event_number": event_data["event_number"],
-                    "sprite_name": char["sprite_name"],
-                    "map_name": char["map_name"],
-                    "char_dict": char["char_dict"],
-                }
-                self.server.notify(cuuid, event_data_2)
+        # a client pushing itself again is described anew to everyone
+        self.forget_client(cuuid)
+        self.set_map(cuuid, event_data["map_name"])
+        self.notify_client(cuuid, event_data)
 
     def notify_client_interaction(
         self, cuuid: str, event_data: EventData
@@ -273,7 +459,7 @@ class TuxemonServer:
         event_data["type"] = "NOTIFY_" + event_data["type"]
         client_id = event_data["target"]
         event_data["target"] = cuuid
-        self.server.notify(client_id, event_data)
+        self.outbox.setdefault(client_id, []).append(event_data)
 
 
 class ControllerServer:
@@ -390,6 +576,8 @@ class TuxemonClient:
         self.listening = False
         self.event_list: Dict[str, int] = {}
         self.ping_time = 2.0
+        # characters of the other clients, the server only sends changes
+        self.char_dicts: Dict[str, Dict[str, Any]] = {}
 
         # Handle users without networking support.
         if not networking:
@@ -428,84 +616,91 @@ class TuxemonClient:
         server and updates the local client registry
         to reflect the updated information.
         """
-        for euuid, event_data in self.client.event_notifies.items():
-            if event_data["type"] == "NOTIFY_CLIENT_DISCONNECTED":
-                del self.client.registry[event_data["cuuid"]]
-                del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_PUSH_SELF":
-                if event_data["cuuid"] not in self.client.registry:
-                    self.client.registry[str(event_data["cuuid"])] = {}
-                sprite = populate_client(
-                    event_data["cuuid"],
-                    event_data,
-                    self.game,
-                    self.client.registry,
-                )
-                update_client(sprite, event_data["char_dict"], self.game)
-                del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_MOVE_START":
-                direction = str(event_data["direction"])
-                sprite = self.client.registry[event_data["cuuid"]]["sprite"]
-                sprite.facing = direction
-                for d in sprite.direction:
-                    if sprite.direction[d]:
-                        sprite.direction[d] = False
-                sprite.direction[direction] = True
-                del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_MOVE_COMPLETE":
-                sprite = self.client.registry[event_data["cuuid"]]["sprite"]
-                sprite.final_move_dest = event_data["char_dict"]["tile_pos"]
-                for d in sprite.direction:
-                    if sprite.direction[d]:
-                        sprite.direction[d] = False
-                del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_MAP_UPDATE":
-                self.update_client_map(event_data["cuuid"], event_data)
-                del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_KEYDOWN":
-                sprite = self.client.registry[event_data["cuuid"]]["sprite"]
-                if event_data["kb_key"] == "SHIFT":
-                    sprite.running = True
-                    del self.client.event_notifies[euuid]
-                elif event_data["kb_key"] == "CTRL":
-                    del self.client.event_notifies[euuid]
-                elif event_data["kb_key"] == "ALT":
-                    del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_KEYUP":
-                sprite = self.client.registry[event_data["cuuid"]]["sprite"]
-                if event_data["kb_key"] == "SHIFT":
-                    sprite.running = False
-                    del self.client.event_notifies[euuid]
-                elif event_data["kb_key"] == "CTRL":
-                    del self.client.event_notifies[euuid]
-                elif event_data["kb_key"] == "ALT":
-                    del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_FACING":
-                sprite = self.client.registry[event_data["cuuid"]]["sprite"]
-                if not sprite.moving:
-                    sprite.facing = event_data["char_dict"]["facing"]
-                del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_INTERACTION":
-                _world = self.game.get_state_by_name(world.WorldState)
-                _world.handle_interaction(event_data, self.client.registry)
-                del self.client.event_notifies[euuid]
-
-            if event_data["type"] == "NOTIFY_CLIENT_START_BATTLE":
-                sprite = self.client.registry[event_data["cuuid"]]["sprite"]
+        for euuid, event_data in list(self.client.event_notifies.items()):
+            del self.client.event_notifies[euuid]
+            if event_data["type"] == "NOTIFY_BATCH":
+                events = event_data["events"]
+            else:
+                events = [event_data]
+            for event in events:
+                apply_char_delta(self.char_dicts, event)
+                self.handle_notify(event)
+
+    def handle_notify(self, event_data: Dict[str, Any]) -> None:
+        """
+        Updates the local client registry with a notify event.
+
+        Parameters:
+            event_data: Event sent by the server, with its whole
+                character dictionary.
+
+        """
+        if event_data["type"] == "NOTIFY_CLIENT_DISCONNECTED":
+            self.client.registry.pop(event_data["cuuid"], None)
+            self.char_dicts.pop(event_data["cuuid"], None)
+
+        if event_data["type"] == "NOTIFY_PUSH_SELF":
+            if event_data["cuuid"] not in self.client.registry:
+                self.client.registry[str(event_data["cuuid"])] = {}
+            sprite = populate_client(
+                event_data["cuuid"],
+                event_data,
+                self.game,
+                self.client.registry,
+            )
+            update_client(sprite, event_data["char_dict"], self.game)
+
+        if event_data["type"] == "NOTIFY_CLIENT_MOVE_START":
+            direction = str(event_data["direction"])
+            sprite = self.client.registry[event_data["cuuid"]]["sprite"]
+            sprite.facing = direction
+            for d in sprite.direction:
+                if sprite.direction[d]:
+                    sprite.direction[d] = False
+            sprite.direction[direction] = True
+
+        if event_data["type"] == "NOTIFY_CLIENT_MOVE_COMPLETE":
+            sprite = self.client.registry[event_data["cuuid"]]["sprite"]
+            sprite.final_move_dest = event_data["char_dict"]["tile_pos"]
+            for d in sprite.direction:
+                if sprite.direction[d]:
+                    sprite.direction[d] = False
+
+        if event_data["type"] == "NOTIFY_CLIENT_MAP_UPDATE":
+            self.update_client_map(event_data["cuuid"], event_data)
+
+        if event_data["type"] == "NOTIFY_CLIENT_CORRECTION":
+            # the server refused a move, go back where it knows us
+            player = local_session.player
+            player.abort_movement()
+            player.set_position(event_data["char_dict"]["tile_pos"])
+
+        if event_data["type"] == "NOTIFY_CLIENT_KEYDOWN":
+            sprite = self.client.registry[event_data["cuuid"]]["sprite"]
+            if event_data["kb_key"] == "SHIFT":
+                sprite.running = True
+
+        if event_data["type"] == "NOTIFY_CLIENT_KEYUP":
+            sprite = self.client.registry[event_data["cuuid"]]["sprite"]
+            if event_data["kb_key"] == "SHIFT":
                 sprite.running = False
-                sprite.final_move_dest = event_data["char_dict"]["tile_pos"]
-                for d in sprite.direction:
-                    if sprite.direction[d]:
-                        sprite.direction[d] = False
-                del self.client.event_notifies[euuid]
+
+        if event_data["type"] == "NOTIFY_CLIENT_FACING":
+            sprite = self.client.registry[event_data["cuuid"]]["sprite"]
+            if not sprite.moving:
+                sprite.facing = event_data["char_dict"]["facing"]
+
+        if event_data["type"] == "NOTIFY_CLIENT_INTERACTION":
+            _world = self.game.get_state_by_name(world.WorldState)
+            _world.handle_interaction(event_data, self.client.registry)
+
+        if event_data["type"] == "NOTIFY_CLIENT_START_BATTLE":
+            sprite = self.client.registry[event_data["cuuid"]]["sprite"]
+            sprite.running = False
+            sprite.final_move_dest = event_data["char_dict"]["tile_pos"]
+            for d in sprite.direction:
+                if sprite.direction[d]:
+                    sprite.direction[d] = False
 
     def join_multiplayer(self, time_delta: float) -> Optional[bool]:
         """
@@ -805,6 +1000,29 @@ class DummyNetworking:
 
 
 # Universal functions
+def apply_char_delta(
+    char_dicts: MutableMapping[str, Dict[str, Any]],
+    event_data: Dict[str, Any],
+) -> None:
+    """Merges the character changes of a notify event into the known
+    characters, then gives the event the whole character.
+
+    :param char_dicts: Characters known by the client, by client id.
+    :param event_data: Event sent by the server.
+
+    :type char_dicts: Dictionary
+    :type event_data: Dictionary
+
+    """
+    if "char_dict" not in event_data or "cuuid" not in event_data:
+        return
+    if event_data["type"] == "NOTIFY_PUSH_SELF":
+        char_dicts[event_data["cuuid"]] = {}
+    char = char_dicts.setdefault(event_data["cuuid"], {})
+    char.update(event_data["char_dict"])
+    event_data["char_dict"] = dict(char)
+
+
 def populate_client(cuuid, event_data, game, registry):
     """Creates an NPC to represent the client character and adds the
     information to the registry.
@@ -26,8 +26,10 @@ from tuxemon.battle import Battle, decode_battle, encode_battle
 from tuxemon.compat import Rect
 from tuxemon.db import ElementType, PlagueType, SeenStatus, db
 from tuxemon.entity import Entity
+from tuxemon.game_variables import GameVariables
 from tuxemon.graphics import load_and_scale
-from tuxemon.item.item import MAX_TYPES_BAG, Item, decode_items, encode_items
+from tuxemon.item.inventory import Inventory
+from tuxemon.item.item import MAX_TYPES_BAG, Item, decode_items
 from tuxemon.locale import T
 from tuxemon.map import Direction, dirs2, dirs3, facing, get_direction, proj
 from tuxemon.math import Vector2
@@ -38,6 +40,7 @@ from tuxemon.monster import (
     decode_monsters,
     encode_monsters,
 )
+from tuxemon.monster_registry import MonsterRegistry
 from tuxemon.prepare import CONFIG
 from tuxemon.session import Session
 from tuxemon.states.pc import KENNEL, LOCKER
@@ -49,8 +52,8 @@ from tuxemon.tools import open_choice_dialog, open_dialog, vector2_to_tile_pos
 if TYPE_CHECKING:
     import pygame
 
+    from tuxemon.combat import EnqueuedAction
     from tuxemon.item.economy import Economy
-    from tuxemon.states.combat.combat import EnqueuedAction
     from tuxemon.states.world.worldstate import WorldState
 
     SpriteMap = Union[
@@ -129,7 +132,7 @@ class NPC(Entity[NPCState]):
 
         # general
         self.behavior: Optional[str] = "wander"  # not used for now
-        self.game_variables: Dict[str, Any] = {}  # Tracks the game state
+        self.game_variables = GameVariables()  # Tracks the game state
         self.battles: List[Battle] = []  # Tracks the battles
         self.forfeit: bool = True
         # Tracks Tuxepedia (monster seen or caught)
@@ -143,7 +146,7 @@ class NPC(Entity[NPCState]):
         # This is a list of tuxemon the npc has. Do not modify directly
         self.monsters: List[Monster] = []
         # The player's items.
-        self.items: List[Item] = []
+        self.items = Inventory()
         self.template: List[Template] = []
         self.economy: Optional[Economy] = None
         # related to spyderbite (PlagueType)
@@ -152,7 +155,13 @@ class NPC(Entity[NPCState]):
         # Keeping these separate so other code can safely
         # assume that all values are lists
         self.monster_boxes: Dict[str, List[Monster]] = {}
-        self.item_boxes: Dict[str, List[Item]] = {}
+        # indexes of the party and boxes, see add_monster
+        self.monster_registry = MonsterRegistry()
+        # encoded boxes, kept while the storage does not change
+        self._encoded_boxes: Dict[
+            str, Tuple[List[Monster], int, Sequence[Mapping[str, Any]]]
+        ] = {}
+        self.item_boxes: Dict[str, Inventory] = {}
         # nr tuxemon fight
         self.max_position: int = 1
         self.speed = 10  # To determine combat order (not related to movement!)
@@ -222,12 +231,12 @@ class NPC(Entity[NPCState]):
         state: NPCState = {
             "current_map": session.client.get_map_name(),
             "facing": self.facing,
-            "game_variables": self.game_variables,
+            "game_variables": self.game_variables.snapshot(),
             "battles": encode_battle(self.battles),
             "tuxepedia": self.tuxepedia,
             "contacts": self.contacts,
             "money": self.money,
-            "items": encode_items(self.items),
+            "items": self.items.get_state(),
             "template": encode_template(self.template),
             "monsters": encode_monsters(self.monsters),
             "player_name": self.name,
@@ -238,11 +247,37 @@ class NPC(Entity[NPCState]):
         }
 
         for monsterkey, monstervalue in self.monster_boxes.items():
-            state["monster_boxes"][monsterkey] = encode_monsters(monstervalue)
+            state["monster_boxes"][monsterkey] = self._encode_box(
+                monsterkey, monstervalue
+            )
 
         for itemkey, itemvalue in self.item_boxes.items():
-            state["item_boxes"][itemkey] = encode_items(itemvalue)
+            state["item_boxes"][itemkey] = itemvalue.get_state()
+
+        return state
+
+    def _encode_box(
+        self,
+        name: str,
+        box: List[Monster],
+    ) -> Sequence[Mapping[str, Any]]:
+        """
+        Encode a storage box, unless it did not change since the last time.
+
+        Parameters:
+            name: Name of the box.
+            box: Monsters of the box.
+
+        Returns:
+            Save data of the monsters, not to be modified.
 
+        """
+        version = self.monster_registry.storage_version
+        encoded = self._encoded_boxes.get(name)
+        if encoded is not None and encoded[0] is box and encoded[1] == version:
+            return encoded[2]
+        state = encode_monsters(box)
+        self._encoded_boxes[name] = (box, version, state)
         return state
 
     def set_state(self, session: Session, save_data: NPCState) -> None:
@@ -255,17 +290,18 @@ class NPC(Entity[NPCState]):
 
         """
         self.facing = save_data.get("facing", "down")
-        self.game_variables = save_data["game_variables"]
+        self.game_variables.reset(save_data["game_variables"])
         self.tuxepedia = save_data["tuxepedia"]
         self.contacts = save_data["contacts"]
         self.money = save_data["money"]
         self.battles = []
         for battle in decode_battle(save_data.get("battles")):
             self.battles.append(battle)
-        self.items = []
+        self.items = Inventory()
         for item in decode_items(save_data.get("items")):
             self.add_item(item)
         self.monsters = []
+        self.monster_registry.clear()
         for monster in decode_monsters(save_data.get("monsters")):
             self.add_monster(monster, len(self.monsters))
         self.template = []
@@ -275,8 +311,11 @@ class NPC(Entity[NPCState]):
         self.plague = save_data["plague"]
         for monsterkey, monstervalue in save_data["monster_boxes"].items():
             self.monster_boxes[monsterkey] = decode_monsters(monstervalue)
+        for box in self.monster_boxes.values():
+            for monster in box:
+                self.monster_registry.add_to_storage(monster, box)
         for itemkey, itemvalue in save_data["item_boxes"].items():
-            self.item_boxes[itemkey] = decode_items(itemvalue)
+            self.item_boxes[itemkey] = Inventory(decode_items(itemvalue))
 
         self.load_sprites()
 
@@ -659,7 +698,7 @@ class NPC(Entity[NPCState]):
 
         monster.owner = self
         if len(self.monsters) >= self.party_limit:
-            self.monster_boxes[KENNEL].append(monster)
+            self.add_monster_to_storage(monster, KENNEL)
             if len(self.monster_boxes[KENNEL]) >= MAX_BOX:
                 i = sum(
                     1
@@ -670,8 +709,25 @@ class NPC(Entity[NPCState]):
                 self.monster_boxes[KENNEL] = []
         else:
             self.monsters.insert(slot, monster)
+            self.monster_registry.add_to_party(monster)
             self.set_party_status()
 
+    def add_monster_to_storage(self, monster: Monster, box: str) -> None:
+        """
+        Adds a monster to one of the npc's storage boxes.
+
+        The box is created if needed.
+
+        Parameters:
+            monster: The monster to store.
+            box: The name of the box.
+
+        """
+        if box not in self.monster_boxes:
+            self.monster_boxes[box] = []
+        self.monster_boxes[box].append(monster)
+        self.monster_registry.add_to_storage(monster, self.monster_boxes[box])
+
     def find_monster(self, monster_slug: str) -> Optional[Monster]:
         """
         Finds a monster in the npc's list of monsters.
@@ -683,6 +739,9 @@ class NPC(Entity[NPCState]):
             Monster found.
 
         """
+        if not self.monster_registry.count_slug(monster_slug):
+            return None
+
         for monster in self.monsters:
             if monster.slug == monster_slug:
                 return monster
@@ -700,9 +759,7 @@ class NPC(Entity[NPCState]):
             Monster found, or None.
 
         """
-        return next(
-            (m for m in self.monsters if m.instance_id == instance_id), None
-        )
+        return self.monster_registry.in_party(instance_id)
 
     def find_monster_in_storage(
         self, instance_id: uuid.UUID
@@ -717,15 +774,7 @@ class NPC(Entity[NPCState]):
             Monster found, or None.
 
         """
-        monster = None
-        for box in self.monster_boxes.values():
-            monster = next(
-                (m for m in box if m.instance_id == instance_id), None
-            )
-            if monster is not None:
-                break
-
-        return monster
+        return self.monster_registry.in_storage(instance_id)
 
     def release_monster(self, monster: Monster) -> bool:
         """
@@ -738,7 +787,7 @@ class NPC(Entity[NPCState]):
         if len(self.monsters) == 1:
             return False
 
-        if monster in self.monsters:
+        if self.monster_registry.remove_from_party(monster):
             self.monsters.remove(monster)
             self.set_party_status()
             return True
@@ -753,7 +802,7 @@ class NPC(Entity[NPCState]):
             monster: Monster to remove from the npc's party.
 
         """
-        if monster in self.monsters:
+        if self.monster_registry.remove_from_party(monster):
             self.monsters.remove(monster)
             self.set_party_status()
 
@@ -766,7 +815,7 @@ class NPC(Entity[NPCState]):
             evolution: Monster to add to the npc's party.
 
         """
-        if old_monster not in self.monsters:
+        if self.find_monster_by_id(old_monster.instance_id) is not old_monster:
             return
 
         # TODO: implement an evolution animation
@@ -803,11 +852,9 @@ class NPC(Entity[NPCState]):
             monster: Monster to remove from storage.
 
         """
-
-        for box in self.monster_boxes.values():
-            if monster in box:
-                box.remove(monster)
-                return
+        box = self.monster_registry.remove_from_storage(monster)
+        if box is not None:
+            box.remove(monster)
 
     def switch_monsters(self, index_1: int, index_2: int) -> None:
         """
@@ -825,11 +872,9 @@ class NPC(Entity[NPCState]):
 
     def load_party(self) -> None:
         """Loads the party of this npc from their npc.json entry."""
-        for monster in self.monsters:
+        for monster in list(self.monsters):
             self.remove_monster(monster)
 
-        self.monsters = []
-
         # Look up the NPC's details from our NPC database
         npc_details = db.lookup(self.slug, "npc")
         self.forfeit = npc_details.forfeit
@@ -849,9 +894,7 @@ class NPC(Entity[NPCState]):
             self.add_monster(monster, len(npc_party))
 
         # load NPC bag
-        for item in self.items:
-            self.remove_item(item)
-        self.items = []
+        self.items.clear()
         npc_bag = npc_details.items
         for npc_itm_details in npc_bag:
             itm = Item(save_data=npc_itm_details.model_dump())
@@ -896,24 +939,13 @@ class NPC(Entity[NPCState]):
         Parameters:
             tech: The slug name of the technique.
         """
-        for technique in self.monsters:
-            for move in technique.moves:
-                if move.slug == tech:
-                    return True
-        return False
+        return tech is not None and self.monster_registry.has_technique(tech)
 
     def has_type(self, element: Optional[ElementType]) -> bool:
         """
         Returns TRUE if there is the type in the party.
         """
-        ret: bool = False
-        if element:
-            eles = []
-            for mon in self.monsters:
-                eles = [ele for ele in mon.types if ele.slug == element]
-            if eles:
-                ret = True
-        return ret
+        return element is not None and self.monster_registry.has_type(element)
 
     def check_max_moves(self, session: Session, monster: Monster) -> None:
         """
@@ -983,6 +1015,7 @@ class NPC(Entity[NPCState]):
 
         def set_variable(var_value: Technique) -> None:
             monster.moves.remove(var_value)
+            self.monster_registry.update(monster)
             session.client.pop_state()
 
         var_list = monster.moves
@@ -1021,7 +1054,7 @@ class NPC(Entity[NPCState]):
         """
         # it creates the locker
         if LOCKER not in self.item_boxes.keys():
-            self.item_boxes[LOCKER] = []
+            self.item_boxes[LOCKER] = Inventory()
 
         if len(self.items) >= MAX_TYPES_BAG:
             self.item_boxes[LOCKER].append(item)
@@ -1041,33 +1074,26 @@ class NPC(Entity[NPCState]):
         Finds an item in the npc's bag.
 
         """
-        for itm in self.items:
-            if itm.slug == item_slug:
-                return itm
-
-        return None
+        return self.items.find(item_slug)
 
     def find_item_by_id(self, instance_id: uuid.UUID) -> Optional[Item]:
         """
         Finds an item in the npc's bag which has the given id.
 
         """
-        return next(
-            (m for m in self.items if m.instance_id == instance_id), None
-        )
+        return self.items.get(instance_id)
 
     def find_item_in_storage(self, instance_id: uuid.UUID) -> Optional[Item]:
         """
         Finds an item in the npc's storage boxes which has the given id.
 
         """
-        item = None
         for box in self.item_boxes.values():
-            item = next((m for m in box if m.instance_id == instance_id), None)
+            item = box.get(instance_id)
             if item is not None:
-                break
+                return item
 
-        return item
+        return None
 
     def remove_item_from_storage(self, item: Item) -> None:
         """
@@ -9,9 +9,9 @@ from __future__ import annotations
 import logging
 import os.path
 import re
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-from tuxemon import config
+from tuxemon import config, vfs
 from tuxemon.constants import paths
 
 if TYPE_CHECKING:
@@ -174,27 +174,51 @@ def init() -> None:
 # note: this has the potential of being a bottle neck doing to all the checking of paths
 # eventually, this should be configured at game launch, or in a config file instead
 # of looking all over creation for the required files.
+def _search_mod(mod_folder: str, relative_path: str) -> Optional[str]:
+    """
+    Search an asset in a mod folder, or in the archive installed in its place.
+
+    Parameters:
+        mod_folder: Path of the mod folder.
+        relative_path: Path of the asset in the mod.
+
+    Returns:
+        Path of the asset, ``None`` if the mod does not have it.
+
+    """
+    path = os.path.join(mod_folder, relative_path)
+    logger.debug("searching asset: %s", path)
+    if os.path.exists(path):
+        return path
+    if vfs.mount(mod_folder) and vfs.exists(path):
+        return path
+    return None
+
+
 def fetch(*args: str) -> str:
     relative_path = os.path.join(*args)
 
     for mod_name in CONFIG.mods:
         # when assets are in folder with the source
-        path = os.path.join(paths.mods_folder, mod_name, relative_path)
-        logger.debug("searching asset: %s", path)
-        if os.path.exists(path):
+        path = _search_mod(
+            os.path.join(paths.mods_folder, mod_name), relative_path
+        )
+        if path is not None:
             return path
 
         # when assets are in a system path (like for os packages and android)
         for root_path in paths.system_installed_folders:
-            path = os.path.join(root_path, "mods", mod_name, relative_path)
-            logger.debug("searching asset: %s", path)
-            if os.path.exists(path):
+            path = _search_mod(
+                os.path.join(root_path, "mods", mod_name), relative_path
+            )
+            if path is not None:
                 return path
 
         # mods folder is in same folder as the launch script
-        path = os.path.join(paths.BASEDIR, "mods", mod_name, relative_path)
-        logger.debug("searching asset: %s", path)
-        if os.path.exists(path):
+        path = _search_mod(
+            os.path.join(paths.BASEDIR, "mods", mod_name), relative_path
+        )
+        if path is not None:
             return path
 
     raise OSError(f"cannot load file {relative_path}")
@@ -0,0 +1,268 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""Frame profiler, timing the phases of the game loop.
+
+The client times each phase of a frame (input, event engine, the update
+and draw of each state...) and any code can time its own scopes::
+
+    with profiler.scope("pathfind"):
+        ...
+
+The frame times can be shown over the game as a rolling graph, and the
+scopes recorded to a trace file in the Chrome trace event format, which
+chrome://tracing or https://ui.perfetto.dev open.
+
+While the profiler is disabled, a scope only costs an attribute check.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter
+from types import TracebackType
+from typing import (
+    ContextManager,
+    Deque,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# frames shown by the graph
+HISTORY = 240
+# scopes recorded before the trace is cut, to bound its memory
+MAX_EVENTS = 1_000_000
+GRAPH_HEIGHT = 60
+GRAPH_BACKGROUND = (0, 0, 0, 160)
+GRAPH_BUDGET_COLOR = (255, 255, 255)
+GRAPH_COLOR = (0, 200, 0)
+GRAPH_OVER_COLOR = (230, 30, 30)
+
+# name, category, start and end of a scope, in seconds
+TraceEvent = Tuple[str, str, float, float]
+
+_NULL_SCOPE: ContextManager[None] = nullcontext()
+
+
+class ProfilerScope:
+    """
+    Times the code run in a ``with`` block.
+
+    Parameters:
+        profiler: The profiler recording the scope.
+        name: Name of the scope.
+        category: Category of the scope, like ``update`` or ``draw``.
+
+    """
+
+    __slots__ = ("profiler", "name", "category", "start")
+
+    def __init__(self, profiler: Profiler, name: str, category: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.profiler.add(self.name, self.category, self.start, perf_counter())
+
+
+class Profiler:
+    """
+    Records the frame times and the scopes of the game loop.
+
+    Parameters:
+        history: Number of frames kept for the graph.
+        max_events: Number of scopes recorded before the trace is cut.
+
+    """
+
+    def __init__(
+        self,
+        history: int = HISTORY,
+        max_events: int = MAX_EVENTS,
+    ) -> None:
+        # whether the scopes are timed: while recording or showing the graph
+        self.enabled = False
+        self.show_graph = False
+        self.frame_times: Deque[float] = deque(maxlen=history)
+        self.max_events = max_events
+        self._trace: Optional[List[TraceEvent]] = None
+        self._frame_start: Optional[float] = None
+        self._origin = perf_counter()
+        self._main_thread = threading.get_ident()
+
+    @property
+    def recording(self) -> bool:
+        """Whether a trace is being recorded."""
+        return self._trace is not None
+
+    def _update_enabled(self) -> None:
+        self.enabled = self.show_graph or self.recording
+        if not self.enabled:
+            self._frame_start = None
+
+    def scope(self, name: str, category: str = "") -> ContextManager[None]:
+        """
+        Time a scope, if the profiler is enabled.
+
+        Parameters:
+            name: Name of the scope.
+            category: Category of the scope.
+
+        Returns:
+            Context manager timing the code run in it.
+
+        """
+        if not self.enabled:
+            return _NULL_SCOPE
+        return ProfilerScope(self, name, category)
+
+    def add(self, name: str, category: str, start: float, end: float) -> None:
+        """
+        Record a scope timed by the caller.
+
+        Parameters:
+            name: Name of the scope.
+            category: Category of the scope.
+            start: When the scope started, from ``time.perf_counter``.
+            end: When the scope ended, from ``time.perf_counter``.
+
+        """
+        trace = self._trace
+        if trace is None:
+            return
+        if len(trace) < self.max_events:
+            trace.append((name, category, start, end))
+        elif len(trace) == self.max_events:
+            logger.warning("trace is full, the next scopes are not recorded")
+            trace.append(("trace full", "profiler", end, end))
+
+    def begin_frame(self) -> None:
+        """Mark the start of a frame."""
+        if self.enabled:
+            self._frame_start = perf_counter()
+
+    def end_frame(self) -> None:
+        """Mark the end of a frame, started with ``begin_frame``."""
+        start = self._frame_start
+        if start is None:
+            return
+        end = perf_counter()
+        self.frame_times.append(end - start)
+        self.add("frame", "frame", start, end)
+        self._frame_start = None
+
+    def set_graph(self, show: bool) -> None:
+        """
+        Show or hide the frame time graph.
+
+        Parameters:
+            show: Whether to show the graph.
+
+        """
+        self.show_graph = show
+        self._update_enabled()
+
+    def start_trace(self) -> None:
+        """Start recording the scopes, dropping those already recorded."""
+        self._trace = []
+        self._update_enabled()
+
+    def stop_trace(self, filename: str) -> int:
+        """
+        Stop recording the scopes, and write them to a trace file.
+
+        Parameters:
+            filename: Path of the trace file.
+
+        Returns:
+            Number of scopes written.
+
+        """
+        trace = self._trace or []
+        self._trace = None
+        self._update_enabled()
+        self.write_trace(trace, filename)
+        return len(trace)
+
+    def write_trace(self, events: Sequence[TraceEvent], filename: str) -> None:
+        """
+        Write scopes to a file, in the Chrome trace event format.
+
+        Parameters:
+            events: The scopes.
+            filename: Path of the trace file.
+
+        """
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": pid,
+                "tid": self._main_thread,
+            }
+            for name, category, start, end in events
+        ]
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, "w") as fp:
+            json.dump(
+                {"traceEvents": trace_events, "displayTimeUnit": "ms"}, fp
+            )
+        logger.info(f"{len(trace_events)} scopes written to {filename}")
+
+    def draw(self, surface: pygame.surface.Surface, budget: float) -> None:
+        """
+        Draw the frame time graph, in the top right corner.
+
+        Each frame is a bar, red when it took longer than the budget,
+        which is the line across the graph.
+
+        Parameters:
+            surface: Surface where to draw.
+            budget: Time of a frame at the target FPS, in seconds.
+
+        """
+        width = self.frame_times.maxlen or HISTORY
+        graph = pygame.Surface((width, GRAPH_HEIGHT), pygame.SRCALPHA)
+        graph.fill(GRAPH_BACKGROUND)
+        # the budget is at half the height, longer frames are clipped
+        scale = GRAPH_HEIGHT / (2 * budget)
+        x = width - len(self.frame_times)
+        for frame_time in self.frame_times:
+            height = min(GRAPH_HEIGHT, max(1, int(frame_time * scale)))
+            color = GRAPH_OVER_COLOR if frame_time > budget else GRAPH_COLOR
+            graph.fill(color, (x, GRAPH_HEIGHT - height, 1, height))
+            x += 1
+        budget_y = GRAPH_HEIGHT // 2
+        pygame.draw.line(
+            graph, GRAPH_BUDGET_COLOR, (0, budget_y), (width, budget_y)
+        )
+        surface.blit(graph, (surface.get_width() - width, 0))
+
+
+profiler = Profiler()
@@ -0,0 +1,444 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""Recording of the player inputs, and their replay without a display.
+
+While recording, the client steps the game by a fixed time each frame,
+and the inputs given to the states are logged with their frame number,
+so the frame times are ``frame * time_delta``. The random generator is
+seeded at the start of the session, and the seed saved with the inputs.
+
+A replay starts the game with the same seed, options and save, and
+feeds the logged inputs at the same frames, as fast as possible. It
+reports the time taken by each frame and a hash of the player state at
+the end, which must be the same each time the recording is replayed.
+
+The replay is only as deterministic as the game: the hash leaves out
+the values depending on the date and time, and the instance ids, but
+actions reading the wall clock may still run differently.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import statistics
+from collections import defaultdict, deque
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Deque,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from tuxemon.platform.events import PlayerInput
+from tuxemon.platform.platform_pygame.events import PygameEventQueueHandler
+from tuxemon.session import Session, local_session
+
+if TYPE_CHECKING:
+    from tuxemon.client import LocalPygameClient
+
+logger = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+
+# kind of the calls to the input manager
+PROCESS = "process"
+RELEASE = "release"
+
+# keys of the player state which change between two identical sessions
+VOLATILE_KEYS = frozenset({"instance_id", "date", "capture"})
+# game variables set from the date and time
+VOLATILE_VARIABLES = frozenset(
+    {
+        "hour",
+        "day_of_year",
+        "year",
+        "leap_year",
+        "daytime",
+        "stage_of_day",
+        "season",
+    }
+)
+
+
+class InputBatch(NamedTuple):
+    frame: int
+    kind: str
+    # button, value, hold time and triggered flag of each input
+    inputs: Sequence[Sequence[Any]]
+
+
+def _snapshot(player_input: PlayerInput) -> List[Any]:
+    return [
+        player_input.button,
+        player_input.value,
+        player_input.hold_time,
+        player_input.triggered,
+    ]
+
+
+def _restore(snapshot: Sequence[Any]) -> PlayerInput:
+    button, value, hold_time, triggered = snapshot
+    if isinstance(value, list):
+        # mouse positions are tuples
+        value = tuple(value)
+    player_input = PlayerInput(button, value, hold_time)
+    player_input.triggered = triggered
+    return player_input
+
+
+class InputRecording:
+    """
+    Inputs of a session, with what is needed to replay it.
+
+    Parameters:
+        seed: Seed of the random generator.
+        time_delta: Time the game is stepped by each frame.
+        options: How the session was started, see ``tuxemon.main``.
+
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        time_delta: float,
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        self.seed = seed
+        self.time_delta = time_delta
+        self.options = dict(options or {})
+        self.frames = 0
+        self.batches: List[InputBatch] = []
+
+    @classmethod
+    def new(
+        cls,
+        time_delta: float,
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> InputRecording:
+        """
+        Start a recording with a random seed.
+
+        Parameters:
+            time_delta: Time the game is stepped by each frame.
+            options: How the session was started.
+
+        Returns:
+            The recording.
+
+        """
+        return cls(random.SystemRandom().getrandbits(32), time_delta, options)
+
+    def save(self, filename: str) -> None:
+        """
+        Write the recording to a file.
+
+        Parameters:
+            filename: Path of the file.
+
+        """
+        data = {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "time_delta": self.time_delta,
+            "options": self.options,
+            "frames": self.frames,
+            "inputs": [list(batch) for batch in self.batches],
+        }
+        with open(filename, "w") as fp:
+            json.dump(data, fp, separators=(",", ":"))
+        logger.info(f"{self.frames} frames recorded to {filename}")
+
+    @classmethod
+    def load(cls, filename: str) -> InputRecording:
+        """
+        Read a recording from a file.
+
+        Parameters:
+            filename: Path of the file.
+
+        Returns:
+            The recording.
+
+        Raises:
+            ValueError: The file is not a recording of this version.
+
+        """
+        with open(filename) as fp:
+            data = json.load(fp)
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{filename} is not a recording of the inputs")
+        recording = cls(data["seed"], data["time_delta"], data["options"])
+        recording.frames = data["frames"]
+        recording.batches = [InputBatch(*batch) for batch in data["inputs"]]
+        return recording
+
+
+class RecordingEventQueueHandler(PygameEventQueueHandler):
+    """
+    Records the inputs of another input manager.
+
+    The input handlers added to either manager are shared.
+
+    Parameters:
+        handler: The input manager whose inputs are recorded.
+        recording: Where to record the inputs.
+
+    """
+
+    def __init__(
+        self,
+        handler: PygameEventQueueHandler,
+        recording: InputRecording,
+    ) -> None:
+        super().__init__()
+        self._inputs = handler._inputs
+        self.handler = handler
+        self.recording = recording
+
+    def _record(
+        self,
+        kind: str,
+        inputs: Iterable[PlayerInput],
+    ) -> Generator[PlayerInput, None, None]:
+        # the inputs change once used, they are saved as they are given,
+        # and the batch is kept if the caller stops using the generator.
+        # The releases are all kept, to be replayed in the same order.
+        batch = []
+        try:
+            for player_input in inputs:
+                batch.append(_snapshot(player_input))
+                yield player_input
+        finally:
+            if batch or kind == RELEASE:
+                self.recording.batches.append(
+                    InputBatch(self.recording.frames, kind, batch)
+                )
+
+    def process_events(self) -> Generator[PlayerInput, None, None]:
+        self.recording.frames += 1
+        yield from self._record(PROCESS, self.handler.process_events())
+
+    def release_controls(self) -> Generator[PlayerInput, None, None]:
+        yield from self._record(RELEASE, self.handler.release_controls())
+
+
+class ReplayEventQueueHandler(PygameEventQueueHandler):
+    """
+    Gives the inputs of a recording, instead of those of another manager.
+
+    The input handlers of the other manager are kept, but not read.
+
+    Parameters:
+        handler: The input manager replaced.
+        recording: The recording to replay.
+
+    """
+
+    def __init__(
+        self,
+        handler: PygameEventQueueHandler,
+        recording: InputRecording,
+    ) -> None:
+        super().__init__()
+        self._inputs = handler._inputs
+        self.frame = 0
+        self._batches: DefaultDict[str, Deque[InputBatch]]
+        self._batches = defaultdict(deque)
+        for batch in recording.batches:
+            self._batches[batch.kind].append(batch)
+
+    def _replay(self, kind: str) -> Generator[PlayerInput, None, None]:
+        batches = self._batches[kind]
+        while batches and batches[0].frame < self.frame:
+            # the game did not ask for them at the same frame
+            logger.warning(f"replay diverged: {batches.popleft()} skipped")
+        if not batches or batches[0].frame != self.frame:
+            return
+        for snapshot in batches.popleft().inputs:
+            player_input = _restore(snapshot)
+            yield player_input
+            # like the input handlers, once the input is used
+            if player_input.held:
+                player_input.hold_time += 1
+            elif player_input.triggered:
+                player_input.triggered = False
+
+    def process_events(self) -> Generator[PlayerInput, None, None]:
+        self.frame += 1
+        yield from self._replay(PROCESS)
+
+    def release_controls(self) -> Generator[PlayerInput, None, None]:
+        yield from self._replay(RELEASE)
+
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {
+            str(k): _stable(v)
+            for k, v in value.items()
+            if k not in VOLATILE_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_stable(v) for v in value]
+    return value
+
+
+def state_hash(session: Session) -> str:
+    """
+    Hash the state of the player.
+
+    Parameters:
+        session: Game session.
+
+    Returns:
+        SHA-256 of the player state, without the values depending on the
+        date and time, and the instance ids.
+
+    """
+    state = _stable(session.player.get_state(session))
+    variables = state["game_variables"]
+    for name in VOLATILE_VARIABLES:
+        variables.pop(name, None)
+    encoded = json.dumps(state, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def save_hash(slot: int) -> Optional[str]:
+    """
+    Hash the data of a save slot.
+
+    A session started from a save is only replayed from the same save,
+    so the recording keeps this hash.
+
+    Parameters:
+        slot: The save slot.
+
+    Returns:
+        SHA-256 of the save data, ``None`` if the slot is empty.
+
+    """
+    from tuxemon import save
+
+    save_data = save.read_save(slot)
+    if not save_data:
+        return None
+    encoded = json.dumps(save_data, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ReplayReport(NamedTuple):
+    # time of a frame in the game, the budget of its computation
+    time_delta: float
+    frame_times: Sequence[float]
+    state_hash: Optional[str]
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.frame_times)
+
+    def summary(self) -> str:
+        """
+        Describe the frame times.
+
+        Returns:
+            Text of the report.
+
+        """
+        times = sorted(self.frame_times)
+        if not times:
+            return "No frame replayed"
+        slow = sum(1 for t in times if t > self.time_delta)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        return "\n".join(
+            (
+                f"frames: {len(times)} in {self.total_time:.3f}s",
+                f"frame time: mean {statistics.mean(times) * 1000:.3f}ms, "
+                f"median {statistics.median(times) * 1000:.3f}ms, "
+                f"95% {p95 * 1000:.3f}ms, max {times[-1] * 1000:.3f}ms",
+                f"frames over {self.time_delta * 1000:.1f}ms: {slow}",
+                f"state hash: {self.state_hash}",
+            )
+        )
+
+
+def record(
+    client: LocalPygameClient,
+    options: Optional[Mapping[str, Any]] = None,
+) -> InputRecording:
+    """
+    Record the inputs of the player, from now on.
+
+    The random generator is seeded, and the client steps the game by a
+    fixed time each frame. Call this before starting the game.
+
+    Parameters:
+        client: The client.
+        options: How the session is started.
+
+    Returns:
+        The recording, filled as the game runs.
+
+    """
+    recording = InputRecording.new(1.0 / client.fps, options)
+    client.input_manager = RecordingEventQueueHandler(
+        client.input_manager,
+        recording,
+    )
+    client.fixed_step = True
+    random.seed(recording.seed)
+    return recording
+
+
+def replay(
+    client: LocalPygameClient,
+    recording: InputRecording,
+    start_game: Callable[[], None],
+    draw: bool = True,
+) -> ReplayReport:
+    """
+    Replay the inputs of a recording, as fast as possible.
+
+    Parameters:
+        client: The client.
+        recording: The recording.
+        start_game: Starts the game the way the recorded session was.
+        draw: Whether to draw the frames.
+
+    Returns:
+        The time of each frame and the state hash at the end.
+
+    """
+    client.input_manager = ReplayEventQueueHandler(
+        client.input_manager,
+        recording,
+    )
+    random.seed(recording.seed)
+    start_game()
+    time_delta = recording.time_delta
+    frame_times = []
+    for _ in range(recording.frames):
+        if client.exit:
+            logger.warning("the game quit before the end of the recording")
+            break
+        start = perf_counter()
+        client.update(time_delta)
+        if draw:
+            client.draw(client.screen)
+        frame_times.append(perf_counter() - start)
+
+    # the player only exists once the game is started
+    if local_session.player is None:
+        return ReplayReport(time_delta, frame_times, None)
+    return ReplayReport(time_delta, frame_times, state_hash(local_session))
@@ -4,20 +4,26 @@ from __future__ import annotations
 
 import base64
 import datetime
+import hashlib
 import importlib
 import json
 import logging
 import os
+import uuid
+from functools import partial
 from operator import itemgetter
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
+    List,
     Literal,
     Mapping,
-    NewType,
     Optional,
     TextIO,
+    Tuple,
+    TypedDict,
     TypeVar,
 )
 
@@ -45,17 +51,50 @@ slot_number: Optional[int] = None
 TIME_FORMAT = "%Y-%m-%d %H:%M"
 config = prepare.CONFIG
 
-EncodedScreenshot = NewType("EncodedScreenshot", str)
+# height of the screenshot saved, only shown as a thumbnail
+SCREENSHOT_HEIGHT = 180
+
+# The save of a slot is a full file, followed by a journal of the sections
+# changed by the next saves. The journal is merged into a new full file
+# after some saves, or once some times bigger than the full file.
+MAX_JOURNAL_ENTRIES = 32
+MAX_JOURNAL_SIZE_RATIO = 4
+JOURNAL_EXTENSION = "journal"
+# Next to the save, the save menu reads the player name and time from a
+# small header file, and the thumbnail from a PNG file, written only when
+# it changes.
+HEADER_EXTENSION = "header"
+THUMBNAIL_EXTENSION = "png"
+# the save data of a section, the other keys being in the "player" section
+SECTION_KEYS: Mapping[str, Tuple[str, ...]] = {
+    # saves written before the thumbnail file
+    "screenshot": ("screenshot", "screenshot_width", "screenshot_height"),
+    "party": ("monsters",),
+    "inventory": ("items",),
+    "variables": ("game_variables",),
+}
+PLAYER_SECTION = "player"
+# each box is a section, named like "monster_boxes/Kennel"
+BOX_KEYS = ("monster_boxes", "item_boxes")
+# encoded again by each save: the player fields are changed in place, and
+# the monsters have no change hooks
+FRESH_SECTIONS = (PLAYER_SECTION, "party")
+# compared by digest when they are not the data written by the last save
+MONSTER_SECTIONS = ("party", "monster_boxes/")
 
 
 class SaveData(NPCState):
-    screenshot: EncodedScreenshot
-    screenshot_width: int
-    screenshot_height: int
     time: str
     version: int
 
 
+class SaveHeader(TypedDict):
+    player_name: str
+    time: str
+    thumbnail: Optional[pygame.surface.Surface]
+    broken: bool
+
+
 def capture_screenshot(client: LocalPygameClient) -> pygame.surface.Surface:
     """
     Capture a screenshot.
@@ -73,6 +112,25 @@ def capture_screenshot(client: LocalPygameClient) -> pygame.surface.Surface:
     return screenshot
 
 
+def capture_thumbnail(client: LocalPygameClient) -> pygame.surface.Surface:
+    """
+    Capture the thumbnail shown by the save menu.
+
+    Parameters:
+        client: Tuxemon client.
+
+    Returns:
+        Screenshot, scaled down to ``SCREENSHOT_HEIGHT``.
+
+    """
+    screenshot = capture_screenshot(client)
+    width, height = screenshot.get_size()
+    if height > SCREENSHOT_HEIGHT:
+        size = (width * SCREENSHOT_HEIGHT // height, SCREENSHOT_HEIGHT)
+        screenshot = pygame.transform.smoothscale(screenshot, size)
+    return screenshot
+
+
 def get_save_data(session: Session) -> SaveData:
     """
     Gets a dictionary which represents the state of the session.
@@ -84,14 +142,8 @@ def get_save_data(session: Session) -> SaveData:
         Game data to save, must be JSON encodable.
 
     """
-    screenshot = capture_screenshot(session.client)
     npc_state = session.player.get_state(session)
     save_data: SaveData = {
-        "screenshot": base64.b64encode(
-            pygame.image.tostring(screenshot, "RGB")
-        ).decode("utf-8"),
-        "screenshot_width": screenshot.get_width(),
-        "screenshot_height": screenshot.get_height(),
         "time": datetime.datetime.now().strftime(TIME_FORMAT),
         "version": SAVE_VERSION,
         **npc_state,  # type: ignore[misc]
@@ -197,21 +249,238 @@ def open_save_file(save_path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def save(
-    save_data: SaveData,
-    slot: int,
-) -> None:
+def split_sections(save_data: Mapping[str, Any]) -> Dict[str, Any]:
     """
-    Saves the current game state to a file using gzip compressed JSON.
+    Split save data in the sections written separately to the journal.
 
     Parameters:
-        save_data: The data to save.
-        slot: The save slot to save the data to.
+        save_data: The save data.
+
+    Returns:
+        Mapping of the section names to their data.
 
     """
-    # Save a screenshot of the current frame
+    section_of_key = {
+        key: name for name, keys in SECTION_KEYS.items() for key in keys
+    }
+    sections: Dict[str, Any] = {PLAYER_SECTION: {}}
+    for key, value in save_data.items():
+        if key in BOX_KEYS:
+            for box, content in value.items():
+                sections[f"{key}/{box}"] = content
+        elif key in section_of_key:
+            sections.setdefault(section_of_key[key], {})[key] = value
+        else:
+            sections[PLAYER_SECTION][key] = value
+    return sections
+
+
+def merge_sections(sections: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Merge sections back into save data, see ``split_sections``.
 
-    save_path = get_save_path(slot)
+    Parameters:
+        sections: Mapping of the section names to their data.
+
+    Returns:
+        The save data.
+
+    """
+    save_data: Dict[str, Any] = {key: {} for key in BOX_KEYS}
+    for name, value in sections.items():
+        key, _, box = name.partition("/")
+        if key in BOX_KEYS:
+            save_data[key][box] = value
+        else:
+            save_data.update(value)
+    return save_data
+
+
+def section_digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+def same_section(value: Any, previous: Any) -> bool:
+    """
+    Whether a section holds the very data of a previous one.
+
+    The variables, inventories and boxes keep their save data until they
+    change, so getting the same objects again means that
+    they did not change. Numbers and strings are compared by value.
+
+    Parameters:
+        value: Data of the section.
+        previous: Data of the section in a previous save.
+
+    Returns:
+        Whether the data, or each value of a section of several keys, is
+        the same.
+
+    """
+
+    def same(value: Any, previous: Any) -> bool:
+        return value is previous or (
+            isinstance(value, (str, int, float)) and value == previous
+        )
+
+    if same(value, previous):
+        return True
+    if not isinstance(value, dict) or not isinstance(previous, dict):
+        return False
+    return value.keys() == previous.keys() and all(
+        same(value[key], previous[key]) for key in value
+    )
+
+
+def is_monster_section(name: str) -> bool:
+    return name.startswith(MONSTER_SECTIONS)
+
+
+class SaveJournal:
+    """
+    What is written in a save slot: the full file and its journal.
+
+    A section is written to the journal unless it holds the same objects
+    as when it was last written, see ``same_section``. The player section
+    is always written, and the party compared by digest, as they are
+    encoded again by each save. The storage boxes are also compared by
+    digest when they are not the same objects, as after a load.
+
+    Parameters:
+        save_path: Path of the full save file.
+        generation: Id of the full save file, which the journal entries
+            written after it refer to. ``None`` for a file saved before
+            the journal existed.
+        sections: Sections of the save, as the full file and journal
+            give them.
+        entries: Number of journal entries.
+        size: Size of the journal, in bytes.
+
+    """
+
+    def __init__(
+        self,
+        save_path: str,
+        generation: Optional[str],
+        sections: Mapping[str, Any],
+        entries: int = 0,
+        size: int = 0,
+    ) -> None:
+        self.save_path = save_path
+        self.journal_path = f"{save_path}.{JOURNAL_EXTENSION}"
+        self.generation = generation
+        self.sections = dict(sections)
+        self.digests = {
+            name: section_digest(value)
+            for name, value in sections.items()
+            if is_monster_section(name)
+        }
+        self.entries = entries
+        self.size = size
+        # pixels of the thumbnail file, if written by this game
+        self.thumbnail: Optional[bytes] = None
+
+    def needs_compaction(self) -> bool:
+        """Whether the next save must write the full file."""
+        if self.generation is None or self.entries >= MAX_JOURNAL_ENTRIES:
+            return True
+        try:
+            max_size = os.path.getsize(self.save_path) * MAX_JOURNAL_SIZE_RATIO
+        except OSError:
+            return True
+        return self.size > max_size
+
+    def append(self, sections: Mapping[str, Any]) -> Optional[int]:
+        """
+        Write the changed sections to the journal.
+
+        Parameters:
+            sections: All the sections of the save.
+
+        Returns:
+            Number of bytes written.
+
+        """
+        changed = {}
+        for name, value in sections.items():
+            if name not in FRESH_SECTIONS and same_section(
+                value, self.sections.get(name)
+            ):
+                continue
+            if is_monster_section(name):
+                digest = section_digest(value)
+                if self.digests.get(name) == digest:
+                    continue
+                self.digests[name] = digest
+            changed[name] = value
+        removed = [name for name in self.sections if name not in sections]
+        for name in removed:
+            self.digests.pop(name, None)
+        entry = {
+            "generation": self.generation,
+            "sections": changed,
+            "removed": removed,
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write(line)
+        self.sections = dict(sections)
+        self.entries += 1
+        self.size += len(line.encode())
+        return len(line)
+
+    def remove(self) -> None:
+        """Remove the journal, once merged in the full file."""
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self.entries = 0
+        self.size = 0
+
+
+# what is known to be written in each save slot, by path
+journals: Dict[str, SaveJournal] = {}
+
+
+def read_journal(
+    journal_path: str,
+    generation: str,
+) -> Iterator[Tuple[Mapping[str, Any], List[str], int]]:
+    """
+    Read the entries of a journal written after a full save file.
+
+    The entries are read up to the first one which cannot be decoded,
+    like a line partly written when the game stopped.
+
+    Parameters:
+        journal_path: Path of the journal.
+        generation: Id of the full save file.
+
+    Yields:
+        Changed sections, removed sections and size of each entry.
+
+    """
+    try:
+        journal = open(journal_path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with journal:
+        for line in journal:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("Save journal %s is truncated", journal_path)
+                return
+            # written after a previous full file, when the game stopped
+            # before the journal was removed
+            if entry["generation"] != generation:
+                continue
+            yield entry["sections"], entry["removed"], len(line.encode())
+
+
+def write_save_file(save_data: Mapping[str, Any], save_path: str) -> None:
     save_path_tmp = save_path + ".tmp"
     json_kwargs = {
         "indent": 4,
@@ -230,6 +499,203 @@ def save(
     os.replace(save_path_tmp, save_path)
 
 
+def replace_file(path: str, write: Callable[[str], None]) -> None:
+    """
+    Write a file through a temporary file, replaced atomically.
+
+    Parameters:
+        path: Path of the file.
+        write: Function writing the file at the path given.
+
+    """
+    root, extension = os.path.splitext(path)
+    # the extension is kept, as pygame uses it to choose the image format
+    path_tmp = f"{root}.tmp{extension}"
+    write(path_tmp)
+    os.replace(path_tmp, path)
+
+
+def write_header(save_data: Mapping[str, Any], save_path: str) -> None:
+    header = {key: save_data[key] for key in ("player_name", "time")}
+
+    def write(path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(header, file)
+
+    replace_file(f"{save_path}.{HEADER_EXTENSION}", write)
+
+
+def write_thumbnail(
+    thumbnail: pygame.surface.Surface,
+    journal: SaveJournal,
+) -> None:
+    """
+    Write the thumbnail of a save, unless it did not change.
+
+    Parameters:
+        thumbnail: The thumbnail.
+        journal: What is written in the save slot.
+
+    """
+    pixels = pygame.image.tostring(thumbnail, "RGB")
+    if pixels == journal.thumbnail:
+        return
+    replace_file(
+        f"{journal.save_path}.{THUMBNAIL_EXTENSION}",
+        partial(pygame.image.save, thumbnail),
+    )
+    journal.thumbnail = pixels
+
+
+def save(
+    save_data: SaveData,
+    slot: int,
+    thumbnail: Optional[pygame.surface.Surface] = None,
+) -> None:
+    """
+    Saves the current game state to a file.
+
+    Only the sections changed since the last save are written, to the
+    journal of the slot, unless the full file has to be written again.
+
+    Parameters:
+        save_data: The data to save.
+        slot: The save slot to save the data to.
+        thumbnail: Thumbnail shown by the save menu, see
+            ``capture_thumbnail``.
+
+    """
+    save_path = get_save_path(slot)
+    sections = split_sections(save_data)
+    journal = journals.get(save_path)
+    if journal is not None and not journal.needs_compaction():
+        size = journal.append(sections)
+        logger.info("Saved %s bytes to save journal: %s", size, save_path)
+    else:
+        generation = uuid.uuid4().hex
+        write_save_file({**save_data, "generation": generation}, save_path)
+        written = SaveJournal(save_path, generation, sections)
+        if journal is not None:
+            written.thumbnail = journal.thumbnail
+        journal = written
+        journal.remove()
+        journals[save_path] = journal
+
+    write_header(save_data, save_path)
+    if thumbnail is not None:
+        write_thumbnail(thumbnail, journal)
+
+
+def read_save(slot: int) -> Optional[Dict[str, Any]]:
+    """
+    Reads the save data of a slot, with the changes of its journal.
+
+    Parameters:
+        slot: The save slot to read.
+
+    Returns:
+        The save data as written, ``None`` if the slot is empty.
+
+    """
+    save_path = get_save_path(slot)
+    save_data = open_save_file(save_path)
+    if not save_data:
+        return save_data
+
+    generation = save_data.pop("generation", None)
+    sections = split_sections(save_data)
+    entries = 0
+    size = 0
+    if generation is not None:
+        journal_path = f"{save_path}.{JOURNAL_EXTENSION}"
+        for changed, removed, entry_size in read_journal(
+            journal_path,
+            generation,
+        ):
+            sections.update(changed)
+            for name in removed:
+                sections.pop(name, None)
+            entries += 1
+            size += entry_size
+
+    # the journal of this game knows which data was written
+    journal = journals.get(save_path)
+    if (
+        journal is None
+        or journal.generation != generation
+        or (journal.entries, journal.size) != (entries, size)
+    ):
+        journals[save_path] = SaveJournal(
+            save_path,
+            generation,
+            sections,
+            entries,
+            size,
+        )
+    return merge_sections(sections)
+
+
+def read_header(slot: int) -> Optional[SaveHeader]:
+    """
+    Reads what the save menu shows of a slot, without reading the save.
+
+    Saves written before the header file are read in full.
+
+    Parameters:
+        slot: The save slot to read.
+
+    Returns:
+        Player name, time and thumbnail of the save, ``None`` if the slot
+        is empty.
+
+    """
+    save_path = get_save_path(slot)
+    if not os.path.exists(save_path):
+        return None
+    try:
+        with open(f"{save_path}.{HEADER_EXTENSION}", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        save_data = read_save(slot)
+        if save_data is None:
+            return None
+        if not save_data:
+            return {
+                "player_name": "BROKEN SAVE!",
+                "time": "",
+                "thumbnail": None,
+                "broken": True,
+            }
+        thumbnail = None
+        if "screenshot" in save_data:
+            thumbnail = pygame.image.frombuffer(
+                base64.b64decode(save_data["screenshot"]),
+                (
+                    save_data["screenshot_width"],
+                    save_data["screenshot_height"],
+                ),
+                "RGB",
+            )
+        return {
+            "player_name": save_data["player_name"],
+            "time": save_data["time"],
+            "thumbnail": thumbnail,
+            "broken": False,
+        }
+
+    thumbnail_path = f"{save_path}.{THUMBNAIL_EXTENSION}"
+    try:
+        thumbnail = pygame.image.load(thumbnail_path)
+    except (OSError, pygame.error):
+        thumbnail = None
+    return {
+        "player_name": data["player_name"],
+        "time": data["time"],
+        "thumbnail": thumbnail,
+        "broken": False,
+    }
+
+
 def load(slot: int) -> Optional[SaveData]:
     """
     Loads game state data from a save file.
@@ -241,8 +707,7 @@ def load(slot: int) -> Optional[SaveData]:
         Dictionary containing game data to load.
 
     """
-    save_path = get_save_path(slot)
-    save_data = open_save_file(save_path)
+    save_data = read_save(slot)
 
     if save_data:
         return upgrade_save(save_data)
@@ -259,11 +724,10 @@ def load(slot: int) -> Optional[SaveData]:
 def get_index_of_latest_save() -> Optional[int]:
     times = []
     for slot_index in range(3):
-        save_path = get_save_path(slot_index + 1)
-        save_data = open_save_file(save_path)
-        if save_data is not None:
+        header = read_header(slot_index + 1)
+        if header and not header["broken"]:
             time_of_save = datetime.datetime.strptime(
-                save_data["time"],
+                header["time"],
                 TIME_FORMAT,
             )
             times.append((slot_index, time_of_save))
@@ -0,0 +1,169 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""Dedicated multiplayer server, running without display.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from tuxemon import prepare
+from tuxemon.map import TuxemonMap, get_exits
+from tuxemon.map_loader import TMXMapLoader
+from tuxemon.networking import EventData, TuxemonServer
+
+logger = logging.getLogger(__name__)
+
+# events moving a player, their tile position is checked
+MOVE_EVENTS = (
+    "CLIENT_MOVE_START",
+    "CLIENT_MOVE_COMPLETE",
+    "CLIENT_MAP_UPDATE",
+    "CLIENT_START_BATTLE",
+)
+
+
+class DedicatedServer(TuxemonServer):
+    """
+    Multiplayer server without a local game.
+
+    The server keeps the authoritative position of the players. Maps
+    are loaded without their images, and a move is only accepted if it
+    leads to a tile the collisions of the map and the other players
+    let the player enter. The player making a refused move is sent back
+    to its last accepted position.
+
+    Changing map is accepted as is: the events teleporting players are
+    only run by the clients.
+
+    Parameters:
+        server_name: Name announced to the clients.
+        network: Transport used instead of a Neteria server.
+
+    """
+
+    def __init__(
+        self,
+        server_name: Optional[str] = None,
+        network: Any = None,
+    ) -> None:
+        super().__init__(None, server_name, network)
+        self.map_loader = TMXMapLoader(load_images=False)
+        self.world_maps: Dict[str, Optional[TuxemonMap]] = {}
+
+    def get_map(self, map_name: str) -> Optional[TuxemonMap]:
+        """
+        Get a map, loading it the first time.
+
+        Parameters:
+            map_name: File name of the map.
+
+        Returns:
+            The map, ``None`` if the server does not have it.
+
+        """
+        try:
+            return self.world_maps[map_name]
+        except KeyError:
+            pass
+        try:
+            txmn_map: Optional[TuxemonMap] = self.map_loader.load(
+                prepare.fetch("maps", map_name)
+            )
+        except OSError:
+            logger.warning(f"map {map_name} not found, moves not checked")
+            txmn_map = None
+        self.world_maps[map_name] = txmn_map
+        return txmn_map
+
+    def is_valid_move(
+        self,
+        cuuid: str,
+        map_name: str,
+        tile_pos: Tuple[int, int],
+    ) -> bool:
+        """
+        Check that a player can be at a tile.
+
+        Parameters:
+            cuuid: Clients unique user identification number.
+            map_name: Map where the player is.
+            tile_pos: Tile position sent by the player.
+
+        Returns:
+            Whether the tile is the current one of the player or one it
+            can move to.
+
+        """
+        client = self.server.registry[cuuid]
+        current = client.get("char_dict", {}).get("tile_pos")
+        if client.get("map_name") != map_name or current is None:
+            return True
+        current = (current[0], current[1])
+        tile_pos = (tile_pos[0], tile_pos[1])
+        if tile_pos == current:
+            return True
+        txmn_map = self.get_map(map_name)
+        if txmn_map is None:
+            return True
+
+        collision_map: Dict[Tuple[int, int], Any] = {}
+        for peer in self.interested_clients(cuuid):
+            peer_pos = self.server.registry[peer]["char_dict"]["tile_pos"]
+            collision_map[(peer_pos[0], peer_pos[1])] = {"entity": peer}
+        collision_map.update(txmn_map.collision_map)
+
+        exits = get_exits(
+            current,
+            collision_map,
+            txmn_map.collision_lines_map,
+            txmn_map.size,
+        )
+        return tile_pos in exits
+
+    def server_event_handler(self, cuuid: str, event_data: EventData) -> None:
+        """Checks the moves of the players before handling their events.
+
+        :param cuuid: Clients unique user identification number.
+        :param event_data: Event information sent by client.
+
+        """
+        if event_data["type"] in MOVE_EVENTS and "char_dict" in event_data:
+            client = self.server.registry[cuuid]
+            map_name = event_data.get("map_name", client.get("map_name"))
+            tile_pos = event_data["char_dict"].get("tile_pos")
+            if tile_pos is not None and not self.is_valid_move(
+                cuuid, map_name, tile_pos
+            ):
+                logger.info(f"refused move of {cuuid} to {tile_pos}")
+                self.correct_client(cuuid)
+                return
+        super().server_event_handler(cuuid, event_data)
+
+    def correct_client(self, cuuid: str) -> None:
+        """Sends a player back to its last accepted position.
+
+        :param cuuid: Clients unique user identification number.
+
+        """
+        client = self.server.registry[cuuid]
+        event_data = EventData(
+            type="NOTIFY_CLIENT_CORRECTION",
+            cuuid=cuuid,
+            map_name=client["map_name"],
+            char_dict=client["char_dict"].copy(),
+        )
+        self.outbox.setdefault(cuuid, []).append(event_data)
+
+    def run(self) -> None:
+        """Listens for clients and ticks at ``TICK_RATE`` until stopped."""
+        logger.info(f"starting dedicated server {self.server_name}")
+        self.server.listen()
+        self.listening = True
+        try:
+            while True:
+                self.update()
+                time.sleep(max(self.next_tick - time.monotonic(), 0.0))
+        except KeyboardInterrupt:
+            logger.info("dedicated server stopped")
@@ -0,0 +1,435 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""
+
+Display-free battle engine, used to run balance tests at scale.
+
+The simulator plays AI-vs-AI battles between plain Monster and Technique
+objects with the same rules as the combat state (action ordering, status
+responses, technique effects and fainting), without sprites, sounds,
+menus or a running client.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from tuxemon.ai import choose_action
+from tuxemon.combat import (
+    EnqueuedAction,
+    fainted,
+    fainted_party,
+    get_awake_monsters,
+    has_status,
+    has_status_bond,
+    pre_checking,
+    rank_action,
+    status_response,
+)
+from tuxemon.db import PlagueType
+from tuxemon.monster import Monster
+from tuxemon.session import local_session
+from tuxemon.technique.technique import Technique
+
+if TYPE_CHECKING:
+    from tuxemon.item.item import Item
+    from tuxemon.npc import NPC
+
+logger = logging.getLogger(__name__)
+
+MAX_TURNS = 100
+
+
+class SimulatedTrainer:
+    """
+    Display-free stand-in for the NPC fighting a simulated battle.
+
+    It only holds the attributes read by the combat rules and the
+    technique effects: party, game variables, money and plague.
+
+    """
+
+    def __init__(
+        self,
+        slug: str,
+        monsters: Sequence[Monster],
+        isplayer: bool = False,
+    ) -> None:
+        self.slug = slug
+        self.name = slug
+        self.isplayer = isplayer
+        self.monsters = list(monsters)
+        self.max_position = 1
+        self.game_variables: Dict[str, Any] = {}
+        self.money = {"player": 0}
+        self.plague = PlagueType.healthy
+        self.speed = 0
+
+    def give_money(self, amount: int) -> None:
+        self.money["player"] += amount
+
+
+class BattleResult(NamedTuple):
+    """Outcome of a simulated battle."""
+
+    winner: Optional[int]
+    turns: int
+    parties: Tuple[Sequence[str], Sequence[str]]
+    techniques: Tuple[Sequence[str], Sequence[str]]
+
+
+class BattleSimulator:
+    """
+    Headless battle engine.
+
+    Technique effects, formulas and monster creation draw from the
+    module-level random generator, so the simulator gives it a state of
+    its own, seeded from ``rng``, while it creates monsters and plays,
+    and restores the previous state after. The same seed always plays
+    the same battle.
+
+    The simulator exposes the parts of the combat state used by the
+    technique effects (``monsters_in_play_human``, ``_log_action``, ...).
+    Experience is not awarded, so monsters keep their level for the
+    whole battle.
+
+    Parameters:
+        rng: Random generator used for the AI decisions and hit rolls.
+        difficulty: Difficulty of the AI of both trainers, one of
+            ``tuxemon.ai.DIFFICULTIES``.
+        max_turns: Number of turns after which the battle is a draw.
+
+    """
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        difficulty: str = "easy",
+        max_turns: int = MAX_TURNS,
+    ) -> None:
+        self.rng = rng or random.Random()
+        self.difficulty = difficulty
+        self.max_turns = max_turns
+        self._random_state = random.Random(self.rng.getrandbits(64)).getstate()
+
+        self.players: Tuple[SimulatedTrainer, ...] = ()
+        self.monsters_in_play: Dict[SimulatedTrainer, List[Monster]] = {}
+        self.is_trainer_battle = True
+        self._action_queue: List[EnqueuedAction] = []
+        self._log_action: List[Tuple[int, EnqueuedAction]] = []
+        self._damage_map: DefaultDict[Monster, Set[Monster]] = defaultdict(set)
+        self._techniques: Tuple[Set[str], Set[str]] = (set(), set())
+        self._turn = 0
+
+    @contextmanager
+    def _seeded(self) -> Iterator[None]:
+        """Use the state of the simulator in the module-level generator."""
+        state = random.getstate()
+        random.setstate(self._random_state)
+        try:
+            yield
+        finally:
+            self._random_state = random.getstate()
+            random.setstate(state)
+
+    def create_monster(self, slug: str, level: int) -> Monster:
+        """
+        Create a monster ready to fight, without loading its sprites.
+
+        Parameters:
+            slug: Slug of the monster.
+            level: Level of the monster.
+
+        Returns:
+            The monster, with full health and the moves of its level.
+
+        """
+        with self._seeded():
+            monster = Monster()
+            monster.load_from_db(slug)
+            monster.set_level(level)
+            monster.set_moves(level)
+        monster.current_hp = monster.hp
+        return monster
+
+    def run(
+        self,
+        party_a: Sequence[Monster],
+        party_b: Sequence[Monster],
+    ) -> BattleResult:
+        """
+        Play a battle until one of the parties is defeated.
+
+        Parameters:
+            party_a: Monsters of the first trainer.
+            party_b: Monsters of the second trainer.
+
+        Returns:
+            The outcome of the battle.
+
+        """
+        self.players = (
+            SimulatedTrainer("trainer_a", party_a, isplayer=True),
+            SimulatedTrainer("trainer_b", party_b),
+        )
+        self.monsters_in_play = {player: [] for player in self.players}
+        self._action_queue = []
+        self._log_action = []
+        self._damage_map = defaultdict(set)
+        self._techniques = (set(), set())
+        self._turn = 0
+
+        # technique effects read the hit roll from the session player
+        session_player = local_session.player
+        local_session.player = self.players[0]  # type: ignore[assignment]
+        try:
+            with self._seeded():
+                winner = self._play()
+        finally:
+            local_session.player = session_player
+
+        return BattleResult(
+            winner=winner,
+            turns=self._turn,
+            parties=(
+                [m.slug for m in party_a],
+                [m.slug for m in party_b],
+            ),
+            techniques=(
+                sorted(self._techniques[0]),
+                sorted(self._techniques[1]),
+            ),
+        )
+
+    def _play(self) -> Optional[int]:
+        while self._turn < self.max_turns:
+            self.housekeeping()
+            self.decision()
+            self._action_queue.sort(key=rank_action, reverse=True)
+            self.handle_action_queue()
+            self.post_action()
+            self.handle_action_queue()
+
+            remaining = self.remaining_players
+            if len(remaining) == 0:
+                return None
+            elif len(remaining) == 1:
+                return self.players.index(remaining[0])
+        return None
+
+    @property
+    def active_monsters(self) -> Sequence[Monster]:
+        return list(chain.from_iterable(self.monsters_in_play.values()))
+
+    @property
+    def monsters_in_play_human(self) -> Sequence[Monster]:
+        return self.monsters_in_play[self.players[0]]
+
+    @property
+    def monsters_in_play_ai(self) -> Sequence[Monster]:
+        return self.monsters_in_play[self.players[1]]
+
+    @property
+    def remaining_players(self) -> Sequence[SimulatedTrainer]:
+        return [p for p in self.players if not fainted_party(p.monsters)]
+
+    def opponent(self, player: SimulatedTrainer) -> SimulatedTrainer:
+        if player is self.players[0]:
+            return self.players[1]
+        return self.players[0]
+
+    def housekeeping(self) -> None:
+        """Start a new turn and send out monsters in free positions."""
+        self._turn += 1
+        for player in self.remaining_players:
+            if len([m for m in player.monsters if not fainted(m)]) == 1:
+                player.max_position = 1
+            positions_available = player.max_position - len(
+                self.monsters_in_play[player]
+            )
+            if positions_available:
+                available = get_awake_monsters(
+                    player,  # type: ignore[arg-type]
+                    self.monsters_in_play[player],
+                    self._turn,
+                )
+                for _ in range(positions_available):
+                    self.add_monster_into_play(player, next(available))
+
+    def add_monster_into_play(
+        self,
+        player: SimulatedTrainer,
+        monster: Monster,
+    ) -> None:
+        self.monsters_in_play[player].append(monster)
+        # remove "connected" status (eg. lifeleech, etc.)
+        for mon in self.active_monsters:
+            if has_status_bond(mon):
+                mon.status.clear()
+
+    def decision(self) -> None:
+        """Let every monster in play choose its action."""
+        # saves random value, so the effects know if a tech hit or missed
+        value = self.rng.random()
+        self.players[0].game_variables["random_tech_hit"] = value
+        for player in self.remaining_players:
+            enemy = self.opponent(player)
+            for monster in self.monsters_in_play[player]:
+                for tech in monster.moves:
+                    tech.recharge()
+                technique, target = self.choose_technique(
+                    monster, self.monsters_in_play[enemy]
+                )
+                technique = pre_checking(
+                    monster,
+                    technique,
+                    target,
+                    player,  # type: ignore[arg-type]
+                    enemy,  # type: ignore[arg-type]
+                )
+                status_response(monster, technique)
+                self.enqueue_action(monster, technique, target)
+
+    def choose_technique(
+        self,
+        monster: Monster,
+        opponents: Sequence[Monster],
+    ) -> Tuple[Technique, Monster]:
+        """
+        Choose among the usable techniques, like the AI does.
+
+        Parameters:
+            monster: Monster choosing the technique.
+            opponents: Monsters it may target.
+
+        Returns:
+            The technique and its target.
+
+        """
+        action = choose_action(monster, opponents, self.difficulty, self.rng)
+        if action is None:
+            skip = Technique()
+            skip.load("skip")
+            return skip, self.rng.choice(opponents)
+        return action
+
+    def post_action(self) -> None:
+        """Enqueue the status effects of the monsters in play."""
+        for monster in self.active_monsters:
+            for technique in monster.status:
+                if technique.validate(monster):
+                    technique.combat_state = self  # type: ignore[assignment]
+                    technique.nr_turn += 1
+                    self.enqueue_action(None, technique, monster)
+                # avoid multiple effect status
+                monster.set_stats()
+
+    def enqueue_action(
+        self,
+        user: Optional[Monster],
+        technique: Technique,
+        target: Monster,
+    ) -> None:
+        action = EnqueuedAction(user, technique, target)
+        self._action_queue.append(action)
+        self._log_action.append((self._turn, action))
+
+    def handle_action_queue(self) -> None:
+        while self._action_queue:
+            action = self._action_queue.pop()
+            self.perform_action(*action)
+            self.check_party_hp()
+
+    def perform_action(
+        self,
+        user: Union[Monster, NPC, None],
+        technique: Union[Technique, Item, None],
+        target: Monster,
+    ) -> None:
+        """
+        Perform the action.
+
+        Parameters:
+            user: Monster that does the action, ``None`` for statuses.
+            technique: Technique used.
+            target: Monster that receives the action.
+
+        """
+        if not isinstance(technique, Technique):
+            return
+        technique.combat_state = self  # type: ignore[assignment]
+        if not isinstance(user, Monster):
+            technique.use(None, target)  # type: ignore[arg-type]
+            return
+
+        technique.advance_round()
+        result = technique.use(user, target)
+        for index, player in enumerate(self.players):
+            if user in player.monsters:
+                self._techniques[index].add(technique.slug)
+        if result.get("should_tackle"):
+            self._damage_map[target].add(user)
+
+    def check_party_hp(self) -> None:
+        """Apply the recover and diehard statuses, then faint monsters."""
+        for party in self.monsters_in_play.values():
+            for monster in list(party):
+                if monster.current_hp >= monster.hp and has_status(
+                    monster, "status_recover"
+                ):
+                    monster.status = []
+                    monster.current_hp = min(monster.current_hp, monster.hp)
+                    return
+                if monster.current_hp <= 0 and has_status(
+                    monster, "status_diehard"
+                ):
+                    monster.current_hp = 1
+                    monster.status = []
+                    return
+                if monster.current_hp <= 0 and not has_status(
+                    monster, "status_faint"
+                ):
+                    self.faint_monster(monster)
+
+    def faint_monster(self, monster: Monster) -> None:
+        """
+        Make the monster faint and remove it from play.
+
+        Parameters:
+            monster: Monster that will faint.
+
+        """
+        self._action_queue = [
+            action
+            for action in self._action_queue
+            if action.user is not monster and action.target is not monster
+        ]
+        faint = Technique()
+        faint.load("status_faint")
+        monster.current_hp = 0
+        if monster.status:
+            monster.status[0].nr_turn = 0
+        monster.status = [faint]
+        self._damage_map.pop(monster, None)
+        for party in self.monsters_in_play.values():
+            if monster in party:
+                party.remove(monster)
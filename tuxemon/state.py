@@ -10,6 +10,7 @@ import warnings
 from abc import ABCMeta
 from importlib import import_module
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     Dict,
@@ -30,12 +31,21 @@ import pygame
 from pygame.rect import Rect
 
 from tuxemon import graphics, prepare
-from tuxemon.animation import Animation, Task, remove_animations_of
+from tuxemon.animation import (
+    Animation,
+    AnimationGroup,
+    Task,
+    remove_animations_of,
+)
 from tuxemon.constants import paths
 from tuxemon.platform.events import PlayerInput
+from tuxemon.profiler import profiler
 from tuxemon.session import local_session
 from tuxemon.sprite import Sprite, SpriteGroup
 
+if TYPE_CHECKING:
+    from tuxemon.clock import Scheduler
+
 logger = logging.getLogger(__name__)
 
 StateType = TypeVar("StateType", bound="State")
@@ -77,7 +87,7 @@ class State:
         self.current_time = 0.0
 
         # Only animations and tasks
-        self.animations = pygame.sprite.Group()
+        self.animations = AnimationGroup()
 
         # All sprites that draw on the screen
         self.sprites: SpriteGroup[Sprite] = SpriteGroup()
@@ -129,7 +139,8 @@ class State:
         """
         Create a task for this state.
 
-        Tasks are processed even while state is inactive.
+        Tasks are processed even while state is inactive, by the
+        scheduler of the client, until the state is removed.
         If you want to pass positional arguments, use functools.partial.
 
         Parameters:
@@ -141,7 +152,11 @@ class State:
 
         """
         task = Task(*args, **kwargs)
-        self.animations.add(task)
+        if self.client is None:
+            self.animations.add(task)
+        else:
+            # the client scheduler cancels the task when the state is removed
+            task.attach(self.client.scheduler, owner=self)
         return task
 
     def remove_animations_of(self, target: Any) -> None:
@@ -271,6 +286,8 @@ class StateManager:
         package: Name of package to search for states.
         on_state_change: Optional callback to be executed when top state
             changes.
+        scheduler: Optional scheduler of the state tasks, their tasks are
+            cancelled when states are removed.
 
     """
 
@@ -278,8 +295,10 @@ class StateManager:
         self,
         package: str,
         on_state_change: Optional[Callable[[], None]] = None,
+        scheduler: Optional[Scheduler] = None,
     ) -> None:
         self.package = package
+        self.scheduler = scheduler
         # TODO: consider API for handling hooks
         self._on_state_change_hook = on_state_change
         self._state_queue: List[Tuple[str, Mapping[str, Any]]] = list()
@@ -390,7 +409,8 @@ class StateManager:
         logger.debug("updating states")
         for state in self.active_states:
             self._check_resume(state)
-            state.update(time_delta)
+            with profiler.scope(state.name, "update"):
+                state.update(time_delta)
 
     def _check_resume(self, state: State) -> None:
         """
@@ -479,6 +499,7 @@ class StateManager:
             self._check_resume(state)
             state.pause()
             state.shutdown()
+            self._cancel_tasks(state)
             if self._state_stack:
                 self._resume_set.add(self._state_stack[0])
             if self._on_state_change_hook:
@@ -486,6 +507,7 @@ class StateManager:
         else:
             logger.debug("pop-remove state: %s", state.name)
             self._state_stack.remove(state)
+            self._cancel_tasks(state)
 
     def remove_state(self, state: State) -> None:
         """
@@ -510,6 +532,11 @@ class StateManager:
             logger.debug("remove state: %s", state.name)
             self._state_stack.remove(state)
             state.shutdown()
+            self._cancel_tasks(state)
+
+    def _cancel_tasks(self, state: State) -> None:
+        if self.scheduler is not None:
+            self.scheduler.unschedule_owner(state)
 
     @overload
     def push_state(self, state_name: str, **kwargs: Any) -> State:
@@ -45,7 +45,6 @@ from typing import (
     List,
     Literal,
     MutableMapping,
-    NamedTuple,
     Optional,
     Sequence,
     Set,
@@ -61,6 +60,7 @@ from tuxemon.ai import AI
 from tuxemon.animation import Animation, Task
 from tuxemon.battle import Battle
 from tuxemon.combat import (
+    EnqueuedAction,
     alive_party,
     check_moves,
     confused,
@@ -69,11 +69,12 @@ from tuxemon.combat import (
     generic,
     get_awake_monsters,
     has_effect,
-    has_effect_param,
     has_status,
     has_status_bond,
+    rank_action,
     scope,
     spyderbite,
+    status_response,
 )
 from tuxemon.db import (
     BattleGraphicsModel,
@@ -90,6 +91,7 @@ from tuxemon.monster import Monster
 from tuxemon.npc import NPC
 from tuxemon.platform.const import buttons
 from tuxemon.platform.events import PlayerInput
+from tuxemon.profiler import profiler
 from tuxemon.session import local_session
 from tuxemon.sprite import Sprite
 from tuxemon.states.journal import MonsterInfoState
@@ -121,12 +123,6 @@ CombatPhase = Literal[
 ]
 
 
-class EnqueuedAction(NamedTuple):
-    user: Union[Monster, NPC, None]
-    technique: Union[Technique, Item, None]
-    target: Monster
-
-
 # TODO: move to mod config
 MULT_MAP = {
     4: "attack_very_effective",
@@ -253,10 +249,21 @@ class CombatState(CombatAnimations):
 
         super().__init__(players, graphics)
         self.is_trainer_battle = combat_type == "trainer"
+        self.preload_sounds()
         self.show_combat_dialog()
         self.transition_phase("begin")
         self.task(partial(setattr, self, "phase", "ready"), 3)
 
+    def preload_sounds(self) -> None:
+        """Decode the cries and technique sounds of the battle."""
+        slugs = []
+        for player in self.players:
+            for monster in player.monsters:
+                slugs.append(monster.combat_call)
+                slugs.append(monster.faint_call)
+                slugs.extend(tech.sfx for tech in monster.moves)
+        audio.preload_sounds(slugs)
+
     @staticmethod
     def is_task_finished(task: Union[Task, Animation]) -> bool:
         """
@@ -284,8 +291,10 @@ class CombatState(CombatAnimations):
         * update the new phase, or the current one
         """
         super().update(time_delta)
-        if not self._animation_in_progress and all(
-            map(self.is_task_finished, self.animations)
+        if (
+            not self._animation_in_progress
+            and not self.client.scheduler.is_scheduled(self)
+            and all(map(self.is_task_finished, self.animations))
         ):
             new_phase = self.determine_phase(self.phase)
             if new_phase:
@@ -513,7 +522,7 @@ class CombatState(CombatAnimations):
             else:
                 # remove monsters still around
                 for mon in self.ai_players:
-                    mon.monsters.pop()
+                    mon.remove_monster(mon.monsters[-1])
                 var["battle_last_result"] = OutputBattle.ran
                 message = T.translate("combat_player_run")
 
@@ -614,43 +623,7 @@ class CombatState(CombatAnimations):
             assert_never(phase)
 
     def sort_action_queue(self) -> None:
-        """Sort actions in the queue according to game rules.
-
-        * Swap actions are always first
-        * Techniques that damage are sorted by monster speed
-        * Items are sorted by trainer speed
-
-        """
-
-        def rank_action(action: EnqueuedAction) -> Tuple[int, int]:
-            if action.technique is None:
-                return 0, 0
-            sort = action.technique.sort
-            primary_order = sort_order.index(sort)
-
-            if sort == "meta":
-                # all meta items sorted together
-                # use of 0 leads to undefined sort/probably random
-                return primary_order, 0
-            elif sort == "potion":
-                return primary_order, 0
-            else:
-                # TODO: determine the secondary sort element,
-                # monster speed, trainer speed, etc
-                assert action.user
-                return primary_order, action.user.speed_test(action)
-
-        # TODO: move to mod config
-        sort_order = [
-            "meta",
-            "item",
-            "utility",
-            "potion",
-            "food",
-            "heal",
-            "damage",
-        ]
-
+        """Sort actions in the queue according to game rules."""
         # TODO: Running happens somewhere else, it should be moved here
         # i think.
         # TODO: Eventually make an action queue class?
@@ -684,7 +657,8 @@ class CombatState(CombatAnimations):
         """Take one action from the queue and do it."""
         if self._action_queue:
             action = self._action_queue.pop()
-            self.perform_action(*action)
+            with profiler.scope("combat action"):
+                self.perform_action(*action)
             self.task(self.check_party_hp, 1)
             self.task(self.animate_party_status, 3)
             self.task(self.animate_xp_message, 3)
@@ -1126,7 +1100,6 @@ class CombatState(CombatAnimations):
                     m = generic(user, technique, target, _player)
                 message += "\n" + m
                 action_time += len(message) * letter_time
-            # TODO: caching sounds
             audio.load_sound(technique.sfx, None).play()
             # animation own monster AI NPC
             if "own monster" in technique.target:
@@ -1543,25 +1516,10 @@ class CombatState(CombatAnimations):
         - eventually removes the status
         - eventually shows a text
         """
-        # removes enraged
-        if has_status(monster, "status_enraged") and not has_effect_param(
-            technique, "status_enraged", "give", "condition"
-        ):
-            monster.status.clear()
-            return True
-        # removes sniping
-        if has_status(monster, "status_sniping") and not has_effect_param(
-            technique, "status_sniping", "give", "condition"
-        ):
-            monster.status.clear()
-            return True
-        # removes dozing
-        if has_status(monster, "status_dozing"):
-            monster.status.clear()
-            return True
-        # removes tired
-        if has_status(monster, "status_tired"):
-            monster.status.clear()
+        changed = status_response(monster, technique)
+        if changed is None:
+            return False
+        if changed == "status_tired":
             label = T.format(
                 "combat_state_tired_end",
                 {
@@ -1569,44 +1527,7 @@ class CombatState(CombatAnimations):
                 },
             )
             self._lost_status = label
-            return True
-        # change exhausted -> tired
-        if has_status(monster, "status_exhausted") and not has_effect_param(
-            technique, "status_exhausted", "give", "condition"
-        ):
-            monster.status.clear()
-            status = Technique()
-            status.load("status_tired")
-            monster.apply_status(status)
-            return True
-        # change charging -> charged up
-        if has_status(monster, "status_charging") and not has_effect_param(
-            technique, "status_charging", "give", "condition"
-        ):
-            monster.status.clear()
-            status = Technique()
-            status.load("status_chargedup")
-            monster.apply_status(status)
-            return True
-        # change charged up -> exhausted
-        if has_status(monster, "status_chargedup") and not has_effect_param(
-            technique, "status_chargedup", "give", "condition"
-        ):
-            monster.status.clear()
-            status = Technique()
-            status.load("status_exhausted")
-            monster.apply_status(status)
-            return True
-        # change nodding off -> dozing
-        if has_status(monster, "status_noddingoff") and not has_effect_param(
-            technique, "status_noddingoff", "give", "condition"
-        ):
-            monster.status.clear()
-            status = Technique()
-            status.load("status_dozing")
-            monster.apply_status(status)
-            return True
-        return False
+        return True
 
     def evolve(self) -> None:
         self.client.pop_state()
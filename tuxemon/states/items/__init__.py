@@ -25,6 +25,24 @@ if TYPE_CHECKING:
     from tuxemon.npc import NPC
 
 
+# the two reversals are used to let name sort desc, but class sort asc
+SORT_ORDER = ["potion", "food", "utility", "quest"][::-1]
+
+
+def rank_item(item: Item) -> Tuple[int, str]:
+    """
+    Sort key of the items, see ``sort_inventory``.
+
+    Parameters:
+        item: Item to sort.
+
+    Returns:
+        Rank of the category of the item, then its name.
+
+    """
+    return SORT_ORDER.index(item.sort), item.name
+
+
 def sort_inventory(
     inventory: Sequence[Item],
 ) -> Sequence[Item]:
@@ -42,14 +60,6 @@ def sort_inventory(
         Sorted copy of the inventory.
 
     """
-
-    def rank_item(item: Item) -> Tuple[int, str]:
-        primary_order = sort_order.index(item.sort)
-        return primary_order, item.name
-
-    # the two reversals are used to let name sort desc, but class sort asc
-    sort_order = ["potion", "food", "utility", "quest"]
-    sort_order.reverse()
     return sorted(inventory, key=rank_item, reverse=True)
 
 
@@ -226,27 +236,19 @@ class ItemMenuState(Menu[Item]):
     def initialize_items(self) -> Generator[MenuItem[Item], None, None]:
         """Get all player inventory items and add them to menu."""
         state = self.determine_state_called_from()
-        inventory = []
+        inventory = local_session.player.items.sorted(rank_item, reverse=True)
         # in battle shows only items with MainCombatMenuState (usable_in)
         if state == "MainCombatMenuState":
             inventory = [
-                item
-                for item in local_session.player.items
-                if State[state] in item.usable_in
+                item for item in inventory if State[state] in item.usable_in
             ]
         # shows all items (excluded phone category)
         else:
             inventory = [
-                item
-                for item in local_session.player.items
-                if item.category != "phone"
+                item for item in inventory if item.category != "phone"
             ]
 
-        # required because the max() below will fail if inv empty
-        if not inventory:
-            return
-
-        for obj in sort_inventory(inventory):
+        for obj in inventory:
             label = obj.name + " x " + str(obj.quantity)
             image = self.shadow_text(label, bg=(128, 128, 128))
             yield MenuItem(image, obj.name, obj.description, obj)
@@ -318,24 +320,19 @@ class ShopMenuState(Menu[Item]):
 
     def initialize_items(self) -> Generator[MenuItem[Item], None, None]:
         """Get all player inventory items and add them to menu."""
-        inventory = []
+        inventory: Sequence[Item] = []
         # when the player buys
         if self.buyer.isplayer:
-            inventory = [item for item in self.seller.items]
+            inventory = self.seller.items.sorted(rank_item, reverse=True)
         # when the player sells
         if self.seller.isplayer:
             inventory = [
                 item
-                for item in self.seller.items
-                for t in self.economy.items
-                if item.slug == t.item_name
+                for item in self.seller.items.sorted(rank_item, reverse=True)
+                if self.economy.lookup_item(item.slug) is not None
             ]
 
-        # required because the max() below will fail if inv empty
-        if not inventory:
-            return
-
-        for obj in sort_inventory(inventory):
+        for obj in inventory:
             if obj.quantity != INFINITE_ITEMS:
                 label = obj.name + " x " + str(obj.quantity)
             else:
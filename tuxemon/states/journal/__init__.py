@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import math
+from bisect import bisect_right
 from functools import partial
-from typing import Any, Callable, List
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
 
 import pygame_menu
 from pygame_menu import locals
@@ -24,6 +25,53 @@ MAX_PAGE = 20
 
 MenuGameObj = Callable[[], object]
 
+# monster table and its numbered monsters, see numbered_monsters
+_numbered: Tuple[Optional[Mapping[str, MonsterModel]], List[MonsterModel]] = (
+    None,
+    [],
+)
+
+
+def numbered_monsters() -> Sequence[MonsterModel]:
+    """
+    Monsters of the Tuxepedia (with a txmn_id), sorted by txmn_id.
+
+    The list is built once per monster table and shared by the
+    journal pages.
+
+    Returns:
+        The sorted monsters.
+
+    """
+    global _numbered
+    table = db.database["monster"]
+    if _numbered[0] is not table:
+        monsters = [mon for mon in table.values() if mon.txmn_id > 0]
+        monsters.sort(key=lambda x: x.txmn_id)
+        _numbered = (table, monsters)
+    return _numbered[1]
+
+
+def monsters_in_page(
+    monsters: Sequence[MonsterModel],
+    page: int,
+) -> Sequence[MonsterModel]:
+    """
+    Monsters of a journal page, with a txmn_id in the page range.
+
+    Parameters:
+        monsters: Monsters sorted by txmn_id.
+        page: Number of the page.
+
+    Returns:
+        The monsters of the page.
+
+    """
+    ids = [mon.txmn_id for mon in monsters]
+    start = bisect_right(ids, page * MAX_PAGE)
+    stop = bisect_right(ids, (page + 1) * MAX_PAGE)
+    return monsters[start:stop]
+
 
 def fix_width(screen_x: int, pos_x: float) -> int:
     """it returns the correct width based on percentage"""
@@ -43,7 +91,7 @@ class JournalChoice(PygameMenuState):
     def add_menu_items(
         self,
         menu: pygame_menu.Menu,
-        monsters: List[MonsterModel],
+        monsters: Sequence[MonsterModel],
     ) -> None:
         width = menu._width
         height = menu._height
@@ -91,12 +139,7 @@ class JournalChoice(PygameMenuState):
 
         columns = 2
 
-        monsters = list(db.database["monster"])
-        box = []
-        for mov in monsters:
-            results = db.lookup(mov, table="monster")
-            if results.txmn_id > 0:
-                box.append(results)
+        box = numbered_monsters()
 
         diff = round(len(box) / MAX_PAGE) + 1
         rows = int(diff / columns) + 1
@@ -105,10 +148,7 @@ class JournalChoice(PygameMenuState):
             height=height, width=width, columns=columns, rows=rows
         )
 
-        menu_items_map = []
-        menu_items_map = box
-
-        self.add_menu_items(self.menu, menu_items_map)
+        self.add_menu_items(self.menu, box)
         self.repristinate()
 
     def repristinate(self) -> None:
@@ -125,7 +165,7 @@ class JournalState(PygameMenuState):
     def add_menu_items(
         self,
         menu: pygame_menu.Menu,
-        monsters: List[MonsterModel],
+        monsters: Sequence[MonsterModel],
     ) -> None:
         width = menu._width
         height = menu._height
@@ -137,8 +177,6 @@ class JournalState(PygameMenuState):
         def change_state(state: str, **kwargs: Any) -> MenuGameObj:
             return partial(self.client.push_state, state, **kwargs)
 
-        monsters = sorted(monsters, key=lambda x: x.txmn_id)
-
         player = local_session.player
         for mon in monsters:
             if mon.slug in player.tuxepedia:
@@ -180,7 +218,7 @@ class JournalState(PygameMenuState):
                 lab.translate(fix_width(width, 0.25), fix_height(height, 0.01))
 
     def __init__(self, **kwargs: Any) -> None:
-        monsters = ""
+        monsters: Sequence[MonsterModel] = []
         page = 0
         for ele in kwargs.values():
             monsters = ele["monsters"]
@@ -201,21 +239,8 @@ class JournalState(PygameMenuState):
 
         columns = 2
 
-        # defines range txmn_ids
-        min_txmn = 0
-        max_txmn = 0
-        if page == 0:
-            min_txmn = 0
-            max_txmn = MAX_PAGE
-        else:
-            min_txmn = page * MAX_PAGE
-            max_txmn = (page + 1) * MAX_PAGE
-
         # applies range to tuxemon
-        monster_list = []
-        for ele in monsters:
-            if min_txmn < ele.txmn_id <= max_txmn:
-                monster_list.append(ele)
+        monster_list = monsters_in_page(monsters, page)
 
         # fix columns and rows
         num_mon = 0
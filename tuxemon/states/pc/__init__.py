@@ -8,6 +8,7 @@ import logging
 from functools import partial
 from typing import Any, Callable, Generator, Sequence, Tuple
 
+from tuxemon.item.inventory import Inventory
 from tuxemon.locale import T
 from tuxemon.menu.input import InputMenu
 from tuxemon.menu.interface import MenuItem
@@ -51,7 +52,7 @@ class PCState(PopUpMenu[MenuGameObj]):
         if KENNEL not in local_session.player.monster_boxes.keys():
             local_session.player.monster_boxes[KENNEL] = []
         if LOCKER not in local_session.player.item_boxes.keys():
-            local_session.player.item_boxes[LOCKER] = []
+            local_session.player.item_boxes[LOCKER] = Inventory()
 
         def change_state(state: str, **kwargs: Any) -> partial[State]:
             return partial(self.client.replace_state, state, **kwargs)
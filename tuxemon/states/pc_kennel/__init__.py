@@ -3,23 +3,38 @@
 from __future__ import annotations
 
 import logging
-import math
 import uuid
 from functools import partial
-from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import pygame
 import pygame_menu
 from pygame_menu import locals
 from pygame_menu.locals import POSITION_CENTER
+from pygame_menu.widgets import SurfaceWidget
+from pygame_menu.widgets.core.widget import Widget
 from pygame_menu.widgets.selection.highlight import HighlightSelection
 from pygame_menu.widgets.widget.menubar import MENUBAR_STYLE_ADAPTIVE
 
-from tuxemon import prepare
+from tuxemon import graphics, prepare
 from tuxemon.db import PlagueType
 from tuxemon.locale import T
+from tuxemon.menu.grid import VirtualGrid
 from tuxemon.menu.interface import MenuItem
 from tuxemon.menu.menu import BACKGROUND_COLOR, PygameMenuState
 from tuxemon.menu.theme import get_theme
+from tuxemon.platform.const import buttons
+from tuxemon.platform.events import PlayerInput
 from tuxemon.session import local_session
 from tuxemon.state import State
 from tuxemon.states.journal import MonsterInfoState
@@ -27,6 +42,7 @@ from tuxemon.states.monster import MonsterMenuState
 from tuxemon.tools import (
     open_choice_dialog,
     open_dialog,
+    scale_sequence,
     transform_resource_filename,
 )
 
@@ -49,6 +65,11 @@ def fix_width(screen_x: int, pos_x: float) -> int:
 HIDDEN = "hidden_kennel"
 HIDDEN_LIST = [HIDDEN]
 MAX_BOX = 30
+# rows of monsters on screen, each made of NUM_WIDGETS widgets
+VISIBLE_ROWS = 3
+NUM_WIDGETS = 3
+# drawn while the monster sprite is being decoded
+PLACEHOLDER = pygame.Surface(scale_sequence((24, 24)), pygame.SRCALPHA)
 
 
 class MonsterTakeState(PygameMenuState):
@@ -60,7 +81,7 @@ class MonsterTakeState(PygameMenuState):
     def add_menu_items(
         self,
         menu: pygame_menu.Menu,
-        items: Sequence[Monster],
+        items: Sequence[Tuple[int, Optional[Monster]]],
     ) -> None:
         # it regroups kennel operations: pick up, move and release
         def kennel_options(instance_id: str) -> None:
@@ -79,7 +100,7 @@ class MonsterTakeState(PygameMenuState):
                 if len(kennels) >= 2:
                     self.client.pop_state()
                 self.player.remove_monster_from_storage(mon)
-                self.player.monster_boxes[box].append(mon)
+                self.player.add_monster_to_storage(mon, box)
 
             # opens choice dialog (move monster)
             def change_kennel(mon: Monster) -> None:
@@ -115,7 +136,7 @@ class MonsterTakeState(PygameMenuState):
                 self.client.pop_state()
                 self.client.pop_state()
                 self.client.pop_state()
-                self.box.remove(mon)
+                self.player.remove_monster_from_storage(mon)
                 open_dialog(
                     local_session,
                     [T.format("tuxemon_released", {"name": mon.name})],
@@ -187,32 +208,66 @@ class MonsterTakeState(PygameMenuState):
             self.client.push_state(MonsterInfoState(monster=mon))
 
         # it prints monsters inside the screen: image + button
-        _sorted = sorted(items, key=lambda x: x.slug)
-        for monster in _sorted:
+        def add_cell(index: int, monster: Optional[Monster]) -> None:
+            if monster is None:
+                # keeps the cells of a partial row empty
+                for _ in range(NUM_WIDGETS):
+                    menu.add.none_widget()
+                return
             label = T.translate(monster.name).upper()
             iid = monster.instance_id.hex
-            new_image = pygame_menu.BaseImage(
-                transform_resource_filename(monster.menu_sprite_1),
-                drawing_position=POSITION_CENTER,
-            )
-            new_image.scale(prepare.SCALE, prepare.SCALE)
-            menu.add.banner(
-                new_image,
-                partial(kennel_options, iid),
+            thumbnail = self.request_thumbnail(monster.menu_sprite_1)
+            # the surface is drawn as it is, and swapped once decoded
+            banner = menu.add.surface(
+                thumbnail or PLACEHOLDER,
+                selectable=True,
                 selection_effect=HighlightSelection(),
             )
+            banner.set_onreturn(partial(kennel_options, iid))
+            if thumbnail is None:
+                self._thumbnails[banner] = monster.menu_sprite_1
+            self._banners[banner] = index
             diff = round((monster.current_hp / monster.current_hp) * 100, 1)
             level = f"Lv.{monster.level}"
             menu.add.progress_bar(
                 level, default=diff, font_size=20, align=locals.ALIGN_CENTER
             )
-            menu.add.button(
+            button = menu.add.button(
                 label,
                 partial(description, monster),
                 font_size=20,
                 align=locals.ALIGN_CENTER,
                 selection_effect=HighlightSelection(),
             )
+            self._buttons[button] = index
+
+        # the page controls go under the last row: previous, range, next
+        def add_page_control(column: int) -> None:
+            if column == 1:
+                first = self.grid.first_row * self.grid.columns
+                last = first + len(self.grid.visible)
+                text = f"{first + 1}-{last}/{len(self.grid.items)}"
+                menu.add.label(text, font_size=20)
+                return
+            direction = 1 if column else -1
+            self._pages[direction] = menu.add.button(
+                ">" if direction > 0 else "<",
+                partial(self.turn_page, direction),
+                font_size=20,
+                align=locals.ALIGN_CENTER,
+                selection_effect=HighlightSelection(),
+            )
+
+        self._banners: Dict[Widget, int] = {}
+        self._buttons: Dict[Widget, int] = {}
+        self._pages: Dict[int, Widget] = {}
+        self._thumbnails: Dict[SurfaceWidget, str] = {}
+        cells = len(items) // self.grid.columns
+        for column in range(self.grid.columns):
+            for index, monster in items[column * cells : (column + 1) * cells]:
+                add_cell(index, monster)
+            if self.paged:
+                add_page_control(column)
 
         # menu
         box_label = T.translate(self.box_name).upper()
@@ -250,9 +305,20 @@ class MonsterTakeState(PygameMenuState):
         self.player = local_session.player
         self.box = self.player.monster_boxes[self.box_name]
 
+        # only the rows on screen have widgets, see VirtualGrid
+        self.grid = VirtualGrid(
+            sorted(self.box, key=lambda x: x.slug),
+            columns,
+            VISIBLE_ROWS,
+        )
+
         # Widgets are like a pygame_menu label, image, etc.
-        num_widgets = 3
-        rows = math.ceil(len(self.box) / columns) * num_widgets
+        rows = min(self.grid.rows, VISIBLE_ROWS) * NUM_WIDGETS
+        # monsters past the first screen are reached with page controls
+        self.paged = self.grid.rows > VISIBLE_ROWS
+        if self.paged:
+            rows += 1
+        self._broken_thumbnails: Set[str] = set()
 
         super().__init__(
             height=height, width=width, columns=columns, rows=rows
@@ -264,13 +330,131 @@ class MonsterTakeState(PygameMenuState):
             fix_width(self.menu._width, 0.33),
         ]
 
-        menu_items_map = []
-        for monster in self.box:
-            menu_items_map.append(monster)
-
-        self.add_menu_items(self.menu, menu_items_map)
+        self.build()
         self.repristinate()
 
+    def process_event(self, event: PlayerInput) -> Optional[PlayerInput]:
+        if self.open and event.pressed and event.button == buttons.MOUSELEFT:
+            # taps and clicks act on the widget under them
+            widget = self.widget_at(event.value)
+            if widget is not None:
+                self.menu.select_widget(widget)
+                widget.apply()
+            return None
+        # going past the first or last row on screen scrolls the grid
+        if self.open and event.pressed:
+            selected = self.menu.get_selected_widget()
+            # surfaces, unlike buttons, do not apply themselves
+            if event.button == buttons.A and selected in self._banners:
+                selected.apply()
+                return None
+            if event.button == buttons.DOWN and selected in self._buttons:
+                index = self._buttons[selected]
+                last_row = self.grid.visible_rows - 1
+                if index // self.grid.columns == last_row and self.scroll(1):
+                    self.select(self._banners, index)
+                    return None
+            elif event.button == buttons.UP and selected in self._banners:
+                index = self._banners[selected]
+                if index // self.grid.columns == 0 and self.scroll(-1):
+                    self.select(self._buttons, index)
+                    return None
+        return super().process_event(event)
+
+    def widget_at(self, position: Tuple[int, int]) -> Optional[Widget]:
+        """
+        Find the selectable widget drawn at a position of the screen.
+
+        Parameters:
+            position: Position of the tap or click.
+
+        Returns:
+            Widget at the position, if any.
+
+        """
+        for widget in self.menu.get_widgets():
+            if (
+                widget.is_selectable
+                and widget.is_visible()
+                and widget.get_rect(to_real_position=True).collidepoint(
+                    position
+                )
+            ):
+                return widget
+        return None
+
+    def scroll(self, rows: int) -> bool:
+        """
+        Scroll the grid and rebuild the widgets on screen.
+
+        Parameters:
+            rows: Number of rows to move down, negative to move up.
+
+        Returns:
+            Whether the grid moved.
+
+        """
+        if not self.grid.scroll(rows):
+            return False
+        self.build()
+        return True
+
+    def build(self) -> None:
+        """Build the widgets on screen, laying out the menu once."""
+        self.menu.disable_render()
+        self.menu.clear()
+        self.add_menu_items(self.menu, list(self.grid.by_column()))
+        self.menu.enable_render()
+
+    def turn_page(self, direction: int) -> None:
+        """
+        Show the previous or next screen of monsters.
+
+        Parameters:
+            direction: 1 for the next page, -1 for the previous one.
+
+        """
+        if self.scroll(direction * self.grid.visible_rows):
+            self.menu.select_widget(self._pages[direction])
+
+    def select(self, widgets: Mapping[Widget, int], index: int) -> None:
+        """Select the widget of a cell, or of the last one if it is empty."""
+        cells = {cell: widget for widget, cell in widgets.items()}
+        self.menu.select_widget(cells.get(index, cells[max(cells)]))
+
+    def request_thumbnail(
+        self,
+        filename: str,
+    ) -> Optional[pygame.surface.Surface]:
+        """
+        Get the thumbnail of a monster without waiting for it.
+
+        Parameters:
+            filename: Path of the monster sprite.
+
+        Returns:
+            Thumbnail, ``None`` while it is being decoded. Sprites that
+            failed to load get the placeholder.
+
+        """
+        if filename in self._broken_thumbnails:
+            return PLACEHOLDER
+        try:
+            return graphics.request_shared_image(filename)
+        except Exception:
+            logger.exception(f"cannot load the thumbnail {filename}")
+            self._broken_thumbnails.add(filename)
+            return PLACEHOLDER
+
+    def update(self, time_delta: float) -> None:
+        super().update(time_delta)
+        # swaps the placeholders for the thumbnails decoded meanwhile
+        for banner, filename in list(self._thumbnails.items()):
+            thumbnail = self.request_thumbnail(filename)
+            if thumbnail is not None:
+                banner.set_surface(thumbnail)
+                del self._thumbnails[banner]
+
     def repristinate(self) -> None:
         """Repristinate original theme (color, alignment, etc.)"""
         theme = get_theme()
@@ -433,6 +617,6 @@ class MonsterDropOffState(MonsterMenuState):
                 [T.translate("menu_storage_infected_monster")],
             )
         else:
-            player.monster_boxes[self.box_name].append(monster)
             player.remove_monster(monster)
+            player.add_monster_to_storage(monster, self.box_name)
             self.client.pop_state(self)
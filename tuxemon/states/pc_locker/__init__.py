@@ -10,7 +10,6 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
-    List,
     Optional,
     Sequence,
     Tuple,
@@ -458,14 +457,8 @@ class ItemDropOffState(ItemMenuState):
 
             box = player.item_boxes[self.box_name]
 
-            def find_monster_box(itm: Item, box: List[Item]) -> Optional[Item]:
-                for ele in box:
-                    if ele.slug == itm.slug:
-                        return ele
-                return None
-
             if box:
-                retrieve = find_monster_box(itm, box)
+                retrieve = box.find(itm.slug)
                 if retrieve is not None:
                     stored = player.find_item_in_storage(retrieve.instance_id)
                     if stored is not None:
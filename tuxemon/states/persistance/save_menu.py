@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 import os
-from base64 import b64decode
 from typing import Optional
 
 import pygame
@@ -71,20 +70,11 @@ class SaveMenuState(PopUpMenu[None]):
     ) -> pygame.surface.Surface:
         slot_image = pygame.Surface(rect.size, pygame.SRCALPHA)
 
-        # Try and load the save game and draw details about the save
-        save_data = save.load(slot_num)
-        assert save_data
-        if "screenshot" in save_data:
-            screenshot = b64decode(save_data["screenshot"])
-            size = (
-                save_data["screenshot_width"],
-                save_data["screenshot_height"],
-            )
-            thumb_image = pygame.image.frombuffer(
-                screenshot,
-                size,
-                "RGB",
-            ).convert()
+        # Read what the menu shows of the save, not the whole save
+        header = save.read_header(slot_num)
+        assert header
+        if header["thumbnail"] is not None:
+            thumb_image = header["thumbnail"].convert()
             thumb_rect = thumb_image.get_rect().fit(rect)
             thumb_image = pygame.transform.smoothscale(
                 thumb_image,
@@ -96,7 +86,7 @@ class SaveMenuState(PopUpMenu[None]):
             thumb_image = pygame.Surface(thumb_rect.size)
             thumb_image.fill((255, 255, 255))
 
-        if "error" in save_data:
+        if header["broken"]:
             red = (255, 0, 0)
             pygame.draw.line(thumb_image, red, [0, 0], thumb_rect.size, 3)
             pygame.draw.line(
@@ -122,14 +112,14 @@ class SaveMenuState(PopUpMenu[None]):
         x = int(rect.width * 0.5)
         text.draw_text(
             slot_image,
-            save_data["player_name"],
+            header["player_name"],
             (x, 0, 500, 500),
             font=self.font,
         )
-        if "error" not in save_data:
+        if not header["broken"]:
             text.draw_text(
                 slot_image,
-                save_data["time"],
+                header["time"],
                 (x, 50, 500, 500),
                 font=self.font,
             )
@@ -145,6 +135,7 @@ class SaveMenuState(PopUpMenu[None]):
             save.save(
                 save_data,
                 self.selected_index + 1,
+                save.capture_thumbnail(self.client),
             )
             save.slot_number = self.selected_index
         except Exception as e:
@@ -184,8 +175,7 @@ class SaveMenuState(PopUpMenu[None]):
                 escape_key_exits=True,
             )
 
-        save_data = save.load(self.selected_index + 1)
-        if save_data:
+        if save.read_header(self.selected_index + 1):
             ask_confirmation()
         else:
             self.client.pop_state()  # close save menu
@@ -55,10 +55,7 @@ class NuPhone(PygameMenuState):
             )
 
         def uninstall(itm: Item) -> None:
-            count = sum(
-                [1 for ele in self.player.items if ele.slug == itm.slug]
-            )
-            if count > 1:
+            if self.player.items.count(itm.slug) > 1:
                 self.player.remove_item(itm)
                 self.client.replace_state("NuPhone")
             else:
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import itertools
 import logging
-import os
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -24,7 +23,7 @@ from typing import (
 import pygame
 from pygame.rect import Rect
 
-from tuxemon import networking, prepare, state
+from tuxemon import networking, prepare, state, vfs
 from tuxemon.entity import Entity
 from tuxemon.graphics import ColorLike
 from tuxemon.map import (
@@ -32,14 +31,15 @@ from tuxemon.map import (
     PathfindNode,
     RegionProperties,
     TuxemonMap,
-    dirs2,
-    pairs,
+    get_exits,
+    get_explicit_tile_exits,
     proj,
 )
 from tuxemon.map_loader import TMXMapLoader, YAMLEventLoader
 from tuxemon.math import Vector2
 from tuxemon.platform.const import buttons, events, intentions
 from tuxemon.platform.events import PlayerInput
+from tuxemon.profiler import profiler
 from tuxemon.session import local_session
 from tuxemon.states.world.world_menus import WorldMenuState
 from tuxemon.surfanim import SurfaceAnimation
@@ -431,9 +431,9 @@ class WorldState(state.State):
         # TODO: move all drawing into a "WorldView" widget
         # interlace player sprites with tiles surfaces.
         # eventually, maybe use pygame sprites or something similar
-        world_surfaces: List[
-            Tuple[pygame.surface.Surface, Vector2, int]
-        ] = list()
+        world_surfaces: List[Tuple[pygame.surface.Surface, Vector2, int]] = (
+            list()
+        )
 
         # temporary
         if self.current_map.renderer is None:
@@ -666,11 +666,12 @@ class WorldState(state.State):
             ``None`` otherwise.
 
         """
-        pathnode = self.pathfind_r(
-            dest,
-            [PathfindNode(start)],
-            set(),
-        )
+        with profiler.scope("pathfind"):
+            pathnode = self.pathfind_r(
+                dest,
+                [PathfindNode(start)],
+                set(),
+            )
 
         if pathnode:
             # traverse the node to get the path
@@ -739,9 +740,7 @@ class WorldState(state.State):
         """
         Check for exits from tile which are defined in the map.
 
-        This will return exits which were defined by the map creator.
-
-        Checks "continue" and "exits" properties of the tile.
+        See :func:`tuxemon.map.get_explicit_tile_exits`.
 
         Parameters:
             position: Original position.
@@ -749,30 +748,7 @@ class WorldState(state.State):
             skip_nodes: Set of nodes to skip.
 
         """
-        # Check if the players current position has any exit limitations.
-        # this check is for tiles which define the only way to exit.
-        # for instance, one-way tiles.
-
-        # does the tile define continue movements?
-        try:
-            return [tuple(dirs2[tile["continue"]] + position)]
-        except KeyError:
-            pass
-
-        # does the tile explicitly define exits?
-        try:
-            adjacent_tiles = list()
-            for direction in tile["exit"]:
-                exit_tile = tuple(dirs2[direction] + position)
-                if exit_tile in skip_nodes:
-                    continue
-
-                adjacent_tiles.append(exit_tile)
-            return adjacent_tiles
-        except KeyError:
-            pass
-
-        return None
+        return get_explicit_tile_exits(position, tile, skip_nodes)
 
     def get_exits(
         self,
@@ -800,71 +776,13 @@ class WorldState(state.State):
         if collision_map is None:
             collision_map = self.get_collision_map()
 
-        if skip_nodes is None:
-            skip_nodes = set()
-
-        # if there are explicit way to exit this position use that information,
-        # handles 'continue' and 'exits'
-        tile_data = collision_map.get(position)
-        if tile_data:
-            exits = self.get_explicit_tile_exits(
-                position,
-                tile_data,
-                skip_nodes,
-            )
-        else:
-            exits = None
-
-        # get exits by checking surrounding tiles
-        adjacent_tiles = list()
-        for direction, neighbor in (
-            ("down", (position[0], position[1] + 1)),
-            ("right", (position[0] + 1, position[1])),
-            ("up", (position[0], position[1] - 1)),
-            ("left", (position[0] - 1, position[1])),
-        ):
-            # if exits are defined make sure the neighbor is present there
-            if exits and neighbor not in exits:
-                continue
-
-            # check if the neighbor region is present in skipped nodes
-            if neighbor in skip_nodes:
-                continue
-
-            # We only need to check the perimeter,
-            # as there is no way to get further out of bounds
-            if not (
-                self.invalid_x[0] < neighbor[0] < self.invalid_x[1]
-            ) or not (self.invalid_y[0] < neighbor[1] < self.invalid_y[1]):
-                continue
-
-            # check to see if this tile is separated by a wall
-            if (position, direction) in self.collision_lines_map:
-                # there is a wall so stop checking this direction
-                continue
-
-            # test if this tile has special movement handling
-            # NOTE: Do not refact. into a dict.get(xxxxx, None) style check
-            # NOTE: None has special meaning in this check
-            try:
-                tile_data = collision_map[neighbor]
-            except KeyError:
-                pass
-            else:
-                # None means tile is blocked with no specific data
-                if tile_data is None:
-                    continue
-
-                try:
-                    if pairs[direction] not in tile_data["enter"]:
-                        continue
-                except KeyError:
-                    continue
-
-            # no tile data, so assume it is free to move into
-            adjacent_tiles.append(neighbor)
-
-        return adjacent_tiles
+        return get_exits(
+            position,
+            collision_map,
+            self.collision_lines_map,
+            self.map_size,
+            skip_nodes,
+        )
 
     ####################################################
     #                Player Movement                   #
@@ -1090,13 +1008,14 @@ class WorldState(state.State):
             Loaded map.
 
         """
-        txmn_map = TMXMapLoader().load(path)
-        yaml_path = path[:-4] + ".yaml"
-        # TODO: merge the events from both sources
-        if os.path.exists(yaml_path):
-            new_events = list(txmn_map.events)
-            new_events.extend(YAMLEventLoader().load_events(yaml_path))
-            txmn_map.events = new_events
+        with profiler.scope("load map"):
+            txmn_map = TMXMapLoader().load(path)
+            yaml_path = path[:-4] + ".yaml"
+            # TODO: merge the events from both sources
+            if vfs.exists(yaml_path):
+                new_events = list(txmn_map.events)
+                new_events.extend(YAMLEventLoader().load_events(yaml_path))
+                txmn_map.events = new_events
         return txmn_map
 
     @no_type_check  # only used by multiplayer which is disabled
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from tuxemon.db import ElementType
-from tuxemon.element import Element
+from tuxemon.element import get_element
 from tuxemon.technique.techeffect import TechEffect, TechEffectResult
 
 if TYPE_CHECKING:
@@ -41,7 +41,7 @@ class SwitchEffect(TechEffect):
         done: bool = False
         elements = list(ElementType)
         if self.element != "random":
-            ele = Element(self.element)
+            ele = get_element(self.element)
             if ele not in target.types:
                 if self.objective == "user":
                     user.types = [ele]
@@ -56,8 +56,8 @@ class SwitchEffect(TechEffect):
         else:
             _user = random.choice(elements)
             _target = random.choice(elements)
-            ele_u = Element(_user)
-            ele_t = Element(_target)
+            ele_u = get_element(_user)
+            ele_t = get_element(_target)
             if self.objective == "user":
                 user.types = [ele_u]
                 done = True
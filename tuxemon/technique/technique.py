@@ -25,7 +25,7 @@ from tuxemon.db import (
     db,
     process_targets,
 )
-from tuxemon.element import Element
+from tuxemon.element import Element, get_element
 from tuxemon.graphics import animation_frame_files
 from tuxemon.locale import T
 from tuxemon.technique.techcondition import TechCondition
@@ -136,7 +136,7 @@ class Technique:
         self.counter_success = self.counter_success
         # types
         for _ele in results.types:
-            _element = Element(_ele)
+            _element = get_element(_ele)
             self.types.append(_element)
         # technique stats
         self.accuracy = results.accuracy or self.accuracy
@@ -19,6 +19,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Dict,
     Iterable,
     Mapping,
     NoReturn,
@@ -33,6 +34,7 @@ from typing import (
 
 from tuxemon import prepare
 from tuxemon.compat.rect import ReadOnlyRect
+from tuxemon.game_variables import GameVariables, parse_number
 from tuxemon.locale import T, replace_text
 from tuxemon.math import Vector2
 
@@ -240,80 +242,138 @@ def number_or_variable(
         that name can be retrieved.
 
     """
-    player = session.player
-    if value.isdigit():
-        return float(value)
-    elif value.replace(".", "", 1).isdigit():
-        return float(value)
+    number = parse_number(value)
+    if number is not None:
+        return number
+    variables = session.player.game_variables
+    try:
+        if isinstance(variables, GameVariables):
+            return variables.number(value)
+        return float(variables[value])
+    except (KeyError, ValueError, TypeError):
+        raise ValueError(f"invalid number or game variable {value}")
+
+
+def get_types_tuple(
+    param_type: ValidParameterSingleType,
+) -> Sequence[ValidParameterSingleType]:
+    if typing.get_origin(param_type) is Union:
+        return typing.get_args(param_type)
     else:
-        try:
-            return float(player.game_variables[value])
-        except (KeyError, ValueError, TypeError):
-            raise ValueError(f"invalid number or game variable {value}")
+        return (param_type,)
 
 
-# TODO: stability/testing
-def cast_value(
-    i: Tuple[Tuple[ValidParameterTypes, str], Any],
-) -> Any:
-    (type_constructors, param_name), value = i
+def compile_cast(
+    type_constructors: Sequence[ValidParameterSingleType],
+    param_name: str,
+) -> Callable[[Any], Any]:
+    """
+    Build a function casting values to one of the types of a parameter.
 
-    if not isinstance(type_constructors, Sequence):
-        type_constructors = [type_constructors]
+    Empty values are ``None`` if the parameter is optional, values of one
+    of the types are kept, else the first type accepting the value is
+    used. The checks that only depend on the constructors are done once,
+    here, instead of for each value.
 
-    if (value is None or value == "") and (
-        None in type_constructors or type(None) in type_constructors
-    ):
-        return None
+    Parameters:
+        type_constructors: The types allowed for the parameter.
+        param_name: The name of the parameter, for the error message.
 
-    for constructor in type_constructors:
-        if not constructor:
-            continue
+    Returns:
+        Function casting a value to one of the types.
 
-        if isinstance(value, constructor):
-            return value
+    """
+    nullable = None in type_constructors or type(None) in type_constructors
+    candidates = [
+        constructor
+        for constructor in type_constructors
+        if constructor and constructor is not type(None)
+    ]
+    message = (
+        f"Error parsing parameter {param_name} with value {{}} and "
+        f"constructor list {type_constructors}"
+    )
 
-        elif typing.get_origin(constructor) is typing.Literal:
-            allowed_values = typing.get_args(constructor)
-            if value in allowed_values:
-                return value
+    if len(candidates) == 1 and isinstance(candidates[0], type):
+        constructor = candidates[0]
 
-        else:
+        def cast_single(value: Any) -> Any:
+            if nullable and (value is None or value == ""):
+                return None
+            if isinstance(value, constructor):
+                return value
             try:
                 return constructor(value)
             except (ValueError, TypeError):
-                pass
+                raise ValueError(message.format(value))
+
+        return cast_single
+
+    def cast(value: Any) -> Any:
+        if nullable and (value is None or value == ""):
+            return None
+        for constructor in candidates:
+            if typing.get_origin(constructor) is typing.Literal:
+                if value in typing.get_args(constructor):
+                    return value
+            elif isinstance(value, constructor):
+                return value
+            else:
+                try:
+                    return constructor(value)
+                except (ValueError, TypeError):
+                    pass
+        raise ValueError(message.format(value))
 
-    raise ValueError(
-        f"Error parsing parameter {param_name} with value {value} and "
-        f"constructor list {type_constructors}",
-    )
+    return cast
 
 
-def get_types_tuple(
-    param_type: ValidParameterSingleType,
-) -> Sequence[ValidParameterSingleType]:
-    if typing.get_origin(param_type) is Union:
-        return typing.get_args(param_type)
-    else:
-        return (param_type,)
+# casting plan of each dataclass: the name and cast of its init fields
+_casting_plans: Dict[type, Sequence[Tuple[str, Callable[[Any], Any]]]] = {}
+
+
+def get_casting_plan(
+    cls: type,
+) -> Sequence[Tuple[str, Callable[[Any], Any]]]:
+    """
+    Get how to cast the init fields of a dataclass.
+
+    The type hints of the class are only evaluated the first time.
+
+    Parameters:
+        cls: The dataclass.
+
+    Returns:
+        The name and cast of each init field.
+
+    """
+    try:
+        return _casting_plans[cls]
+    except KeyError:
+        pass
+    type_hints = typing.get_type_hints(cls)
+    plan = tuple(
+        (
+            field.name,  # e.g "map_name"
+            compile_cast(
+                # e.g. (<class 'str'>, <class 'NoneType'>)
+                get_types_tuple(type_hints[field.name]),
+                field.name,
+            ),
+        )
+        for field in fields(cls)
+        if field.init
+    )
+    _casting_plans[cls] = plan
+    return plan
 
 
 def cast_dataclass_parameters(self) -> None:
     """
     Takes a dataclass object and casts its __init__ values to the correct type
     """
-    type_hints = typing.get_type_hints(self.__class__)
-    for field in fields(self):
-        if field.init:
-            field_name = field.name  # e.g "map_name"
-            type_hint = type_hints[field_name]  # e.g. Optional[str]
-            constructors = get_types_tuple(
-                type_hint
-            )  # e.g. (<class 'str'>, <class 'NoneType'>)
-            old_value = getattr(self, field_name)
-            new_value = cast_value(((constructors, field_name), old_value))
-            setattr(self, field_name, new_value)
+    for field_name, cast in get_casting_plan(self.__class__):
+        setattr(self, field_name, cast(getattr(self, field_name)))
 
 
 def show_item_result_as_dialog(
@@ -0,0 +1,285 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (c) 2014-2023 William Edwards <shadowapex@gmail.com>, Benjamin Bean <superman2k5@gmail.com>
+"""Virtual file system, reading mods straight from their archives.
+
+A mod can be installed as a single archive, ``mods/<name>.zip``, in place
+of the ``mods/<name>`` folder. Once mounted, the archive is seen at the
+path of the folder: ``mods/<name>/gfx/tuxemon.png`` is read from the
+``gfx/tuxemon.png`` member of the archive, so the paths given by
+``prepare.fetch`` are the same whether the mod is extracted or not.
+
+The central directory of the archive is read once to index its members,
+then the archive is memory-mapped: reading a member is a slice of the
+mapping, inflated if the member is compressed.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+from typing import IO, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_EXTENSIONS = (".zip",)
+
+# size of the fixed part of a local file header, and where the lengths
+# of the name and extra field are in it
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_LENGTHS = 26
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+_mounts: Dict[str, Optional[Archive]] = {}
+
+
+class Archive:
+    """
+    Zip archive indexed and memory-mapped for reading.
+
+    Parameters:
+        filename: Path of the archive.
+
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        with zipfile.ZipFile(filename) as zipf:
+            infos = zipf.infolist()
+        self.entries: Dict[str, zipfile.ZipInfo] = {}
+        self.directories: Dict[str, Set[str]] = {"": set()}
+        for info in infos:
+            name = info.filename.strip("/")
+            if not name:
+                continue
+            if info.is_dir():
+                self.directories.setdefault(name, set())
+            else:
+                self.entries[name] = info
+            self._add(name)
+        self._offsets: Dict[str, int] = {}
+        self._file = open(filename, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _add(self, name: str) -> None:
+        # lists the name in its parent directory, adding missing parents
+        parent, _, base = name.rpartition("/")
+        if parent not in self.directories:
+            self.directories[parent] = set()
+            self._add(parent)
+        self.directories[parent].add(base)
+
+    def _data_offset(self, info: zipfile.ZipInfo) -> int:
+        try:
+            return self._offsets[info.filename]
+        except KeyError:
+            pass
+        header = info.header_offset
+        if self._map[header : header + 4] != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(
+                f"bad local header for {info.filename} in {self.filename}"
+            )
+        name_length, extra_length = struct.unpack_from(
+            "<HH", self._map, header + LOCAL_HEADER_LENGTHS
+        )
+        offset = header + LOCAL_HEADER_SIZE + name_length + extra_length
+        self._offsets[info.filename] = offset
+        return offset
+
+    def read(self, name: str) -> bytes:
+        """
+        Read a member of the archive.
+
+        Parameters:
+            name: Name of the member, with ``/`` separators.
+
+        Returns:
+            The uncompressed content of the member.
+
+        """
+        info = self.entries[name]
+        encrypted = info.flag_bits & 0x1
+        if not encrypted:
+            start = self._data_offset(info)
+            data = self._map[start : start + info.compress_size]
+            if info.compress_type == zipfile.ZIP_STORED:
+                return data
+            if info.compress_type == zipfile.ZIP_DEFLATED:
+                return zlib.decompress(data, -zlib.MAX_WBITS)
+        # other compressions are left to zipfile
+        with zipfile.ZipFile(self.filename) as zipf:
+            return zipf.read(info)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+def mount(directory: str) -> bool:
+    """
+    Mount the archive installed in place of a folder, if any.
+
+    Looking for the archive is only done once per folder.
+
+    Parameters:
+        directory: Path of the folder, like ``mods/<name>``.
+
+    Returns:
+        Whether an archive is mounted at this path.
+
+    """
+    directory = os.path.normpath(directory)
+    try:
+        return _mounts[directory] is not None
+    except KeyError:
+        pass
+    archive = None
+    for extension in ARCHIVE_EXTENSIONS:
+        filename = directory + extension
+        if os.path.isfile(filename):
+            logger.debug("mounting %s at %s", filename, directory)
+            archive = Archive(filename)
+            break
+    _mounts[directory] = archive
+    return archive is not None
+
+
+def unmount_all() -> None:
+    """Close the mounted archives, and forget the folders searched."""
+    for archive in _mounts.values():
+        if archive is not None:
+            archive.close()
+    _mounts.clear()
+
+
+def _resolve(path: str) -> Optional[Tuple[Archive, str]]:
+    path = os.path.normpath(path)
+    for directory, archive in _mounts.items():
+        if archive is None:
+            continue
+        if path == directory:
+            return archive, ""
+        if path.startswith(directory + os.sep):
+            name = path[len(directory) + 1 :]
+            return archive, name.replace(os.sep, "/")
+    return None
+
+
+def exists(path: str) -> bool:
+    """
+    Whether a file or folder exists, on disk or in a mounted archive.
+
+    Parameters:
+        path: Path of the file.
+
+    Returns:
+        Whether the path exists.
+
+    """
+    if os.path.exists(path):
+        return True
+    resolved = _resolve(path)
+    if resolved is None:
+        return False
+    archive, name = resolved
+    return name in archive.entries or name in archive.directories
+
+
+def isdir(path: str) -> bool:
+    """
+    Whether a folder exists, on disk or in a mounted archive.
+
+    Parameters:
+        path: Path of the folder.
+
+    Returns:
+        Whether the path is a folder.
+
+    """
+    if os.path.isdir(path):
+        return True
+    resolved = _resolve(path)
+    return resolved is not None and resolved[1] in resolved[0].directories
+
+
+def getmtime_ns(path: str) -> int:
+    """
+    Modification time of a file or folder, on disk or in a mounted archive.
+
+    The files of an archive change only with the archive, so they all
+    have the modification time of the archive.
+
+    Parameters:
+        path: Path of the file.
+
+    Returns:
+        Modification time, in nanoseconds.
+
+    """
+    if os.path.exists(path):
+        return os.stat(path).st_mtime_ns
+    if not exists(path):
+        raise FileNotFoundError(path)
+    resolved = _resolve(path)
+    assert resolved is not None
+    return os.stat(resolved[0].filename).st_mtime_ns
+
+
+def listdir(path: str) -> List[str]:
+    """
+    List a folder, on disk or in a mounted archive.
+
+    Parameters:
+        path: Path of the folder.
+
+    Returns:
+        Names of the files and folders in it.
+
+    """
+    if os.path.isdir(path):
+        return os.listdir(path)
+    resolved = _resolve(path)
+    if resolved is None or resolved[1] not in resolved[0].directories:
+        raise FileNotFoundError(path)
+    archive, name = resolved
+    return sorted(archive.directories[name])
+
+
+def read_bytes(path: str) -> bytes:
+    """
+    Read a file, on disk or in a mounted archive.
+
+    Parameters:
+        path: Path of the file.
+
+    Returns:
+        Content of the file.
+
+    """
+    if os.path.isfile(path):
+        with open(path, "rb") as fp:
+            return fp.read()
+    resolved = _resolve(path)
+    if resolved is None or resolved[1] not in resolved[0].entries:
+        raise FileNotFoundError(path)
+    archive, name = resolved
+    return archive.read(name)
+
+
+def open_file(path: str) -> IO[bytes]:
+    """
+    Open a file for reading, on disk or in a mounted archive.
+
+    Parameters:
+        path: Path of the file.
+
+    Returns:
+        Binary file object.
+
+    """
+    if os.path.isfile(path):
+        return open(path, "rb")
+    return io.BytesIO(read_bytes(path))